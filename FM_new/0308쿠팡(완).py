@@ -1,6 +1,9 @@
 import os
 import json
 import time
+import threading
+import multiprocessing
+import queue
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import hashlib
@@ -17,11 +20,23 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
     NoSuchElementException,
-    ElementClickInterceptedException
+    ElementClickInterceptedException,
+    StaleElementReferenceException
 )
 import openai
 from dotenv import load_dotenv
 from supabase import create_client, Client
+from prohibited_matcher import get_prohibited_matcher
+from learned_bans import LearnedBans
+from review_events import ReviewEventLog
+from rules_repository import RulesRepository
+from error_log_sink import ErrorLogSink
+from review_mirror import ReviewMirror
+from review_writer import ReviewWriter
+from run_profile import timed, span, print_profile_report
+from session_cache import SessionCache
+from page_wait import PageWaiter, page_idle, element_present, element_in_view
+from reply_scorer import escalate_score, pass_fail_totals
 
 # 스크립트 최상단에 전역 변수로 추가
 processed_reviews_in_session = set()
@@ -38,6 +53,18 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 client = openai
 
+# 리뷰별 처리 단계 이벤트 로그 (events/review_events_coupang_*.jsonl)
+review_events = ReviewEventLog("쿠팡이츠", "coupang")
+
+# platform_reply_rules 메모리 저장소 (fetch_platform_data 에서 로드, updated_at 증분 갱신)
+rules_repo = RulesRepository(supabase, ["쿠팡잇츠"])
+
+# error_logs 비동기 저장 (같은 오류는 60초 안에 한 행으로 합쳐 배치 insert)
+error_sink = ErrorLogSink(supabase)
+
+# reviews 로컬 미러 (review_mirror_coupang.db, 중복 체크를 로컬에서 처리하고 updated_at 기준 백그라운드 동기화)
+review_mirror = ReviewMirror(supabase, "coupang")
+
 ###################################################
 # 1) 리뷰 해시 생성 및 ID 처리 함수들
 ###################################################
@@ -193,11 +220,8 @@ def save_config(config):
 ###################################################
 def fetch_platform_data():
     try:
-        response = supabase.table("platform_reply_rules") \
-                           .select("*") \
-                           .in_("platform", ["쿠팡잇츠"]) \
-                           .execute()
-        rows = response.data
+        # 매장 설정은 저장소에 한 번 로드 (이후 조회는 메모리에서)
+        rows = rules_repo.load()
         if not rows:
             print("플랫폼 데이터가 비어있음.")
             return []
@@ -253,13 +277,8 @@ def save_error_log_to_supabase(
     stack_trace: str = ""
 ):
     try:
-        # platform_reply_rules에서 store_name 조회
-        store_query = supabase.table("platform_reply_rules") \
-                             .select("store_name") \
-                             .eq("store_code", store_code) \
-                             .eq("platform", platform) \
-                             .execute()
-        store_name = store_query.data[0].get("store_name", "") if store_query.data else ""
+        # 매장 설정 저장소에서 store_name 조회 (워커 프로세스는 첫 조회 시 1회 로드)
+        store_name = rules_repo.store_name(store_code, platform)
 
         data = {
             "store_code": store_code,
@@ -271,8 +290,9 @@ def save_error_log_to_supabase(
             "occurred_at": datetime.now().isoformat(),
             "store_name": store_name
         }
-        supabase.table("error_logs").insert(data).execute()
-        print(f"[save_error_log_to_supabase] 에러 로그 저장 완료 - store_code={store_code}, error_type={error_type}, msg={error_message}")
+        # 바로 insert 하지 않고 대기열에 추가 (같은 오류는 합쳐서 백그라운드에서 일괄 저장)
+        if error_sink.add(data):
+            print(f"[save_error_log_to_supabase] 에러 로그 대기열 추가 - store_code={store_code}, error_type={error_type}, msg={error_message}")
     except Exception as e:
         print(f"[save_error_log_to_supabase] 에러 로그 저장 실패: {str(e)}")
 
@@ -295,6 +315,7 @@ def save_error_screenshot(driver, store_code, error_type):
 ###################################################
 # 5) 팝업 처리 관련 함수
 ###################################################
+@timed("popup.homepage")
 def close_popups_on_homepage(driver, timeout=5):
     try:
         # 쿠팡이츠의 팝업 구조에 맞게 수정
@@ -444,7 +465,7 @@ def restore_page_settings(driver, store_code, store_name, platform_code):
             # 리뷰 페이지로 다시 이동
             review_url = "https://store.coupangeats.com/merchant/management/reviews"
             driver.get(review_url)
-            time.sleep(3)
+            wait_for(driver, "restore.page_load", timeout=3)
             
             # 매장 선택 확인
             if not verify_store_code(driver, platform_code, store_name):
@@ -457,20 +478,20 @@ def restore_page_settings(driver, store_code, store_name, platform_code):
                     EC.element_to_be_clickable((By.XPATH, "//div[input[@name='startDate']]/div"))
                 )
                 driver.execute_script("arguments[0].click();", date_dropdown)
-                time.sleep(1)
+                wait_for(driver, "restore.date_dropdown", element_present(By.XPATH, "//label[.//span[text()='1개월']]"), timeout=1)
                 
                 one_month_option = WebDriverWait(driver, 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//label[.//span[text()='1개월']]"))
                 )
                 driver.execute_script("arguments[0].click();", one_month_option)
-                time.sleep(1)
+                wait_for(driver, "restore.one_month", timeout=1)
                 
                 # 조회 버튼 클릭
                 search_button = WebDriverWait(driver, 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//button[.//span[contains(text(), '조회')]]"))
                 )
                 driver.execute_script("arguments[0].click();", search_button)
-                time.sleep(2)
+                wait_for(driver, "restore.search", timeout=2)
                 
                 # 미답변 탭 클릭
                 if not click_unanswered_tab(driver, store_code):
@@ -488,10 +509,35 @@ def restore_page_settings(driver, store_code, store_name, platform_code):
         save_error_screenshot(driver, store_code, "페이지복구실패")
         return False
 
+###################################################
+# 6-1) 적응형 대기 함수 (고정 sleep 대체)
+###################################################
+# 호출 위치별 대기시간 기록/학습 (page_wait.py, 배민/쿠팡 공용): wait_stats_coupang.json
+page_waiter = PageWaiter("coupang")
+page_waiter.load_history()
+wait_for = page_waiter.wait_for
+
 ###################################################
 # 7) 로그인 처리 함수
 ###################################################
+# 로그인 세션 캐시 (session_cache.py): 쿠키 + localStorage를 계정별 파일로 보관
+SESSION_CACHE_ENABLED = True
+session_cache = SessionCache(
+    "coupang",
+    origin="https://store.coupangeats.com",
+    probe_url="https://store.coupangeats.com/merchant/management",
+    login_marker="/merchant/login",
+    enabled=SESSION_CACHE_ENABLED
+)
+
+@timed("login")
 def login_to_coupang(driver, platform_id, platform_pw, store_code, platform_name, options=None):
+    # 저장된 세션이 유효하면 로그인 생략
+    if session_cache.restore(driver, platform_id, wait=wait_for):
+        close_popups_on_homepage(driver)
+        print(f"[login_to_coupang] {store_code} 저장된 세션으로 로그인 성공")
+        return True, driver
+
     max_attempts = 3
     for attempt in range(1, max_attempts+1):
         try:
@@ -526,6 +572,7 @@ def login_to_coupang(driver, platform_id, platform_pw, store_code, platform_name
                 if attempt == max_attempts:
                     msg = f"[login_to_coupang] {store_code} 로그인 실패(최대 시도)"
                     print(msg)
+                    session_cache.invalidate(platform_id, "로그인 실패")
                     save_error_screenshot(driver, store_code, "LoginFail")
                     save_error_log_to_supabase(
                         category="오류",
@@ -539,12 +586,14 @@ def login_to_coupang(driver, platform_id, platform_pw, store_code, platform_name
 
             close_popups_on_homepage(driver)
             print(f"[login_to_coupang] {store_code} 로그인 성공")
+            session_cache.save(driver, platform_id)
             return True, driver
 
         except Exception as e:
             if attempt == max_attempts:
                 msg = f"[login_to_coupang] {store_code} 로그인 중 오류: {str(e)}"
                 print(msg)
+                session_cache.invalidate(platform_id, "로그인 실패")
                 save_error_screenshot(driver, store_code, "LoginError")
                 save_error_log_to_supabase(
                     category="오류",
@@ -560,6 +609,7 @@ def login_to_coupang(driver, platform_id, platform_pw, store_code, platform_name
 ###################################################
 # 8) AI 리뷰 분석 관련 함수
 ###################################################
+@timed("llm.analyze")
 def analyze_restaurant_review(review_text: str, rating: int, order_menu: str = "", delivery_review: str = "") -> dict:
     """음식점 리뷰를 더 세부적으로 분석하여 AI 답변 가능 여부와 상세 정보를 반환"""
     
@@ -822,6 +872,7 @@ def validate_reply_content(ai_reply: str, max_length: int = 300, greeting_end: s
             
     return True, ""
 
+@timed("llm.generate")
 def generate_ai_reply(review_text, store_info):
     """AI 답변 생성"""
     try:
@@ -923,6 +974,15 @@ def generate_ai_reply(review_text, store_info):
                 f"반드시 '{greeting_end}'(으)로 답변을 끝내세요. 다른 맺음말 사용 금지."
             ])
 
+        # 이전에 금지어 팝업이 뜬 단어는 처음부터 피하도록 지시
+        learned_bans_list = store_info.get('learned_bans') or []
+        if learned_bans_list:
+            system_prompt_parts.extend([
+                "",
+                "## 사용 금지 단어 (플랫폼 금지어)",
+                f"다음 단어는 등록이 거부되므로 절대 사용하지 마세요: {', '.join(learned_bans_list)}"
+            ])
+
         # Join all parts with newlines
         system_prompt = "\n".join(system_prompt_parts)
 
@@ -1134,12 +1194,13 @@ def generate_ai_reply_with_retry(review_text: str, store_info: dict, max_attempt
 
         # 품질 점수 평가
         try:
-            is_good, scores = score_reply(ai_reply, review_text, 
+            is_good, scores = evaluate_reply(ai_reply, review_text, 
                             store_info.get('author', ''), 
-                            store_info.get('rating', 0))
+                            store_info.get('rating', 0),
+                            store_info=store_info)
 
-            # 점수 추출
-            score = sum(scores.values()) if isinstance(scores, dict) else 70
+            # 점수 추출 (총점 항목은 합산에서 제외)
+            score = scores.get("총점", 70) if isinstance(scores, dict) else 70
             print(f"[generate_ai_reply_with_retry] Attempt {attempt + 1}: 품질 점수: {score}")
             
             # 더 나은 답변 저장
@@ -1188,6 +1249,7 @@ def generate_ai_reply_with_retry(review_text: str, store_info: dict, max_attempt
     
     raise Exception(f"유효한 답변 생성 실패 - 시도 {max_attempts}회 모두 실패: {', '.join(failure_reasons)}")
 
+@timed("llm.generate_prohibited_free")
 def generate_prohibited_free_reply(review_text, store_info):
     """금지어를 피해 AI 답변 생성"""
     try:
@@ -1208,19 +1270,20 @@ def generate_prohibited_free_reply(review_text, store_info):
         # 맺음말 존재 여부 확인
         has_greeting_end = greeting_end and greeting_end.strip()
         
-        # 감지된 금지어가 있으면 prioritized_prohibited_words에 추가
-        prioritized_prohibited_words = prohibited_words.copy()
-        if detected_word and detected_word not in prioritized_prohibited_words:
-            prioritized_prohibited_words.append(detected_word)
+        # 학습 금지어/감지된 금지어는 한 글자라도 함께 오토마톤 구성 (매장 설정별 캐시)
+        extra_words = list(store_info.get('learned_bans') or []) + ([detected_word] if detected_word else [])
+        matcher = get_prohibited_matcher(prohibited_words, extra_words=extra_words)
+        prioritized_prohibited_words = list(matcher.words)
+        if detected_word:
             print(f"[generate_prohibited_free_reply] 팝업에서 감지된 금지어 '{detected_word}' 추가")
         
-        # 리뷰 내용에서 금지어가 있는지 확인하고 마스킹된 버전 생성
-        masked_review = review_text
+        # 리뷰 내용에서 금지어가 있는지 확인하고 마스킹된 버전 생성 (한 번 탐색 결과로 마스킹)
+        review_hits = matcher.find_all(review_text)
+        masked_review = matcher.mask(review_text, hits=review_hits)
         detected_words_in_review = []
         
-        for word in prioritized_prohibited_words:
-            if word and word in review_text:
-                masked_review = masked_review.replace(word, "****")
+        for _, _, word, _ in review_hits:
+            if word not in detected_words_in_review:
                 detected_words_in_review.append(word)
                 print(f"[generate_prohibited_free_reply] 리뷰에서 금지어 '{word}' 발견 및 마스킹")
         
@@ -1305,10 +1368,11 @@ def generate_prohibited_free_reply(review_text, store_info):
         ai_reply = clean_ai_reply(ai_reply)
         
         # 생성된 답변에서 금지어 추가 확인 및 제거
-        for word in prioritized_prohibited_words:
-            if word and word in ai_reply:
+        reply_hits = matcher.find_all(ai_reply)
+        if reply_hits:
+            for word in dict.fromkeys(h[2] for h in reply_hits):
                 print(f"[generate_prohibited_free_reply] 생성된 답변에서 금지어 '{word}' 발견 및 대체")
-                ai_reply = ai_reply.replace(word, "****")
+            ai_reply = matcher.replace(ai_reply, "****", hits=reply_hits)
         
         # 맺음말 확인 및 필요시 추가 - 맺음말이 있는 경우에만 적용
         if has_greeting_end and not ai_reply.endswith(greeting_end):
@@ -1338,6 +1402,7 @@ def generate_prohibited_free_reply(review_text, store_info):
 ###################################################
 # 10) AI 답변 품질 평가 함수
 ###################################################
+@timed("llm.score")
 def score_reply(ai_reply: str, original_review: str, original_author: str = "", original_rating: int = 0, threshold: int = 80) -> tuple:
     """
     AI 답변의 품질을 세부적으로 평가합니다.
@@ -1448,9 +1513,36 @@ AI 답글:
         # 오류 발생시 기본적으로 통과 처리
         return True, {"총점": 80}
 
+# 로컬 품질 평가 (reply_scorer.py, 배민/쿠팡/요기요 공용): score_reply 와 같은 100점 항목을 간단한 특징으로 계산하고,
+# 점수가 기준점 근처일 때만 GPT 평가 호출
+SCORE_LOCAL_ENABLED = True
+
+def evaluate_reply(ai_reply: str, original_review: str, original_author: str = "", original_rating: int = 0,
+                   threshold: int = 80, store_info: dict = None) -> tuple:
+    """
+    로컬 평가 후 기준점 근처(±SCORE_ESCALATION_MARGIN)일 때만 GPT 평가(score_reply)로 확정 (reply_scorer.escalate_score)
+    - 반환 형식은 score_reply 와 같음: (합격 여부, {항목: 점수, ..., "총점": 점수})
+    - store_info 의 greeting_start/greeting_end/max_length/order_menu 를 평가에 사용
+    """
+    def remote_score():
+        return score_reply(ai_reply, original_review, original_author, original_rating, threshold)
+
+    if not SCORE_LOCAL_ENABLED or store_info is None:
+        return remote_score()
+    review = {
+        "review_text": original_review,
+        "star": original_rating,
+        "order_menu": store_info.get("order_menu", "")
+    }
+    return escalate_score(ai_reply, review, store_info, remote_score, threshold, local_result=pass_fail_totals)
+
 ###################################################
 # 11) 리뷰 저장 및 관리 함수
 ###################################################
+# 리뷰 저장 write-behind 큐 (배치 upsert, review_writer.py)
+review_writer = ReviewWriter(supabase, "review_write_queue_coupang.jsonl")
+
+@timed("db.save")
 def _save_review_data(
     store_code, platform, platform_code, review_name, rating, 
     review_content, ai_response, review_date, status, store_name, 
@@ -1482,18 +1574,11 @@ def _save_review_data(
             "updated_at": datetime.now().isoformat()
         }
         
-        # 기존 레코드 확인
-        existing = supabase.table("reviews").select("id").eq("review_id", review_id).execute()
-        
-        if existing.data:
-            # 업데이트
-            record_id = existing.data[0]['id']
-            supabase.table("reviews").update(data).eq("id", record_id).execute()
-            print(f"[_save_review_data] 리뷰 업데이트: id={record_id}, status={status}, retry={retry_count}")
-        else:
-            # 신규 저장
-            supabase.table("reviews").insert(data).execute()
-            print(f"[_save_review_data] 새 리뷰 저장: status={status}, retry={retry_count}")
+        # write-behind 큐에 추가 (review_id 기준 upsert로 일괄 저장)
+        review_writer.enqueue(data)
+        review_mirror.put(data)
+        print(f"[_save_review_data] 리뷰 저장 대기열 추가: status={status}, retry={retry_count}")
+        review_events.finish(review_id, status)
             
     except Exception as e:
         print(f"[_save_review_data] 저장 실패: {str(e)}")
@@ -1527,17 +1612,16 @@ def _check_duplicate_review(driver, store_code, platform_name, review_hash, auth
         # 날짜 차이 계산 (오늘 - 리뷰날짜)
         days_passed = (today_date - review_date_obj).days
         
-        # DB에서 기존 리뷰 조회
-        existing = supabase.table("reviews").select("*").eq("review_id", review_hash).execute()
+        # 기존 리뷰 조회 (로컬 미러 우선, 동기화된 적 없는 매장만 DB 조회)
+        record = review_mirror.lookup(review_hash, store_code, platform_name)
         
-        if not existing.data:
+        if not record:
             # 기존 리뷰 없음 - 날짜 체크: 하루가 지났는지 확인
             if days_passed < 1:
                 print(f"[_check_duplicate_review] 새 리뷰 발견: {review_hash[:8]} - 작성된지 1일 미만이라 답변대기 상태로 저장")
                 return True, 0, "답변대기"  # 1일 미만은 스킵하고 답변대기 상태로 저장
             return False, 0, ""  # 1일 이상은 처리
             
-        record = existing.data[0]
         status = record.get('response_status', '')
         retry_count = record.get('retry_count', 0)
         
@@ -1599,6 +1683,30 @@ def sanitize_reply(reply_text, greeting_end=None):
     
     return clean_text
 
+def _submit_settled(text_area):
+    """
+    댓글 등록 후 팝업이 화면에 뜨거나 입력창이 사라지면 True인 조건
+    - 모달 틀(dialog-modal-wrapper__body)은 숨겨진 채로 DOM에 남아 있을 수 있으므로 표시된 경우만 인정
+    """
+    def _condition(driver):
+        for popup in driver.find_elements(By.XPATH, "//div[contains(@class, 'dialog-modal-wrapper__body')] | //div[contains(text(), '외부 API 호출')]"):
+            try:
+                if popup.is_displayed():
+                    return True
+            except StaleElementReferenceException:
+                continue
+        try:
+            return not text_area.is_displayed()
+        except StaleElementReferenceException:
+            return True
+    return _condition
+
+# 학습 금지어 (learned_bans.py): 금지어 팝업에서 추출한 단어를 플랫폼/매장별로 저장해 두고
+# 다음 답변부터 프롬프트와 등록 전 검사에 반영 (팝업 → 재생성 → 재등록 왕복 방지)
+learned_bans = LearnedBans("learned_bans_coupang.json")
+learned_bans.load()
+
+@timed("submit")
 def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, max_attempts=3):
     """댓글 등록 로직 - 맺음말 중복 제거 및 API 오류 처리"""
     for attempt in range(1, max_attempts + 1):
@@ -1608,7 +1716,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                 card_element
             )
-            time.sleep(2)
+            wait_for(driver, "comment.scroll_card", element_in_view(card_element), timeout=2)
 
             # 댓글 등록 버튼 찾기
             comment_btn = WebDriverWait(card_element, 5).until(
@@ -1618,7 +1726,6 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
                 ))
             )
             driver.execute_script("arguments[0].click();", comment_btn)
-            time.sleep(2)
 
             # 텍스트 영역 찾기
             text_area = WebDriverWait(driver, 10).until(
@@ -1635,7 +1742,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
             # 직접 값 설정
             text_area.clear()
             driver.execute_script("arguments[0].value = arguments[1];", text_area, clean_reply)
-            time.sleep(2)
+            wait_for(driver, "comment.set_value", lambda d: text_area.get_attribute('value') == clean_reply, timeout=2)
             
             # 실제 입력값 확인
             current_val = text_area.get_attribute('value')
@@ -1646,11 +1753,14 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
                 EC.element_to_be_clickable((By.XPATH, "//button[.//span[contains(text(),'등록')]]"))
             )
             driver.execute_script("arguments[0].click();", submit_btn)
-            time.sleep(2)
+
+            # 팝업이 뜨거나 입력창이 닫힐 때까지 대기 - 결과가 정해진 뒤에는 팝업 확인을 짧게
+            settled = wait_for(driver, "comment.submit_result", _submit_settled(text_area), timeout=5)
+            popup_timeout = 1 if settled else 5
 
             # API 오류 팝업 처리
             try:
-                popup = WebDriverWait(driver, 5).until(
+                popup = WebDriverWait(driver, popup_timeout).until(
                     EC.presence_of_element_located((By.XPATH, "//div[contains(text(), '외부 API 호출')]"))
                 )
                 print("[click_and_submit_comment] API 오류 팝업 발견")
@@ -1658,7 +1768,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
                     EC.element_to_be_clickable((By.XPATH, "//button[.//span[contains(text(), '확인')]]"))
                 )
                 driver.execute_script("arguments[0].click();", ok_btn)
-                time.sleep(2)
+                wait_for(driver, "comment.api_error_ok", timeout=2)
                 
                 # 취소 버튼 클릭하여 댓글 모달 닫기
                 try:
@@ -1666,7 +1776,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
                         EC.element_to_be_clickable((By.XPATH, "//button[.//span[contains(text(),'취소')]]"))
                     )
                     driver.execute_script("arguments[0].click();", cancel_btn)
-                    time.sleep(2)
+                    wait_for(driver, "comment.cancel", lambda d: not d.find_elements(By.XPATH, "//textarea[@name='review']"), timeout=2)
                 except:
                     pass
                 
@@ -1675,7 +1785,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
             except TimeoutException:
                 # 금지어 팝업 확인 (기존 로직)
                 try:
-                    popup_elem = WebDriverWait(driver, 5).until(
+                    popup_elem = WebDriverWait(driver, popup_timeout).until(
                         EC.visibility_of_element_located((
                             By.XPATH, 
                             "//div[contains(@class, 'dialog-modal-wrapper__body')]"
@@ -1710,7 +1820,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
                         ))
                     )
                     driver.execute_script("arguments[0].click();", ok_btn)
-                    time.sleep(1)
+                    wait_for(driver, "comment.prohibited_ok", timeout=1)
                     
                     # 취소 버튼 클릭해서 모달 닫기
                     try:
@@ -1718,7 +1828,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
                             EC.element_to_be_clickable((By.XPATH, "//button[.//span[contains(text(),'취소')]]"))
                         )
                         driver.execute_script("arguments[0].click();", cancel_btn)
-                        time.sleep(1)
+                        wait_for(driver, "comment.cancel", lambda d: not d.find_elements(By.XPATH, "//textarea[@name='review']"), timeout=1)
                     except:
                         pass
                     
@@ -1743,7 +1853,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, author_name, m
                     EC.element_to_be_clickable((By.XPATH, "//button[.//span[contains(text(),'취소')]]"))
                 )
                 driver.execute_script("arguments[0].click();", cancel_btn)
-                time.sleep(1)
+                wait_for(driver, "comment.cancel", lambda d: not d.find_elements(By.XPATH, "//textarea[@name='review']"), timeout=1)
             except:
                 pass
 
@@ -1770,7 +1880,7 @@ def verify_comment_submission(driver, card_element, review_hash, store_code):
     try:
         # 페이지 새로고침 (변경사항 반영을 위해)
         driver.refresh()
-        time.sleep(3)
+        wait_for(driver, "verify.refresh", timeout=3)
         
         # 현재 페이지에서 모든 리뷰 카드 가져오기
         all_cards = driver.find_elements(By.XPATH, '//tr')
@@ -1814,6 +1924,7 @@ def handle_review_card(
     - 맺음말 제한이 적용된 함수 사용
     - 매칭 오류 문제 해결을 위해 작성자와 리뷰 미리보기 추가 검증
     """
+    card_started = time.time()
     # 1. 답글 버튼 체크
     try:
         comment_btn = card_element.find_elements(By.XPATH, ".//button[contains(text(),'사장님 댓글 등록하기')]")
@@ -1893,6 +2004,8 @@ def handle_review_card(
 
     # 3. 리뷰 ID 생성 - 이제 모든 필요한 변수가 준비됨
     review_hash = generate_review_hash(store_code, author, review_text, order_number, review_date, star_rating)
+    review_events.start(review_hash, store_code, started_at=card_started, rating=star_rating)
+    review_events.mark(review_hash, "crawled")
     
     # 5. 중복 체크 및 재시도 횟수 확인, 날짜 기반 처리
     should_skip, retry_count, status = _check_duplicate_review(
@@ -1948,6 +2061,7 @@ def handle_review_card(
     if not existing.data:
         # 리뷰 분석으로 사장님 확인 필요 여부 판단
         analysis_result = analyze_restaurant_review(review_text, star_rating, order_menu, delivery_review)
+        review_events.mark(review_hash, "analyzed")
         
         # AI 답변 불가능 판정이면 사장님 확인 필요로 저장
         if not analysis_result['ai_reply']:
@@ -1981,6 +2095,7 @@ def handle_review_card(
         # 일반 리뷰(사장님 확인필요가 아닌 경우)는 추가 분석
         if not is_from_boss_review:
             analysis_result = analyze_restaurant_review(review_text, star_rating, order_menu, delivery_review)
+            review_events.mark(review_hash, "analyzed")
             
             if not analysis_result['ai_reply']:
                 print(f"[handle_review_card] AI 답변 불가 판정: {analysis_result['reason']}")
@@ -2016,7 +2131,10 @@ def handle_review_card(
             "max_length": rule.get("max_length", 300),
             "author": author,
             "rating": star_rating,
-            "store_type": rule.get("store_type", "delivery_only")
+            "order_menu": order_menu,
+            "store_type": rule.get("store_type", "delivery_only"),
+            "prohibited_words": rule.get("prohibited_words", []),
+            "learned_bans": learned_bans.get(platform_name, store_code)
         }
         
         # 개선된 답변 생성 함수 사용
@@ -2041,8 +2159,11 @@ def handle_review_card(
             )
             return None
 
+        review_events.mark(review_hash, "generated")
+
         # 10. 답변 품질 검사
-        is_good_reply, _ = score_reply(ai_reply, review_text, author, star_rating, threshold=80)
+        is_good_reply, _ = evaluate_reply(ai_reply, review_text, author, star_rating, threshold=80, store_info=store_info)
+        review_events.mark(review_hash, "scored")
         if not is_good_reply:
             print("[handle_review_card] AI 답변 품질 미달")
             _save_review_data(
@@ -2063,6 +2184,9 @@ def handle_review_card(
             )
             return None
 
+        # 10-1. 학습 금지어 사전 확인 (팝업 전에 교체)
+        ai_reply = learned_bans.avoid(ai_reply, review_text, store_info, generate_prohibited_free_reply)
+
         # 11. 댓글 등록 - 금지어 처리 추가
         max_retries = 2  # 금지어 발견 시 최대 재시도 횟수
         current_retry = 0
@@ -2087,6 +2211,7 @@ def handle_review_card(
             if is_success is True:
                 # 성공 시 DB 저장 및 함수 종료
                 print("[handle_review_card] 댓글 등록 성공!")
+                review_events.mark(review_hash, "posted")
                 _save_review_data(
                     store_code=store_code,
                     platform=platform_name,
@@ -2157,6 +2282,7 @@ def handle_review_card(
                 # 내용 관련 금지어 발견 시 새로운 답변 생성
                 prohibited_info = f"'{prohibited_word}'" if prohibited_word else "내용 관련 금지어"
                 print(f"[handle_review_card] {prohibited_info} 발견. 새로운 답변 생성 시도")
+                learned_bans.record(platform_name, store_code, prohibited_word)
                 
                 try:
                     # 금지어 없는 새 답변 생성 시도 - 감지된 금지어 정보 포함
@@ -2172,6 +2298,7 @@ def handle_review_card(
                         "rating": star_rating,
                         "store_type": rule.get("store_type", "delivery_only"),
                         "prohibited_words": rule.get("prohibited_words", []),
+                        "learned_bans": learned_bans.get(platform_name, store_code),
                         "detected_prohibited_word": prohibited_word  # 감지된 금지어 추가
                     }
                     
@@ -2341,9 +2468,10 @@ def process_reviews_on_page(driver, store_code, platform_name, platform_code, st
             
             try:
                 # 현재 페이지의 리뷰 카드 가져오기
-                rows = WebDriverWait(driver, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, '//tr'))
-                )
+                with span("scan.cards"):
+                    rows = WebDriverWait(driver, 10).until(
+                        EC.presence_of_all_elements_located((By.XPATH, '//tr'))
+                    )
                 
                 if not rows:
                     print("[process_reviews_on_page] 페이지에 리뷰 없음")
@@ -2354,15 +2482,16 @@ def process_reviews_on_page(driver, store_code, platform_name, platform_code, st
                 
                 # 이미 처리된 리뷰 스킵을 위한 ID 목록 미리 생성
                 review_ids_on_page = []
-                for row in rows:
-                    try:
-                        # 답글 버튼 확인
-                        comment_btns = row.find_elements(By.XPATH, ".//button[contains(text(),'사장님 댓글 등록하기')]")
-                        if comment_btns:
-                            review_id = get_review_identifier(row, store_code)
-                            review_ids_on_page.append((row, review_id))
-                    except:
-                        continue
+                with span("scan.cards"):
+                    for row in rows:
+                        try:
+                            # 답글 버튼 확인
+                            comment_btns = row.find_elements(By.XPATH, ".//button[contains(text(),'사장님 댓글 등록하기')]")
+                            if comment_btns:
+                                review_id = get_review_identifier(row, store_code)
+                                review_ids_on_page.append((row, review_id))
+                        except:
+                            continue
                 
                 # 이미 처리된 리뷰 제외하고 처리할 리뷰만 선택
                 reviews_to_process = []
@@ -2544,7 +2673,7 @@ def go_to_next_page(driver):
             return False
         
         driver.execute_script("arguments[0].click();", next_button)
-        time.sleep(3)  # 페이지 로딩 대기
+        wait_for(driver, "page.next", timeout=3)  # 페이지 로딩 대기
         print("[go_to_next_page] 다음 페이지로 이동 성공")
         return True
     
@@ -2558,6 +2687,7 @@ def go_to_next_page(driver):
 ###################################################
 # 15) 매장 선택 함수
 ###################################################
+@timed("navigate")
 def navigate_to_review_management(driver, store_code, store_name, platform_code):
     """리뷰 관리 페이지로 이동하고 가게 선택"""
     try:
@@ -2738,8 +2868,10 @@ def click_unanswered_tab(driver, store_code):
 ###################################################
 # 16) 로그아웃 함수
 ###################################################
-def logout_and_move_to_next(driver):
-    """로그아웃하고 다음 계정으로 넘어가는 함수"""
+def logout_and_move_to_next(driver, platform_id=None):
+    """로그아웃하고 다음 계정으로 넘어가는 함수 (로그아웃하면 저장된 세션도 무효화)"""
+    if platform_id:
+        session_cache.invalidate(platform_id, "로그아웃")
     try:
         # 사용자 메뉴 클릭
         try:
@@ -2835,69 +2967,26 @@ def run_automation():
         # 인증정보별 그룹화
         creds_group = group_by_credentials(platform_data)
 
-        # 계정별 처리
-        for (pid, ppw), rules_list in creds_group.items():
-            print(f"\n[run_automation] 로그인 계정 ID={pid}, 매장수={len(rules_list)}")
-            if not rules_list:
-                continue
-
-            # 브라우저 옵션 설정
-            options = uc.ChromeOptions()
-            options.add_argument("--disable-gpu")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument("--start-maximized")
+        # 리뷰 저장 큐 준비 (이전 실행 미전송분 복구 후 백그라운드 writer 시작)
+        review_writer.load_spilled()
+        review_writer.start()
 
-            # 드라이버 시작
-            print("[run_automation] 드라이버 시작")
-            try:
-                driver = uc.Chrome(options=options)
-                
-                # 1) 로그인
-                login_success, driver = login_to_coupang(driver, pid, ppw, rules_list[0]["store_code"], "쿠팡잇츠", options)
-                if not login_success:
-                    print(f"[run_automation] ID={pid} 로그인 실패 => 다음 계정으로 넘어감")
-                    driver.quit()
-                    continue
-                    
-                # 로그인 성공 시 매장별 처리
-                for rule in rules_list:
-                    store_code = rule["store_code"]
-                    platform_code = rule["platform_code"]
-                    store_nm = rule["store_name"]
-                    print(f"[run_automation] 매장처리 시작 store_code={store_code}, platform=쿠팡잇츠, code={platform_code}")
-                    
-                    # 새창 체크 및 닫기
-                    check_and_close_new_windows(driver, store_code)
-                    
-                    # 리뷰 페이지로 이동
-                    if not navigate_to_review_management(driver, store_code, store_nm, platform_code):
-                        print(f"[run_automation] {store_code} 리뷰 페이지 이동 실패 => 다음 매장으로 넘어감")
-                        continue
-                    
-                    # 리뷰 처리
-                    process_reviews_on_page(driver, store_code, "쿠팡잇츠", platform_code, store_nm, rule)
-                    
-                    # 다음 매장 처리 전 잠시 대기
-                    time.sleep(2)
-                
-                # 드라이버 종료
-                try:
-                    driver.quit()
-                    print("[run_automation] 드라이버 종료")
-                except:
-                    pass
-                
-            except Exception as e:
-                print(f"[run_automation] 계정 처리 중 전체 오류: {str(e)}")
-                try:
-                    if driver:
-                        driver.quit()
-                except:
-                    pass
+        # 동시 실행 계정 수가 2 이상이면 프로세스 풀로 병렬 처리
+        worker_count = get_worker_count()
+        if worker_count > 1 and len(creds_group) > 1:
+            run_in_worker_pool(creds_group, worker_count)
+        else:
+            # 계정별 처리
+            for (pid, ppw), rules_list in creds_group.items():
+                process_account_group(pid, ppw, rules_list)
 
         # 모든 작업 완료 후 메시지
+        review_writer.flush("작업 완료")
+        page_waiter.print_stats()
+        learned_bans.print_stats()
+        print_profile_report("coupang")
+        error_sink.close()
+        review_mirror.log_stats()
         print(f"=== 쿠팡이츠 자동화 로그 종료: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===")
         messagebox.showinfo("완료", f"쿠팡이츠 리뷰 자동화 처리가 완료되었습니다.\n로그 파일: {log_file_path}")
     
@@ -2911,6 +3000,213 @@ def run_automation():
         log_file.close()
         print(f"로그 파일이 저장되었습니다: {log_file_path}")
 
+def process_account_group(pid, ppw, rules_list, profile_dir=None, on_store_done=None):
+    """
+    한 계정에 속한 매장들을 전용 드라이버 하나로 처리 (로그인 1회)
+    - profile_dir: 크롬 프로필 폴더 (병렬 실행 시 워커별로 분리)
+    - on_store_done(store_code, ok): 매장 처리 후 호출 (병렬 실행 시 결과 보고용)
+    """
+    print(f"\n[run_automation] 로그인 계정 ID={pid}, 매장수={len(rules_list)}")
+    if not rules_list:
+        return
+
+    # 브라우저 옵션 설정
+    options = uc.ChromeOptions()
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--start-maximized")
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+    # 드라이버 시작
+    print("[run_automation] 드라이버 시작")
+    driver = None
+    try:
+        driver = uc.Chrome(options=options)
+        
+        # 1) 로그인
+        login_success, driver = login_to_coupang(driver, pid, ppw, rules_list[0]["store_code"], "쿠팡잇츠", options)
+        if not login_success:
+            print(f"[run_automation] ID={pid} 로그인 실패 => 다음 계정으로 넘어감")
+            driver.quit()
+            if on_store_done:
+                for rule in rules_list:
+                    on_store_done(rule["store_code"], False)
+            return
+            
+        # 로그인 성공 시 매장별 처리
+        for rule in rules_list:
+            store_code = rule["store_code"]
+            platform_code = rule["platform_code"]
+            store_nm = rule["store_name"]
+            print(f"[run_automation] 매장처리 시작 store_code={store_code}, platform=쿠팡잇츠, code={platform_code}")
+            
+            # 새창 체크 및 닫기
+            check_and_close_new_windows(driver, store_code)
+            
+            # 리뷰 페이지로 이동
+            if not navigate_to_review_management(driver, store_code, store_nm, platform_code):
+                print(f"[run_automation] {store_code} 리뷰 페이지 이동 실패 => 다음 매장으로 넘어감")
+                if on_store_done:
+                    on_store_done(store_code, False)
+                continue
+            
+            # 리뷰 처리
+            process_reviews_on_page(driver, store_code, "쿠팡잇츠", platform_code, store_nm, rule)
+            review_writer.flush(f"매장 종료 {store_code}")
+            if on_store_done:
+                on_store_done(store_code, True)
+            
+            # 다음 매장 처리 전 잠시 대기
+            time.sleep(2)
+        
+        # 드라이버 종료
+        try:
+            driver.quit()
+            print("[run_automation] 드라이버 종료")
+        except:
+            pass
+        
+    except Exception as e:
+        print(f"[run_automation] 계정 처리 중 전체 오류: {str(e)}")
+        try:
+            if driver:
+                driver.quit()
+        except:
+            pass
+        # 병렬 실행 워커는 오류를 부모 프로세스에 보고하도록 다시 발생
+        if on_store_done:
+            raise
+    finally:
+        review_writer.flush(f"계정 종료 {pid}")
+
+###################################################
+# 18) 병렬 실행 (계정 그룹별 프로세스 풀)
+###################################################
+WORKER_PROFILE_ROOT = "chrome_profiles"  # 워커별 크롬 프로필 상위 폴더
+
+def get_worker_count():
+    """GUI에서 입력한 동시 실행 계정 수 (잘못된 값이면 1)"""
+    try:
+        return max(1, int(worker_count_var.get()))
+    except Exception:
+        return 1
+
+def account_worker(worker_id, groups, result_queue, log_file_path):
+    """
+    워커 프로세스 진입점
+    - 전용 크롬 프로필로 할당받은 계정 그룹을 순서대로 처리
+    - 리뷰 행, 매장 결과, 오류는 result_queue로 부모 프로세스에 전달
+    """
+    review_writer.forward_to(result_queue, worker_id)
+
+    # 워커별 로그 파일
+    original_stdout = sys.stdout
+    log_file = open(log_file_path, 'w', encoding='utf-8')
+    sys.stdout = LogWriter(original_stdout, log_file)
+
+    stats = {"accounts": 0, "stores": 0, "failed_stores": 0, "errors": 0}
+    started = time.time()
+
+    def on_store_done(store_code, ok):
+        stats["stores" if ok else "failed_stores"] += 1
+        result_queue.put(("store", worker_id, store_code, ok))
+
+    profile_dir = os.path.abspath(os.path.join(WORKER_PROFILE_ROOT, f"coupang_w{worker_id}"))
+    os.makedirs(profile_dir, exist_ok=True)
+    try:
+        print(f"[account_worker] 워커 {worker_id} 시작: 계정 {len(groups)}개, 프로필={profile_dir}")
+        for pid, ppw, rules_list in groups:
+            stats["accounts"] += 1
+            try:
+                process_account_group(pid, ppw, rules_list, profile_dir, on_store_done)
+            except Exception as e:
+                stats["errors"] += 1
+                result_queue.put(("error", worker_id, f"ID={pid}: {str(e)}"))
+    finally:
+        stats["elapsed"] = time.time() - started
+        result_queue.put(("done", worker_id, stats))
+        page_waiter.print_stats()
+        learned_bans.print_stats()
+        print_profile_report("coupang")
+        error_sink.close()
+        review_mirror.log_stats()
+        sys.stdout = original_stdout
+        log_file.close()
+
+def run_in_worker_pool(creds_group, worker_count):
+    """
+    계정 그룹을 worker_count개 프로세스에 나눠 병렬 처리
+    - 워커가 보낸 리뷰 행은 부모의 write-behind 큐로 저장
+    - 종료 후 워커별 처리량 요약 출력
+    """
+    groups = [(pid, ppw, rules) for (pid, ppw), rules in creds_group.items() if rules]
+    worker_count = max(1, min(worker_count, len(groups)))
+    shards = [groups[i::worker_count] for i in range(worker_count)]
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ctx = multiprocessing.get_context("spawn")
+    result_queue = ctx.Queue()
+    workers = {}
+    summary = {}
+    for worker_id, shard in enumerate(shards, 1):
+        worker_log = os.path.join('쿠팡_로그', f"coupang_log_{timestamp}_w{worker_id}.txt")
+        proc = ctx.Process(target=account_worker, args=(worker_id, shard, result_queue, worker_log))
+        proc.start()
+        workers[worker_id] = proc
+        summary[worker_id] = {"accounts": 0, "stores": 0, "failed_stores": 0, "errors": 0, "reviews": 0, "elapsed": 0.0}
+        print(f"[run_in_worker_pool] 워커 {worker_id} 시작 (pid={proc.pid}, 계정 {len(shard)}개, 로그={worker_log})")
+
+    started = time.time()
+    finished = set()
+    while len(finished) < len(workers):
+        try:
+            msg = result_queue.get(timeout=5)
+        except queue.Empty:
+            # 비정상 종료된 워커는 done 메시지 없이 끝난 것으로 처리
+            for worker_id, proc in workers.items():
+                if worker_id not in finished and not proc.is_alive() and result_queue.empty():
+                    print(f"[run_in_worker_pool] 워커 {worker_id} 비정상 종료 (exitcode={proc.exitcode})")
+                    summary[worker_id]["errors"] += 1
+                    summary[worker_id]["elapsed"] = time.time() - started
+                    finished.add(worker_id)
+            continue
+
+        kind, worker_id = msg[0], msg[1]
+        if kind == "review":
+            review_writer.enqueue(msg[2])
+            summary[worker_id]["reviews"] += 1
+        elif kind == "store":
+            print(f"[run_in_worker_pool] 워커 {worker_id} 매장 완료: {msg[2]} ({'성공' if msg[3] else '실패'})")
+        elif kind == "error":
+            print(f"[run_in_worker_pool] 워커 {worker_id} 오류: {msg[2]}")
+        elif kind == "done":
+            summary[worker_id].update(msg[2])
+            finished.add(worker_id)
+
+    for proc in workers.values():
+        proc.join(timeout=10)
+
+    print_worker_summary(summary, time.time() - started)
+    return summary
+
+def print_worker_summary(summary, total_elapsed):
+    """워커별 처리량 요약 출력"""
+    print("\n[병렬 실행 요약]")
+    print(f"{'워커':>4} {'계정':>4} {'매장':>4} {'실패':>4} {'리뷰':>5} {'오류':>4} {'소요(초)':>8} {'매장/분':>7} {'리뷰/분':>7}")
+    for worker_id in sorted(summary):
+        s = summary[worker_id]
+        minutes = s["elapsed"] / 60 if s["elapsed"] else 0
+        stores_per_min = s["stores"] / minutes if minutes else 0
+        reviews_per_min = s["reviews"] / minutes if minutes else 0
+        print(f"{worker_id:>4} {s['accounts']:>4} {s['stores']:>4} {s['failed_stores']:>4} {s['reviews']:>5} "
+              f"{s['errors']:>4} {s['elapsed']:>8.1f} {stores_per_min:>7.2f} {reviews_per_min:>7.2f}")
+    total_stores = sum(s["stores"] for s in summary.values())
+    total_reviews = sum(s["reviews"] for s in summary.values())
+    print(f"[병렬 실행 요약] 전체 소요 {total_elapsed:.1f}초, 매장 {total_stores}개, 리뷰 {total_reviews}건")
+
 # 화면과 파일에 동시에 출력하기 위한 클래스 (run_automation 함수 바로 위에 추가)
 class LogWriter:
     def __init__(self, terminal, log_file):
@@ -2925,15 +3221,9 @@ class LogWriter:
         self.terminal.flush()
         self.log_file.flush()
 
-# GUI 설정
-root = tk.Tk()
-root.title("쿠팡이츠 리뷰 자동화")
-
-# 설정 로드
+# GUI 설정 (설정 로드, Tk 위젯은 build_gui 에서 생성)
 config = load_config()
 driver_path = config.get('chromedriver_path', '')
-driver_label = tk.Label(root, text=f"크롬드라이버 경로: {driver_path if driver_path else '미설정'}")
-driver_label.pack(pady=10)
 
 def set_driver_path():
     """크롬드라이버 경로 설정 버튼 함수"""
@@ -2949,31 +3239,54 @@ def set_driver_path():
         save_config(conf)
         driver_path = path
 
-# 버튼과 UI 요소들
-btn_driver = tk.Button(root, text="크롬드라이버 경로 설정", command=set_driver_path)
-btn_driver.pack(pady=5)
+def build_gui():
+    """
+    GUI 구성 (메인 프로세스에서만 호출)
+    - 병렬 실행 워커(spawn)는 이 모듈을 다시 import 하므로 Tk 창은 모듈 최상위에서 만들지 않음
+    """
+    global root, driver_label, execution_mode, range_entry, worker_count_var
+    root = tk.Tk()
+    root.title("쿠팡이츠 리뷰 자동화")
+
+    driver_label = tk.Label(root, text=f"크롬드라이버 경로: {driver_path if driver_path else '미설정'}")
+    driver_label.pack(pady=10)
+
+    # 버튼과 UI 요소들
+    btn_driver = tk.Button(root, text="크롬드라이버 경로 설정", command=set_driver_path)
+    btn_driver.pack(pady=5)
 
-# 실행 모드 설정
-execution_mode = tk.StringVar(value='all')
-frame_mode = tk.LabelFrame(root, text="실행 범위 설정", padx=10, pady=10)
-frame_mode.pack(pady=5)
+    # 실행 모드 설정
+    execution_mode = tk.StringVar(value='all')
+    frame_mode = tk.LabelFrame(root, text="실행 범위 설정", padx=10, pady=10)
+    frame_mode.pack(pady=5)
 
-rb_all = tk.Radiobutton(frame_mode, text="전체 실행", variable=execution_mode, value='all')
-rb_all.grid(row=0, column=0, sticky="w")
-rb_partial = tk.Radiobutton(frame_mode, text="부분 실행", variable=execution_mode, value='partial')
-rb_partial.grid(row=0, column=1, sticky="w")
+    rb_all = tk.Radiobutton(frame_mode, text="전체 실행", variable=execution_mode, value='all')
+    rb_all.grid(row=0, column=0, sticky="w")
+    rb_partial = tk.Radiobutton(frame_mode, text="부분 실행", variable=execution_mode, value='partial')
+    rb_partial.grid(row=0, column=1, sticky="w")
 
-range_label = tk.Label(frame_mode, text="StoreCode 범위 (예: STORE00001, STORE00003)")
-range_label.grid(row=1, column=0, columnspan=2, sticky="w")
+    range_label = tk.Label(frame_mode, text="StoreCode 범위 (예: STORE00001, STORE00003)")
+    range_label.grid(row=1, column=0, columnspan=2, sticky="w")
 
-range_entry = tk.Entry(frame_mode, width=30)
-range_entry.grid(row=2, column=0, columnspan=2, pady=5, sticky="w")
+    range_entry = tk.Entry(frame_mode, width=30)
+    range_entry.grid(row=2, column=0, columnspan=2, pady=5, sticky="w")
 
-# 실행 버튼
-btn_run = tk.Button(root, text="자동화 실행", command=run_automation)
-btn_run.pack(pady=20)
+    # 동시 실행 계정 수 (2 이상이면 계정 그룹별 프로세스로 병렬 처리)
+    worker_frame = tk.Frame(root)
+    worker_frame.pack(pady=5)
+    tk.Label(worker_frame, text="동시 실행 계정 수").pack(side=tk.LEFT)
+    worker_count_var = tk.StringVar(value="1")
+    worker_spin = tk.Spinbox(worker_frame, from_=1, to=8, width=5, textvariable=worker_count_var)
+    worker_spin.pack(side=tk.LEFT, padx=5)
+
+    # 실행 버튼
+    btn_run = tk.Button(root, text="자동화 실행", command=run_automation)
+    btn_run.pack(pady=20)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    build_gui()
+
     # 설정 파일에서 드라이버 경로 로드
     config = load_config()
     driver_path = config.get('chromedriver_path', '')
@@ -4,6 +4,10 @@ processed_reviews_in_session = set()
 import os
 import json
 import time
+import threading
+import atexit
+import multiprocessing
+import queue
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import hashlib
@@ -19,50 +23,184 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
     NoSuchElementException,
-    ElementClickInterceptedException
+    ElementClickInterceptedException,
+    StaleElementReferenceException
 )
 import openai
 from dotenv import load_dotenv
 from supabase import create_client, Client
+from review_events import ReviewEventLog
+from rules_repository import RulesRepository
+from error_log_sink import ErrorLogSink
+from review_mirror import ReviewMirror
+from review_writer import ReviewWriter
+from crawl_watermark import CrawlWatermarks
+from run_profile import timed, span, print_profile_report
+from session_cache import SessionCache
+from page_wait import PageWaiter, page_idle, element_present, element_in_view
+from reply_scorer import escalate_score, pass_fail_totals
 import calendar
 # 로그 파일 설정 코드 추가 - 여기에 배치
 import sys
 from datetime import datetime
-import io
 
 # 로그 파일 설정
 log_dir = "logs"
 if not os.path.exists(log_dir):
     os.makedirs(log_dir)
 current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-log_file = os.path.join(log_dir, f"baemin_review_{current_time}.log")
+# 병렬 실행 워커(spawn)는 이 모듈을 다시 실행하므로, 워커 로그 파일이 정해질 때까지(set_path) 파일을 만들지 않음
+IS_WORKER_PROCESS = multiprocessing.parent_process() is not None
+log_file = None if IS_WORKER_PROCESS else os.path.join(log_dir, f"baemin_review_{current_time}.log")
+
+LOG_MAX_BYTES = 20 * 1024 * 1024   # 로그 파일 최대 크기, 넘으면 .1 .2 ... 로 교체
+LOG_BACKUP_COUNT = 5               # 보관할 이전 로그 파일 수
+LOG_QUEUE_SIZE = 20000             # 기록 대기 중인 출력 최대 개수 (넘으면 버리고 개수만 기록)
+LOG_FLUSH_INTERVAL = 1.0           # 파일 flush 주기(초)
+# BAEMIN_LOG_LEVEL=DEBUG 로 실행하면 해시 생성/리뷰 분석 상세 로그까지 출력
+LOG_LEVEL = os.getenv("BAEMIN_LOG_LEVEL", "INFO").upper()
+
+class StreamingLogSink:
+    """
+    출력 내용을 큐에 넣고 백그라운드 스레드가 파일에 바로 기록
+    - 메모리에 전체 로그를 쌓지 않음 (큐 크기 제한)
+    - 파일 크기가 LOG_MAX_BYTES 를 넘으면 교체 (비정상 종료 시에도 기록된 부분은 남음)
+    - path 가 None 이면 set_path 로 파일이 정해질 때까지 출력을 보관 (워커 프로세스)
+    - 큐 초과로 버린 출력은 다음 출력 바로 앞에 누락 표시를 넣어, 로그 파일에서 빠진 위치에 기록
+    """
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT, queue_size=LOG_QUEUE_SIZE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0          # 큐 초과로 버렸지만 아직 누락 표시를 넣지 못한 출력 수
+        self._file = None
+        self._held = []   # path 지정 전 출력
+        self._held_dropped = 0    # 보관 한도 초과로 버린 출력 수 (보관분 뒤에 표시)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, message):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True, name="log-writer")
+                    self._thread.start()
+        try:
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                try:
+                    self.queue.put_nowait(("__dropped__", dropped))
+                except queue.Full:
+                    self.dropped += dropped
+                    raise
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def set_path(self, path):
+        """기록 파일 변경 (워커 프로세스별 로그 파일)"""
+        self.flush()
+        self.queue.put(("__path__", path))
+        self.flush()
+
+    def flush(self, timeout=5.0):
+        """큐에 쌓인 내용이 모두 파일에 기록될 때까지 대기"""
+        if self._thread is None:
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            self.queue.put(("__dropped__", dropped))
+        deadline = time.time() + timeout
+        while self.queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.05)
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backup_count - 1, 0, -1):
+            src, dst = f"{self.path}.{i}", f"{self.path}.{i + 1}"
+            if os.path.exists(src):
+                os.replace(src, dst)
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+
+    def _run(self):
+        last_flush = time.time()
+        while True:
+            try:
+                message = self.queue.get(timeout=LOG_FLUSH_INTERVAL)
+            except queue.Empty:
+                message = None
+            try:
+                if isinstance(message, tuple) and message[0] == "__dropped__":
+                    message = f"\n[로그] 큐 초과로 출력 {message[1]}건 누락\n"
+                if isinstance(message, tuple) and message[0] == "__path__":
+                    if self._file:
+                        self._file.close()
+                        self._file = None
+                    self.path = message[1]
+                    if self._held or self._held_dropped:
+                        f = self._open()
+                        f.writelines(self._held)
+                        if self._held_dropped:
+                            f.write(f"\n[로그] 로그 파일 지정 전 보관 한도 초과로 출력 {self._held_dropped}건 누락\n")
+                        self._held = []
+                        self._held_dropped = 0
+                elif message and self.path is None:
+                    if len(self._held) < self.queue.maxsize:
+                        self._held.append(message)
+                    else:
+                        self._held_dropped += 1
+                elif message:
+                    f = self._open()
+                    f.write(message)
+                    if f.tell() >= self.max_bytes:
+                        self._rotate()
+                if self._file and (message is None or time.time() - last_flush >= LOG_FLUSH_INTERVAL):
+                    self._file.flush()
+                    last_flush = time.time()
+            except Exception as e:
+                sys.__stderr__.write(f"[log-writer] 로그 기록 실패: {e}\n")
+            finally:
+                if message is not None:
+                    self.queue.task_done()
 
-# 로그 파일 준비 (실행 종료 시 저장되도록 변경)
-log_buffer = io.StringIO()
+log_sink = StreamingLogSink(log_file)
 
-# 터미널과 버퍼에 동시에 출력하는 클래스
+# 터미널과 로그 파일에 동시에 출력하는 클래스
 class TeeOutput:
-    def __init__(self, original_stdout, buffer):
+    def __init__(self, original_stdout, sink):
         self.original_stdout = original_stdout
-        self.buffer = buffer
+        self.sink = sink
 
     def write(self, message):
         self.original_stdout.write(message)
-        self.buffer.write(message)
+        self.sink.put(message)
 
     def flush(self):
         self.original_stdout.flush()
-        self.buffer.flush()
 
 # stdout와 stderr를 TeeOutput 객체로 교체
-sys.stdout = TeeOutput(sys.__stdout__, log_buffer)
-sys.stderr = TeeOutput(sys.__stderr__, log_buffer)
+sys.stdout = TeeOutput(sys.__stdout__, log_sink)
+sys.stderr = TeeOutput(sys.__stderr__, log_sink)
+
+def debug_print(*args, **kwargs):
+    """LOG_LEVEL 이 DEBUG 일 때만 출력하는 상세 로그"""
+    if LOG_LEVEL == "DEBUG":
+        print(*args, **kwargs)
 
-# 프로그램 종료 시 로그 파일 저장 함수
+# 프로그램 종료 시 남은 로그 기록
 def save_log_on_exit():
-    with open(log_file, 'w', encoding='utf-8') as f:
-        f.write(log_buffer.getvalue())
     print(f"로그가 {log_file}에 저장되었습니다.")
+    log_sink.flush()
+
+atexit.register(log_sink.flush)
 
 # 환경 설정
 load_dotenv()
@@ -76,6 +214,21 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 client = openai
 
+# 리뷰별 처리 단계 이벤트 로그 (events/review_events_baemin_*.jsonl)
+review_events = ReviewEventLog("배민", "baemin")
+
+# platform_reply_rules 메모리 저장소 (fetch_platform_data 에서 로드, updated_at 증분 갱신)
+rules_repo = RulesRepository(supabase, ["배민", "배민1"])
+
+# error_logs 비동기 저장 (같은 오류는 60초 안에 한 행으로 합쳐 배치 insert)
+error_sink = ErrorLogSink(supabase)
+
+# reviews 로컬 미러 (review_mirror_baemin.db, 중복 체크를 로컬에서 처리하고 updated_at 기준 백그라운드 동기화)
+review_mirror = ReviewMirror(supabase, "baemin")
+
+# 매장별 크롤링 기준점 (watermarks/baemin_*.json, 처리 끝난 구간에 도달하면 스크롤 중단)
+crawl_watermarks = CrawlWatermarks("baemin")
+
 ###################################################
 # 1) 리뷰 해시 생성 및 ID 처리 함수들
 ###################################################
@@ -86,7 +239,7 @@ def generate_review_hash(store_code: str, author: str, review_text: str) -> str:
     """
     base_str = f"{store_code}_{author}_{review_text}"
     hash_val = hashlib.md5(base_str.encode("utf-8")).hexdigest()
-    print(f"[generate_review_hash] base_str={base_str} => hash={hash_val[:8]}...")
+    debug_print(f"[generate_review_hash] base_str={base_str} => hash={hash_val[:8]}...")
     return hash_val
 
 def extract_date_from_review_id(review_id):
@@ -166,6 +319,19 @@ def extract_relative_date(driver, card_element):
             print("[extract_relative_date] 날짜 요소를 찾을 수 없음, 현재 날짜 사용")
             return datetime.now().date().isoformat()
         
+        return relative_date_to_iso(relative_date)
+        
+    except Exception as e:
+        print(f"[extract_relative_date] 날짜 추출 중 오류: {str(e)}")
+        return datetime.now().date().isoformat()
+
+def relative_date_to_iso(relative_date):
+    """'오늘', '3일 전', '지난 달' 같은 상대 날짜 텍스트를 실제 날짜(ISO)로 변환"""
+    try:
+        if not relative_date:
+            print("[relative_date_to_iso] 날짜 텍스트 없음, 현재 날짜 사용")
+            return datetime.now().date().isoformat()
+        
         today = datetime.now().date()
         
         # 상대적 날짜를 실제 날짜로 변환 (새로운 패턴 추가)
@@ -174,37 +340,37 @@ def extract_relative_date(driver, card_element):
         elif relative_date == "어제":
             return (today - timedelta(days=1)).isoformat()
         elif relative_date == "그제" or relative_date == "2일 전":
-            print("[extract_relative_date] '그제' 또는 '2일 전' 인식 -> 2일 전 날짜 반환")
+            print("[relative_date_to_iso] '그제' 또는 '2일 전' 인식 -> 2일 전 날짜 반환")
             return (today - timedelta(days=2)).isoformat()
         elif relative_date == "3일 전":
             return (today - timedelta(days=3)).isoformat()
         # 새로운 패턴 처리 추가
         elif "지난 달" in relative_date or "저번 달" in relative_date:
             # 한 달 전으로 이동
-            print("[extract_relative_date] '지난 달' 인식 -> 한 달 전 날짜 반환")
+            print("[relative_date_to_iso] '지난 달' 인식 -> 한 달 전 날짜 반환")
             last_month = today.replace(day=1) - timedelta(days=1)
             # 현재 일자와 동일한 날짜로 설정 (해당 월의 최대 일수 고려)
             return last_month.replace(day=min(today.day, calendar.monthrange(last_month.year, last_month.month)[1])).isoformat()
         elif "지난 주" in relative_date or "저번 주" in relative_date:
             # 일주일 전으로 이동
-            print("[extract_relative_date] '지난 주' 인식 -> 7일 전 날짜 반환")
+            print("[relative_date_to_iso] '지난 주' 인식 -> 7일 전 날짜 반환")
             return (today - timedelta(days=7)).isoformat()
         elif "이번 달" in relative_date:
             # 이번 달은 10일 전으로 계산
-            print("[extract_relative_date] '이번 달' 인식 -> 10일 전 날짜 반환")
+            print("[relative_date_to_iso] '이번 달' 인식 -> 10일 전 날짜 반환")
             return (today - timedelta(days=10)).isoformat()
         elif "이번 주" in relative_date:
             # 이번 주는 4일 전으로 계산
-            print("[extract_relative_date] '이번 주' 인식 -> 4일 전 날짜 반환")
+            print("[relative_date_to_iso] '이번 주' 인식 -> 4일 전 날짜 반환")
             return (today - timedelta(days=4)).isoformat()
         elif "주 전" in relative_date:
             # n주 전 패턴 처리
             try:
                 weeks = int(relative_date.split("주 전")[0].strip())
-                print(f"[extract_relative_date] '{weeks}주 전' 인식 -> {weeks*7}일 전 날짜 반환")
+                print(f"[relative_date_to_iso] '{weeks}주 전' 인식 -> {weeks*7}일 전 날짜 반환")
                 return (today - timedelta(days=weeks * 7)).isoformat()
             except:
-                print(f"[extract_relative_date] '주 전' 패턴 처리 실패: '{relative_date}'")
+                print(f"[relative_date_to_iso] '주 전' 패턴 처리 실패: '{relative_date}'")
         elif "개월 전" in relative_date or "달 전" in relative_date:
             # n개월 전 패턴 처리
             try:
@@ -213,7 +379,7 @@ def extract_relative_date(driver, card_element):
                 else:
                     months = int(relative_date.split("달 전")[0].strip())
                     
-                print(f"[extract_relative_date] '{months}개월 전' 인식")
+                print(f"[relative_date_to_iso] '{months}개월 전' 인식")
                 
                 # n개월 전 날짜 계산
                 result_date = today
@@ -227,14 +393,14 @@ def extract_relative_date(driver, card_element):
                 )
                 return result_date.isoformat()
             except Exception as e:
-                print(f"[extract_relative_date] '개월 전' 패턴 처리 실패: '{relative_date}', 오류: {str(e)}")
+                print(f"[relative_date_to_iso] '개월 전' 패턴 처리 실패: '{relative_date}', 오류: {str(e)}")
         
         # 다른 모든 방법이 실패하면 현재 날짜 반환
-        print(f"[extract_relative_date] 날짜 형식 인식 실패: '{relative_date}', 현재 날짜로 대체")
+        print(f"[relative_date_to_iso] 날짜 형식 인식 실패: '{relative_date}', 현재 날짜로 대체")
         return today.isoformat()
         
     except Exception as e:
-        print(f"[extract_relative_date] 날짜 추출 중 오류: {str(e)}")
+        print(f"[relative_date_to_iso] 날짜 변환 중 오류: {str(e)}")
         return datetime.now().date().isoformat()
 
 def get_review_identifier(card_element, store_code):
@@ -283,7 +449,7 @@ def extract_review_data_from_network(driver, card_element):
             "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
             card_element
         )
-        time.sleep(1)
+        wait_for(driver, "date.scroll_card", element_in_view(card_element), timeout=1)
         
         # 브라우저 콘솔에서 실행할 스크립트
         # 페이지에 있는 리뷰 데이터를 찾고 캡처하는 코드
@@ -462,11 +628,8 @@ def save_config(config):
 ###################################################
 def fetch_platform_data():
     try:
-        response = supabase.table("platform_reply_rules") \
-                           .select("*") \
-                           .in_("platform", ["배민", "배민1"]) \
-                           .execute()
-        rows = response.data
+        # 매장 설정은 저장소에 한 번 로드 (이후 조회는 메모리에서)
+        rows = rules_repo.load()
         if not rows:
             print("플랫폼 데이터가 비어있음.")
             return []
@@ -521,13 +684,8 @@ def save_error_log_to_supabase(
     stack_trace: str = ""
 ):
     try:
-        # platform_reply_rules에서 store_name 조회
-        store_query = supabase.table("platform_reply_rules") \
-                             .select("store_name") \
-                             .eq("store_code", store_code) \
-                             .eq("platform", platform) \
-                             .execute()
-        store_name = store_query.data[0].get("store_name", "") if store_query.data else ""
+        # 매장 설정 저장소에서 store_name 조회 (워커 프로세스는 첫 조회 시 1회 로드)
+        store_name = rules_repo.store_name(store_code, platform)
 
         data = {
             "store_code": store_code,
@@ -539,8 +697,9 @@ def save_error_log_to_supabase(
             "occurred_at": datetime.now().isoformat(),
             "store_name": store_name
         }
-        supabase.table("error_logs").insert(data).execute()
-        print(f"[save_error_log_to_supabase] 에러 로그 저장 완료 - store_code={store_code}, error_type={error_type}, msg={error_message}")
+        # 바로 insert 하지 않고 대기열에 추가 (같은 오류는 합쳐서 백그라운드에서 일괄 저장)
+        if error_sink.add(data):
+            print(f"[save_error_log_to_supabase] 에러 로그 대기열 추가 - store_code={store_code}, error_type={error_type}, msg={error_message}")
     except Exception as e:
         print(f"[save_error_log_to_supabase] 에러 로그 저장 실패: {str(e)}")
 
@@ -563,6 +722,7 @@ def save_error_screenshot(driver, store_code, error_type):
 ###################################################
 # 5) 팝업 처리 관련 함수
 ###################################################
+@timed("popup.homepage")
 def close_popups_on_homepage(driver, timeout=5):
     try:
         popup1_close = WebDriverWait(driver, timeout).until(
@@ -586,6 +746,7 @@ def close_popups_on_homepage(driver, timeout=5):
     except Exception as e:
         print(f"[close_popups_on_homepage] 팝업 닫기 에러2: {e}")
 
+@timed("popup.review_page")
 def close_popups_on_review_page(driver, timeout=5):
     try:
         popup_close = WebDriverWait(driver, timeout).until(
@@ -598,6 +759,7 @@ def close_popups_on_review_page(driver, timeout=5):
     except Exception as e:
         print(f"[close_popups_on_review_page] 리뷰 페이지 팝업 닫기 실패: {e}")
 
+@timed("popup.today")
 def close_today_popup(driver, timeout=5):
     """
     '오늘 하루 보지 않기' 버튼이 있는 팝업을 처리하는 함수
@@ -611,12 +773,13 @@ def close_today_popup(driver, timeout=5):
         )
         driver.execute_script("arguments[0].click();", today_btn)
         print("[close_today_popup] '오늘 하루 보지 않기' 팝업 닫음")
-        time.sleep(1)
+        wait_for(driver, "popup.today_close", timeout=1)
     except TimeoutException:
         print("[close_today_popup] '오늘 하루 보지 않기' 버튼 없음")
     except Exception as e:
         print(f"[close_today_popup] 팝업 닫기 중 오류: {str(e)}")
         
+@timed("popup.7day")
 def close_7day_popup(driver, timeout=5):
     """
     7일간 보지 않기 → 1일간 보지 않기 → 오늘 하루 보지 않기 팝업을 처리하는 함수
@@ -627,7 +790,7 @@ def close_7day_popup(driver, timeout=5):
         )
         driver.execute_script("arguments[0].click();", btn_7day)
         print("[close_7day_popup] 7일간 보지 않기 클릭")
-        time.sleep(3)
+        wait_for(driver, "popup.7day_close", timeout=3)
         
         try:
             btn_1day = WebDriverWait(driver, timeout).until(
@@ -717,7 +880,7 @@ def handle_new_windows(driver, store_code=None, main_window=None):
                     store_info = f"[{store_code}] " if store_code else ""
                     print(f"{store_info}[새창감지] title='{driver.title}' => 닫기 시도")
                     driver.close()
-                    time.sleep(1)
+                    wait_for(driver, "window.close", lambda d, h=handle: h not in d.window_handles, timeout=1)
                 except Exception as ex:
                     print(f"{store_info}[새창닫기실패] handle={handle}, error={str(ex)}")
         driver.switch_to.window(main_window)
@@ -747,16 +910,41 @@ def check_windows_periodically(driver, store_code=None, interval_seconds=30):
         check_and_close_new_windows(driver, store_code)
         last_check = curr_time
 
+###################################################
+# 6-1) 적응형 대기 함수 (고정 sleep 대체)
+###################################################
+# 호출 위치별 대기시간 기록/학습 (page_wait.py, 배민/쿠팡 공용): wait_stats_baemin.json
+page_waiter = PageWaiter("baemin")
+page_waiter.load_history()
+wait_for = page_waiter.wait_for
+
 ###################################################
 # 7) 로그인 처리 함수
 ###################################################
+# 로그인 세션 캐시 (session_cache.py): 쿠키 + localStorage를 계정별 파일로 보관
+SESSION_CACHE_ENABLED = True
+session_cache = SessionCache(
+    "baemin",
+    origin="https://ceo.baemin.com",
+    probe_url="https://self.baemin.com/",
+    login_marker="/login",
+    enabled=SESSION_CACHE_ENABLED
+)
+
+@timed("login")
 def login_to_baemin(driver, platform_id, platform_pw, store_code, platform_name, options=None):
+    # 저장된 세션이 유효하면 로그인 생략
+    if session_cache.restore(driver, platform_id, wait=wait_for):
+        close_popups_on_homepage(driver)
+        print(f"[login_to_baemin] {store_code} 저장된 세션으로 로그인 성공")
+        return True, driver
+
     max_attempts = 3
     for attempt in range(1, max_attempts+1):
         try:
             print(f"[login_to_baemin] 로그인 시도 {attempt}/{max_attempts}, ID={platform_id}, store_code={store_code}")
             driver.get("https://biz-member.baemin.com/login?returnUrl=https%3A%2F%2Fceo.baemin.com%2F")
-            time.sleep(3)
+            wait_for(driver, "login.page_load", element_present(By.NAME, 'id'), timeout=3)
 
             if check_antibot(driver):
                 print("[login_to_baemin] 안티봇 감지 -> 드라이버 재시작")
@@ -773,7 +961,12 @@ def login_to_baemin(driver, platform_id, platform_pw, store_code, platform_name,
             pw_input.clear()
             pw_input.send_keys(platform_pw)
             pw_input.send_keys(Keys.RETURN)
-            time.sleep(5)
+            # 로그인 페이지를 벗어나거나 에러 메시지가 뜰 때까지 대기
+            wait_for(
+                driver, "login.submit",
+                lambda d: "/login" not in d.current_url or d.find_elements(By.XPATH, "//p[@role='alert']"),
+                timeout=5
+            )
 
             if check_antibot(driver):
                 print("[login_to_baemin] 로그인 후 안티봇 감지 -> 재시작")
@@ -791,6 +984,7 @@ def login_to_baemin(driver, platform_id, platform_pw, store_code, platform_name,
                 if attempt == max_attempts:
                     msg = f"[login_to_baemin] {store_code} 로그인 실패(최대 시도)"
                     print(msg)
+                    session_cache.invalidate(platform_id, "로그인 실패")
                     save_error_screenshot(driver, store_code, "LoginFail")
                     save_error_log_to_supabase(
                         category="오류",
@@ -804,12 +998,14 @@ def login_to_baemin(driver, platform_id, platform_pw, store_code, platform_name,
 
             close_popups_on_homepage(driver)
             print(f"[login_to_baemin] {store_code} 로그인 성공")
+            session_cache.save(driver, platform_id)
             return True, driver
 
         except Exception as e:
             if attempt == max_attempts:
                 msg = f"[login_to_baemin] {store_code} 로그인 중 오류: {str(e)}"
                 print(msg)
+                session_cache.invalidate(platform_id, "로그인 실패")
                 save_error_screenshot(driver, store_code, "LoginError")
                 save_error_log_to_supabase(
                     category="오류",
@@ -825,18 +1021,19 @@ def login_to_baemin(driver, platform_id, platform_pw, store_code, platform_name,
 ###################################################
 # 8) AI 리뷰 분석 관련 함수
 ###################################################
+@timed("llm.analyze")
 def analyze_restaurant_review(review_text: str, rating: int, order_menu: str = "", delivery_review: str = "") -> dict:
     """음식점 리뷰를 더 세부적으로 분석하여 AI 답변 가능 여부와 상세 정보를 반환"""
     
     try:
-        # 1. 기본 정보 로깅
-        print("\n" + "="*50)
-        print("[분석 시작] 리뷰 정보")
-        print(f"별점: {rating}점")
-        print(f"리뷰: {review_text}")
-        print(f"주문메뉴: {order_menu}")
-        print(f"배달리뷰: {delivery_review}")
-        print("="*50)
+        # 1. 기본 정보 로깅 (상세 로그)
+        debug_print("\n" + "="*50)
+        debug_print("[분석 시작] 리뷰 정보")
+        debug_print(f"별점: {rating}점")
+        debug_print(f"리뷰: {review_text}")
+        debug_print(f"주문메뉴: {order_menu}")
+        debug_print(f"배달리뷰: {delivery_review}")
+        debug_print("="*50)
 
         # 2. 입력값 검증
         if not openai.api_key:
@@ -922,10 +1119,10 @@ def analyze_restaurant_review(review_text: str, rating: int, order_menu: str = "
                 result["ai_reply"] = True
 
             # 7. 상세 로깅
-            print("\n[분석 결과]")
+            debug_print("\n[분석 결과]")
             for key, value in result.items():
-                print(f"- {key}: {value}")
-            print("="*50 + "\n")
+                debug_print(f"- {key}: {value}")
+            debug_print("="*50 + "\n")
             
             return result
 
@@ -1077,6 +1274,7 @@ def validate_reply_content(ai_reply: str) -> tuple[bool, str]:
             
     return True, ""
 
+@timed("llm.generate")
 def generate_ai_reply(review_text, store_info):
     """AI 답변 생성"""
     try:
@@ -1221,12 +1419,13 @@ def generate_ai_reply_with_retry(review_text: str, store_info: dict, max_attempt
             continue
         
         # 2차: 품질 점수 평가
-        is_good, scores = score_reply(ai_reply, review_text, 
+        is_good, scores = evaluate_reply(ai_reply, review_text, 
                           store_info.get('author', ''), 
-                          store_info.get('rating', 0))
+                          store_info.get('rating', 0),
+                          store_info=store_info)
         
-        # 문자열 비교 위해 점수 변환
-        score = sum(scores.values()) if isinstance(scores, dict) else 70
+        # 문자열 비교 위해 점수 변환 (총점 항목은 합산에서 제외)
+        score = scores.get("총점", 70) if isinstance(scores, dict) else 70
         print(f"[Attempt {attempt + 1}] 점수: {score}")
         
         # 더 나은 답변 저장
@@ -1248,6 +1447,7 @@ def generate_ai_reply_with_retry(review_text: str, store_info: dict, max_attempt
 ###################################################
 # 10) AI 답변 품질 평가 함수
 ###################################################
+@timed("llm.score")
 def score_reply(ai_reply: str, original_review: str, original_author: str = "", original_rating: int = 0, threshold: int = 80) -> tuple[bool, dict]:
     """
     AI 답변의 품질을 세부적으로 평가합니다.
@@ -1358,9 +1558,151 @@ AI 답글:
         # 오류 발생시 기본적으로 통과 처리
         return True, {"총점": 80}
 
+# 로컬 품질 평가 (reply_scorer.py, 배민/쿠팡/요기요 공용): score_reply 와 같은 100점 항목을 간단한 특징으로 계산하고,
+# 점수가 기준점 근처일 때만 GPT 평가 호출
+SCORE_LOCAL_ENABLED = True
+
+def evaluate_reply(ai_reply: str, original_review: str, original_author: str = "", original_rating: int = 0,
+                   threshold: int = 80, store_info: dict = None) -> tuple:
+    """
+    로컬 평가 후 기준점 근처(±SCORE_ESCALATION_MARGIN)일 때만 GPT 평가(score_reply)로 확정 (reply_scorer.escalate_score)
+    - 반환 형식은 score_reply 와 같음: (합격 여부, {항목: 점수, ..., "총점": 점수})
+    - store_info 의 greeting_start/greeting_end/max_length/order_menu 를 평가에 사용
+    """
+    def remote_score():
+        return score_reply(ai_reply, original_review, original_author, original_rating, threshold)
+
+    if not SCORE_LOCAL_ENABLED or store_info is None:
+        return remote_score()
+    review = {
+        "review_text": original_review,
+        "star": original_rating,
+        "order_menu": store_info.get("order_menu", "")
+    }
+    return escalate_score(ai_reply, review, store_info, remote_score, threshold, local_result=pass_fail_totals)
+
 ###################################################
 # 11) 리뷰 저장 및 관리 함수
 ###################################################
+# 매장별 리뷰 상태 스냅샷 (review_id -> reviews 레코드)
+review_snapshot = {}
+review_snapshot_key = None  # (store_code, platform)
+
+def load_review_snapshot(store_code, platform):
+    """
+    매장의 reviews 레코드를 한 번에 불러와 메모리에 저장
+    - 카드마다 review_id로 조회하던 것을 로컬 dict 조회로 대체
+    - 로컬 미러를 updated_at 기준으로 증분 동기화한 뒤 미러에서 구성
+      (Supabase 장애 시에도 이전에 동기화된 매장은 미러 기준으로 중복 판단)
+    """
+    global review_snapshot, review_snapshot_key
+    snapshot = {}
+    try:
+        review_mirror.track(store_code, platform)
+        if not review_mirror.is_synced(store_code, platform):
+            raise RuntimeError("로컬 미러 동기화 이력 없음")
+        for row in review_mirror.store_rows(store_code, platform):
+            if row.get("review_id"):
+                snapshot[row["review_id"]] = row
+
+        review_snapshot = snapshot
+        review_snapshot_key = (store_code, platform)
+        print(f"[load_review_snapshot] store_code={store_code}, platform={platform}, 리뷰 {len(snapshot)}건 로드")
+        return True
+    except Exception as e:
+        # 로드 실패 시 스냅샷을 비워 개별 조회로 동작하도록 함
+        review_snapshot = {}
+        review_snapshot_key = None
+        print(f"[load_review_snapshot] 스냅샷 로드 실패: {str(e)}")
+        return False
+
+def get_review_record(review_id, store_code=None):
+    """
+    review_id에 해당하는 reviews 레코드 반환 (없으면 None)
+    - 현재 매장 스냅샷이 로드되어 있으면 로컬 조회
+    - 그렇지 않으면 기존처럼 DB 개별 조회
+    """
+    if review_snapshot_key and (store_code is None or review_snapshot_key[0] == store_code):
+        return review_snapshot.get(review_id)
+
+    try:
+        existing = supabase.table("reviews").select("*").eq("review_id", review_id).execute()
+        return existing.data[0] if existing.data else None
+    except Exception as e:
+        print(f"[get_review_record] 리뷰 조회 실패: {str(e)}")
+        return None
+
+def _update_review_snapshot(data):
+    """저장 후 스냅샷 갱신 (현재 매장 레코드만)"""
+    if not review_snapshot_key:
+        return
+    if (data.get("store_code"), data.get("platform")) != review_snapshot_key:
+        return
+    record = dict(review_snapshot.get(data["review_id"], {}))
+    record.update(data)
+    review_snapshot[data["review_id"]] = record
+
+RECONCILE_CHUNK_SIZE = 200  # 스냅샷이 없을 때 in_ 조회 1회당 review_id 수
+
+def reconcile_visited_reviews(store_code, platform, review_ids):
+    """
+    미답변 탭에서 확인한 리뷰들의 DB 상태 일괄 대조
+    - 현재 매장 스냅샷이 있으면 DB 조회 없이 스냅샷으로 판단
+    - 없으면 review_id 를 RECONCILE_CHUNK_SIZE 개씩 묶어 in_ 조회
+    - 반환: {"visited", "completed_in_db", "not_in_db", "status_counts", "source"}
+    """
+    review_ids = [rid for rid in review_ids if rid]
+    statuses = {}
+    source = "snapshot"
+    if review_snapshot_key == (store_code, platform):
+        for rid in review_ids:
+            record = review_snapshot.get(rid)
+            if record is not None:
+                statuses[rid] = record.get("response_status") or ""
+    else:
+        source = "db"
+        for i in range(0, len(review_ids), RECONCILE_CHUNK_SIZE):
+            chunk = review_ids[i:i + RECONCILE_CHUNK_SIZE]
+            try:
+                resp = supabase.table("reviews").select("review_id, response_status").in_("review_id", chunk).execute()
+                for row in resp.data or []:
+                    statuses[row["review_id"]] = row.get("response_status") or ""
+            except Exception as e:
+                print(f"[reconcile_visited_reviews] 리뷰 상태 일괄 조회 오류: {str(e)}")
+
+    status_counts = {}
+    for status in statuses.values():
+        status_counts[status] = status_counts.get(status, 0) + 1
+    return {
+        "visited": len(review_ids),
+        "completed_in_db": status_counts.get("답변완료", 0),
+        "not_in_db": len(review_ids) - len(statuses),
+        "status_counts": status_counts,
+        "source": source
+    }
+
+def crawl_status_from_snapshot(review_hash):
+    """
+    크롤링 기준점 계산용 리뷰 상태 (상태, 처리끝 여부, review_date)
+    - 답변완료 / 사장님 확인필요 / 재시도 초과는 처리 끝 (_check_duplicate_review 스킵 기준)
+    - 재시도 초과 항목은 다시 열리지 않으므로 상태를 비워 사장님 확인필요 목록에서 제외
+    """
+    record = review_snapshot.get(review_hash) or {}
+    status = record.get("response_status") or ""
+    if (record.get("retry_count") or 0) >= 9:
+        return "", True, record.get("review_date", "")
+    return status, status in ("답변완료", "사장님 확인필요"), record.get("review_date", "")
+
+def clear_review_snapshot():
+    """매장 처리 종료 시 스냅샷 초기화"""
+    global review_snapshot, review_snapshot_key
+    review_snapshot = {}
+    review_snapshot_key = None
+
+# 리뷰 저장 write-behind 큐 (배치 upsert, review_writer.py)
+review_writer = ReviewWriter(supabase, "review_write_queue_baemin.jsonl")
+
+@timed("db.save")
 def _save_review_data(
     store_code, platform, platform_code, review_name, rating, 
     review_content, ai_response, review_date, status, store_name, 
@@ -1392,18 +1734,15 @@ def _save_review_data(
             "updated_at": datetime.now().isoformat()
         }
         
-        # 기존 레코드 확인
-        existing = supabase.table("reviews").select("id").eq("review_id", review_id).execute()
-        
-        if existing.data:
-            # 업데이트
-            record_id = existing.data[0]['id']
-            supabase.table("reviews").update(data).eq("id", record_id).execute()
-            print(f"[_save_review_data] 리뷰 업데이트: id={record_id}, status={status}, retry={retry_count}")
-        else:
-            # 신규 저장
-            supabase.table("reviews").insert(data).execute()
-            print(f"[_save_review_data] 새 리뷰 저장: status={status}, retry={retry_count}")
+        # write-behind 큐에 추가 (review_id 기준 upsert로 일괄 저장)
+        review_writer.enqueue(data)
+        print(f"[_save_review_data] 리뷰 저장 대기열 추가: status={status}, retry={retry_count}")
+
+        # 저장 후 매장 스냅샷/로컬 미러 갱신
+        _update_review_snapshot(data)
+        review_mirror.put(data)
+
+        review_events.finish(review_id, status)
             
     except Exception as e:
         print(f"[_save_review_data] 저장 실패: {str(e)}")
@@ -1423,14 +1762,13 @@ def _check_duplicate_review(driver, store_code, platform_name, review_hash, auth
     try:
         today_date = datetime.now().date()
         
-        # DB에서 기존 리뷰 조회
-        existing = supabase.table("reviews").select("*").eq("review_id", review_hash).execute()
+        # 기존 리뷰 조회 (매장 스냅샷 우선)
+        record = get_review_record(review_hash, store_code)
         
-        if not existing.data:
+        if not record:
             # 기존 리뷰 없음 - 계속 처리
             return False
             
-        record = existing.data[0]
         status = record.get('response_status', '')
         record_date = datetime.fromisoformat(record.get('review_date', today_date.isoformat())).date()
         retry_count = record.get('retry_count', 0)
@@ -1467,6 +1805,18 @@ def _check_duplicate_review(driver, store_code, platform_name, review_hash, auth
 ###################################################
 # 12) 댓글 등록 처리 함수
 ###################################################
+def _submit_settled(text_area):
+    """댓글 등록 후 알림 팝업이 뜨거나 입력창이 사라지면 True인 조건"""
+    def _condition(driver):
+        if driver.find_elements(By.XPATH, "//div[@role='alertdialog'] | //div[@role='dialog']"):
+            return True
+        try:
+            return not text_area.is_displayed()
+        except StaleElementReferenceException:
+            return True
+    return _condition
+
+@timed("submit")
 def click_and_submit_comment(driver, card_element, ai_reply_text, review_text, store_info, max_attempts=3):
     """개선된 댓글 입력 및 제출 처리 함수"""
     detected_prohibited_words = set()
@@ -1481,7 +1831,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, review_text, s
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                 card_element
             )
-            time.sleep(1.5)  # 스크롤 후 충분히 대기
+            wait_for(driver, "comment.scroll_card", element_in_view(card_element), timeout=1.5)
 
             # 2. 댓글 버튼 찾고 클릭 - 여러 방법 시도
             comment_btn = None
@@ -1537,8 +1887,8 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, review_text, s
                     except Exception as e:
                         raise Exception(f"댓글 버튼 클릭 실패: {str(e)}")
             
-            # 3. 클릭 후 충분히 대기 (댓글 입력 영역이 나타날 때까지)
-            time.sleep(2)
+            # 3. 댓글 입력 영역이 나타날 때까지 대기
+            wait_for(driver, "comment.open_textarea", element_present(By.TAG_NAME, "textarea"), timeout=2)
             
             # 4. 텍스트 영역 찾기 - 새로운 선택자 사용
             text_area = None
@@ -1579,16 +1929,16 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, review_text, s
             try:
                 # 먼저 클릭하여 포커스
                 driver.execute_script("arguments[0].click();", text_area)
-                time.sleep(0.5)
+                wait_for(driver, "comment.focus", lambda d: d.execute_script("return document.activeElement === arguments[0];", text_area), timeout=0.5)
                 
                 # 기존 텍스트 선택 및 삭제
                 driver.execute_script("arguments[0].select();", text_area)
                 text_area.send_keys(Keys.DELETE)
-                time.sleep(0.5)
+                wait_for(driver, "comment.clear", lambda d: not d.execute_script("return arguments[0].value;", text_area), timeout=0.5)
                 
                 # JS로 직접 값 설정 먼저 시도
                 driver.execute_script("arguments[0].value = arguments[1];", text_area, ai_reply_text)
-                time.sleep(0.5)
+                wait_for(driver, "comment.set_value", lambda d: d.execute_script("return arguments[0].value;", text_area) == ai_reply_text, timeout=0.5)
                 
                 # 이벤트 발생 시뮬레이션 (React 입력 필드 인식용)
                 driver.execute_script("""
@@ -1610,7 +1960,7 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, review_text, s
                         time.sleep(0.01)
                 
                 print("[click_and_submit_comment] 텍스트 입력 완료")
-                time.sleep(1)
+                wait_for(driver, "comment.after_input", timeout=1)
             except Exception as e:
                 print(f"[click_and_submit_comment] 텍스트 입력 중 오류: {str(e)}")
                 raise Exception(f"텍스트 입력 실패: {str(e)}")
@@ -1676,7 +2026,8 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, review_text, s
                         raise Exception(f"등록 버튼 클릭 실패: {str(e)}")
             
             # 8. 금지어 팝업 확인 개선 - 제공된 HTML 기반
-            time.sleep(2)  # 팝업이 나타날 시간 확보
+            # 알림 팝업이 뜨거나 입력창이 닫힐 때까지 대기
+            wait_for(driver, "comment.submit_result", _submit_settled(text_area), timeout=2)
             popup_found = False
             
             try:
@@ -1752,6 +2103,258 @@ def click_and_submit_comment(driver, card_element, ai_reply_text, review_text, s
 # 13) 리뷰 카드 처리 핵심 함수
 ###################################################
 
+# 리뷰 카드 정보를 한 번에 추출하는 스크립트
+# - 카드 탐색(find_review_cards), 유효성 검증(validate_review_card), 정보 파싱(parse_review_info),
+#   답글 버튼(find_reply_button), 날짜(extract_relative_date) 로직을 브라우저 안에서 한 번에 수행
+# - 카드마다 find_elements/.text 를 반복 호출하던 왕복을 화면당 1회로 줄임
+REVIEW_CARD_EXTRACT_JS = r"""
+var visibleOnly = arguments[0];
+var EXCLUDED_TEXTS = ['평균 별점', '고객이 보는 리뷰 정렬', '최신순', '사장님!', '배민마케팅'];
+var UI_TEXTS = ['평균 별점', '최근 6개월', '기준', '사장님!', '배민마케팅'];
+var DATE_WORDS = ['오늘', '어제', '그제', '지난 달', '지난 주', '이번 달', '이번 주'];
+var DATE_KEYWORDS = ['오늘', '어제', '그제', '일 전', '지난 달', '지난 주', '이번 달', '이번 주'];
+
+function txt(el) {
+    return ((el && (el.innerText || el.textContent)) || '').trim();
+}
+function has(text, words) {
+    for (var i = 0; i < words.length; i++) {
+        if (text.indexOf(words[i]) >= 0) return true;
+    }
+    return false;
+}
+function goldCount(card) {
+    return card.querySelectorAll('path[fill="#FFC600"]').length;
+}
+function hasButton(card, words) {
+    var buttons = card.querySelectorAll('button');
+    for (var i = 0; i < buttons.length; i++) {
+        if (has(txt(buttons[i]), words) || buttons[i].getAttribute('aria-label') === '사장님 댓글') return true;
+    }
+    return false;
+}
+function isDateText(text) {
+    return !!text && (DATE_WORDS.indexOf(text) >= 0 || text.indexOf('전') >= 0 ||
+                      text.indexOf('월') >= 0 || text.indexOf('일') >= 0);
+}
+
+// 1. 리뷰 카드 찾기 (정확한 선택자 -> 대체 선택자)
+var cards = [];
+var primarySelectors = ["div[class*='ReviewContent-module']", "div.Container_c_qbca_1utdzds5.ReviewContent-module__Ksg4"];
+for (var s = 0; s < primarySelectors.length && cards.length === 0; s++) {
+    var nodes = document.querySelectorAll(primarySelectors[s]);
+    for (var n = 0; n < nodes.length; n++) {
+        var g = goldCount(nodes[n]);
+        if ((g > 0 && g <= 5) || hasButton(nodes[n], ['사장님 댓글'])) cards.push(nodes[n]);
+    }
+}
+if (cards.length === 0) {
+    var containers = document.querySelectorAll("div[data-atelier-component='Container']");
+    for (var c = 0; c < containers.length; c++) {
+        var gc = goldCount(containers[c]);
+        var hasStars = gc > 0 && gc <= 5;
+        if ((hasStars || hasButton(containers[c], ['사장님 댓글', '댓글'])) && !has(txt(containers[c]), UI_TEXTS)) {
+            cards.push(containers[c]);
+        }
+    }
+}
+
+// 2. 카드별 정보 추출
+var result = [];
+for (var i = 0; i < cards.length; i++) {
+    var card = cards[i];
+    var rect = card.getBoundingClientRect();
+    if (visibleOnly && !(rect.top < window.innerHeight && rect.bottom > 0)) continue;
+
+    var fullText = txt(card);
+
+    // data-index (카드 또는 상위 5단계 이내)
+    var dataIndex = null;
+    var node = card;
+    for (var d = 0; d < 5 && node && node.getAttribute; d++) {
+        var v = node.getAttribute('data-index');
+        if (v !== null) { dataIndex = v; break; }
+        node = node.parentNode;
+    }
+
+    // 유효성 검증
+    var isValid = !has(fullText, EXCLUDED_TEXTS);
+    var gold = goldCount(card);
+    var hasReplyButton = hasButton(card, ['사장님', '답글', '댓글']);
+    if (isValid) {
+        var hasContent = false;
+        var typos = card.querySelectorAll("span[class*='Typography']");
+        for (var t = 0; t < typos.length; t++) {
+            if (txt(typos[t]).length > 10) { hasContent = true; break; }
+        }
+        isValid = (gold > 0 && gold <= 5) || fullText.indexOf('별점') >= 0 || hasReplyButton ||
+                  hasContent || card.querySelectorAll("span[class*='Badge']").length > 0;
+    }
+
+    // 작성자
+    var author = '알 수 없음';
+    var authorSelectors = ["div[class*='Flex_c_qbca_bbdidap'] span[class*='Typography']",
+                           "span[class*='Typography_b_qmgb_1bisyd47']",
+                           "span[class*='Typography']"];
+    for (var a = 0; a < authorSelectors.length && author === '알 수 없음'; a++) {
+        var authorEls = card.querySelectorAll(authorSelectors[a]);
+        for (var ae = 0; ae < authorEls.length; ae++) {
+            var at = txt(authorEls[ae]);
+            if (at.length > 0 && at.length < 20) { author = at; break; }
+        }
+    }
+
+    // 별점
+    var stars = 0;
+    var svgs = card.querySelectorAll('svg');
+    for (var sv = 0; sv < svgs.length; sv++) {
+        if (svgs[sv].querySelectorAll('path[fill="#FFC600"]').length > 0) stars++;
+    }
+    if (stars === 0) {
+        var paths = card.querySelectorAll('svg path');
+        for (var pi = 0; pi < paths.length; pi++) {
+            var fill = (paths[pi].getAttribute('fill') || '').toLowerCase();
+            if (fill === '#ffc600' || fill === 'gold' || fill === 'yellow') stars++;
+        }
+    }
+    stars = Math.min(stars, 5);
+
+    // 리뷰 텍스트
+    var reviewText = '';
+    var textCandidates = [card.querySelectorAll("span[class*='Typography_b_qmgb_1bisyd49'][class*='Typography_b_qmgb_1bisyd41u']")];
+    var flexDivs = card.querySelectorAll("div[class*='Flex_c_qbca_bbdidap']");
+    if (flexDivs.length > 1) textCandidates.push(flexDivs[1].querySelectorAll("span[class*='Typography']"));
+    for (var tc = 0; tc < textCandidates.length && !reviewText; tc++) {
+        for (var te = 0; te < textCandidates[tc].length; te++) {
+            var rt = txt(textCandidates[tc][te]);
+            if (rt && rt !== author && rt.indexOf('별점') !== 0 && rt.indexOf('[고기천원]') !== 0) {
+                reviewText = rt;
+                break;
+            }
+        }
+    }
+
+    // 주문 메뉴
+    var menus = [];
+    var menuEls = card.querySelectorAll("span[class*='Badge_b_qmgb_19agxism']");
+    for (var m = 0; m < menuEls.length; m++) {
+        var mt = txt(menuEls[m]);
+        if (mt) menus.push(mt);
+    }
+
+    // 상대 날짜 텍스트
+    var dateText = '';
+    var dateCandidates = [card.querySelectorAll("span[class*='Typography_b_qmgb_1bisyd4b'][class*='Typography_b_qmgb_1bisyd41v']"),
+                          card.querySelectorAll('span')];
+    for (var dc = 0; dc < dateCandidates.length && !dateText; dc++) {
+        for (var de = 0; de < dateCandidates[dc].length; de++) {
+            var dt = txt(dateCandidates[dc][de]);
+            if (dc === 1 && !has(dt, DATE_KEYWORDS) && DATE_WORDS.indexOf(dt) < 0) continue;
+            if (isDateText(dt)) { dateText = dt; break; }
+        }
+    }
+    if (!dateText) {
+        var spans = card.querySelectorAll('span');
+        for (var sp = 0; sp < spans.length; sp++) {
+            var st = txt(spans[sp]);
+            if (isDateText(st)) { dateText = st; break; }
+        }
+    }
+
+    result.push({
+        element: card,
+        key: dataIndex,
+        data_index: dataIndex,
+        author: author,
+        rating: stars > 0 ? stars : 5,
+        review_text: reviewText,
+        order_menu: menus.join(', '),
+        delivery_review: '',
+        date_text: dateText,
+        has_reply_button: hasReplyButton,
+        is_old: fullText.indexOf('30일이 지난 리뷰') >= 0,
+        is_valid: isValid
+    });
+}
+return result;
+"""
+
+# 카드 정보 추출 방식
+# - "script": REVIEW_CARD_EXTRACT_JS 를 execute_script 1회로 실행
+# - "page_source": driver.page_source 1회 + 오프라인 파서(review_html_parser.py), element 는 답글 등록 시 조회
+CARD_SOURCE_MODE = "script"
+
+try:
+    from review_html_parser import parse_review_cards
+except ImportError:
+    parse_review_cards = None
+
+@timed("scan.cards")
+def extract_visible_cards(driver, visible_only=True):
+    """
+    화면의 리뷰 카드 정보를 execute_script 한 번으로 추출
+    - 반환: 카드별 dict 목록 (작성자/별점/내용/메뉴/날짜/답글버튼/30일경과/data-index)
+    - element 는 답글 등록 시에만 사용
+    - page_source 모드에서는 화면 밖 카드도 포함 (처리 여부는 호출부의 해시 중복 체크로 판단)
+    """
+    if CARD_SOURCE_MODE == "page_source" and parse_review_cards is not None:
+        try:
+            cards = parse_review_cards(driver.page_source)
+            for card in cards:
+                card["element"] = None
+            print(f"[extract_visible_cards] page_source 파싱으로 {len(cards)}개 카드 추출")
+            return cards
+        except Exception as e:
+            print(f"[extract_visible_cards] page_source 파싱 오류, 스크립트 방식으로 대체: {str(e)}")
+    
+    try:
+        cards = driver.execute_script(REVIEW_CARD_EXTRACT_JS, visible_only) or []
+    except Exception as e:
+        print(f"[extract_visible_cards] 카드 추출 스크립트 오류: {str(e)}")
+        return []
+    
+    for idx, card in enumerate(cards):
+        # data-index 가 없는 카드는 화면 내 순서로 키 부여
+        if card.get("key") is None:
+            card["key"] = f"pos_{idx}"
+        try:
+            card["rating"] = int(card.get("rating") or 5)
+        except (TypeError, ValueError):
+            card["rating"] = 5
+    
+    print(f"[extract_visible_cards] {len(cards)}개 카드 추출 (visible_only={visible_only})")
+    return cards
+
+def resolve_card_element(driver, card):
+    """카드 정보에 해당하는 WebElement 조회 (page_source 모드에서 답글 등록 직전에만 호출)"""
+    if card.get("element") is not None:
+        return card["element"]
+    try:
+        card_selector = card.get("card_selector") or "div[class*='ReviewContent-module']"
+        if card.get("data_index") is not None:
+            container = driver.find_element(By.CSS_SELECTOR, f"[data-index='{card['data_index']}']")
+            inner = container.find_elements(By.CSS_SELECTOR, card_selector)
+            card["element"] = inner[0] if inner else container
+        else:
+            elements = driver.find_elements(By.CSS_SELECTOR, card_selector)
+            position = card.get("position", -1)
+            if 0 <= position < len(elements):
+                card["element"] = elements[position]
+    except Exception as e:
+        print(f"[resolve_card_element] 카드 요소 조회 실패 (key={card.get('key')}): {str(e)}")
+    return card.get("element")
+
+def review_info_from_card(card):
+    """extract_visible_cards 결과를 parse_review_info 반환 형식으로 변환"""
+    return {
+        "author": card.get("author") or "알 수 없음",
+        "rating": card.get("rating", 5),
+        "review_text": card.get("review_text") or "",
+        "order_menu": card.get("order_menu") or "",
+        "delivery_review": card.get("delivery_review") or "",
+        "is_valid": bool(card.get("is_valid"))
+    }
+
 def parse_review_info(driver, card_element):
     """리뷰 카드에서 정보 추출 - 별점 파싱 알고리즘 강화"""
     try:
@@ -1993,25 +2596,39 @@ def find_reply_button(card_element):
         print(f"[find_reply_button] 답글 버튼 찾기 오류: {str(e)}")
         return None
 
-def handle_review_card(driver, store_code, platform_name, platform_code, store_nm, card_element, rule):
-    """개선된 리뷰 카드 처리 함수"""
-    # 1. 30일 경과 체크
-    try:
-        old_notice_els = card_element.find_elements(By.XPATH, ".//*[contains(text(), '30일이 지난 리뷰')]")
-        if old_notice_els:
+def handle_review_card(driver, store_code, platform_name, platform_code, store_nm, card_element, rule, card_data=None):
+    """
+    개선된 리뷰 카드 처리 함수
+    - card_data: extract_visible_cards 로 미리 추출한 카드 정보 (있으면 1~3단계 DOM 조회 생략)
+    """
+    card_started = time.time()
+    if card_data is not None:
+        # 1~3. 미리 추출한 카드 정보 사용
+        if card_data.get("is_old"):
             print("[handle_review_card] 30일 지난 리뷰 -> 처리 중단")
             return "STOP_30D"
-    except:
-        pass
+        if not card_data.get("has_reply_button"):
+            print("[handle_review_card] 답글 불가능한 리뷰(버튼 없음)")
+            return None
+        review_info = review_info_from_card(card_data)
+    else:
+        # 1. 30일 경과 체크
+        try:
+            old_notice_els = card_element.find_elements(By.XPATH, ".//*[contains(text(), '30일이 지난 리뷰')]")
+            if old_notice_els:
+                print("[handle_review_card] 30일 지난 리뷰 -> 처리 중단")
+                return "STOP_30D"
+        except:
+            pass
 
-    # 2. 답글 버튼 체크
-    reply_btn = find_reply_button(card_element)
-    if not reply_btn:
-        print("[handle_review_card] 답글 불가능한 리뷰(버튼 없음)")
-        return None
+        # 2. 답글 버튼 체크
+        reply_btn = find_reply_button(card_element)
+        if not reply_btn:
+            print("[handle_review_card] 답글 불가능한 리뷰(버튼 없음)")
+            return None
 
-    # 3. 리뷰 정보 파싱
-    review_info = parse_review_info(driver, card_element)
+        # 3. 리뷰 정보 파싱
+        review_info = parse_review_info(driver, card_element)
     author = review_info["author"]
     rating = review_info["rating"]
     review_text = review_info["review_text"]
@@ -2037,15 +2654,21 @@ def handle_review_card(driver, store_code, platform_name, platform_code, store_n
     # HTML에서 날짜 추출 시도
     if review_date == datetime.now().date().isoformat():
         try:
-            html_date = extract_relative_date(driver, card_element)
+            if card_data is not None:
+                html_date = relative_date_to_iso(card_data.get("date_text"))
+            else:
+                html_date = extract_relative_date(driver, card_element)
             if html_date:
                 review_date = html_date
                 print(f"[handle_review_card] HTML에서 날짜 추출: {html_date}")
         except Exception as e:
             print(f"[handle_review_card] HTML 날짜 추출 실패: {str(e)}")
 
-    # 5. 기존 리뷰 정보 확인
-    existing = supabase.table("reviews").select("*").eq("review_id", review_hash).execute()
+    review_events.start(review_hash, store_code, started_at=card_started, rating=rating)
+    review_events.mark(review_hash, "crawled")
+
+    # 5. 기존 리뷰 정보 확인 (매장 스냅샷 우선)
+    record = get_review_record(review_hash, store_code)
 
     now = datetime.now()
     current_date = now.date().isoformat()
@@ -2061,8 +2684,7 @@ def handle_review_card(driver, store_code, platform_name, platform_code, store_n
         days_since_review = 0  # 안전하게 기본값 설정
 
     # 기존 리뷰가 있는 경우
-    if existing.data:
-        record = existing.data[0]
+    if record:
         # 날짜가 이미 설정되어 있으면 유지 (하지만 경과일은 새로 계산된 값 사용)
         review_date = record.get('review_date', review_date)
         status = record.get('response_status', '')
@@ -2129,6 +2751,7 @@ def handle_review_card(driver, store_code, platform_name, platform_code, store_n
         is_empty_review = not review_text or review_text.strip() == "" or review_text.strip() == "[고기천원]마라탕麻"
         if not is_empty_review or rating < 4:
             analysis_result = analyze_restaurant_review(review_text, rating, order_menu, delivery_review)
+            review_events.mark(review_hash, "analyzed")
             
             # AI 답변 불가능 판정이면 사장님 확인 필요로 저장
             if not analysis_result['ai_reply'] and not (is_empty_review and rating >= 4):
@@ -2239,16 +2862,19 @@ def handle_review_card(driver, store_code, platform_name, platform_code, store_n
         "tone": rule.get("tone", ""),
         "max_length": rule.get("max_length", 300),
         "author": author,
-        "rating": rating
+        "rating": rating,
+        "order_menu": order_menu
     }
     
     try:
         ai_reply = generate_ai_reply(review_text, store_info)
         if not ai_reply:
             raise Exception("AI 답변 생성 실패")
+        review_events.mark(review_hash, "generated")
         
         # 9. 답변 품질 검사
-        is_good_reply, _ = score_reply(ai_reply, review_text, author, rating, threshold=80)
+        is_good_reply, _ = evaluate_reply(ai_reply, review_text, author, rating, threshold=80, store_info=store_info)
+        review_events.mark(review_hash, "scored")
         if not is_good_reply:
             print("[handle_review_card] AI 답변 품질 미달")
             # 다시 시도
@@ -2257,7 +2883,7 @@ def handle_review_card(driver, store_code, platform_name, platform_code, store_n
                 raise Exception("AI 답변 재생성 실패")
                 
             # 두 번째 생성도 실패하면 별도 처리
-            is_good_reply, _ = score_reply(ai_reply, review_text, author, rating, threshold=75)
+            is_good_reply, _ = evaluate_reply(ai_reply, review_text, author, rating, threshold=75, store_info=store_info)
             if not is_good_reply:
                 print("[handle_review_card] 두 번째 AI 답변도 품질 미달")
         
@@ -2314,6 +2940,7 @@ def handle_review_card(driver, store_code, platform_name, platform_code, store_n
 
         # 성공 처리
         print("[handle_review_card] 댓글 등록 성공!")
+        review_events.mark(review_hash, "posted")
         _save_review_data(
             store_code=store_code,
             platform=platform_name,
@@ -2363,6 +2990,7 @@ def handle_review_card(driver, store_code, platform_name, platform_code, store_n
         )
         return None
     
+@timed("navigate")
 def navigate_to_uncommented_tab(driver, store_code):
     """미답변 탭으로 이동 - 클릭 이후 상태 확인 개선"""
     max_attempts = 2
@@ -2371,8 +2999,8 @@ def navigate_to_uncommented_tab(driver, store_code):
         try:
             print(f"[navigate_to_uncommented_tab] 미답변 탭 클릭 시도 {attempt}/{max_attempts}")
             
-            # 페이지 로딩 대기
-            time.sleep(3)
+            # 페이지 로딩 대기 (탭 버튼이 나타날 때까지)
+            wait_for(driver, "tab.page_load", element_present(By.XPATH, "//button[@role='tab']"), timeout=3)
             
             # 미답변 탭 요소 찾기
             tab_element = None
@@ -2420,7 +3048,11 @@ def navigate_to_uncommented_tab(driver, store_code):
                     try:
                         print(f"[navigate_to_uncommented_tab] 클릭 방법 {click_index + 1} 시도")
                         click_method()
-                        time.sleep(2)
+                        wait_for(
+                            driver, "tab.click",
+                            lambda d: d.find_element(By.XPATH, "//button[@id='no-comment']").get_attribute("aria-selected") == "true",
+                            timeout=2
+                        )
                         
                         # 클릭 후 상태 확인 - 실제로 탭이 선택되었는지 검증
                         current_element = driver.find_element(By.XPATH, "//button[@id='no-comment']")
@@ -2440,8 +3072,8 @@ def navigate_to_uncommented_tab(driver, store_code):
                         save_error_screenshot(driver, store_code, "TabSelectionFail")
                         return False
             
-            # 클릭 후 충분한 대기 시간 추가
-            time.sleep(3)
+            # 클릭 후 리뷰 목록 로딩 대기
+            wait_for(driver, "tab.reviews_load", timeout=3)
             
             # 클릭 후 리뷰 확인
             review_cards = find_review_cards(driver)
@@ -2461,6 +3093,7 @@ def navigate_to_uncommented_tab(driver, store_code):
     
     return False
 
+@timed("scan.cards")
 def find_review_cards(driver):
     """효율적인 리뷰 카드 찾기 - 중복 검색 제거"""
     # 정확한 리뷰 카드 선택자 사용 (가장 신뢰할 수 있는 것만)
@@ -2541,8 +3174,8 @@ def find_review_cards(driver):
 ###################################################
 # 14) 리뷰 페이지 전체 처리 함수
 ###################################################
-def process_reviews_on_page_improved(driver, store_code, platform_name, platform_code, store_nm, rule):
-    """개선된 리뷰 페이지 처리 함수 - 30일 지난 리뷰 로직 개선"""
+def process_reviews_on_page_improved(driver, store_code, platform_name, platform_code, store_nm, rule, crawl=None):
+    """개선된 리뷰 페이지 처리 함수 - 30일 지난 리뷰 로직 개선 (crawl: 매장 크롤링 기준점)"""
     global processed_reviews_in_session
     processed_count = 0
     
@@ -2565,6 +3198,7 @@ def process_reviews_on_page_improved(driver, store_code, platform_name, platform
     
     # 6. 30일 지난 리뷰 발견 플래그 (다음 스크롤부터 중단)
     found_old_review = False
+    reached_watermark = False  # 지난 실행에서 처리 끝난 구간 도달
     
     print(f"[process_reviews_on_page_improved] 시작: 총 높이={total_height}, 스크롤 단위={scroll_height}")
     
@@ -2573,20 +3207,16 @@ def process_reviews_on_page_improved(driver, store_code, platform_name, platform
         if found_old_review:
             print("[process_reviews_on_page_improved] 이전 스크롤에서 30일 지난 리뷰 발견, 이후 처리 중단")
             break
+        if reached_watermark:
+            print("[process_reviews_on_page_improved] 크롤링 기준점 도달, 이후 리뷰는 지난 실행에서 처리 완료")
+            break
         
         # A. 스크롤 다운
         driver.execute_script(f"window.scrollTo(0, {current_position});")
-        time.sleep(1.5)  # 로딩 대기
-        
-        # B. 현재 화면에 보이는 리뷰 찾기 (JavaScript 활용)
-        visible_cards = driver.execute_script("""
-            const allCards = document.querySelectorAll('div[class*="ReviewContent-module"]');
-            return Array.from(allCards).filter(card => {
-                const rect = card.getBoundingClientRect();
-                // 현재 화면에 완전히 또는 부분적으로 보이는 카드 선택
-                return (rect.top < window.innerHeight && rect.bottom > 0);
-            });
-        """)
+        wait_for(driver, "scan.scroll", timeout=1.5)  # 로딩 대기
+        
+        # B. 현재 화면에 보이는 리뷰 카드 정보 한 번에 추출
+        visible_cards = extract_visible_cards(driver)
         
         if visible_cards:
             print(f"[process_reviews_on_page_improved] 현재 위치({current_position})에서 {len(visible_cards)}개 카드 발견")
@@ -2594,12 +3224,9 @@ def process_reviews_on_page_improved(driver, store_code, platform_name, platform
         # C. 발견한 카드 처리
         cards_old_review_found = False  # 현재 스크롤에서 30일 지난 리뷰 발견 플래그
         
-        for card in visible_cards:
-            if not is_element_valid(card):
-                continue
-                
-            # 카드의 리뷰 정보 추출
-            review_info = parse_review_info(driver, card)
+        for card_data in visible_cards:
+            # 카드의 리뷰 정보 (추출 결과 사용)
+            review_info = review_info_from_card(card_data)
             if not review_info.get("is_valid", False):
                 continue
                 
@@ -2608,24 +3235,38 @@ def process_reviews_on_page_improved(driver, store_code, platform_name, platform
             review_text = review_info["review_text"]
             review_hash = generate_review_hash(store_code, author, review_text)
             
+            # 크롤링 기준점 확인 (이후 카드는 지난 실행에서 모두 처리 끝)
+            if crawl is not None:
+                if crawl.reached_frontier(review_hash):
+                    reached_watermark = True
+                    break
+                crawl.seen(review_hash)
+            
             # 이미 처리한 리뷰 스킵 (세션 전체 + 현재 함수 호출 내)
             if review_hash in processed_reviews_in_session or review_hash in processed_ids:
                 continue
                 
             # 리뷰 처리 
             try:
+                card = resolve_card_element(driver, card_data)
+                if card is None:
+                    continue
+                
                 # 카드가 잘 보이도록 스크롤 조정
                 driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", card)
-                time.sleep(0.5)
+                wait_for(driver, "scan.scroll_card", element_in_view(card), timeout=0.5)
                 
                 # 리뷰 처리
-                result = handle_review_card(driver, store_code, platform_name, platform_code, store_nm, card, rule)
+                result = handle_review_card(driver, store_code, platform_name, platform_code, store_nm, card, rule,
+                                            card_data=card_data)
                 
                 # 중요 변경: 30일 지난 리뷰 발견 시 현재 스크롤의 나머지 리뷰는 처리하고
                 # 다음 스크롤부터 처리 중단하도록 플래그 설정
                 if result == "STOP_30D":
                     print("[process_reviews_on_page_improved] 30일 이상 지난 리뷰 발견, 다음 스크롤부터 처리 중단")
                     cards_old_review_found = True
+                    if crawl is not None:
+                        crawl.seen(review_hash, settled=True)
                     # 현재 리뷰는 처리 완료된 리뷰로 추가
                     processed_ids.add(review_hash)
                     processed_reviews_in_session.add(review_hash)
@@ -2662,42 +3303,24 @@ def process_reviews_on_page_improved(driver, store_code, platform_name, platform
             no_new_content_count += 1
             print(f"[process_reviews_on_page_improved] 새 컨텐츠 없음 카운트: {no_new_content_count}/3")
     
+    # 목록 끝 / 30일 경과 / 기준점에서 끝났으므로 확인 완료
+    if crawl is not None:
+        crawl.complete = True
+    
     print(f"[process_reviews_on_page_improved] 완료: 총 {processed_count}개 리뷰 처리")
     return processed_count
 
 def find_review_cards_with_data_index(driver):
-    """data-index 속성이 있는 리뷰 카드를 찾고 해당 속성을 반환하는 함수"""
+    """data-index 속성이 있는 리뷰 카드 정보를 한 번에 추출하는 함수"""
     try:
-        # 모든 카드 찾기
-        all_cards = find_review_cards(driver)
-        
-        # 결과 저장 딕셔너리: {data-index: card_element}
+        # 결과 저장 딕셔너리: {data-index: 카드 정보(dict)}
         cards_with_index = {}
         
-        # 각 카드에서 data-index 속성 확인
-        for card in all_cards:
-            try:
-                # 상위 요소를 찾아 올라가며 data-index 속성 찾기
-                parent = card
-                max_depth = 5  # 최대 상위 5단계까지만 확인
-                
-                for _ in range(max_depth):
-                    try:
-                        data_index = parent.get_attribute("data-index")
-                        if data_index is not None:
-                            cards_with_index[data_index] = card
-                            print(f"[find_review_cards_with_data_index] data-index={data_index} 리뷰 카드 발견")
-                            break
-                    except:
-                        pass
-                    
-                    # 부모 요소로 이동
-                    parent = driver.execute_script("return arguments[0].parentNode;", parent)
-                    if parent is None:
-                        break
-                
-            except Exception as e:
-                continue
+        for card in extract_visible_cards(driver, visible_only=False):
+            data_index = card.get("data_index")
+            if data_index is not None:
+                cards_with_index[data_index] = card
+                print(f"[find_review_cards_with_data_index] data-index={data_index} 리뷰 카드 발견")
         
         print(f"[find_review_cards_with_data_index] 총 {len(cards_with_index)}개 리뷰(data-index 기준) 발견")
         return cards_with_index
@@ -2706,8 +3329,8 @@ def find_review_cards_with_data_index(driver):
         print(f"[find_review_cards_with_data_index] 리뷰 카드 찾기 오류: {str(e)}")
         return {}
 
-def process_reviews_by_data_index(driver, store_code, platform_name, platform_code, store_nm, rule):
-    """간소화된 data-index 속성을 기반으로 리뷰 순차 처리 - 무한 루프 방지"""
+def process_reviews_by_data_index(driver, store_code, platform_name, platform_code, store_nm, rule, crawl=None):
+    """간소화된 data-index 속성을 기반으로 리뷰 순차 처리 - 무한 루프 방지 (crawl: 매장 크롤링 기준점)"""
     global processed_reviews_in_session
     processed_count = 0
     visited_review_hashes = set()  # 리뷰 해시 기반으로 중복 추적
@@ -2735,11 +3358,13 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
             # 리뷰가 없는 상태가 연속 3번 발생하면 처리 중단
             if no_reviews_count >= max_no_reviews:
                 print(f"[process_reviews_by_data_index] 리뷰가 {max_no_reviews}번 연속으로 없음, 처리 종료")
+                if crawl is not None:
+                    crawl.complete = True
                 return processed_count
                 
             # 스크롤을 내려서 더 많은 리뷰 로드 시도
             driver.execute_script(f"window.scrollBy(0, 1000);")
-            time.sleep(3)
+            wait_for(driver, "index.scroll_more", timeout=3)
             continue
         else:
             # 리뷰가 발견되면 카운트 초기화
@@ -2772,17 +3397,17 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
             else:
                 # 더 큰 인덱스가 없으면 스크롤해서 새 리뷰 로드
                 driver.execute_script(f"window.scrollBy(0, 800);")
-                time.sleep(2)
+                wait_for(driver, "index.scroll_next", timeout=2)
                 print("[process_reviews_by_data_index] 더 큰 인덱스가 없어 스크롤 다운")
                 continue
         
-        # 현재 타겟 인덱스의 카드 가져오기
-        card = cards_with_index[current_target_index]
+        # 현재 타겟 인덱스의 카드 가져오기 (WebElement 는 답글 등록에만 사용)
+        card_data = cards_with_index[current_target_index]
         
         print(f"[process_reviews_by_data_index] data-index {current_target_index} 처리 시작")
         
-        # 리뷰 정보 추출
-        review_info = parse_review_info(driver, card)
+        # 리뷰 정보 (추출 결과 사용)
+        review_info = review_info_from_card(card_data)
         if not review_info.get("is_valid", False):
             print(f"[process_reviews_by_data_index] data-index {current_target_index}는 유효한 리뷰가 아님")
             # 다음 인덱스로 이동 (유효하지 않은 경우)
@@ -2796,6 +3421,13 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
         review_text = review_info["review_text"]
         review_hash = generate_review_hash(store_code, author, review_text)
         
+        # 크롤링 기준점 확인 (data-index 순서 = 최신순, 이후 카드는 지난 실행에서 모두 처리 끝)
+        if crawl is not None:
+            if crawl.reached_frontier(review_hash):
+                print(f"[process_reviews_by_data_index] 크롤링 기준점 도달 (해시: {review_hash[:8]}), 이후 리뷰는 지난 실행에서 처리 완료")
+                break
+            crawl.seen(review_hash)
+        
         # ===== 무한 루프 방지 로직 =====
         # 현재 인덱스에서 이미 처리한 해시 확인
         if current_target_index in index_processed_hashes:
@@ -2809,6 +3441,8 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
                     print(f"[process_reviews_by_data_index] 다음 인덱스 {current_target_index}로 이동")
                 else:
                     print("[process_reviews_by_data_index] 다음 인덱스가 없어 처리 종료")
+                    if crawl is not None:
+                        crawl.complete = True
                     break
                 continue
         
@@ -2828,13 +3462,19 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
         
         print(f"[process_reviews_by_data_index] data-index {current_target_index} 리뷰 처리 시도 (해시: {review_hash[:8]})")
         
+        card = resolve_card_element(driver, card_data)
+        if card is None:
+            print(f"[process_reviews_by_data_index] data-index {current_target_index} 카드 요소를 찾을 수 없음, 다음 시도로 진행")
+            continue
+        
         # 카드가 화면에 보이도록 스크롤
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", card)
-        time.sleep(1.5)
+        wait_for(driver, "index.scroll_card", element_in_view(card), timeout=1.5)
         
         try:
             # 리뷰 처리
-            result = handle_review_card(driver, store_code, platform_name, platform_code, store_nm, card, rule)
+            result = handle_review_card(driver, store_code, platform_name, platform_code, store_nm, card, rule,
+                                        card_data=card_data)
             
             # 방문한 리뷰 해시 추가
             visited_review_hashes.add(review_hash)
@@ -2846,6 +3486,9 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
             
             if result == "STOP_30D":
                 print(f"[process_reviews_by_data_index] 30일 경과 리뷰 발견, 처리 종료")
+                if crawl is not None:
+                    crawl.seen(review_hash, settled=True)
+                    crawl.complete = True
                 return processed_count
             elif result == True:  # 답변 성공
                 print(f"[process_reviews_by_data_index] data-index {current_target_index} 처리 성공")
@@ -2854,8 +3497,8 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
                 # 핵심: 답변 성공 시 같은 인덱스 유지 (DOM 변경으로 새 리뷰가 당겨짐)
                 print(f"[process_reviews_by_data_index] 답변 성공 - 같은 data-index {current_target_index} 유지")
                 
-                # 처리 후 잠시 대기
-                time.sleep(2)
+                # 처리 후 목록 갱신 대기
+                wait_for(driver, "index.after_reply", timeout=2)
                 
             else:  # 답변 대기, 사장님 확인 필요 등
                 print(f"[process_reviews_by_data_index] data-index {current_target_index} - 처리 불가 상태")
@@ -2867,7 +3510,7 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
                     print(f"[process_reviews_by_data_index] 처리 불가로 다음 인덱스 {current_target_index}로 이동")
                     
                 # 짧은 대기
-                time.sleep(1)
+                wait_for(driver, "index.after_skip", timeout=1)
                 
         except Exception as e:
             print(f"[process_reviews_by_data_index] data-index {current_target_index} 처리 중 오류: {str(e)}")
@@ -2886,35 +3529,30 @@ def process_reviews_by_data_index(driver, store_code, platform_name, platform_co
             
         # 각 시도 후 짧게 스크롤 다운 (모든 리뷰 유지 위해)
         driver.execute_script(f"window.scrollBy(0, 100);")
-        time.sleep(1)
+        wait_for(driver, "index.scroll_step", timeout=1)
     
     # 처리 통계
     print(f"[process_reviews_by_data_index] 총 {processed_count}개 리뷰 처리 완료")
     
-    # 미답변 탭 상태 요약 및 불일치 통계 
-    completed_in_db_count = 0
-    for review_hash in visited_review_hashes:
-        try:
-            # 리뷰 상태 확인
-            status_check = supabase.table("reviews").select("response_status").eq("review_id", review_hash).execute()
-            if status_check.data and status_check.data[0].get('response_status') == "답변완료":
-                completed_in_db_count += 1
-        except Exception as e:
-            print(f"[process_reviews_by_data_index] 리뷰 상태 확인 오류: {str(e)}")
+    # 미답변 탭 상태 요약 및 불일치 통계 (스냅샷/일괄 조회로 한 번에 대조)
+    reconcile = reconcile_visited_reviews(store_code, platform_name, list(visited_review_hashes))
+    reconcile.update({"store_code": store_code, "platform": platform_name, "processed": processed_count})
+    print(f"[process_reviews_by_data_index] 미답변 탭 대조: {json.dumps(reconcile, ensure_ascii=False)}")
+    completed_in_db_count = reconcile["completed_in_db"]
     
     # 불일치 상태 로그 기록
     if completed_in_db_count > 0:
         mismatch_message = f"미답변 탭에 표시된 리뷰 중 {completed_in_db_count}개가 DB에서는 '답변완료' 상태"
         print(f"[process_reviews_by_data_index] {mismatch_message}")
         
-        # 전체 통계 저장
+        # 전체 통계 저장 (매장별 대조 결과를 한 행으로)
         save_error_log_to_supabase(
             category="시스템 통계",
             platform=platform_name,
             store_code=store_code,
             error_type="미답변탭 불일치 통계",
             error_message=mismatch_message,
-            stack_trace=f"총 확인 리뷰: {len(visited_review_hashes)}, 답변완료 상태: {completed_in_db_count}, 처리된 리뷰: {processed_count}"
+            stack_trace=json.dumps(reconcile, ensure_ascii=False)
         )
     
     return processed_count
@@ -2930,17 +3568,19 @@ def is_element_valid(element):
 ###################################################
 # 15) 로그아웃 함수  
 ###################################################
-def logout_and_move_to_next(driver):
-    """로그아웃하고 다음 계정으로 넘어가는 함수"""
+def logout_and_move_to_next(driver, platform_id=None):
+    """로그아웃하고 다음 계정으로 넘어가는 함수 (로그아웃하면 저장된 세션도 무효화)"""
+    if platform_id:
+        session_cache.invalidate(platform_id, "로그아웃")
     try:
         driver.get("https://self.baemin.com/settings")
-        time.sleep(3)
+        wait_for(driver, "logout.page_load", timeout=3)
         close_popups_on_homepage(driver)
         logout_button = WebDriverWait(driver, 5).until(
             EC.element_to_be_clickable((By.XPATH, "//button[@class='LandingPage-module__mLoG']"))
         )
         logout_button.click()
-        time.sleep(2)
+        wait_for(driver, "logout.submit", lambda d: "/settings" not in d.current_url, timeout=2)
         print("[logout_and_move_to_next] 로그아웃 완료")
     except Exception as e:
         print(f"[logout_and_move_to_next] 로그아웃 중 문제: {str(e)}")
@@ -2948,14 +3588,9 @@ def logout_and_move_to_next(driver):
 ###################################################
 # 16) GUI 설정 및 메인 실행 함수
 ###################################################
-root = tk.Tk()
-root.title("배민 리뷰 자동화")
-
-# 설정 로드
+# 설정 로드 (Tk 위젯은 build_gui 에서 생성)
 config = load_config()
 driver_path = config.get('chromedriver_path', '')
-driver_label = tk.Label(root, text=f"크롬드라이버 경로: {driver_path if driver_path else '미설정'}")
-driver_label.pack(pady=10)
 
 def set_driver_path():
     """크롬드라이버 경로 설정 버튼 함수"""
@@ -2971,25 +3606,49 @@ def set_driver_path():
         save_config(conf)
         driver_path = path
 
-# 버튼과 UI 요소들
-btn_driver = tk.Button(root, text="크롬드라이버 경로 설정", command=set_driver_path)
-btn_driver.pack(pady=5)
+def build_gui():
+    """
+    GUI 구성 (메인 프로세스에서만 호출)
+    - 병렬 실행 워커(spawn)는 이 모듈을 다시 import 하므로 Tk 창은 모듈 최상위에서 만들지 않음
+    """
+    global root, driver_label, execution_mode, range_entry, worker_count_var
+    root = tk.Tk()
+    root.title("배민 리뷰 자동화")
+
+    driver_label = tk.Label(root, text=f"크롬드라이버 경로: {driver_path if driver_path else '미설정'}")
+    driver_label.pack(pady=10)
+
+    # 버튼과 UI 요소들
+    btn_driver = tk.Button(root, text="크롬드라이버 경로 설정", command=set_driver_path)
+    btn_driver.pack(pady=5)
 
-# 실행 모드 설정
-execution_mode = tk.StringVar(value='all')
-frame_mode = tk.LabelFrame(root, text="실행 범위 설정", padx=10, pady=10)
-frame_mode.pack(pady=5)
+    # 실행 모드 설정
+    execution_mode = tk.StringVar(value='all')
+    frame_mode = tk.LabelFrame(root, text="실행 범위 설정", padx=10, pady=10)
+    frame_mode.pack(pady=5)
 
-rb_all = tk.Radiobutton(frame_mode, text="전체 실행", variable=execution_mode, value='all')
-rb_all.grid(row=0, column=0, sticky="w")
-rb_partial = tk.Radiobutton(frame_mode, text="부분 실행", variable=execution_mode, value='partial')
-rb_partial.grid(row=0, column=1, sticky="w")
+    rb_all = tk.Radiobutton(frame_mode, text="전체 실행", variable=execution_mode, value='all')
+    rb_all.grid(row=0, column=0, sticky="w")
+    rb_partial = tk.Radiobutton(frame_mode, text="부분 실행", variable=execution_mode, value='partial')
+    rb_partial.grid(row=0, column=1, sticky="w")
 
-range_label = tk.Label(frame_mode, text="StoreCode 범위 예: AAA0010, AAA0015")
-range_label.grid(row=1, column=0, columnspan=2, sticky="w")
+    range_label = tk.Label(frame_mode, text="StoreCode 범위 예: AAA0010, AAA0015")
+    range_label.grid(row=1, column=0, columnspan=2, sticky="w")
 
-range_entry = tk.Entry(frame_mode, width=30)
-range_entry.grid(row=2, column=0, columnspan=2, pady=5, sticky="w")
+    range_entry = tk.Entry(frame_mode, width=30)
+    range_entry.grid(row=2, column=0, columnspan=2, pady=5, sticky="w")
+
+    # 동시 실행 계정 수 (2 이상이면 계정 그룹별 프로세스로 병렬 처리)
+    worker_frame = tk.Frame(root)
+    worker_frame.pack(pady=5)
+    tk.Label(worker_frame, text="동시 실행 계정 수").pack(side=tk.LEFT)
+    worker_count_var = tk.StringVar(value="1")
+    worker_spin = tk.Spinbox(worker_frame, from_=1, to=8, width=5, textvariable=worker_count_var)
+    worker_spin.pack(side=tk.LEFT, padx=5)
+
+    # 실행 버튼 생성
+    btn_run = tk.Button(root, text="자동화 실행", command=run_automation)
+    btn_run.pack(pady=20)
 
 ###################################################
 # 17) 메인 실행 함수
@@ -3037,6 +3696,19 @@ def run_automation():
     # 인증정보별 그룹화
     creds_group = group_by_credentials(platform_data)
 
+    # 리뷰 저장 큐 준비 (이전 실행 미전송분 복구 후 백그라운드 writer 시작)
+    review_writer.load_spilled()
+    review_writer.start()
+
+    # 동시 실행 계정 수가 2 이상이면 프로세스 풀로 병렬 처리
+    worker_count = get_worker_count()
+    if worker_count > 1 and len(creds_group) > 1:
+        run_in_worker_pool(creds_group, worker_count)
+        review_writer.flush("작업 완료")
+        save_log_on_exit()  # 로그 저장
+        messagebox.showinfo("완료", "배민 리뷰 자동화 처리가 완료되었습니다.")
+        return
+
     # 브라우저 옵션 설정
     options = uc.ChromeOptions()
     options.add_argument("--start-maximized")
@@ -3047,59 +3719,228 @@ def run_automation():
 
     # 계정별 처리
     for (pid, ppw), rules_list in creds_group.items():
-        print(f"\n[run_automation] 로그인 계정 ID={pid}, 매장수={len(rules_list)}")
-        if not rules_list:
-            continue
+        driver = process_account_group(driver, pid, ppw, rules_list, options)
+
+    # 모든 작업 완료 후 드라이버 종료
+    driver.quit()
+    review_writer.flush("작업 완료")
+    page_waiter.print_stats()
+    print_profile_report("baemin")
+    error_sink.close()
+    review_mirror.log_stats()
+    crawl_watermarks.log_stats()
+    save_log_on_exit()  # 로그 저장
+    messagebox.showinfo("완료", "배민 리뷰 자동화 처리가 완료되었습니다.")
 
-        # 로그인
-        first_store_code = rules_list[0]["store_code"]
-        login_success, driver = login_to_baemin(driver, pid, ppw, first_store_code, "배민", options)
-        if not login_success:
-            print(f"[run_automation] ID={pid} 로그인 실패 => 다음 계정으로 넘어감")
+def process_account_group(driver, pid, ppw, rules_list, options, on_store_done=None):
+    """
+    한 계정(로그인 1회)에 속한 매장들을 순서대로 처리
+    - on_store_done(store_code, ok): 매장 처리 후 호출 (병렬 실행 시 결과 보고용)
+    - 로그인 중 드라이버가 재시작될 수 있으므로 최종 드라이버를 반환
+    """
+    print(f"\n[run_automation] 로그인 계정 ID={pid}, 매장수={len(rules_list)}")
+    if not rules_list:
+        return driver
+
+    # 로그인
+    first_store_code = rules_list[0]["store_code"]
+    login_success, driver = login_to_baemin(driver, pid, ppw, first_store_code, "배민", options)
+    if not login_success:
+        print(f"[run_automation] ID={pid} 로그인 실패 => 다음 계정으로 넘어감")
+        if on_store_done:
+            for rule in rules_list:
+                on_store_done(rule["store_code"], False)
+        return driver
+
+    # 매장별 처리
+    for rule in rules_list:
+        store_code = rule["store_code"]
+        platform = rule["platform"]
+        platform_code = rule["platform_code"]
+        store_nm = rule["store_name"]
+        print(f"[run_automation] 매장처리 시작 store_code={store_code}, platform={platform}, code={platform_code}")
+
+        # 리뷰 페이지로 이동
+        url = f"https://self.baemin.com/shops/{platform_code}/reviews"
+        driver.get(url)
+        wait_for(driver, "review_page.load", timeout=5)
+        check_and_close_new_windows(driver, store_code)  # 새창 체크
+
+        # 팝업 처리
+        close_popups_on_review_page(driver)
+        close_7day_popup(driver)
+        close_today_popup(driver)  # 새로 추가된 함수 호출
+
+        # 개선된 미답변 탭 이동 함수 사용
+        tab_success = navigate_to_uncommented_tab(driver, store_code)
+        if not tab_success:
+            print(f"[run_automation] {store_code} 미답변 탭 이동 실패, 다음 매장으로 이동")
+            if on_store_done:
+                on_store_done(store_code, False)
             continue
 
-        # 매장별 처리
-        for rule in rules_list:
-            store_code = rule["store_code"]
-            platform = rule["platform"]
-            platform_code = rule["platform_code"]
-            store_nm = rule["store_name"]
-            print(f"[run_automation] 매장처리 시작 store_code={store_code}, platform={platform}, code={platform_code}")
-
-            # 리뷰 페이지로 이동
-            url = f"https://self.baemin.com/shops/{platform_code}/reviews"
-            driver.get(url)
-            time.sleep(5)
-            check_and_close_new_windows(driver, store_code)  # 새창 체크
-
-            # 팝업 처리
-            close_popups_on_review_page(driver)
-            close_7day_popup(driver)
-            close_today_popup(driver)  # 새로 추가된 함수 호출
-
-            # 개선된 미답변 탭 이동 함수 사용
-            tab_success = navigate_to_uncommented_tab(driver, store_code)
-            if not tab_success:
-                print(f"[run_automation] {store_code} 미답변 탭 이동 실패, 다음 매장으로 이동")
-                continue
+        # 매장 리뷰 상태 스냅샷 로드 (카드별 DB 조회 대체)
+        load_review_snapshot(store_code, platform)
+
+        # 실제 리뷰 처리 (인덱스 기반 처리, 크롤링 기준점에 도달하면 중단)
+        crawl = crawl_watermarks.begin(store_code, platform, platform_code)
+        process_reviews_by_data_index(driver, store_code, platform, platform_code, store_nm, rule, crawl=crawl)
+        crawl_watermarks.finish(crawl, crawl_status_from_snapshot)
+        review_writer.flush(f"매장 종료 {store_code}")
+        clear_review_snapshot()
+        if on_store_done:
+            on_store_done(store_code, True)
+
+    # 다음 계정으로 이동 전 로그아웃
+    # (세션 캐시 사용 시 서버 세션은 유지하고 브라우저 쿠키만 비워 다음 실행에서 재사용)
+    if SESSION_CACHE_ENABLED:
+        session_cache.clear_browser(driver)
+    else:
+        logout_and_move_to_next(driver, pid)
+    review_writer.flush(f"계정 종료 {pid}")
+    return driver
 
-            # 실제 리뷰 처리 (인덱스 기반 처리)
-            process_reviews_by_data_index(driver, store_code, platform, platform_code, store_nm, rule)
+###################################################
+# 18) 병렬 실행 (계정 그룹별 프로세스 풀)
+###################################################
+WORKER_PROFILE_ROOT = "chrome_profiles"  # 워커별 크롬 프로필 상위 폴더
 
-        # 다음 계정으로 이동 전 로그아웃
-        logout_and_move_to_next(driver)
+def get_worker_count():
+    """GUI에서 입력한 동시 실행 계정 수 (잘못된 값이면 1)"""
+    try:
+        return max(1, int(worker_count_var.get()))
+    except Exception:
+        return 1
 
-    # 모든 작업 완료 후 드라이버 종료
-    driver.quit()
-    save_log_on_exit()  # 로그 저장
-    messagebox.showinfo("완료", "배민 리뷰 자동화 처리가 완료되었습니다.")
+def account_worker(worker_id, groups, result_queue):
+    """
+    워커 프로세스 진입점
+    - 전용 크롬 프로필/드라이버로 할당받은 계정 그룹을 순서대로 처리
+    - 리뷰 행, 매장 결과, 오류는 result_queue로 부모 프로세스에 전달
+    """
+    global log_file
+    log_file = os.path.join(log_dir, f"baemin_review_{current_time}_w{worker_id}.log")
+    log_sink.set_path(log_file)
+    review_writer.forward_to(result_queue, worker_id)
+
+    stats = {"accounts": 0, "stores": 0, "failed_stores": 0, "errors": 0}
+    started = time.time()
+
+    def on_store_done(store_code, ok):
+        stats["stores" if ok else "failed_stores"] += 1
+        result_queue.put(("store", worker_id, store_code, ok))
+
+    profile_dir = os.path.abspath(os.path.join(WORKER_PROFILE_ROOT, f"baemin_w{worker_id}"))
+    os.makedirs(profile_dir, exist_ok=True)
+    options = uc.ChromeOptions()
+    options.add_argument("--start-maximized")
+    options.add_argument(f"--user-data-dir={profile_dir}")
 
-# 실행 버튼 생성
-btn_run = tk.Button(root, text="자동화 실행", command=run_automation)
-btn_run.pack(pady=20)
+    driver = None
+    try:
+        print(f"[account_worker] 워커 {worker_id} 시작: 계정 {len(groups)}개, 프로필={profile_dir}")
+        driver = uc.Chrome(options=options)
+        for pid, ppw, rules_list in groups:
+            stats["accounts"] += 1
+            try:
+                driver = process_account_group(driver, pid, ppw, rules_list, options, on_store_done)
+            except Exception as e:
+                stats["errors"] += 1
+                print(f"[account_worker] 워커 {worker_id} 계정 ID={pid} 처리 오류: {str(e)}")
+                result_queue.put(("error", worker_id, f"ID={pid}: {str(e)}"))
+    except Exception as e:
+        stats["errors"] += 1
+        print(f"[account_worker] 워커 {worker_id} 실행 오류: {str(e)}")
+        result_queue.put(("error", worker_id, str(e)))
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except:
+                pass
+        stats["elapsed"] = time.time() - started
+        result_queue.put(("done", worker_id, stats))
+        page_waiter.print_stats()
+        print_profile_report("baemin")
+        error_sink.close()
+        review_mirror.log_stats()
+        crawl_watermarks.log_stats()
+        save_log_on_exit()
+
+def run_in_worker_pool(creds_group, worker_count):
+    """
+    계정 그룹을 worker_count개 프로세스에 나눠 병렬 처리
+    - 워커가 보낸 리뷰 행은 부모의 write-behind 큐로 저장
+    - 종료 후 워커별 처리량 요약 출력
+    """
+    groups = [(pid, ppw, rules) for (pid, ppw), rules in creds_group.items() if rules]
+    worker_count = max(1, min(worker_count, len(groups)))
+    shards = [groups[i::worker_count] for i in range(worker_count)]
+
+    ctx = multiprocessing.get_context("spawn")
+    result_queue = ctx.Queue()
+    workers = {}
+    summary = {}
+    for worker_id, shard in enumerate(shards, 1):
+        proc = ctx.Process(target=account_worker, args=(worker_id, shard, result_queue))
+        proc.start()
+        workers[worker_id] = proc
+        summary[worker_id] = {"accounts": 0, "stores": 0, "failed_stores": 0, "errors": 0, "reviews": 0, "elapsed": 0.0}
+        print(f"[run_in_worker_pool] 워커 {worker_id} 시작 (pid={proc.pid}, 계정 {len(shard)}개)")
+
+    started = time.time()
+    finished = set()
+    while len(finished) < len(workers):
+        try:
+            msg = result_queue.get(timeout=5)
+        except queue.Empty:
+            # 비정상 종료된 워커는 done 메시지 없이 끝난 것으로 처리
+            for worker_id, proc in workers.items():
+                if worker_id not in finished and not proc.is_alive() and result_queue.empty():
+                    print(f"[run_in_worker_pool] 워커 {worker_id} 비정상 종료 (exitcode={proc.exitcode})")
+                    summary[worker_id]["errors"] += 1
+                    summary[worker_id]["elapsed"] = time.time() - started
+                    finished.add(worker_id)
+            continue
+
+        kind, worker_id = msg[0], msg[1]
+        if kind == "review":
+            review_writer.enqueue(msg[2])
+            summary[worker_id]["reviews"] += 1
+        elif kind == "store":
+            print(f"[run_in_worker_pool] 워커 {worker_id} 매장 완료: {msg[2]} ({'성공' if msg[3] else '실패'})")
+        elif kind == "error":
+            print(f"[run_in_worker_pool] 워커 {worker_id} 오류: {msg[2]}")
+        elif kind == "done":
+            summary[worker_id].update(msg[2])
+            finished.add(worker_id)
+
+    for proc in workers.values():
+        proc.join(timeout=10)
+
+    print_worker_summary(summary, time.time() - started)
+    return summary
+
+def print_worker_summary(summary, total_elapsed):
+    """워커별 처리량 요약 출력"""
+    print("\n[병렬 실행 요약]")
+    print(f"{'워커':>4} {'계정':>4} {'매장':>4} {'실패':>4} {'리뷰':>5} {'오류':>4} {'소요(초)':>8} {'매장/분':>7} {'리뷰/분':>7}")
+    for worker_id in sorted(summary):
+        s = summary[worker_id]
+        minutes = s["elapsed"] / 60 if s["elapsed"] else 0
+        stores_per_min = s["stores"] / minutes if minutes else 0
+        reviews_per_min = s["reviews"] / minutes if minutes else 0
+        print(f"{worker_id:>4} {s['accounts']:>4} {s['stores']:>4} {s['failed_stores']:>4} {s['reviews']:>5} "
+              f"{s['errors']:>4} {s['elapsed']:>8.1f} {stores_per_min:>7.2f} {reviews_per_min:>7.2f}")
+    total_stores = sum(s["stores"] for s in summary.values())
+    total_reviews = sum(s["reviews"] for s in summary.values())
+    print(f"[병렬 실행 요약] 전체 소요 {total_elapsed:.1f}초, 매장 {total_stores}개, 리뷰 {total_reviews}건")
 
 # 메인 실행
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    build_gui()
+
     # 설정 파일에서 드라이버 경로 로드
     config = load_config()
     driver_path = config.get('chromedriver_path', '')
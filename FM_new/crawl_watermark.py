@@ -0,0 +1,219 @@
+"""
+매장별 크롤링 기준점 (배민/요기요 공용)
+
+미답변 목록은 최신순이므로, 지난 실행에서 "이 리뷰부터 아래는 모두 처리 끝"으로 확인된 리뷰(frontier)를
+만나면 더 스크롤하지 않고 멈춥니다. 답변 대기 중인 "사장님 확인필요" 리뷰(open)는 따로 보관해
+재처리 시점(작성 후 OPEN_RECHECK_DAYS 일)이 지난 항목이 있으면 기준점에서 멈추지 않고 끝까지 확인합니다.
+
+- frontier: 마지막으로 처리 안 된 카드 아래쪽에서 연속으로 처리 끝난 카드 중 최신 FRONTIER_SIZE 개 해시
+  (맨 위 카드가 사장님 답글 등으로 목록에서 빠져도 다음 카드로 인식)
+- 목록 끝까지(또는 기준점까지) 확인한 실행에서만 frontier 를 새로 계산하고,
+  중간에 끊긴 실행은 기존 frontier 를 유지 (그 아래는 여전히 처리 끝)
+- 목록 아래쪽에 늦게 올라온 리뷰도 찾도록 FULL_RESCAN_HOURS 시간마다 한 번은 기준점에서 멈추지 않고 끝까지 확인
+- 파일: watermarks/<실행기>_<store_code>_<platform>_<platform_code>.json
+  (store_code 하나에 요기요 가게 여러 개, 배민/배민1 이 함께 있으므로 가게별 파일, 가게는 한 워커만 처리)
+
+사용 예:
+    crawl = crawl_watermarks.begin(store_code, platform, platform_code)
+    for 카드 in 최신순:
+        if crawl.reached_frontier(review_hash):
+            break
+        crawl.seen(review_hash, review_date)
+        ...
+    crawl.complete = True                         # 목록 끝까지 확인한 경우
+    crawl_watermarks.finish(crawl, status_of)     # status_of(review_hash) -> (상태, 처리끝 여부, review_date)
+"""
+import json
+import os
+from datetime import datetime, date
+
+WATERMARK_DIR = "watermarks"
+FRONTIER_SIZE = 5          # 기준점으로 보관할 연속 처리 끝 카드 수
+OPEN_RECHECK_DAYS = 2      # "사장님 확인필요" 재처리 경과일 (_check_duplicate_review 와 동일)
+OPEN_STATUS = "사장님 확인필요"
+FULL_RESCAN_HOURS = 24     # 기준점과 관계없이 끝까지 확인하는 주기(시간)
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)[:10]).date()
+    except ValueError:
+        return None
+
+
+def _parse_datetime(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+class StoreCrawl:
+    """한 가게의 이번 실행 크롤링 기록"""
+
+    def __init__(self, store_code, previous, platform="", platform_code=""):
+        self.store_code = store_code
+        self.platform = platform or ""
+        self.platform_code = str(platform_code or "")
+        self.previous = previous or {}
+        self.frontier = set(self.previous.get("frontier") or [])
+        self.open_items = dict(self.previous.get("open") or {})   # review_hash -> review_date
+        self.order = []            # 최신순으로 확인한 카드 [(review_hash, review_date, 처리끝 여부 또는 None)]
+        self._seen = set()
+        self.complete = False      # 목록 끝 또는 기준점까지 확인했는지
+        self.stopped_at = None     # 기준점에서 멈춘 경우 해당 해시
+        self.due_open = self._due_open()
+        self.full_rescan_due = self._full_rescan_due()
+
+    def _due_open(self):
+        today = date.today()
+        due = []
+        for review_hash, review_date in self.open_items.items():
+            d = _parse_date(review_date)
+            if d is None or (today - d).days >= OPEN_RECHECK_DAYS:
+                due.append(review_hash)
+        return due
+
+    def _full_rescan_due(self):
+        last = _parse_datetime(self.previous.get("full_scan_at"))
+        return last is None or (datetime.now() - last).total_seconds() >= FULL_RESCAN_HOURS * 3600
+
+    def can_stop_early(self):
+        """
+        기준점에서 멈춰도 되는지
+        (기준점이 있고, 재처리 시점이 지난 사장님 확인필요 항목이 없고, 주기적 전체 확인 시점이 아님)
+        """
+        return bool(self.frontier) and not self.due_open and not self.full_rescan_due
+
+    def reached_frontier(self, review_hash):
+        """이 카드가 기준점이면 True (이후 카드는 지난 실행에서 모두 처리 끝)"""
+        if review_hash in self.frontier and self.can_stop_early():
+            self.stopped_at = review_hash
+            self.complete = True
+            return True
+        return False
+
+    def seen(self, review_hash, review_date="", settled=None):
+        """확인한 카드 기록 (settled: 이미 처리 끝이 확실하면 True, 나중에 상태로 판단하면 None)"""
+        if review_hash in self._seen:
+            return
+        self._seen.add(review_hash)
+        self.order.append((review_hash, review_date or "", settled))
+
+
+class CrawlWatermarks:
+    """가게별 기준점 파일 관리"""
+
+    def __init__(self, file_tag, log=print, watermark_dir=WATERMARK_DIR):
+        self.file_tag = file_tag
+        self.log = log
+        self.watermark_dir = watermark_dir
+        self.stats = {"stores": 0, "stopped_early": 0, "full_scans": 0}
+
+    def _path(self, store_code, platform="", platform_code=""):
+        safe = "_".join("".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in str(part))
+                        for part in (store_code, platform, platform_code))
+        return os.path.join(self.watermark_dir, f"{self.file_tag}_{safe}.json")
+
+    @staticmethod
+    def _label(store_code, platform="", platform_code=""):
+        return "/".join(str(p) for p in (store_code, platform, platform_code) if p)
+
+    def load(self, store_code, platform="", platform_code=""):
+        try:
+            with open(self._path(store_code, platform, platform_code), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.log(f"[crawl_watermark] {self._label(store_code, platform, platform_code)} 기준점 읽기 실패 (전체 확인): {e}")
+            return {}
+
+    def begin(self, store_code, platform="", platform_code=""):
+        crawl = StoreCrawl(store_code, self.load(store_code, platform, platform_code), platform, platform_code)
+        label = self._label(store_code, platform, platform_code)
+        if crawl.frontier and crawl.due_open:
+            self.log(f"[crawl_watermark] {label} 재처리 시점이 지난 사장님 확인필요 {len(crawl.due_open)}건 → 끝까지 확인")
+        elif crawl.frontier and crawl.full_rescan_due:
+            self.log(f"[crawl_watermark] {label} 전체 확인 주기({FULL_RESCAN_HOURS}시간) 경과 → 끝까지 확인")
+        elif crawl.frontier:
+            self.log(f"[crawl_watermark] {label} 기준점 {crawl.previous.get('frontier_date', '')} 이후만 확인")
+        return crawl
+
+    def finish(self, crawl, status_of):
+        """
+        이번 실행 결과로 기준점 갱신 후 저장
+        - status_of(review_hash) -> (상태, 처리끝 여부, review_date)
+        """
+        self.stats["stores"] += 1
+        if crawl.stopped_at:
+            self.stats["stopped_early"] += 1
+        else:
+            self.stats["full_scans"] += 1
+
+        open_items = dict(crawl.open_items)
+        tail = []                  # 마지막 미처리 카드 아래쪽의 연속 처리 끝 카드
+        for review_hash, review_date, settled in crawl.order:
+            status, done, record_date = status_of(review_hash)
+            if settled:
+                done = True
+            review_date = record_date or review_date
+            if status == OPEN_STATUS and done:
+                open_items[review_hash] = review_date
+            else:
+                open_items.pop(review_hash, None)
+            if done:
+                tail.append((review_hash, review_date))
+            else:
+                tail = []
+
+        previous_frontier = crawl.previous.get("frontier") or []
+        full_scan_at = crawl.previous.get("full_scan_at", "")
+        if crawl.complete:
+            frontier = [h for h, _ in tail]
+            frontier_date = next((d for _, d in tail if d), "")
+            if crawl.stopped_at:
+                # 기준점에서 멈췄으면 tail 바로 아래가 기존 기준점이므로 이어 붙임
+                frontier += [h for h in previous_frontier if h not in frontier]
+                frontier_date = frontier_date or crawl.previous.get("frontier_date", "")
+            frontier = frontier[:FRONTIER_SIZE]
+            if not crawl.stopped_at:
+                full_scan_at = datetime.now().isoformat(timespec="seconds")
+                # 끝까지 확인했으면 목록에 없는 사장님 확인필요 항목은 정리
+                seen = {h for h, _, _ in crawl.order}
+                open_items = {h: d for h, d in open_items.items() if h in seen}
+        else:
+            # 중간에 끊긴 실행: 확인하지 못한 아래쪽은 기존 기준점 유지
+            frontier, frontier_date = previous_frontier, crawl.previous.get("frontier_date", "")
+
+        state = {
+            "store_code": crawl.store_code,
+            "platform": crawl.platform,
+            "platform_code": crawl.platform_code,
+            "frontier": frontier,
+            "frontier_date": frontier_date,
+            "open": open_items,
+            "checked": len(crawl.order),
+            "stopped_early": bool(crawl.stopped_at),
+            "full_scan_at": full_scan_at,
+            "saved_at": datetime.now().isoformat(timespec="seconds")
+        }
+        path = self._path(crawl.store_code, crawl.platform, crawl.platform_code)
+        try:
+            os.makedirs(self.watermark_dir, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+        except Exception as e:
+            self.log(f"[crawl_watermark] {self._label(crawl.store_code, crawl.platform, crawl.platform_code)} 기준점 저장 실패: {e}")
+        return state
+
+    def log_stats(self):
+        s = self.stats
+        if s["stores"]:
+            self.log(f"[crawl_watermark] 가게 {s['stores']}개 중 기준점에서 멈춤 {s['stopped_early']}개, 끝까지 확인 {s['full_scans']}개")
@@ -0,0 +1,156 @@
+"""
+error_logs 비동기 저장 (배민/쿠팡/요기요 공용)
+
+save_error_log_to_supabase 가 오류마다 바로 insert 하지 않고 대기열에 넣으면,
+백그라운드 스레드가 ERROR_FLUSH_INTERVAL 초마다 모아서 한 번에 insert 합니다.
+같은 (store_code, error_type, error_message) 오류가 ERROR_DEDUP_WINDOW 초 안에 반복되면
+한 행으로 합치고 반복 횟수(occurrence_count)와 마지막 발생 시각(last_occurred_at)만 갱신합니다.
+대기열은 ERROR_MAX_PENDING 건까지만 보관하며, 넘치는 새 오류는 버리고 건수만 셉니다.
+실행 종료 시(close / atexit) 남은 오류를 모두 저장합니다.
+
+error_logs 에 occurrence_count / last_occurred_at 컬럼이 없으면
+반복 횟수를 error_message 앞에 "[N회 반복]" 으로 붙여 저장합니다.
+
+사용 예:
+    error_sink = ErrorLogSink(supabase, log=print)
+    error_sink.add(data)          # data: error_logs 행 dict
+    error_sink.close()            # 실행 종료 시
+"""
+import atexit
+import threading
+import time
+from datetime import datetime
+
+ERROR_TABLE = "error_logs"
+ERROR_FLUSH_INTERVAL = 10.0    # 저장 주기(초)
+ERROR_DEDUP_WINDOW = 60.0      # 같은 오류를 한 행으로 합치는 시간(초, 첫 발생 기준)
+ERROR_BATCH_SIZE = 100         # insert 1회당 최대 행 수
+ERROR_MAX_PENDING = 1000       # 대기열 최대 건수 (서로 다른 오류 기준)
+ERROR_MAX_RETRY = 2            # insert 실패 시 다음 주기 재시도 횟수
+
+
+class ErrorLogSink:
+    """error_logs 행을 모아 중복을 합친 뒤 배치 insert 하는 백그라운드 저장기"""
+
+    def __init__(self, supabase, log=print, flush_interval=ERROR_FLUSH_INTERVAL,
+                 dedup_window=ERROR_DEDUP_WINDOW, max_pending=ERROR_MAX_PENDING):
+        self.supabase = supabase
+        self.log = log
+        self.flush_interval = flush_interval
+        self.dedup_window = dedup_window
+        self.max_pending = max_pending
+        self._pending = {}         # (store_code, error_type, error_message) -> {"row", "count", "first", "retry"}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._count_columns = True  # occurrence_count / last_occurred_at 컬럼 사용 여부
+        self.stats = {"added": 0, "merged": 0, "dropped": 0, "inserted_rows": 0, "failed_rows": 0}
+        atexit.register(self.close)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="error-log-sink", daemon=True)
+            self._thread.start()
+
+    def add(self, data):
+        """오류 행 추가 (바로 반환) - 새로 대기열에 들어갔으면 True, 합쳐졌거나 버려졌으면 False"""
+        key = (data.get("store_code", ""), data.get("error_type", ""), data.get("error_message", ""))
+        now = time.time()
+        with self._lock:
+            self.stats["added"] += 1
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry["count"] += 1
+                entry["last"] = data.get("occurred_at") or datetime.now().isoformat()
+                self.stats["merged"] += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.stats["dropped"] += 1
+                self._wake.set()
+                return False
+            self._pending[key] = {"row": dict(data), "count": 1, "first": now,
+                                  "last": data.get("occurred_at"), "retry": 0}
+            full = len(self._pending) >= self.max_pending // 2
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.log(f"[error_log_sink] 에러 로그 저장 스레드 오류: {e}")
+
+    def _to_row(self, entry):
+        row = dict(entry["row"])
+        if self._count_columns:
+            row["occurrence_count"] = entry["count"]
+            row["last_occurred_at"] = entry["last"] or row.get("occurred_at")
+        elif entry["count"] > 1:
+            row["error_message"] = f"[{entry['count']}회 반복] {row.get('error_message', '')}"
+        return row
+
+    def _insert(self, entries):
+        rows = [self._to_row(e) for e in entries]
+        try:
+            self.supabase.table(ERROR_TABLE).insert(rows).execute()
+        except Exception as e:
+            if self._count_columns and ("occurrence_count" in str(e) or "last_occurred_at" in str(e)):
+                self.log("[error_log_sink] error_logs 에 반복 횟수 컬럼이 없어 error_message 에 횟수를 붙여 저장합니다.")
+                self._count_columns = False
+                rows = [self._to_row(e) for e in entries]
+                self.supabase.table(ERROR_TABLE).insert(rows).execute()
+            else:
+                raise
+        return len(rows)
+
+    def flush(self, force=False):
+        """합치는 시간이 지난 오류(force 면 전부)를 배치 insert - 저장한 행 수 반환"""
+        with self._flush_lock:
+            now = time.time()
+            with self._lock:
+                over = len(self._pending) >= self.max_pending // 2
+                due_keys = [k for k, e in self._pending.items()
+                            if force or over or now - e["first"] >= self.dedup_window]
+                due = [self._pending.pop(k) for k in due_keys]
+            saved = 0
+            for i in range(0, len(due), ERROR_BATCH_SIZE):
+                batch = due[i:i + ERROR_BATCH_SIZE]
+                try:
+                    saved += self._insert(batch)
+                except Exception as e:
+                    retry = [b for b in batch if b["retry"] < ERROR_MAX_RETRY and not force]
+                    self.stats["failed_rows"] += len(batch) - len(retry)
+                    self.log(f"[error_log_sink] 에러 로그 {len(batch)}건 저장 실패 (재시도 {len(retry)}건): {e}")
+                    with self._lock:
+                        for b in retry:
+                            b["retry"] += 1
+                            key = (b["row"].get("store_code", ""), b["row"].get("error_type", ""),
+                                   b["row"].get("error_message", ""))
+                            cur = self._pending.get(key)
+                            if cur is None:
+                                self._pending[key] = b
+                            else:
+                                cur["count"] += b["count"]
+            if saved:
+                merged = sum(e["count"] for e in due) - len(due)
+                self.stats["inserted_rows"] += saved
+                self.log(f"[error_log_sink] 에러 로그 {saved}건 저장 (중복 {merged}건 합침)")
+            return saved
+
+    def close(self):
+        """남은 오류를 모두 저장하고 통계 출력 (여러 번 호출해도 안전)"""
+        try:
+            self.flush(force=True)
+        except Exception as e:
+            self.log(f"[error_log_sink] 종료 시 에러 로그 저장 실패: {e}")
+        s = self.stats
+        if s["added"]:
+            self.log(f"[error_log_sink] 오류 {s['added']}건 → {s['inserted_rows']}행 저장, "
+                     f"중복 합침 {s['merged']}건, 대기열 초과로 버림 {s['dropped']}건, 저장 실패 {s['failed_rows']}건")
+            self.stats = {k: 0 for k in s}
@@ -0,0 +1,128 @@
+"""
+학습 금지어 (쿠팡)
+
+답글 등록 시 금지어 팝업에서 추출한 단어를 플랫폼/매장별로 저장해 두고
+다음 답변부터 프롬프트와 등록 전 검사에 반영합니다 (팝업 → 재생성 → 재등록 왕복 방지).
+- 팝업에서 감지된 단어는 한 글자라도 그대로 학습 (매장 설정 금지어의 두 글자 기준은 적용하지 않음)
+- 같은 플랫폼의 LEARNED_BAN_SHARE_MIN_STORES 개 이상 매장에서 걸린 단어는 모든 매장에 적용
+- 저장 시 다른 워커 프로세스가 저장한 내용과 합침
+
+사용 예:
+    learned_bans = LearnedBans("learned_bans_coupang.json", log=print)
+    learned_bans.load()
+    store_info["learned_bans"] = learned_bans.get(platform_name, store_code)
+    ai_reply = learned_bans.avoid(ai_reply, review_text, store_info, generate_prohibited_free_reply)
+    learned_bans.record(platform_name, store_code, popup_word)
+"""
+import json
+import os
+import threading
+
+from prohibited_matcher import get_prohibited_matcher
+
+LEARNED_BAN_SHARE_MIN_STORES = 2    # 같은 플랫폼의 이 수 이상 매장에서 걸린 단어는 모든 매장에 적용
+LEARNED_BAN_MAX_LEN = 20
+
+
+class LearnedBans:
+    """팝업에서 학습한 금지어 저장소 (platform -> {store_code: {단어: 감지 횟수}})"""
+
+    def __init__(self, path, log=print, share_min_stores=LEARNED_BAN_SHARE_MIN_STORES,
+                 max_len=LEARNED_BAN_MAX_LEN):
+        self.path = path
+        self.log = log
+        self.share_min_stores = share_min_stores
+        self.max_len = max_len
+        self.words = {}
+        self.stats = {"popups": 0, "learned": 0, "checked": 0, "avoided": 0}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """저장된 학습 금지어 로드"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.words = json.load(f)
+        except Exception as e:
+            self.log(f"[learned_bans] 학습 금지어 로드 실패: {str(e)}")
+            self.words = {}
+
+    def save(self):
+        """학습 금지어 저장 (다른 워커 프로세스가 저장한 내용과 합침)"""
+        try:
+            with self._lock:
+                merged = {}
+                if os.path.exists(self.path):
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        merged = json.load(f)
+                for platform_name, stores in self.words.items():
+                    for store_code, words in stores.items():
+                        saved = merged.setdefault(platform_name, {}).setdefault(store_code, {})
+                        for word, count in words.items():
+                            saved[word] = max(saved.get(word, 0), count)
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            self.log(f"[learned_bans] 학습 금지어 저장 실패: {str(e)}")
+
+    def record(self, platform_name, store_code, word):
+        """팝업에서 감지된 금지어 기록 (한 글자 단어 포함, max_len 초과는 문장 조각으로 보고 제외)"""
+        self.stats["popups"] += 1
+        word = (word or "").strip()
+        if not word or len(word) > self.max_len:
+            return
+        with self._lock:
+            words = self.words.setdefault(platform_name, {}).setdefault(store_code, {})
+            if word not in words:
+                self.stats["learned"] += 1
+                self.log(f"[learned_bans] 새 금지어 학습: '{word}' ({platform_name}/{store_code})")
+            words[word] = words.get(word, 0) + 1
+        self.save()
+
+    def get(self, platform_name, store_code):
+        """매장에 적용할 학습 금지어 (해당 매장 + 여러 매장에서 공통으로 걸린 단어)"""
+        stores = self.words.get(platform_name, {})
+        result = list(stores.get(store_code, {}))
+        store_counts = {}
+        for words in stores.values():
+            for word in words:
+                store_counts[word] = store_counts.get(word, 0) + 1
+        for word, n in store_counts.items():
+            if n >= self.share_min_stores and word not in result:
+                result.append(word)
+        return result
+
+    def avoid(self, ai_reply, review_text, store_info, regenerate):
+        """
+        등록 전에 학습 금지어(store_info["learned_bans"]) 포함 여부 확인
+        - 포함되면 regenerate(review_text, retry_info) 로 금지어 회피 답변을 미리 생성해 교체 (팝업 왕복 1회 절약)
+        - 교체 답변 생성 실패 시 원래 답변 그대로 반환
+        """
+        learned = store_info.get("learned_bans") or []
+        if not learned or not ai_reply:
+            return ai_reply
+        self.stats["checked"] += 1
+        matcher = get_prohibited_matcher((), extra_words=learned)
+        hits = matcher.find_all(ai_reply)
+        if not hits:
+            return ai_reply
+
+        hit_words = list(dict.fromkeys(h[2] for h in hits))
+        self.log(f"[avoid_learned_bans] 등록 전 학습 금지어 발견: {', '.join(hit_words)} => 답변 교체")
+        retry_info = dict(store_info)
+        retry_info["author"] = "고객님"
+        retry_info["detected_prohibited_word"] = hit_words[0]
+        new_reply = regenerate(review_text, retry_info)
+        if not new_reply:
+            return ai_reply
+        if not matcher.find_all(new_reply):
+            self.stats["avoided"] += 1
+        return new_reply
+
+    def print_stats(self):
+        """금지어 팝업/사전 회피 통계 출력 후 학습 금지어 저장"""
+        s = self.stats
+        if s["checked"] or s["popups"]:
+            self.log(f"\n[금지어 통계] 팝업 {s['popups']}회, 새로 학습 {s['learned']}개, "
+                     f"등록 전 검사 {s['checked']}회, 팝업 왕복 회피 {s['avoided']}회")
+        self.save()
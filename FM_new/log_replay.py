@@ -0,0 +1,361 @@
+"""
+기존 실행 로그 재분석 (요기요 yogiyo_automation.log / 쿠팡 쿠팡_로그/coupang_log_*.txt)
+
+로그를 한 줄씩 읽어(파일 크기와 무관하게 일정한 메모리) 매장별/단계별 소요시간과
+리뷰당 호출 수를 다시 계산하고, 가장 오래 걸린 대기와 중복 호출 순위를 출력합니다.
+
+- 요기요 로그 (시각 있음): 각 줄의 직전 줄과의 시간차를 그 줄의 소요시간으로 보고
+  "[팝업] ... 발견되지 않음" 같은 고정 대기, "[리뷰] i/n" 사이 리뷰당 처리시간,
+  리뷰당 HTTP 요청 수(엔드포인트별), 같은 리뷰 안에서 반복된 동일 요청을 집계
+- 쿠팡 로그 (시각 없음): 시작/종료 시각으로 전체 시간만 계산하고,
+  리뷰("[handle_review_card] =>")당 함수 호출 수와 같은 리뷰 안 반복 호출을 집계
+
+사용 예:
+    python log_replay.py yogiyo_automation.log 쿠팡_로그
+    python log_replay.py yogiyo_automation.log --top 20 --json replay_report.json
+"""
+import argparse
+import glob
+import heapq
+import json
+import os
+import re
+from datetime import datetime
+from urllib.parse import urlsplit
+
+TOP_N = 30                # 순위 출력 개수
+MAX_KEYS = 3000           # 집계 키 최대 수 (초과분은 태그 단위 '(기타)'로 합산)
+MAX_GAP_SEC = 600         # 이보다 긴 공백은 실행 사이 휴지로 보고 집계 제외
+MAX_WINDOW_KEYS = 500     # 리뷰 하나에서 추적할 호출 키 최대 수
+
+YOGIYO_LINE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),(\d{3}) - (\w+) - (.*)$')
+COUPANG_STAMP = re.compile(r'^=== .*(시작|종료): (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) ===')
+TAG = re.compile(r'^\[([^\]]+)\]')
+HTTP = re.compile(r'^HTTP Request: (\w+) (\S+)')
+STORE_START_YOGIYO = re.compile(r'\[매장 처리 시작\].*store_code=(\w+)')
+STORE_START_COUPANG = re.compile(r'^\[run_automation\] 매장처리 시작 store_code=(\w+)')
+REVIEW_MARK_YOGIYO = re.compile(r'^\[리뷰\] (\d+)/(\d+)')
+REVIEW_MARK_COUPANG = re.compile(r'^\[handle_review_card\] =>')
+# 새 실행 시작 줄 (GUI에서 다시 실행하기 전까지의 대기는 집계 제외)
+RUN_START_YOGIYO = re.compile(r'platform_reply_rules\?select=%2A&platform=eq\.|^\[fetch_yogiyo_data\]')
+
+
+def normalize_message(msg):
+    """집계용 키: 값(=뒤, 숫자, 해시, 괄호 안) 제거 후 앞부분만"""
+    m = HTTP.match(msg)
+    if m:
+        return f"HTTP {m.group(1)} {endpoint(m.group(2))}"
+    msg = re.sub(r'=[^\s,)]*', '=*', msg)
+    msg = re.sub(r'[0-9a-f]{8,}', '*', msg)
+    msg = re.sub(r'\d+', '#', msg)
+    msg = re.sub(r'\([^)]*\)', '(*)', msg)
+    return msg[:60].rstrip()
+
+
+def endpoint(url):
+    parts = urlsplit(url)
+    path = re.sub(r'\d+', '#', parts.path)
+    return f"{parts.netloc}{path}"
+
+
+def redundant_label(key):
+    """리뷰 안 반복 호출 키(URL/해시 포함)를 순위용 이름으로 변환"""
+    if key.startswith("HTTP "):
+        method, url = key[5:].split(" ", 1)
+        return f"HTTP {method} {endpoint(url)} (같은 URL 반복)"
+    tag = TAG.match(key)
+    if tag and tag.group(1) == "generate_review_hash":
+        return "[generate_review_hash] 같은 리뷰 해시 재계산"
+    return key
+
+
+class StageStats:
+    """키별 횟수/합계/최대 (상수 메모리)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def add(self, key, value=0.0):
+        s = self.data.get(key)
+        if s is None:
+            if len(self.data) >= MAX_KEYS:
+                tag = TAG.match(key)
+                key = f"[{tag.group(1)}] (기타)" if tag else "(기타)"
+                s = self.data.get(key)
+            if s is None:
+                s = self.data[key] = [0, 0.0, 0.0]
+        s[0] += 1
+        s[1] += value
+        s[2] = max(s[2], value)
+
+    def ranked(self, n=TOP_N, by=1):
+        return sorted(self.data.items(), key=lambda x: -x[1][by])[:n]
+
+
+class ReplayReport:
+    def __init__(self, top_n=TOP_N):
+        self.top_n = top_n
+        self.phases = StageStats()          # 줄 키별 소요시간 (요기요)
+        self.calls = StageStats()           # 줄 키별 호출 수 (쿠팡 포함)
+        self.stores = {}                    # store_code -> {"time", "reviews", "http", "lines"}
+        self.review_durations = StageStats()  # 매장별 리뷰 처리시간
+        self.http_per_review = StageStats()   # 엔드포인트별 리뷰당 요청 수
+        self.redundant = StageStats()         # 같은 리뷰 안에서 반복된 호출
+        self.top_waits = []                   # (초, 시각, 매장, 메시지) 최소 힙
+        self.files = []
+        self.reviews = 0
+        self.wall = 0.0
+
+    # ----- 공통 -----
+    def _store(self, code):
+        s = self.stores.get(code)
+        if s is None:
+            s = self.stores[code] = {"time": 0.0, "reviews": 0, "http": 0, "lines": 0}
+        return s
+
+    def _push_wait(self, gap, ts, store, msg):
+        item = (gap, ts, store, msg[:100])
+        if len(self.top_waits) < self.top_n:
+            heapq.heappush(self.top_waits, item)
+        elif gap > self.top_waits[0][0]:
+            heapq.heapreplace(self.top_waits, item)
+
+    def _close_window(self, window):
+        if window is None:
+            return
+        for key, count in window["calls"].items():
+            if count > 1:
+                self.redundant.add(redundant_label(key), count - 1)
+        for ep, count in window["http"].items():
+            self.http_per_review.add(ep, count)
+
+    @staticmethod
+    def _count(window, bucket, key):
+        if window is None:
+            return
+        d = window[bucket]
+        if key in d or len(d) < MAX_WINDOW_KEYS:
+            d[key] = d.get(key, 0) + 1
+
+    # ----- 요기요 -----
+    def replay_yogiyo(self, path):
+        prev_ts = None
+        store = "-"
+        window = None
+        window_start = None
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for raw in f:
+                line = raw.rstrip("\n")
+                m = YOGIYO_LINE.match(line)
+                if not m:
+                    # 시각 없는 이어지는 줄 (매장 시작 배너 등)
+                    sm = STORE_START_YOGIYO.search(line)
+                    if sm:
+                        self._close_window(window)
+                        window = None
+                        store = sm.group(1)
+                    continue
+                ts = datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S").timestamp() + int(m.group(2)) / 1000
+                msg = m.group(4).strip()
+                gap = 0.0
+                if RUN_START_YOGIYO.search(msg):
+                    if store != "-":
+                        self._close_window(window)
+                        window = None
+                    store = "-"
+                elif prev_ts is not None:
+                    gap = ts - prev_ts
+                    if gap < 0 or gap > MAX_GAP_SEC:
+                        gap = 0.0
+                prev_ts = ts
+                self.wall += gap
+                if not msg:
+                    continue
+
+                key = normalize_message(msg)
+                self.phases.add(key, gap)
+                self.calls.add(key)
+                st = self._store(store)
+                st["time"] += gap
+                st["lines"] += 1
+                if gap > 0:
+                    self._push_wait(round(gap, 3), m.group(1), store, msg)
+
+                rm = REVIEW_MARK_YOGIYO.match(msg)
+                if rm:
+                    if window is not None and window_start is not None:
+                        self.review_durations.add(store, ts - window_start)
+                    self._close_window(window)
+                    window = {"calls": {}, "http": {}}
+                    window_start = ts
+                    self.reviews += 1
+                    st["reviews"] += 1
+                    continue
+                if msg.startswith("[로그아웃]") or msg.startswith("[크롤링완료]"):
+                    if window is not None and window_start is not None:
+                        self.review_durations.add(store, ts - window_start)
+                    self._close_window(window)
+                    window = None
+                    window_start = None
+
+                hm = HTTP.match(msg)
+                if hm:
+                    st["http"] += 1
+                    self._count(window, "http", f"{hm.group(1)} {endpoint(hm.group(2))}")
+                    # 같은 URL(쿼리 포함) 반복 = 중복 요청
+                    self._count(window, "calls", f"HTTP {hm.group(1)} {hm.group(2)[:160]}")
+                elif msg.startswith("[generate_review_hash]"):
+                    self._count(window, "calls", msg)
+        self._close_window(window)
+
+    # ----- 쿠팡 -----
+    def replay_coupang(self, path):
+        started = None
+        store = "-"
+        window = None
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for raw in f:
+                line = raw.strip()
+                if not line:
+                    continue
+                sm = COUPANG_STAMP.match(line)
+                if sm:
+                    ts = datetime.strptime(sm.group(2), "%Y-%m-%d %H:%M:%S").timestamp()
+                    if sm.group(1) == "시작":
+                        started = ts
+                    elif started is not None:
+                        self.wall += ts - started
+                        started = None
+                    continue
+                tm = TAG.match(line)
+                if not tm:
+                    continue
+                st_m = STORE_START_COUPANG.match(line)
+                if st_m:
+                    self._close_window(window)
+                    window = None
+                    store = st_m.group(1)
+                st = self._store(store)
+                st["lines"] += 1
+                tag = tm.group(1)
+                self.calls.add(f"[{tag}]")
+
+                if REVIEW_MARK_COUPANG.match(line):
+                    self._close_window(window)
+                    window = {"calls": {}, "http": {}}
+                    self.reviews += 1
+                    st["reviews"] += 1
+                    continue
+                # 리뷰 안에서 같은 함수가 여러 번 호출된 횟수 (재시도/재생성)
+                if tag in ("generate_ai_reply", "답변 품질 평가", "분석 시작", "click_and_submit_comment",
+                           "generate_prohibited_free_reply", "generate_review_hash"):
+                    if tag == "click_and_submit_comment" and "시도" not in line:
+                        continue
+                    if tag == "generate_ai_reply" and "리뷰 텍스트" not in line:
+                        continue
+                    self._count(window, "calls", f"[{tag}]")
+                if tag == "get_review_identifier":
+                    hm = re.search(r'식별자 생성: ([0-9a-f]+)', line)
+                    if hm:
+                        self._count_store_id(store, hm.group(1))
+        # 종료 기록 없는 실행(비정상 종료)은 전체 시간에서 제외
+        self._close_window(window)
+
+    def _count_store_id(self, store, review_id):
+        """같은 매장에서 같은 리뷰 식별자를 다시 만든 횟수 (재검사로 인한 중복 작업)"""
+        seen = self.stores[store].setdefault("_ids", set())
+        if review_id in seen:
+            self.redundant.add("[get_review_identifier] 같은 리뷰 재식별", 1)
+        elif len(seen) < MAX_WINDOW_KEYS * 10:
+            seen.add(review_id)
+
+    def replay(self, path):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            head = ""
+            for _ in range(5):
+                head += f.readline()
+        self.files.append(path)
+        if any(YOGIYO_LINE.match(line) for line in head.splitlines()):
+            self.replay_yogiyo(path)
+        else:
+            self.replay_coupang(path)
+
+    # ----- 결과 -----
+    def to_dict(self):
+        def rows(stats, n=None):
+            return [{"key": k, "count": v[0], "total": round(v[1], 3), "max": round(v[2], 3),
+                     "avg": round(v[1] / v[0], 3) if v[0] else 0.0}
+                    for k, v in stats.ranked(n or self.top_n)]
+        stores = {code: {k: (round(v, 3) if isinstance(v, float) else v) for k, v in s.items() if not k.startswith("_")}
+                  for code, s in self.stores.items()}
+        return {
+            "files": self.files,
+            "wall_sec": round(self.wall, 1),
+            "reviews": self.reviews,
+            "top_waits": [{"sec": g, "ts": ts, "store": st, "line": msg}
+                          for g, ts, st, msg in sorted(self.top_waits, reverse=True)],
+            "phases_by_total": rows(self.phases),
+            "review_duration_by_store": rows(self.review_durations),
+            "http_per_review": rows(self.http_per_review),
+            "redundant_calls": [{"key": k, "extra_calls": int(v[1])} for k, v in self.redundant.ranked(self.top_n)],
+            "calls": rows(self.calls),
+            "stores": stores,
+        }
+
+    def print_report(self):
+        d = self.to_dict()
+        print(f"[log_replay] 파일 {len(self.files)}개, 리뷰 {self.reviews}건, 기록된 실행 시간 {d['wall_sec']:.0f}초")
+        if d["top_waits"]:
+            print(f"\n[가장 긴 대기 TOP {len(d['top_waits'])}] (직전 줄과의 시간차)")
+            for w in d["top_waits"]:
+                print(f"  {w['sec']:>7.2f}s  {w['ts']}  {w['store']:<12} {w['line']}")
+        if self.phases.data:
+            print(f"\n[단계별 누적 시간 TOP {self.top_n}]")
+            print(f"  {'합계(s)':>9} {'횟수':>6} {'평균':>7} {'최대':>7}  단계")
+            for r in d["phases_by_total"]:
+                print(f"  {r['total']:>9.1f} {r['count']:>6} {r['avg']:>7.2f} {r['max']:>7.2f}  {r['key']}")
+        if d["review_duration_by_store"]:
+            print("\n[매장별 리뷰당 처리시간 (리뷰 표시 사이 간격)]")
+            for r in d["review_duration_by_store"]:
+                print(f"  {r['key']:<12} 리뷰 {r['count']:>4}건  평균 {r['avg']:>6.2f}s  최대 {r['max']:>6.2f}s")
+        if d["http_per_review"]:
+            print("\n[리뷰당 HTTP 요청 수 (엔드포인트별)]")
+            for r in d["http_per_review"]:
+                print(f"  평균 {r['avg']:>5.2f}회  최대 {r['max']:>4.0f}회  {r['key']}")
+        if d["redundant_calls"]:
+            print(f"\n[중복 호출 TOP {len(d['redundant_calls'])}] (같은 리뷰 안에서 반복된 호출/요청)")
+            for r in d["redundant_calls"]:
+                print(f"  {r['extra_calls']:>6}회 추가  {r['key'][:120]}")
+        if not self.phases.data and d["calls"]:
+            print(f"\n[호출 횟수 TOP {self.top_n}] (시각 없는 로그)")
+            for r in d["calls"]:
+                print(f"  {r['count']:>7}  {r['key']}")
+
+
+def iter_log_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "*.log")) + glob.glob(os.path.join(path, "*.txt")))
+        else:
+            yield from sorted(glob.glob(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="요기요/쿠팡 실행 로그 재분석 (대기/중복 호출 순위)")
+    parser.add_argument("paths", nargs="+", help="로그 파일 또는 폴더")
+    parser.add_argument("--top", type=int, default=TOP_N, help="순위 출력 개수")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    report = ReplayReport(args.top)
+    for path in iter_log_files(args.paths):
+        report.replay(path)
+    report.print_report()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"\n[log_replay] 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
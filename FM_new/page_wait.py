@@ -0,0 +1,192 @@
+"""
+적응형 페이지 대기 (배민/쿠팡 공용, 고정 sleep 대체)
+
+조건이 충족될 때까지 짧게 폴링하며 기다리고, 호출 위치(site)별 대기시간을 기록합니다.
+- 과거 실행에서 학습한 p95 의 1.5배까지 먼저 기다리고, 그래도 안 되면 timeout 까지만 연장 (fallback)
+- 조건이 실제로 충족된 대기만 학습 표본으로 사용
+- 표본은 wait_stats_<플랫폼>.json 에 저장 (병렬 실행 워커마다 저장하므로 파일 기록에 새 표본만 더해 저장)
+
+사용 예:
+    page_waiter = PageWaiter("baemin", log=print)
+    page_waiter.load_history()
+    page_waiter.wait_for(driver, "login.page_load", element_present(By.NAME, "id"), timeout=3)
+    page_waiter.print_stats()          # 실행 종료 시 (학습 기록 저장 포함)
+"""
+import json
+import os
+import time
+
+from run_profile import percentile
+
+WAIT_POLL_SEC = 0.1                 # 조건 확인 주기
+WAIT_IDLE_STABLE_POLLS = 3          # 네트워크 idle 판정에 필요한 연속 안정 횟수
+WAIT_HISTORY_SIZE = 50
+WAIT_MIN_SAMPLES = 5                # 학습값을 쓰기 위한 최소 표본 수
+
+# 진행 중인 fetch/XHR 수를 세는 훅 (문서마다 한 번만 설치)
+_IDLE_PROBE_JS = """
+if (!window.__waitHook) {
+    window.__waitHook = true;
+    window.__pendingRequests = 0;
+    try { performance.setResourceTimingBufferSize(10000); } catch (e) {}
+    var origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function() {
+            window.__pendingRequests++;
+            return origFetch.apply(this, arguments).finally(function() { window.__pendingRequests--; });
+        };
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__pendingRequests++;
+        this.addEventListener('loadend', function() { window.__pendingRequests--; });
+        return origSend.apply(this, arguments);
+    };
+}
+return [document.readyState, window.__pendingRequests, performance.getEntriesByType('resource').length];
+"""
+
+
+def page_idle():
+    """문서 로드 완료 + 진행 중 요청 0 + 리소스 수 변화 없음이 연속으로 유지되면 True인 조건"""
+    state = {"last_count": None, "stable": 0}
+
+    def _condition(driver):
+        ready, pending, count = driver.execute_script(_IDLE_PROBE_JS)
+        if ready == "complete" and not pending and count == state["last_count"]:
+            state["stable"] += 1
+        else:
+            state["stable"] = 0
+        state["last_count"] = count
+        return state["stable"] >= WAIT_IDLE_STABLE_POLLS
+    return _condition
+
+
+def element_present(by, selector):
+    """요소가 하나라도 있으면 True인 조건"""
+    return lambda d: len(d.find_elements(by, selector)) > 0
+
+
+def element_in_view(element):
+    """요소가 뷰포트 안에 들어오면 True인 조건 (smooth 스크롤 완료 확인용)"""
+    return lambda d: d.execute_script(
+        "var r = arguments[0].getBoundingClientRect();"
+        " return r.top >= 0 && r.bottom <= (window.innerHeight || document.documentElement.clientHeight);",
+        element
+    )
+
+
+class PageWaiter:
+    """플랫폼 하나의 호출 위치별 대기 기록/학습값을 가진 대기기"""
+
+    def __init__(self, platform, log=print, history_file=None):
+        self.log = log
+        self.history_file = history_file or f"wait_stats_{platform}.json"
+        self.history = {}       # site -> 최근 대기시간 목록 (초)
+        self.stats = {}         # site -> 이번 실행 통계
+        self.new_samples = {}   # site -> 이 프로세스에서 새로 쌓은 대기시간 (저장 시 파일 기록과 합침)
+
+    def load_history(self):
+        """이전 실행의 호출 위치별 대기시간 로드"""
+        try:
+            if os.path.exists(self.history_file):
+                with open(self.history_file, "r", encoding="utf-8") as f:
+                    self.history = json.load(f)
+        except Exception as e:
+            self.log(f"[wait_for] 대기 기록 로드 실패: {str(e)}")
+            self.history = {}
+
+    def save_history(self):
+        """
+        호출 위치별 최근 대기시간 저장
+        - 병렬 실행 시 워커마다 저장하므로, 파일의 기존 기록에 이 프로세스의 새 표본만 더해 저장
+        """
+        try:
+            merged = {}
+            if os.path.exists(self.history_file):
+                with open(self.history_file, "r", encoding="utf-8") as f:
+                    merged = json.load(f)
+            for site, samples in self.new_samples.items():
+                history = merged.setdefault(site, [])
+                history.extend(samples)
+                del history[:-WAIT_HISTORY_SIZE]
+            tmp_path = f"{self.history_file}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(merged, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.history_file)
+            self.new_samples.clear()
+        except Exception as e:
+            self.log(f"[wait_for] 대기 기록 저장 실패: {str(e)}")
+
+    def learned_deadline(self, site, timeout):
+        """과거 p95의 1.5배 (최소 0.5초, 최대 timeout) - 표본이 부족하면 timeout"""
+        samples = self.history.get(site, [])
+        if len(samples) < WAIT_MIN_SAMPLES:
+            return timeout
+        return min(timeout, max(0.5, percentile(samples, 95) * 1.5))
+
+    def wait_for(self, driver, site, condition=None, timeout=5.0):
+        """
+        고정 sleep 대신 조건이 충족될 때까지 짧게 폴링하며 대기
+        - condition: driver를 받아 참/거짓을 반환하는 함수 (None이면 page_idle)
+        - 과거 실행에서 학습한 p95 기반 기한까지 먼저 기다리고,
+          그래도 안 되면 timeout까지만 연장 (fallback)
+        - 호출 위치(site)별로 대기시간을 기록
+        Returns:
+            조건 충족 여부 (시간 초과 시 False)
+        """
+        if condition is None:
+            condition = page_idle()
+
+        deadline = self.learned_deadline(site, timeout)
+        start = time.time()
+        met = False
+        fallback = False
+        while True:
+            try:
+                if condition(driver):
+                    met = True
+                    break
+            except Exception:
+                pass  # 요소가 아직 없거나 stale인 경우 등은 계속 대기
+
+            elapsed = time.time() - start
+            if elapsed >= deadline:
+                if deadline >= timeout:
+                    break
+                fallback = True
+                deadline = timeout
+            time.sleep(WAIT_POLL_SEC)
+
+        elapsed = time.time() - start
+        stat = self.stats.setdefault(site, {"calls": 0, "total": 0.0, "max": 0.0, "fallbacks": 0, "timeouts": 0,
+                                            "samples": []})
+        stat["calls"] += 1
+        stat["total"] += elapsed
+        stat["max"] = max(stat["max"], elapsed)
+        stat["samples"].append(elapsed)
+        if fallback:
+            stat["fallbacks"] += 1
+        if not met:
+            stat["timeouts"] += 1
+        else:
+            # 조건이 실제로 충족된 경우만 학습 표본으로 사용
+            history = self.history.setdefault(site, [])
+            history.append(round(elapsed, 3))
+            del history[:-WAIT_HISTORY_SIZE]
+            self.new_samples.setdefault(site, []).append(round(elapsed, 3))
+        return met
+
+    def print_stats(self):
+        """호출 위치별 대기시간 통계 출력 후 학습 기록 저장"""
+        if not self.stats:
+            return
+        self.log("\n[대기 통계] 호출 위치별 대기시간")
+        self.log(f"{'위치':<32} {'횟수':>5} {'합계(초)':>9} {'평균':>6} {'p95':>6} {'최대':>6} {'연장':>4} {'초과':>4}")
+        for site, s in sorted(self.stats.items(), key=lambda x: -x[1]["total"]):
+            avg = s["total"] / s["calls"] if s["calls"] else 0
+            self.log(f"{site:<32} {s['calls']:>5} {s['total']:>9.1f} {avg:>6.2f} {percentile(s['samples'], 95):>6.2f} "
+                     f"{s['max']:>6.2f} {s['fallbacks']:>4} {s['timeouts']:>4}")
+        total = sum(s["total"] for s in self.stats.values())
+        self.log(f"[대기 통계] 전체 대기시간 {total:.1f}초")
+        self.save_history()
@@ -0,0 +1,182 @@
+"""
+금지어 매칭 (요기요 답변 검증 / 쿠팡 금지어 회피 답변 공용)
+
+매장 금지어(prohibit_words)와 (요청 시) 배달전문점 위치 관련 단어를 하나의 Aho–Corasick 오토마톤으로 만들어
+텍스트를 한 번만 훑어 모든 금지어와 위치(시작, 끝)를 찾습니다.
+찾은 위치로 바로 마스킹/치환하므로 단어마다 다시 검색하지 않습니다.
+오토마톤은 매장 설정(금지어 + 위치 단어 포함 여부) 해시별로 캐시합니다.
+위치 관련 단어는 location_words=True 로 요청한 경우에만 넣습니다 (요기요 답변 검증 전용).
+
+사용 예:
+    matcher = get_prohibited_matcher(shop_info.get("prohibited_words"))
+    hits = matcher.find_all(ai_reply)          # [(시작, 끝, 단어, 구분), ...]
+    masked = matcher.mask(review_text)          # 금지어 → ****
+"""
+import ast
+import hashlib
+import json
+import threading
+from collections import deque
+
+# 배달전문점(delivery_only) 답변에 쓰면 안 되는 위치 관련 단어
+DELIVERY_ONLY_LOCATION_WORDS = ['방문', '홀', '매장 식사', '매장에서']
+
+KIND_PROHIBITED = "prohibited"   # 매장 금지어
+KIND_LOCATION = "location"       # 배달전문점 위치 관련 단어
+
+MATCHER_CACHE_SIZE = 256
+
+
+def parse_prohibited_words(value, min_length=2) -> list:
+    """
+    금지어 설정값을 리스트로 변환
+    - 리스트 그대로 / "['a', 'b']" 또는 '["a", "b"]' 문자열 / "a, b" 쉼표 구분 문자열 모두 허용
+    - 앞뒤 공백 제거, min_length 미만 단어와 중복 제외
+      (매장 설정은 기존 검증 규칙대로 한 글자 제외, 팝업에서 감지된 단어는 min_length=1 로 모두 유지)
+    """
+    if not value:
+        return []
+    words = value
+    if isinstance(value, str):
+        text = value.strip()
+        words = None
+        if text.startswith("["):
+            for loader in (json.loads, ast.literal_eval):
+                try:
+                    words = loader(text)
+                    break
+                except (ValueError, SyntaxError):
+                    continue
+        if not isinstance(words, (list, tuple)):
+            words = text.split(",")
+    result = []
+    for word in words:
+        word = str(word).strip().strip("'\"").strip()
+        if len(word) >= min_length and word not in result:
+            result.append(word)
+    return result
+
+
+class ProhibitedMatcher:
+    """여러 금지어를 한 번의 선형 탐색으로 찾는 Aho–Corasick 오토마톤"""
+
+    def __init__(self, words=(), location_words=()):
+        self._goto = [{}]       # 상태별 전이 {문자: 다음 상태}
+        self._fail = [0]
+        self._out = [[]]        # 상태별 출력 [(단어, 구분), ...]
+        self.words = []
+        for word in location_words:
+            self._add(word, KIND_LOCATION)
+        for word in words:
+            self._add(word, KIND_PROHIBITED)
+        self._build()
+
+    def __bool__(self):
+        return bool(self.words)
+
+    def _add(self, word, kind):
+        if not word or word in self.words:
+            return
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((word, kind))
+        self.words.append(word)
+
+    def _build(self):
+        """실패 링크 계산 (BFS)"""
+        q = deque(self._goto[0].values())
+        while q:
+            state = q.popleft()
+            for ch, nxt in self._goto[state].items():
+                q.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text) -> list:
+        """텍스트의 모든 금지어 위치 [(시작, 끝, 단어, 구분), ...] (시작 위치 순)"""
+        hits = []
+        if not text or not self.words:
+            return hits
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for word, kind in out[state]:
+                hits.append((i - len(word) + 1, i + 1, word, kind))
+        hits.sort(key=lambda h: (h[0], -h[1]))
+        return hits
+
+    def first(self, text):
+        """처음 나오는 금지어 (시작, 끝, 단어, 구분), 없으면 None"""
+        hits = self.find_all(text)
+        return hits[0] if hits else None
+
+    def replace(self, text, replacement="****", hits=None) -> str:
+        """금지어 구간을 replacement 로 치환 (겹치는 구간은 합쳐서 한 번만 치환)"""
+        if hits is None:
+            hits = self.find_all(text)
+        if not hits:
+            return text
+        parts = []
+        pos = 0
+        span_start, span_end = hits[0][0], hits[0][1]
+        for start, end, _, _ in hits[1:]:
+            if start < span_end:
+                span_end = max(span_end, end)
+                continue
+            parts.append(text[pos:span_start])
+            parts.append(replacement)
+            pos = span_end
+            span_start, span_end = start, end
+        parts.append(text[pos:span_start])
+        parts.append(replacement)
+        parts.append(text[span_end:])
+        return "".join(parts)
+
+    mask = replace
+
+
+_matcher_cache = {}
+_matcher_lock = threading.Lock()
+
+
+def matcher_config_hash(words, location_words=False) -> str:
+    key = json.dumps([sorted(words), bool(location_words)], ensure_ascii=False)
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+def get_prohibited_matcher(prohibited_words, extra_words=(), location_words=False) -> ProhibitedMatcher:
+    """
+    매장 설정으로 만든 금지어 오토마톤 (설정 해시별 캐시)
+    - prohibited_words: 매장 금지어 (리스트 또는 문자열, 한 글자 단어 제외)
+    - extra_words: 팝업에서 감지된 금지어 등 추가 단어 (한 글자도 유지)
+    - location_words: True 면 배달전문점 위치 관련 단어 포함 (요기요 배달전문점 답변 검증에서만 사용)
+    """
+    words = parse_prohibited_words(prohibited_words)
+    for word in parse_prohibited_words(list(extra_words), min_length=1):
+        if word not in words:
+            words.append(word)
+    config_hash = matcher_config_hash(words, location_words)
+    with _matcher_lock:
+        matcher = _matcher_cache.get(config_hash)
+        if matcher is None:
+            location = DELIVERY_ONLY_LOCATION_WORDS if location_words else ()
+            matcher = ProhibitedMatcher(words, location)
+            if len(_matcher_cache) >= MATCHER_CACHE_SIZE:
+                _matcher_cache.pop(next(iter(_matcher_cache)))
+            _matcher_cache[config_hash] = matcher
+    return matcher
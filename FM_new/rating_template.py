@@ -0,0 +1,137 @@
+"""
+별점만 있는 리뷰 템플릿 답변 (요기요)
+
+내용 없는 리뷰는 GPT 호출 없이 매장 설정(greeting_start/greeting_end/role/tone)과
+별점 구간별 문구를 조합해 답변을 만듭니다 (platform_reply_rules.rating_only_template 로 매장별 on/off).
+금지어/길이 검증은 스크립트(validate_reply_content)에서 후보를 순서대로 확인합니다.
+
+사용 예:
+    for reply in rating_only_candidates(rv, shop_info):
+        if validate_reply_content(reply, shop_info)[0]:
+            break
+"""
+import hashlib
+import re
+
+RATING_TEMPLATE_DEFAULT = True
+
+RATING_TEMPLATE_BANK = {
+    "high": {
+        "opener": [
+            "{menu}맛있게 드셔주셔서 정말 감사합니다.",
+            "{menu}만족스럽게 드셨다니 저희도 기쁩니다.",
+            "소중한 별점 남겨주셔서 진심으로 감사드립니다.",
+            "{menu}주문해주시고 좋은 별점까지 주셔서 감사합니다.",
+        ],
+        "body": [
+            "앞으로도 한결같은 맛으로 보답하겠습니다.",
+            "항상 신선한 재료로 정성껏 준비하겠습니다.",
+            "고객님의 응원 덕분에 오늘도 힘이 납니다.",
+            "다음 주문에도 만족하실 수 있도록 더 노력하겠습니다.",
+        ],
+    },
+    "mid": {
+        "opener": [
+            "{menu}주문해주셔서 감사합니다.",
+            "소중한 별점 남겨주셔서 감사합니다.",
+            "{menu}드셔보시고 별점 남겨주셔서 감사드립니다.",
+        ],
+        "body": [
+            "부족했던 부분이 있었다면 더 꼼꼼히 살피겠습니다.",
+            "다음에는 더 만족하실 수 있도록 맛과 구성을 살피겠습니다.",
+            "더 좋은 맛으로 보답할 수 있도록 노력하겠습니다.",
+        ],
+    },
+    "low": {
+        "opener": [
+            "{menu}주문해주셨는데 만족드리지 못해 죄송합니다.",
+            "기대에 미치지 못한 것 같아 마음이 무겁습니다.",
+        ],
+        "body": [
+            "조리와 포장 과정을 다시 한번 점검하겠습니다.",
+            "말씀해주시면 더 나은 모습으로 개선하겠습니다.",
+        ],
+    },
+}
+# 톤에 친근/밝은 표현이 있으면 맺음 문장을 부드럽게
+RATING_TEMPLATE_FRIENDLY_WORDS = ("친근", "밝", "유쾌", "발랄", "캐주얼", "귀엽")
+RATING_TEMPLATE_FRIENDLY_CLOSER = ["오늘도 행복한 하루 보내세요~", "또 찾아주시길 기다릴게요~"]
+RATING_TEMPLATE_FORMAL_CLOSER = ["늘 건강하고 행복한 하루 보내시길 바랍니다.", "다음에도 찾아주시면 정성껏 모시겠습니다."]
+
+RIEUL_JONG = 8  # 종성 인덱스 ㄹ
+
+
+def use_rating_template(rv: dict, shop_info: dict) -> bool:
+    """별점만 있는 리뷰이고 매장에서 템플릿 답변을 사용하는지"""
+    if (rv.get("review_text") or "").strip():
+        return False
+    enabled = shop_info.get("rating_only_template")
+    return RATING_TEMPLATE_DEFAULT if enabled is None else bool(enabled)
+
+
+def with_josa(word: str, batchim: str, plain: str) -> str:
+    """
+    받침 유무에 따른 조사 선택
+    - 받침 있음: batchim (을/이/은/으로), 받침 없음: plain (를/가/는/로)
+    - ㄹ 받침 예외는 으로/로 에만 적용 (갈비살로, 족발을)
+    - 한글이 아닌 글자로 끝나면 plain
+    """
+    last = word[-1] if word else ""
+    if "가" <= last <= "힣":
+        jong = (ord(last) - 0xAC00) % 28
+        if jong and not (jong == RIEUL_JONG and batchim.startswith("으로")):
+            return word + batchim
+    return word + plain
+
+
+def rating_bucket(rating: int) -> str:
+    return "high" if rating >= 4 else "mid" if rating == 3 else "low"
+
+
+def rating_only_candidates(rv: dict, shop_info: dict):
+    """
+    별점만 있는 리뷰의 템플릿 답변 후보 (검증 전, max_length 이하만)
+    - 같은 고객/리뷰는 항상 같은 순서, 고객마다 다른 조합 (작성자+메뉴 해시 기준)
+    - 긴 조합(역할 문장 포함) → 맺음 문장 포함 → 짧은 조합 순
+    """
+    try:
+        rating = int(float(rv.get("star") or 0))
+    except (TypeError, ValueError):
+        rating = 0
+    bank = RATING_TEMPLATE_BANK[rating_bucket(rating)]
+
+    greeting_start = shop_info.get("greeting_start") or "안녕하세요!"
+    greeting_end = shop_info.get("greeting_end") or "감사합니다."
+    max_length = shop_info.get("max_length") or 350
+    tone = shop_info.get("tone") or ""
+    role = (shop_info.get("role") or "").strip()
+
+    # 주문 메뉴는 첫 번째 메뉴만 짧게 언급
+    menu = (rv.get("order_menu") or "").split(",")[0].strip()
+    menu = re.sub(r'\[[^\]]*\]|\([^)]*\)', '', menu).strip()
+    menu_text = with_josa(menu, "을 ", "를 ") if 0 < len(menu) <= 15 else ""
+
+    closers = RATING_TEMPLATE_FRIENDLY_CLOSER if any(w in tone for w in RATING_TEMPLATE_FRIENDLY_WORDS) \
+        else RATING_TEMPLATE_FORMAL_CLOSER
+    role_line = ""
+    if role and len(role) <= 10 and " " not in role and rating >= 3:
+        role_line = with_josa(role, "으로서", "로서") + " 늘 정성을 다하겠습니다."
+
+    seed = int(hashlib.md5(f"{rv.get('author', '')}|{menu}|{rating}".encode("utf-8")).hexdigest(), 16)
+    openers, bodies = bank["opener"], bank["body"]
+
+    for parts_mode in ("full", "no_role", "short"):
+        if parts_mode == "full" and not role_line:
+            continue
+        for i in range(len(openers) * len(bodies)):
+            opener = openers[(seed + i) % len(openers)].format(menu=menu_text)
+            body = bodies[(seed // 7 + i) % len(bodies)]
+            closer = closers[(seed // 13 + i) % len(closers)]
+            lines = [opener, body]
+            if parts_mode == "full":
+                lines.append(role_line)
+            if parts_mode != "short":
+                lines.append(closer)
+            reply = f"{greeting_start}\n" + " ".join(lines) + f"\n{greeting_end}"
+            if len(reply) <= max_length:
+                yield reply
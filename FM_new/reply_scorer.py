@@ -0,0 +1,164 @@
+"""
+답변 품질 로컬 평가 (배민/쿠팡/요기요 공용)
+
+GPT 평가(score_reply)와 같은 100점 항목(맥락 30 / 전문성 20 / 형식 20 / 어조 15 / 문장 15)을
+간단한 특징(인사말·맺음말, 길이, 단락, 메뉴·리뷰 키워드 언급, 별점에 맞는 대응, 경어, 반복 등)으로 계산합니다.
+로컬 점수가 threshold ± SCORE_ESCALATION_MARGIN 안에 들 때만 스크립트의 GPT 평가(remote_score)를 호출합니다.
+
+사용 예:
+    score, details = local_score_reply(ai_reply, {"review_text": ..., "star": 5, "order_menu": ...}, shop_info)
+    score, details = escalate_score(ai_reply, review, shop_info,
+                                    lambda: score_reply(ai_reply, review, shop_info, threshold), threshold)
+"""
+import re
+
+SCORE_ESCALATION_MARGIN = 5
+REPLY_APOLOGY_WORDS = ("죄송", "송구", "불편", "아쉬", "개선")
+REPLY_COMMIT_WORDS = ("노력", "준비", "개선", "점검", "신경", "보답", "정성")
+REPLY_RUDE_WORDS = ("니가", "너가", "어쩌라", "알아서", "맘대로")
+
+
+def _score_ratio(value: float, full: int) -> int:
+    return max(0, min(full, int(round(value * full))))
+
+
+def local_score_reply(ai_reply: str, review: dict, shop_info: dict) -> tuple:
+    """
+    GPT 호출 없이 답변 품질 평가 (score_reply 와 같은 항목/배점, 같은 반환 형식)
+    - 인사말/맺음말 일치, 길이, 단락, 메뉴·리뷰 키워드 언급, 별점에 맞는 대응, 경어, 반복, 허용 외 문자 비율
+    """
+    reply = ai_reply or ""
+    review_text = review.get("review_text") or ""
+    try:
+        rating = int(float(review.get("star") or 0))
+    except (TypeError, ValueError):
+        rating = 0
+    greeting_start = (shop_info.get("greeting_start") or "").strip()
+    greeting_end = (shop_info.get("greeting_end") or "").strip()
+    max_length = shop_info.get("max_length") or 350
+    
+    lines = [l.strip() for l in reply.split("\n") if l.strip()]
+    sentences = [x.strip() for x in re.split(r'(?<=[.!?~])\s+|\n+', reply) if x.strip()]
+    body = " ".join(lines[1:-1]) if len(lines) > 2 else reply
+    
+    # 1. 맥락 이해도 (30)
+    menus = [re.sub(r'\[[^\]]*\]|\([^)]*\)', '', m).strip() for m in (review.get("order_menu") or "").split(",")]
+    menus = [m for m in menus if len(m) >= 2]
+    if not menus:
+        menu_score = 10
+    elif any(m in reply or m.split()[0] in reply for m in menus):
+        menu_score = 10
+    else:
+        menu_score = 4
+    keywords = {w for w in re.findall(r'[가-힣]{2,}', review_text) if len(w) >= 2}
+    if keywords:
+        hit = sum(1 for w in keywords if w[:2] in body)
+        keyword_score = 4 + _score_ratio(hit / len(keywords) * 2, 6)
+    else:
+        keyword_score = 10
+    if rating and rating <= 3:
+        direction_score = 10 if any(w in reply for w in REPLY_APOLOGY_WORDS) else 4
+    else:
+        direction_score = 10 if "감사" in reply else 6
+    context = {"리뷰이해": keyword_score, "감정이해": direction_score, "대응방향": menu_score}
+    
+    # 2. 전문성 (20)
+    expertise = {
+        "전문성": 10 if any(w in reply for w in REPLY_COMMIT_WORDS) else 6,
+        "구체성": 10 if (menu_score == 10 and menus) or keyword_score >= 8 else 6
+    }
+    
+    # 3. 형식 완성도 (20)
+    length_ratio = len(reply) / max_length if max_length else 0
+    fmt = {
+        "인사말": (3 if greeting_start and reply.startswith(greeting_start) else 1)
+                  + (2 if greeting_end and reply.rstrip().endswith(greeting_end) else 0),
+        "구조": 5 if len(sentences) >= 3 else 3,
+        "길이": 0 if length_ratio > 1 else (5 if length_ratio >= 0.2 else 3),
+        "단락": 5 if len(lines) >= 3 else (3 if len(lines) == 2 else 1)
+    }
+    
+    # 4. 어조와 태도 (15)
+    polite = [x for x in sentences if re.search(r'(니다|요|세요|시오|까)[.!?~♡\s]*$', x)]
+    polite_ratio = len(polite) / len(sentences) if sentences else 0
+    unique_ratio = len(set(sentences)) / len(sentences) if sentences else 0
+    tone = {
+        "공손함": 1 if any(w in reply for w in REPLY_RUDE_WORDS) else 5,
+        "경어사용": _score_ratio(polite_ratio, 5),
+        "진정성": _score_ratio(unique_ratio, 5)
+    }
+    
+    # 5. 문장 품질 (15)
+    valid_pattern = re.compile(r'[가-힣A-Za-z\s.,!?0-9%♡~()]')
+    invalid_ratio = (len([c for c in reply if not (valid_pattern.match(c) or ord(c) > 0x1F000)]) / len(reply)) if reply else 1
+    words = re.findall(r'[가-힣A-Za-z0-9]+', reply)
+    bigrams = list(zip(words, words[1:]))
+    repeat_ratio = 1 - (len(set(bigrams)) / len(bigrams)) if bigrams else 0
+    avg_len = (sum(len(x) for x in sentences) / len(sentences)) if sentences else 0
+    quality = {
+        "맞춤법": _score_ratio(1 - invalid_ratio * 5, 5),
+        "자연스러움": _score_ratio(1 - repeat_ratio * 3, 5),
+        "간결성": 5 if avg_len <= 60 else 3
+    }
+    
+    result = {
+        "context_score": context,
+        "expertise_score": expertise,
+        "format_score": fmt,
+        "tone_score": tone,
+        "quality_score": quality,
+        "improvement_needed": [],
+        "scorer": "local"
+    }
+    if menu_score < 10:
+        result["improvement_needed"].append("주문 메뉴 언급 없음")
+    if fmt["인사말"] < 5:
+        result["improvement_needed"].append("인사말/맺음말 불일치")
+    if fmt["길이"] == 0:
+        result["improvement_needed"].append("길이 초과")
+    result["total_score"] = sum(sum(result[k].values()) for k in
+                                ("context_score", "expertise_score", "format_score", "tone_score", "quality_score"))
+    return result["total_score"], result
+
+
+LOCAL_SCORE_CATEGORIES = {
+    "context_score": "맥락 이해도",
+    "expertise_score": "전문성",
+    "format_score": "형식 완성도",
+    "tone_score": "어조와 태도",
+    "quality_score": "문장 품질",
+}
+
+
+def category_totals(details: dict) -> dict:
+    """세부 점수를 GPT 평가 응답과 같은 {항목: 점수, ..., "총점": 점수} 형식으로 변환 (배민/쿠팡 score_reply 형식)"""
+    result = {name: sum(details[key].values()) for key, name in LOCAL_SCORE_CATEGORIES.items()}
+    result["총점"] = details["total_score"]
+    return result
+
+
+def pass_fail_totals(score: int, details: dict, threshold: int) -> tuple:
+    """로컬 평가 결과를 배민/쿠팡 score_reply 반환 형식 (합격 여부, {항목: 점수, ..., "총점": 점수}) 으로 변환"""
+    return score >= threshold, category_totals(details)
+
+
+def needs_remote_score(score: int, threshold: int) -> bool:
+    """로컬 점수가 기준점 근처(±SCORE_ESCALATION_MARGIN)라 GPT 평가로 확정해야 하는지"""
+    return abs(score - threshold) <= SCORE_ESCALATION_MARGIN
+
+
+def escalate_score(ai_reply: str, review: dict, shop_info: dict, remote_score, threshold: int = 80,
+                   log=print, local_result=None):
+    """
+    로컬 평가 후 기준점 근처일 때만 remote_score() (인자 없는 GPT 평가 호출) 결과로 확정
+    - 기준점에서 먼 경우 로컬 결과 반환: local_result(score, details, threshold), 없으면 (score, details)
+    - remote_score 의 반환값은 그대로 돌려주므로 local_result 는 remote_score 와 같은 형식을 반환해야 함
+    """
+    score, details = local_score_reply(ai_reply, review, shop_info)
+    if needs_remote_score(score, threshold):
+        log(f"[evaluate_reply] 로컬 {score}점 (기준 {threshold}±{SCORE_ESCALATION_MARGIN}) => GPT 평가")
+        return remote_score()
+    log(f"[evaluate_reply] 로컬 {score}점 {details['improvement_needed'] or ''}")
+    if local_result is not None:
+        return local_result(score, details, threshold)
+    return score, details
@@ -0,0 +1,203 @@
+"""
+리뷰 처리 이벤트 로그 (배민/쿠팡/요기요 공용)
+
+리뷰 한 건의 처리 과정(crawled → analyzed → generated → scored → posted → saved)을
+review_hash 기준으로 모아 처리가 끝날 때 JSON 한 줄로 기록합니다.
+기록은 버퍼에 모았다가 EVENT_BUFFER_SIZE 건 또는 EVENT_FLUSH_INTERVAL 초마다 한 번에 씁니다.
+파일: events/review_events_<플랫폼>_<날짜>_<pid>.jsonl (워커 프로세스별로 분리)
+
+기록 예:
+    {"ts": "2025-03-25T14:02:11", "platform": "배민", "store_code": "S001", "review_hash": "...",
+     "status": "답변완료", "stages": {"crawled": 0.41, "analyzed": 2.1, ...},
+     "durations": {"crawled": 0.41, "analyzed": 1.69, ...}, "total": 9.8}
+
+사용 예 (스크립트):
+    review_events = ReviewEventLog("배민", "baemin")
+    review_events.start(review_hash, store_code)
+    review_events.mark(review_hash, "analyzed")
+    review_events.finish(review_hash, "답변완료")
+
+처리량/지연시간 집계 (CLI):
+    python review_events.py [파일 또는 폴더 ...] [--platform 배민] [--store S001] [--since 2025-03-25]
+"""
+import argparse
+import atexit
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from run_profile import percentile
+
+EVENT_DIR = "events"
+EVENT_BUFFER_SIZE = 50        # 버퍼에 이만큼 쌓이면 파일에 기록
+EVENT_FLUSH_INTERVAL = 10.0   # 마지막 기록 후 이 시간(초)이 지나면 기록
+EVENT_MAX_PENDING = 5000      # 끝나지 않은(중복 등으로 저장 없이 종료된) 리뷰 추적 최대 수
+
+STAGE_ORDER = ["crawled", "analyzed", "generated", "scored", "posted", "saved"]
+
+
+class ReviewEventLog:
+    """review_hash 별 처리 단계 시각을 모아 완료 시 JSON 한 줄로 기록"""
+
+    def __init__(self, platform, file_tag=None, event_dir=EVENT_DIR):
+        self.platform = platform
+        self.file_tag = file_tag or platform
+        self.event_dir = event_dir
+        self._pending = {}     # review_hash -> {"store_code", "started", "marks": [(stage, 경과초)]}
+        self._buffer = []
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def _path(self):
+        day = datetime.now().strftime("%Y%m%d")
+        return os.path.join(self.event_dir, f"review_events_{self.file_tag}_{day}_{os.getpid()}.jsonl")
+
+    def start(self, review_hash, store_code="", started_at=None, **fields):
+        """리뷰 처리 시작 (started_at: 카드 파싱 시작 시각 등, 없으면 현재)"""
+        if not review_hash:
+            return
+        with self._lock:
+            if len(self._pending) >= EVENT_MAX_PENDING:
+                self._pending.pop(next(iter(self._pending)))
+            self._pending[review_hash] = {
+                "store_code": store_code,
+                "started": started_at or time.time(),
+                "marks": [],
+                "fields": fields
+            }
+
+    def mark(self, review_hash, stage, at=None):
+        """처리 단계 완료 시각 기록 (at: 이미 끝난 단계를 나중에 기록할 때의 완료 시각, 없으면 현재)"""
+        with self._lock:
+            entry = self._pending.get(review_hash)
+            if entry is not None:
+                entry["marks"].append((stage, (at or time.time()) - entry["started"]))
+
+    def finish(self, review_hash, status, **fields):
+        """처리 종료 (DB 저장 시점) - 시작하지 않은 리뷰는 무시"""
+        with self._lock:
+            entry = self._pending.pop(review_hash, None)
+            if entry is None:
+                return
+            elapsed = time.time() - entry["started"]
+            marks = entry["marks"] + [("saved", elapsed)]
+            stages, durations = {}, {}
+            prev = 0.0
+            for stage, at in marks:
+                durations[stage] = round(durations.get(stage, 0.0) + (at - prev), 3)
+                stages[stage] = round(at, 3)
+                prev = at
+            record = {
+                "ts": datetime.now().isoformat(timespec="seconds"),
+                "platform": self.platform,
+                "store_code": entry["store_code"],
+                "review_hash": review_hash,
+                "status": status,
+                "stages": stages,
+                "durations": durations,
+                "total": round(elapsed, 3)
+            }
+            record.update(entry["fields"])
+            record.update(fields)
+            self._buffer.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            due = len(self._buffer) >= EVENT_BUFFER_SIZE or time.time() - self._last_flush >= EVENT_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        """버퍼에 모인 기록을 파일에 추가"""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._last_flush = time.time()
+        if not lines:
+            return
+        try:
+            os.makedirs(self.event_dir, exist_ok=True)
+            with open(self._path(), "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            sys.__stderr__.write(f"[review_events] 이벤트 기록 실패: {e}\n")
+
+
+###################################################
+# 집계 CLI
+###################################################
+def iter_event_files(paths):
+    for path in paths or [EVENT_DIR]:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "review_events_*.jsonl")))
+        else:
+            yield from sorted(glob.glob(path))
+
+
+def summarize_events(paths, platform=None, store_code=None, since=None):
+    """이벤트 파일을 한 줄씩 읽어 플랫폼별 처리량/상태/단계별 지연시간 집계"""
+    summary = {}
+    for path in iter_event_files(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if platform and rec.get("platform") != platform:
+                    continue
+                if store_code and rec.get("store_code") != store_code:
+                    continue
+                if since and rec.get("ts", "") < since:
+                    continue
+                s = summary.setdefault(rec.get("platform", "?"), {
+                    "count": 0, "status": {}, "first": None, "last": None,
+                    "total": [], "stages": {}, "stores": set()
+                })
+                s["count"] += 1
+                s["status"][rec.get("status", "")] = s["status"].get(rec.get("status", ""), 0) + 1
+                ts = rec.get("ts")
+                if ts:
+                    s["first"] = ts if s["first"] is None else min(s["first"], ts)
+                    s["last"] = ts if s["last"] is None else max(s["last"], ts)
+                s["total"].append(rec.get("total", 0.0))
+                s["stores"].add(rec.get("store_code", ""))
+                for stage, sec in (rec.get("durations") or {}).items():
+                    s["stages"].setdefault(stage, []).append(sec)
+    return summary
+
+
+def print_summary(summary):
+    if not summary:
+        print("[review_events] 집계할 이벤트가 없습니다.")
+        return
+    for platform, s in summary.items():
+        span = 0.0
+        if s["first"] and s["last"]:
+            span = (datetime.fromisoformat(s["last"]) - datetime.fromisoformat(s["first"])).total_seconds()
+        per_min = s["count"] / (span / 60) if span > 0 else 0.0
+        print(f"\n[{platform}] 리뷰 {s['count']}건, 매장 {len(s['stores'])}개, "
+              f"기간 {s['first']} ~ {s['last']}, 처리량 {per_min:.2f}건/분")
+        print("  상태: " + ", ".join(f"{k or '-'} {v}" for k, v in sorted(s["status"].items(), key=lambda x: -x[1])))
+        print(f"  {'단계':<12}{'건수':>7}{'p50(s)':>9}{'p95(s)':>9}{'최대(s)':>9}")
+        stages = sorted(s["stages"], key=lambda x: STAGE_ORDER.index(x) if x in STAGE_ORDER else len(STAGE_ORDER))
+        for stage in stages:
+            vals = s["stages"][stage]
+            print(f"  {stage:<12}{len(vals):>7}{percentile(vals, 50):>9.2f}{percentile(vals, 95):>9.2f}{max(vals):>9.2f}")
+        print(f"  {'total':<12}{len(s['total']):>7}{percentile(s['total'], 50):>9.2f}"
+              f"{percentile(s['total'], 95):>9.2f}{max(s['total']):>9.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="리뷰 처리 이벤트 로그 처리량/지연시간 집계")
+    parser.add_argument("paths", nargs="*", help=f"이벤트 파일/폴더 (기본: {EVENT_DIR})")
+    parser.add_argument("--platform", help="플랫폼 필터 (배민/쿠팡이츠/요기요)")
+    parser.add_argument("--store", help="store_code 필터")
+    parser.add_argument("--since", help="이 시각 이후 기록만 (예: 2025-03-25 또는 2025-03-25T09:00)")
+    args = parser.parse_args(argv)
+    print_summary(summarize_events(args.paths, args.platform, args.store, args.since))
+
+
+if __name__ == "__main__":
+    main()
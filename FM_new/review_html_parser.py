@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+배민 리뷰 페이지 HTML(page_source) 오프라인 파서
+
+- driver.page_source 문자열 하나로 리뷰 카드 정보를 한 번에 추출 (WebDriver 왕복 없음)
+- lxml 이 설치되어 있으면 lxml.html 로, 없으면 표준 라이브러리 html.parser 로 파싱
+- 현재 구조(ReviewContent-module)와 이전 구조(div.Card / p.nick / p.review-cont) 모두 지원
+- 저장된 page_source.html 로 선택자 변경 회귀 확인 및 파싱 속도 측정 가능
+
+사용 예)
+    python review_html_parser.py page_source.html
+    python review_html_parser.py page_source.html --today 2025-03-31 --save expected.json
+    python review_html_parser.py page_source.html --today 2025-03-31 --check expected.json
+
+    회귀 기대값(tests/fixtures/page_source_expected.json) 갱신:
+    python review_html_parser.py page_source.html --store-code S001 --today 2025-03-31 \
+        --save tests/fixtures/page_source_expected.json
+    python review_html_parser.py page_source.html --bench 50
+"""
+import re
+import sys
+import json
+import time
+import calendar
+import hashlib
+import argparse
+from datetime import datetime, timedelta, date
+from html.parser import HTMLParser
+
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+###################################################
+# 1) 설정값 (배민 카드 선택 기준)
+###################################################
+EXCLUDED_TEXTS = ["평균 별점", "고객이 보는 리뷰 정렬", "최신순", "사장님!", "배민마케팅"]
+DATE_WORDS = ["오늘", "어제", "그제", "지난 달", "지난 주", "이번 달", "이번 주"]
+STAR_FILLS = ("#ffc600", "gold", "yellow")
+OLD_REVIEW_TEXT = "30일이 지난 리뷰"
+OWNER_AUTHORS = ("사장님",)       # 사장님 댓글/게시중단 리뷰 블록의 작성자 표시 (리뷰 카드 아님)
+# resolve_card_element 가 position 으로 WebElement 를 다시 찾을 때 쓰는 선택자 (구조별)
+CARD_SELECTOR_CURRENT = "div[class*='ReviewContent-module']"
+CARD_SELECTOR_LEGACY = "div.Card"
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+             "link", "meta", "param", "source", "track", "wbr"}
+
+###################################################
+# 2) 표준 라이브러리 대체 파서 (lxml 미설치 시)
+###################################################
+class _Node:
+    """lxml Element 에서 사용하는 기능(tag/get/iter/text/text_content/getparent)만 흉내낸 노드"""
+    __slots__ = ("tag", "attrib", "children", "parent", "text", "tail")
+
+    def __init__(self, tag, attrib=None, parent=None):
+        self.tag = tag
+        self.attrib = attrib or {}
+        self.children = []
+        self.parent = parent
+        self.text = None
+        self.tail = None
+
+    def get(self, name, default=None):
+        return self.attrib.get(name, default)
+
+    def getparent(self):
+        return self.parent
+
+    def iter(self):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def text_content(self):
+        parts = []
+        def walk(node):
+            if node.text:
+                parts.append(node.text)
+            for child in node.children:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+        walk(self)
+        return "".join(parts)
+
+
+class _TreeBuilder(HTMLParser):
+    """html.parser 이벤트로 _Node 트리 생성"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("root")
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, {k: (v or "") for k, v in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = _Node(tag, {k: (v or "") for k, v in attrs}, self.current)
+        self.current.children.append(node)
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        node = self.current
+        if node.children:
+            last = node.children[-1]
+            last.tail = (last.tail or "") + data
+        else:
+            node.text = (node.text or "") + data
+
+
+def parse_document(html):
+    """HTML 문자열을 트리로 파싱 (lxml 우선, 없으면 html.parser)"""
+    # <br> 은 줄바꿈으로 보존 (Selenium .text 결과와 동일하게)
+    html = re.sub(r"<br\s*/?>", "\n", html, flags=re.I)
+    if lxml_html is not None:
+        return lxml_html.fromstring(html)
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+###################################################
+# 3) 노드 헬퍼
+###################################################
+def _classes(node):
+    return (node.get("class") or "").split()
+
+def _class_contains(node, fragment):
+    return fragment in (node.get("class") or "")
+
+def _text(node):
+    return re.sub(r"[ \t\r\f\v]+", " ", node.text_content() or "").strip()
+
+def _own_text(node):
+    """하위 요소(추천 배지 등)를 제외한 노드 자신의 텍스트"""
+    return (node.text or "").strip() or _text(node)
+
+def _find_all(node, tag=None, cls=None, cls_all=None):
+    """태그/클래스 조건으로 하위 노드 검색 (cls 는 부분 일치, cls_all 은 모두 포함)"""
+    result = []
+    for el in node.iter():
+        if el is node or not isinstance(el.tag, str):
+            continue
+        if tag and el.tag != tag:
+            continue
+        if cls and not _class_contains(el, cls):
+            continue
+        if cls_all and not all(c in _classes(el) for c in cls_all):
+            continue
+        result.append(el)
+    return result
+
+def _first_text(nodes, predicate=None):
+    for el in nodes:
+        text = _text(el)
+        if text and (predicate is None or predicate(text)):
+            return text
+    return ""
+
+def _is_date_text(text):
+    return bool(text) and (text in DATE_WORDS or "전" in text or "월" in text or "일" in text)
+
+###################################################
+# 4) 리뷰 카드 찾기 / 필드 추출
+###################################################
+def find_card_nodes(root):
+    """
+    리뷰 카드 노드 목록 (현재 구조 우선, 없으면 이전 구조)
+    - 반환: (CSS 선택자, [(선택자 기준 문서 내 순서, 노드), ...])
+      순서는 걸러낸 카드가 아니라 선택자에 걸리는 모든 노드 기준 (브라우저에서 같은 선택자로 다시 찾기 위함)
+    - 사장님 댓글 블록(작성자 "사장님")은 리뷰 카드가 아니므로 제외
+    """
+    nodes = _find_all(root, tag="div", cls="ReviewContent-module")
+    cards = [(i, el) for i, el in enumerate(nodes)
+             if (count_stars(el, strict=True) or has_reply_button(el, ["사장님 댓글"])) and not is_owner_reply(el)]
+    if cards:
+        return CARD_SELECTOR_CURRENT, cards
+    nodes = _find_all(root, tag="div", cls_all=["Card"])
+    return CARD_SELECTOR_LEGACY, [(i, el) for i, el in enumerate(nodes)
+                                  if _find_all(el, tag="p", cls_all=["nick"]) and not is_owner_reply(el)]
+
+def is_owner_reply(card):
+    return extract_author(card) in OWNER_AUTHORS
+
+def count_stars(card, strict=False):
+    """노란색(#FFC600) 별 개수, strict 면 1~5개일 때만 반환"""
+    stars = 0
+    for svg in _find_all(card, tag="svg"):
+        for path in _find_all(svg, tag="path"):
+            if (path.get("fill") or "").lower() in STAR_FILLS:
+                stars += 1
+                break
+    if strict:
+        return stars if 0 < stars <= 5 else 0
+    return min(stars, 5)
+
+def has_reply_button(card, words=("사장님", "답글", "댓글")):
+    for btn in _find_all(card, tag="button"):
+        text = _text(btn)
+        if any(w in text for w in words) or btn.get("aria-label") == "사장님 댓글":
+            return True
+    return False
+
+def find_data_index(card, max_depth=5):
+    node = card
+    for _ in range(max_depth):
+        if node is None:
+            break
+        value = node.get("data-index")
+        if value is not None:
+            return value
+        node = node.getparent()
+    return None
+
+def extract_author(card):
+    nick = _first_text(_find_all(card, tag="p", cls_all=["nick"]))
+    if nick:
+        return nick
+    short = lambda t: 0 < len(t) < 20
+    for nodes in (
+        [el for flex in _find_all(card, tag="div", cls="Flex_c_qbca_bbdidap")
+         for el in _find_all(flex, tag="span", cls="Typography")],
+        _find_all(card, tag="span", cls="Typography_b_qmgb_1bisyd47"),
+        _find_all(card, tag="span", cls="Typography"),
+    ):
+        text = _first_text(nodes, short)
+        if text:
+            return text
+    return "알 수 없음"
+
+def extract_review_text(card, author):
+    def ok(text):
+        return text != author and not text.startswith("별점") and not text.startswith("[고기천원]")
+    text = _first_text(_find_all(card, tag="p", cls_all=["review-cont"]))
+    if text:
+        return text
+    text = _first_text(_find_all(card, tag="span",
+                                 cls_all=["Typography_b_qmgb_1bisyd49", "Typography_b_qmgb_1bisyd41u"]), ok)
+    if text:
+        return text
+    flex = _find_all(card, tag="div", cls="Flex_c_qbca_bbdidap")
+    if len(flex) > 1:
+        return _first_text(_find_all(flex[1], tag="span", cls="Typography"), ok)
+    return ""
+
+def _badge_texts(node):
+    texts = [_own_text(el) for el in _find_all(node, tag="span", cls="Badge_b_qmgb_19agxism")]
+    return ", ".join(t for t in texts if t)
+
+def extract_menu_and_delivery(card):
+    """주문메뉴/배달리뷰 배지 (섹션 구분이 없으면 모든 배지를 메뉴로 취급)"""
+    menu_sections = _find_all(card, tag="div", cls="ReviewMenus-module")
+    delivery_sections = _find_all(card, tag="div", cls="ReviewDelivery-module")
+    if not menu_sections and not delivery_sections:
+        return _badge_texts(card), ""
+    menu = ", ".join(t for t in (_badge_texts(s) for s in menu_sections[:1]) if t)
+    delivery = ", ".join(t for t in (_badge_texts(s) for s in delivery_sections[:1]) if t)
+    return menu, delivery
+
+def extract_date_text(card):
+    for nodes in (
+        [el for d in _find_all(card, tag="div", cls_all=["date"]) for el in _find_all(d, tag="span")],
+        _find_all(card, tag="span", cls_all=["Typography_b_qmgb_1bisyd4b", "Typography_b_qmgb_1bisyd41v"]),
+        _find_all(card, tag="span"),
+    ):
+        text = _first_text(nodes, _is_date_text)
+        if text:
+            return text
+    return ""
+
+def is_valid_card(card, full_text, rating_found):
+    """validate_review_card 와 같은 기준의 리뷰 여부 판정"""
+    if any(t in full_text for t in EXCLUDED_TEXTS):
+        return False
+    if rating_found or "별점" in full_text or has_reply_button(card):
+        return True
+    if any(len(_text(el)) > 10 for el in _find_all(card, tag="span", cls="Typography")):
+        return True
+    return bool(_find_all(card, tag="span", cls="Badge"))
+
+###################################################
+# 5) 날짜 변환 / 해시
+###################################################
+def relative_date_to_iso(relative_date, today=None):
+    """'오늘', '3일 전', '지난 달', '2개월 전' 등을 ISO 날짜로 변환 (인식 실패 시 오늘)"""
+    today = today or datetime.now().date()
+    text = (relative_date or "").strip()
+    if not text or text == "오늘":
+        return today.isoformat()
+    if text == "어제":
+        return (today - timedelta(days=1)).isoformat()
+    if text == "그제":
+        return (today - timedelta(days=2)).isoformat()
+    if "지난 달" in text or "저번 달" in text:
+        return _months_ago(today, 1).isoformat()
+    if "지난 주" in text or "저번 주" in text:
+        return (today - timedelta(days=7)).isoformat()
+    if "이번 달" in text:
+        return (today - timedelta(days=10)).isoformat()
+    if "이번 주" in text:
+        return (today - timedelta(days=4)).isoformat()
+    m = re.match(r"(\d+)\s*일 전", text)
+    if m:
+        return (today - timedelta(days=int(m.group(1)))).isoformat()
+    m = re.match(r"(\d+)\s*주 전", text)
+    if m:
+        return (today - timedelta(days=int(m.group(1)) * 7)).isoformat()
+    m = re.match(r"(\d+)\s*(개월|달) 전", text)
+    if m:
+        return _months_ago(today, int(m.group(1))).isoformat()
+    m = re.match(r"(\d{4})[.\-](\d{1,2})[.\-](\d{1,2})", text)
+    if m:
+        return date(int(m.group(1)), int(m.group(2)), int(m.group(3))).isoformat()
+    return today.isoformat()
+
+def _months_ago(today, months):
+    result = today
+    for _ in range(months):
+        result = result.replace(day=1) - timedelta(days=1)
+    return result.replace(day=min(today.day, calendar.monthrange(result.year, result.month)[1]))
+
+def review_hash(store_code, author, review_text):
+    """generate_review_hash 와 동일한 규칙 (store_code_author_review_text 의 md5)"""
+    return hashlib.md5(f"{store_code}_{author}_{review_text}".encode("utf-8")).hexdigest()
+
+###################################################
+# 6) 페이지 단위 파싱
+###################################################
+def parse_review_cards(html, store_code="", today=None):
+    """
+    page_source 문자열에서 리뷰 레코드 목록 추출
+    - 반환 dict 키: extract_visible_cards 결과와 동일 (+ review_date, review_hash, position)
+    - element 는 포함하지 않음 (답글 등록 시 data_index, 없으면 card_selector + position 으로 다시 조회)
+    """
+    root = parse_document(html)
+    records = []
+    card_selector, cards = find_card_nodes(root)
+    for position, card in cards:
+        full_text = _text(card)
+        rating = count_stars(card)
+        author = extract_author(card)
+        review_text = extract_review_text(card, author)
+        order_menu, delivery_review = extract_menu_and_delivery(card)
+        date_text = extract_date_text(card)
+        data_index = find_data_index(card)
+        records.append({
+            "key": data_index if data_index is not None else f"pos_{position}",
+            "data_index": data_index,
+            "position": position,
+            "card_selector": card_selector,
+            "author": author,
+            "rating": rating if rating > 0 else 5,
+            "review_text": review_text,
+            "order_menu": order_menu,
+            "delivery_review": delivery_review,
+            "date_text": date_text,
+            "review_date": relative_date_to_iso(date_text, today),
+            "has_reply_button": has_reply_button(card),
+            "is_old": OLD_REVIEW_TEXT in full_text,
+            "is_valid": is_valid_card(card, full_text, rating > 0),
+            "review_hash": review_hash(store_code, author, review_text),
+        })
+    return records
+
+###################################################
+# 7) 회귀 확인 / 벤치마크 (저장된 page_source.html 대상)
+###################################################
+def _diff_records(expected, actual):
+    """레코드 목록 비교 결과를 사람이 읽을 수 있는 문자열 목록으로 반환"""
+    diffs = []
+    if len(expected) != len(actual):
+        diffs.append(f"카드 수 불일치: 기대={len(expected)}, 실제={len(actual)}")
+    for i, (exp, act) in enumerate(zip(expected, actual)):
+        for key in sorted(set(exp) | set(act)):
+            if exp.get(key) != act.get(key):
+                diffs.append(f"[{i}] {key}: 기대={exp.get(key)!r}, 실제={act.get(key)!r}")
+    return diffs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="배민 page_source 오프라인 리뷰 파서")
+    parser.add_argument("html_file", help="driver.page_source 로 저장한 HTML 파일")
+    parser.add_argument("--store-code", default="", help="review_hash 계산용 매장 코드")
+    parser.add_argument("--today", help="상대 날짜 기준일 (YYYY-MM-DD, 회귀 비교 시 고정)")
+    parser.add_argument("--save", help="파싱 결과를 기대값 JSON 으로 저장")
+    parser.add_argument("--check", help="기대값 JSON 과 비교 (불일치 시 종료코드 1)")
+    parser.add_argument("--bench", type=int, default=0, help="파싱 반복 횟수 (속도 측정)")
+    args = parser.parse_args(argv)
+
+    with open(args.html_file, "r", encoding="utf-8") as f:
+        html = f.read()
+    today = datetime.strptime(args.today, "%Y-%m-%d").date() if args.today else None
+
+    started = time.perf_counter()
+    records = parse_review_cards(html, args.store_code, today)
+    elapsed = time.perf_counter() - started
+    engine = "lxml" if lxml_html is not None else "html.parser"
+    print(f"[review_html_parser] {len(records)}개 카드 파싱 ({engine}, {elapsed * 1000:.1f}ms)")
+
+    for r in records:
+        print(f"  - {r['key']}: 작성자={r['author']}, 별점={r['rating']}, 날짜={r['date_text']}({r['review_date']}), "
+              f"답글버튼={r['has_reply_button']}, 30일경과={r['is_old']}, 메뉴={r['order_menu']}, "
+              f"배달={r['delivery_review']}, 내용={r['review_text'][:20]}")
+
+    if args.bench > 0:
+        started = time.perf_counter()
+        for _ in range(args.bench):
+            parse_review_cards(html, args.store_code, today)
+        per_run = (time.perf_counter() - started) / args.bench
+        print(f"[review_html_parser] 벤치마크 {args.bench}회: 평균 {per_run * 1000:.1f}ms/페이지")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        print(f"[review_html_parser] 기대값 저장: {args.save}")
+
+    if args.check:
+        with open(args.check, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        diffs = _diff_records(expected, records)
+        if diffs:
+            print(f"[review_html_parser] 회귀 불일치 {len(diffs)}건")
+            for d in diffs:
+                print(f"  {d}")
+            return 1
+        print("[review_html_parser] 회귀 확인 통과")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+reviews 로컬 미러 (배민/쿠팡/요기요 공용)
+
+중복 체크(_check_duplicate_review)가 리뷰마다 Supabase 를 조회하지 않도록
+실행기가 다루는 매장의 reviews 행을 로컬 SQLite(WAL) 파일에 보관합니다.
+- 매장을 처음 조회할 때 한 번 동기화하고(이전 실행의 updated_at 기준점 이후만), 이후 조회는 로컬에서 처리
+- 백그라운드 스레드가 MIRROR_SYNC_INTERVAL 초마다 updated_at 이 기준점 이후인 행만 받아 반영
+  (updated_at 은 실행기에서 찍는 값이라 늦게 저장된 행이 기준점보다 과거일 수 있으므로
+   기준점에서 MIRROR_SYNC_OVERLAP 분을 뺀 시점부터 다시 받음 - 같은 값은 건너뛰므로 중복 반영 없음)
+- 이 실행기가 저장한 행은 즉시 로컬에 반영 (MIRROR_DIRTY_TTL 초 동안은 원격 값으로 덮어쓰지 않음)
+- Supabase 가 느리거나 끊겨도 한 번이라도 동기화된 매장은 로컬 기준으로 중복 판단
+- 한 번도 동기화되지 않은 매장만 기존처럼 원격 개별 조회
+
+파일: review_mirror_<플랫폼>.db (워커 프로세스들이 같은 파일을 WAL 모드로 공유)
+파일은 처음 사용할 때 엽니다 (스크립트 import 만으로는 열지 않음 - spawn 워커/GUI 프로세스 공용).
+
+사용 예:
+    review_mirror = ReviewMirror(supabase, "baemin", log=print)
+    record = review_mirror.lookup(review_hash, store_code, platform)   # 없으면 None
+    review_mirror.put(data)                                             # 저장 시
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+MIRROR_SYNC_INTERVAL = 60      # 백그라운드 증분 동기화 주기(초)
+MIRROR_PAGE_SIZE = 1000        # 원격 조회 1회당 행 수
+MIRROR_DIRTY_TTL = 600         # 로컬 저장 후 원격 값으로 덮어쓰지 않는 시간(초)
+MIRROR_BUSY_TIMEOUT = 5000     # 다른 프로세스가 쓰는 중일 때 대기(ms)
+MIRROR_SYNC_OVERLAP = 30       # 증분 동기화 시 기준점보다 앞당겨 다시 받는 시간(분)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id   TEXT PRIMARY KEY,
+    store_code  TEXT,
+    platform    TEXT,
+    updated_at  TEXT,
+    data        TEXT,
+    local_at    REAL
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_store ON reviews(store_code, platform);
+CREATE TABLE IF NOT EXISTS sync_state (
+    store_code  TEXT,
+    platform    TEXT,
+    watermark   TEXT,
+    synced_at   REAL,
+    PRIMARY KEY (store_code, platform)
+);
+"""
+
+
+class ReviewMirror:
+    """reviews 행을 review_id 로 보관하는 로컬 SQLite 미러"""
+
+    def __init__(self, supabase, file_tag, log=print, sync_interval=MIRROR_SYNC_INTERVAL, db_path=None):
+        self.supabase = supabase
+        self.db_path = db_path or f"review_mirror_{file_tag}.db"
+        self.log = log
+        self.sync_interval = sync_interval
+        self._local = threading.local()   # 스레드별 연결
+        self._tracked = set()             # 이번 실행에서 동기화 대상 (store_code, platform)
+        self._tracked_lock = threading.Lock()
+        self._thread = None
+        self._enabled = None              # 처음 사용할 때 초기화 (None: 아직 안 함)
+        self._init_lock = threading.Lock()
+        self.stats = {"local_hit": 0, "local_miss": 0, "remote_lookup": 0, "synced_rows": 0, "sync_errors": 0}
+
+    @property
+    def enabled(self):
+        """로컬 미러 사용 가능 여부 (처음 호출 시 파일/스키마 초기화)"""
+        if self._enabled is None:
+            with self._init_lock:
+                if self._enabled is None:
+                    try:
+                        conn = self._conn()
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                        conn.commit()
+                        self._enabled = True
+                    except Exception as e:
+                        self._enabled = False
+                        self.log(f"[review_mirror] 로컬 미러 초기화 실패 => 원격 조회로 동작: {e}")
+        return self._enabled
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=MIRROR_BUSY_TIMEOUT / 1000)
+            conn.execute(f"PRAGMA busy_timeout={MIRROR_BUSY_TIMEOUT}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    ###################################################
+    # 로컬 읽기/쓰기
+    ###################################################
+    def get(self, review_id):
+        """로컬 행 (없으면 None)"""
+        if not self.enabled:
+            return None
+        row = self._conn().execute("SELECT data FROM reviews WHERE review_id = ?", (review_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, data):
+        """이 실행기가 저장한 행을 로컬에 반영 (기존 값과 병합)"""
+        if not self.enabled or not data.get("review_id"):
+            return
+        try:
+            conn = self._conn()
+            record = self.get(data["review_id"]) or {}
+            record.update(data)
+            conn.execute(
+                "INSERT OR REPLACE INTO reviews (review_id, store_code, platform, updated_at, data, local_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (record["review_id"], record.get("store_code"), record.get("platform"),
+                 record.get("updated_at"), json.dumps(record, ensure_ascii=False), time.time())
+            )
+            conn.commit()
+        except Exception as e:
+            self.log(f"[review_mirror] 로컬 저장 실패: {e}")
+
+    def store_rows(self, store_code, platform):
+        """매장의 로컬 행 목록"""
+        if not self.enabled:
+            return []
+        rows = self._conn().execute(
+            "SELECT data FROM reviews WHERE store_code = ? AND platform = ?", (store_code, platform)
+        ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def _merge_remote(self, rows):
+        """원격 행 반영 - 최근 로컬 저장분(MIRROR_DIRTY_TTL 이내)은 유지"""
+        if not rows:
+            return 0
+        conn = self._conn()
+        fresh_after = time.time() - MIRROR_DIRTY_TTL
+        merged = 0
+        for row in rows:
+            review_id = row.get("review_id")
+            if not review_id:
+                continue
+            cur = conn.execute("SELECT local_at, updated_at FROM reviews WHERE review_id = ?", (review_id,)).fetchone()
+            if cur and cur[0] and cur[0] > fresh_after:
+                continue
+            if cur and cur[0] is None and cur[1] == row.get("updated_at"):
+                continue  # 겹치는 구간에서 다시 받은 같은 행
+            conn.execute(
+                "INSERT OR REPLACE INTO reviews (review_id, store_code, platform, updated_at, data, local_at) "
+                "VALUES (?, ?, ?, ?, ?, NULL)",
+                (review_id, row.get("store_code"), row.get("platform"), row.get("updated_at"),
+                 json.dumps(row, ensure_ascii=False))
+            )
+            merged += 1
+        conn.commit()
+        return merged
+
+    ###################################################
+    # 원격 동기화
+    ###################################################
+    def _sync_state(self, store_code, platform):
+        return self._conn().execute(
+            "SELECT watermark, synced_at FROM sync_state WHERE store_code = ? AND platform = ?",
+            (store_code, platform)
+        ).fetchone()
+
+    @staticmethod
+    def _overlap_start(watermark):
+        """기준점에서 MIRROR_SYNC_OVERLAP 분 앞당긴 조회 시작점 (형식을 모르면 기준점 그대로)"""
+        try:
+            since = datetime.fromisoformat(str(watermark).replace("Z", "+00:00"))
+        except ValueError:
+            return watermark
+        return (since - timedelta(minutes=MIRROR_SYNC_OVERLAP)).isoformat()
+
+    def is_synced(self, store_code, platform):
+        """한 번이라도 원격과 동기화된 매장인지"""
+        return self.enabled and self._sync_state(store_code, platform) is not None
+
+    def sync_store(self, store_code, platform):
+        """
+        매장 행 동기화 - 반영 행 수 반환, 실패 시 예외
+        - 처음이면 전체, 이후에는 기준점 - MIRROR_SYNC_OVERLAP 분 이후 updated_at 만
+        """
+        if not self.enabled:
+            return 0
+        state = self._sync_state(store_code, platform)
+        watermark = state[0] if state else None
+        new_watermark = watermark
+        since = self._overlap_start(watermark) if watermark else None
+        merged = 0
+        start = 0
+        while True:
+            query = (
+                self.supabase.table("reviews")
+                .select("*")
+                .eq("store_code", store_code)
+                .eq("platform", platform)
+            )
+            if since:
+                query = query.gte("updated_at", since)
+            resp = query.order("updated_at").range(start, start + MIRROR_PAGE_SIZE - 1).execute()
+            rows = resp.data or []
+            merged += self._merge_remote(rows)
+            for row in rows:
+                if row.get("updated_at") and (new_watermark is None or row["updated_at"] > new_watermark):
+                    new_watermark = row["updated_at"]
+            if len(rows) < MIRROR_PAGE_SIZE:
+                break
+            start += MIRROR_PAGE_SIZE
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (store_code, platform, watermark, synced_at) VALUES (?, ?, ?, ?)",
+            (store_code, platform, new_watermark, time.time())
+        )
+        conn.commit()
+        self.stats["synced_rows"] += merged
+        return merged
+
+    def track(self, store_code, platform):
+        """매장을 동기화 대상에 추가하고 한 번 동기화 (실패해도 로컬 미러는 계속 사용)"""
+        if not self.enabled:
+            return
+        with self._tracked_lock:
+            if (store_code, platform) in self._tracked:
+                return
+            self._tracked.add((store_code, platform))
+        try:
+            merged = self.sync_store(store_code, platform)
+            self.log(f"[review_mirror] {store_code}/{platform} 동기화: {merged}건 반영")
+        except Exception as e:
+            self.stats["sync_errors"] += 1
+            self.log(f"[review_mirror] {store_code}/{platform} 동기화 실패 (로컬 미러 사용): {e}")
+        self._ensure_thread()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._sync_loop, name="review-mirror-sync", daemon=True)
+            self._thread.start()
+
+    def _sync_loop(self):
+        while True:
+            time.sleep(self.sync_interval)
+            with self._tracked_lock:
+                scopes = list(self._tracked)
+            for store_code, platform in scopes:
+                try:
+                    merged = self.sync_store(store_code, platform)
+                    if merged:
+                        self.log(f"[review_mirror] {store_code}/{platform} 증분 동기화: {merged}건 반영")
+                except Exception as e:
+                    self.stats["sync_errors"] += 1
+                    self.log(f"[review_mirror] {store_code}/{platform} 증분 동기화 실패: {e}")
+
+    def fetch_remote(self, review_id):
+        """원격 개별 조회 후 로컬 반영 (실패 시 예외)"""
+        self.stats["remote_lookup"] += 1
+        resp = self.supabase.table("reviews").select("*").eq("review_id", review_id).execute()
+        if not resp.data:
+            return None
+        self._merge_remote(resp.data[:1])
+        return resp.data[0]
+
+    def lookup(self, review_id, store_code, platform):
+        """
+        중복 체크용 조회 (없으면 None)
+        - 동기화된 적 있는 매장: 로컬에서만 판단
+        - 동기화된 적 없는 매장: 원격 개별 조회 (실패 시 예외 - 호출측 기존 처리)
+        """
+        if not self.enabled:
+            return self._fetch_remote_only(review_id)
+        self.track(store_code, platform)
+        record = self.get(review_id)
+        if record is not None:
+            self.stats["local_hit"] += 1
+            return record
+        if self.is_synced(store_code, platform):
+            self.stats["local_miss"] += 1
+            return None
+        return self.fetch_remote(review_id)
+
+    def _fetch_remote_only(self, review_id):
+        self.stats["remote_lookup"] += 1
+        resp = self.supabase.table("reviews").select("*").eq("review_id", review_id).execute()
+        return resp.data[0] if resp.data else None
+
+    def log_stats(self):
+        s = self.stats
+        if s["local_hit"] or s["local_miss"] or s["remote_lookup"]:
+            self.log(f"[review_mirror] 중복 체크 로컬 적중 {s['local_hit']}건, 로컬 신규 {s['local_miss']}건, "
+                     f"원격 조회 {s['remote_lookup']}건, 동기화 반영 {s['synced_rows']}건, 동기화 실패 {s['sync_errors']}회")
@@ -0,0 +1,169 @@
+"""
+reviews 저장 write-behind 큐 (배민/쿠팡/요기요 공용)
+
+리뷰 행을 저장할 때마다 바로 upsert 하지 않고 큐에 넣으면,
+백그라운드 스레드가 REVIEW_WRITE_BATCH_SIZE 건 또는 REVIEW_WRITE_FLUSH_SEC 초마다
+review_id 기준 upsert 로 한 번에 저장합니다.
+- 같은 review_id 가 여러 번 들어오면 행을 합쳐 전송 (나중 값 우선, 나중 행에 없는 컬럼은 앞 행 값 유지)
+- 큐에 넣은 행은 spill 파일(jsonl)에도 기록해 비정상 종료 후 다음 실행에서 복구
+  (스크립트마다 다른 파일을 써야 함: review_write_queue_<실행기>.jsonl - 같은 파일을 쓰면 서로의 미전송 행을 복구/삭제함)
+- 실패 시 큐/spill 파일을 유지하고 다음 flush 에서 재시도
+- 전송 시점에 updated_at 을 다시 찍어, spill 파일에서 며칠 뒤 복구된 행도 review_mirror 증분 동기화에 잡히게 함
+- 병렬 실행 워커는 forward_to 로 부모 프로세스 큐에 행을 넘기고, 저장은 부모가 담당
+실행 종료 시(atexit) 남은 행을 저장합니다.
+
+사용 예:
+    review_writer = ReviewWriter(supabase, "review_write_queue_baemin.jsonl", log=print)
+    review_writer.load_spilled()       # 실행 시작 시 (부모 프로세스)
+    review_writer.start()
+    review_writer.enqueue(data)        # 저장 시
+    review_writer.flush("작업 완료")
+"""
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+
+from run_profile import timed
+
+REVIEW_WRITE_TABLE = "reviews"
+REVIEW_WRITE_BATCH_SIZE = 20      # 이 건수 이상 쌓이면 즉시 flush
+REVIEW_WRITE_FLUSH_SEC = 10       # 최대 대기 시간(초)
+
+
+class ReviewWriter:
+    """reviews 행을 모아 review_id 기준으로 일괄 upsert 하는 백그라운드 저장기"""
+
+    def __init__(self, supabase, spill_file, log=print, batch_size=REVIEW_WRITE_BATCH_SIZE,
+                 flush_sec=REVIEW_WRITE_FLUSH_SEC):
+        self.supabase = supabase
+        self.spill_file = spill_file      # 미전송 행 보관 파일 (비정상 종료 대비)
+        self.log = log
+        self.batch_size = batch_size
+        self.flush_sec = flush_sec
+        self._queue = []
+        self._result_queue = None         # 병렬 실행 워커에서는 (부모 큐, 워커 ID) - 행을 부모 프로세스로 전달
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._event = threading.Event()
+        self._thread = None
+        atexit.register(self.flush, "종료")
+
+    def forward_to(self, result_queue, worker_id):
+        """워커 프로세스: 이후 행은 부모 프로세스 큐로 전달 (spill 파일/DB 저장은 부모가 담당)"""
+        self._result_queue = (result_queue, worker_id)
+
+    def pending(self):
+        with self._lock:
+            return len(self._queue)
+
+    def _rewrite_spill_file(self, rows):
+        """미전송 행만 spill 파일에 다시 기록 (없으면 파일 삭제)"""
+        try:
+            if rows:
+                with open(self.spill_file, "w", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            elif os.path.exists(self.spill_file):
+                os.remove(self.spill_file)
+        except Exception as e:
+            self.log(f"[review_writer] spill 파일 갱신 실패: {str(e)}")
+
+    def load_spilled(self):
+        """이전 실행에서 전송하지 못한 행을 큐에 복구"""
+        if not os.path.exists(self.spill_file):
+            return 0
+        rows = []
+        try:
+            with open(self.spill_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rows.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # 기록 도중 끊긴 마지막 줄 등은 무시
+        except Exception as e:
+            self.log(f"[review_writer] spill 파일 읽기 실패: {str(e)}")
+            return 0
+
+        with self._lock:
+            self._queue[:0] = rows
+        self.log(f"[review_writer] 미전송 리뷰 {len(rows)}건 복구")
+        return len(rows)
+
+    def enqueue(self, data):
+        """리뷰 행을 큐에 추가 (DB 전송은 백그라운드에서 일괄 처리)"""
+        if self._result_queue:
+            result_queue, worker_id = self._result_queue
+            result_queue.put(("review", worker_id, data))
+            return
+
+        with self._lock:
+            self._queue.append(data)
+            try:
+                with open(self.spill_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(data, ensure_ascii=False) + "\n")
+            except Exception as e:
+                self.log(f"[review_writer] spill 파일 기록 실패: {str(e)}")
+            pending = len(self._queue)
+
+        if pending >= self.batch_size:
+            self._event.set()
+
+    @timed("db.flush")
+    def flush(self, reason=""):
+        """
+        큐에 쌓인 리뷰 행을 upsert(on_conflict=review_id)로 일괄 전송
+        - 같은 review_id가 여러 번 들어온 경우 행을 합쳐 전송 (부분 컬럼 갱신이 앞 행의 컬럼을 지우지 않도록)
+        - updated_at 은 전송 시각으로 갱신
+        - 실패 시 큐/spill 파일을 유지하고 다음 flush에서 재시도
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._queue)
+            if not batch:
+                return True
+
+            latest = {}
+            for row in batch:
+                k = row["review_id"]
+                latest[k] = {**latest.get(k, {}), **row}
+            sent_at = datetime.now().isoformat()
+            latest = {k: {**row, "updated_at": sent_at} if "updated_at" in row else row
+                      for k, row in latest.items()}
+
+            # 컬럼 구성이 같은 행끼리 묶어서 전송 (bulk upsert는 키가 동일해야 함)
+            groups = {}
+            for row in latest.values():
+                groups.setdefault(tuple(sorted(row.keys())), []).append(row)
+
+            try:
+                for rows in groups.values():
+                    self.supabase.table(REVIEW_WRITE_TABLE).upsert(rows, on_conflict="review_id").execute()
+            except Exception as e:
+                self.log(f"[review_writer] 일괄 저장 실패 ({len(latest)}건, 다음 flush에서 재시도): {str(e)}")
+                return False
+
+            with self._lock:
+                del self._queue[:len(batch)]
+                self._rewrite_spill_file(self._queue)
+
+            self.log(f"[review_writer] 리뷰 {len(latest)}건 일괄 저장{f' ({reason})' if reason else ''}")
+            return True
+
+    def _run(self):
+        """N건 또는 T초마다 큐를 비우는 백그라운드 스레드"""
+        while True:
+            self._event.wait(self.flush_sec)
+            self._event.clear()
+            self.flush()
+
+    def start(self):
+        """백그라운드 writer 스레드 시작 (한 번만)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="review-writer", daemon=True)
+        self._thread.start()
@@ -0,0 +1,155 @@
+"""
+platform_reply_rules 메모리 저장소 (배민/쿠팡/요기요 공용)
+
+실행 시작 시 플랫폼의 매장 설정을 한 번 불러와 (store_code, platform, platform_code) 로 색인하고,
+이후 매장 설정/매장명 조회는 HTTP 호출 없이 메모리에서 처리합니다.
+오래 실행되는 경우 RULES_REFRESH_INTERVAL 초마다 updated_at 이 마지막으로 본 값보다 큰 행만 다시 받아 반영합니다.
+- 증분 갱신에서 같은 id 행의 키(platform_code 등)가 바뀌면 이전 키는 제거
+- 삭제된 행은 증분 조회로 알 수 없으므로 RULES_FULL_RELOAD_INTERVAL 초마다 전체 재로드
+- 워커 프로세스처럼 load 없이 조회해도 첫 조회 시 전체 로드
+
+사용 예:
+    rules_repo = RulesRepository(supabase, ["배민", "배민1"], log=print)
+    rows = rules_repo.load()                          # fetch_platform_data 에서 1회
+    rule = rules_repo.get("STORE00001", platform_code="12345")
+    store_name = rules_repo.store_name("STORE00001", "배민")
+"""
+import threading
+import time
+
+RULES_TABLE = "platform_reply_rules"
+RULES_REFRESH_INTERVAL = 300    # 증분 갱신 주기(초)
+RULES_MISS_REFRESH_GAP = 30     # 없는 매장 조회 시 강제 갱신 최소 간격(초)
+RULES_FULL_RELOAD_INTERVAL = 3600  # 삭제된 행 정리를 위한 전체 재로드 주기(초)
+
+
+class RulesRepository:
+    """platform_reply_rules 행을 (store_code, platform, platform_code) 로 색인한 캐시"""
+
+    def __init__(self, supabase, platforms, log=print, refresh_interval=RULES_REFRESH_INTERVAL):
+        self.supabase = supabase
+        self.platforms = [platforms] if isinstance(platforms, str) else list(platforms)
+        self.log = log
+        self.refresh_interval = refresh_interval
+        self._rows = {}            # (store_code, platform, platform_code) -> 행
+        self._by_store = {}        # store_code -> [키, ...]
+        self._key_by_id = {}       # 행 id -> 키 (키가 바뀐 행의 이전 키 제거용)
+        self._max_updated_at = None
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+        self._incremental = True   # updated_at 조회 실패 시 전체 재로드로 대체
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(row):
+        return (row.get("store_code", ""), row.get("platform", ""), str(row.get("platform_code") or ""))
+
+    def _merge(self, rows):
+        with self._lock:
+            for row in rows:
+                key = self._key(row)
+                row_id = row.get("id")
+                if row_id is not None:
+                    old_key = self._key_by_id.get(row_id)
+                    if old_key is not None and old_key != key:
+                        self._drop(old_key)
+                    self._key_by_id[row_id] = key
+                if key not in self._rows:
+                    self._by_store.setdefault(key[0], []).append(key)
+                self._rows[key] = row
+                updated_at = row.get("updated_at")
+                if updated_at and (self._max_updated_at is None or updated_at > self._max_updated_at):
+                    self._max_updated_at = updated_at
+
+    def _drop(self, key):
+        """키 제거 (_lock 안에서 호출)"""
+        self._rows.pop(key, None)
+        keys = self._by_store.get(key[0])
+        if keys and key in keys:
+            keys.remove(key)
+            if not keys:
+                del self._by_store[key[0]]
+
+    def _query(self):
+        query = self.supabase.table(RULES_TABLE).select("*")
+        if len(self.platforms) == 1:
+            return query.eq("platform", self.platforms[0])
+        return query.in_("platform", self.platforms)
+
+    def load(self):
+        """전체 로드 (실행 시작 시 1회) - 행 목록 반환"""
+        response = self._query().execute()
+        rows = response.data or []
+        with self._lock:
+            self._rows = {}
+            self._by_store = {}
+            self._key_by_id = {}
+            self._max_updated_at = None
+        self._merge(rows)
+        self._loaded_at = self._refreshed_at = time.time()
+        self.log(f"[rules_repo] {'/'.join(self.platforms)} 매장 설정 {len(rows)}개 로드")
+        return rows
+
+    def refresh(self):
+        """updated_at 기준 증분 갱신 (전체 재로드 주기가 지났으면 전체) - 바뀐 행 수 반환"""
+        self._refreshed_at = time.time()
+        if (not self._incremental or self._max_updated_at is None
+                or self._refreshed_at - self._loaded_at >= RULES_FULL_RELOAD_INTERVAL):
+            return len(self.load())
+        try:
+            response = self._query().gt("updated_at", self._max_updated_at).execute()
+        except Exception as e:
+            self.log(f"[rules_repo] updated_at 증분 조회 실패 => 전체 재로드로 대체: {e}")
+            self._incremental = False
+            return len(self.load())
+        rows = response.data or []
+        if rows:
+            self._merge(rows)
+            self.log(f"[rules_repo] 매장 설정 {len(rows)}개 갱신: {', '.join(sorted({r.get('store_code', '') for r in rows}))}")
+        return len(rows)
+
+    def refresh_if_due(self):
+        if not self._loaded_at:
+            try:
+                self.load()
+            except Exception as e:
+                self.log(f"[rules_repo] 매장 설정 로드 실패: {e}")
+            return
+        if time.time() - self._refreshed_at >= self.refresh_interval:
+            try:
+                self.refresh()
+            except Exception as e:
+                self.log(f"[rules_repo] 매장 설정 갱신 실패: {e}")
+
+    def _find(self, store_code, platform=None, platform_code=None):
+        with self._lock:
+            keys = self._by_store.get(store_code, [])
+            for key in keys:
+                if platform and key[1] != platform:
+                    continue
+                if platform_code and key[2] != str(platform_code):
+                    continue
+                return self._rows[key]
+        return None
+
+    def get(self, store_code, platform=None, platform_code=None):
+        """매장 설정 행 (없으면 한 번 갱신 후 재조회, 그래도 없으면 None)"""
+        self.refresh_if_due()
+        row = self._find(store_code, platform, platform_code)
+        if row is None and time.time() - self._refreshed_at >= RULES_MISS_REFRESH_GAP:
+            try:
+                self.refresh()
+            except Exception as e:
+                self.log(f"[rules_repo] 매장 설정 갱신 실패: {e}")
+            row = self._find(store_code, platform, platform_code)
+        return row
+
+    def store_name(self, store_code, platform=None):
+        """매장명 (없으면 빈 문자열)"""
+        self.refresh_if_due()
+        row = self._find(store_code, platform) or self._find(store_code)
+        return row.get("store_name", "") if row else ""
+
+    def rows(self):
+        with self._lock:
+            return list(self._rows.values())
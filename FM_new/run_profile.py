@@ -0,0 +1,147 @@
+"""
+실행 단계별 소요시간 측정 (배민/쿠팡/요기요 공용)
+
+로그인, 팝업 처리, 매장 이동, 리뷰 카드 탐색, GPT 호출, DB 저장, 댓글 등록 등
+단계별 소요시간을 모아 실행 종료 시 p50/p95/합계 표를 출력하고 JSON 으로 저장합니다.
+저장 파일: profiles/run_profile_<플랫폼>_<시각>_<pid>.json
+
+사용 예:
+    @timed("login")
+    def login_to_baemin(...): ...
+
+    with span("scan.cards"):
+        rows = driver.find_elements(...)
+
+    print_profile_report("baemin")              # 실행 종료 시
+    print_profile_report("yogiyo", logging.info) # 출력 함수 지정
+
+실행 간 비교 (CLI):
+    python run_profile.py profiles/run_profile_baemin_A.json profiles/run_profile_baemin_B.json
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_DIR = "profiles"
+PROFILE_MAX_SAMPLES = 5000    # 단계별 보관 표본 수 (합계/횟수는 전체 기준)
+
+_stats = {}                   # 단계 -> {"calls", "total", "max", "samples"}
+_lock = threading.Lock()
+_started = time.time()
+
+
+def record(name, elapsed):
+    with _lock:
+        s = _stats.get(name)
+        if s is None:
+            s = _stats[name] = {"calls": 0, "total": 0.0, "max": 0.0, "samples": []}
+        s["calls"] += 1
+        s["total"] += elapsed
+        s["max"] = max(s["max"], elapsed)
+        if len(s["samples"]) < PROFILE_MAX_SAMPLES:
+            s["samples"].append(elapsed)
+        else:
+            s["samples"][s["calls"] % PROFILE_MAX_SAMPLES] = elapsed
+
+
+@contextmanager
+def span(name):
+    """with 블록 소요시간을 name 단계로 기록"""
+    started = time.time()
+    try:
+        yield
+    finally:
+        record(name, time.time() - started)
+
+
+def timed(name):
+    """함수 호출 소요시간을 name 단계로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.time() - started)
+        return wrapper
+    return decorator
+
+
+def percentile(values, pct):
+    """values 의 pct 백분위수 (정렬 후 가장 가까운 위치의 값, 빈 목록은 0.0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def profile_report():
+    """단계별 {calls, total, p50, p95, max} (합계 내림차순)"""
+    with _lock:
+        items = [(name, dict(s, samples=list(s["samples"]))) for name, s in _stats.items()]
+    report = {}
+    for name, s in sorted(items, key=lambda x: -x[1]["total"]):
+        report[name] = {
+            "calls": s["calls"],
+            "total": round(s["total"], 3),
+            "p50": round(percentile(s["samples"], 50), 3),
+            "p95": round(percentile(s["samples"], 95), 3),
+            "max": round(s["max"], 3)
+        }
+    return report
+
+
+def print_profile_report(tag, out=print, save=True):
+    """단계별 소요시간 표 출력 후 JSON 저장, 저장 경로 반환"""
+    report = profile_report()
+    if not report:
+        return None
+    wall = time.time() - _started
+    out(f"\n[실행 프로파일] 전체 {wall:.1f}초")
+    out(f"{'단계':<24} {'횟수':>6} {'합계(초)':>9} {'비율':>6} {'p50':>7} {'p95':>7} {'최대':>7}")
+    for name, s in report.items():
+        share = s["total"] / wall * 100 if wall else 0
+        out(f"{name:<24} {s['calls']:>6} {s['total']:>9.1f} {share:>5.1f}% {s['p50']:>7.2f} {s['p95']:>7.2f} {s['max']:>7.2f}")
+    if not save:
+        return None
+    path = os.path.join(PROFILE_DIR, f"run_profile_{tag}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.json")
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"tag": tag, "saved_at": datetime.now().isoformat(timespec="seconds"),
+                       "wall": round(wall, 3), "stages": report}, f, ensure_ascii=False, indent=2)
+        out(f"[실행 프로파일] 저장: {path}")
+    except Exception as e:
+        out(f"[실행 프로파일] 저장 실패: {e}")
+        return None
+    return path
+
+
+def compare_profiles(base_path, new_path):
+    """두 실행 프로파일의 단계별 합계/p95 차이 출력"""
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"[실행 프로파일 비교] {base_path} ({base.get('wall', 0):.1f}초) → {new_path} ({new.get('wall', 0):.1f}초)")
+    print(f"{'단계':<24} {'합계 전':>9} {'합계 후':>9} {'차이':>9} {'p95 전':>8} {'p95 후':>8}")
+    names = list(dict.fromkeys(list(new["stages"]) + list(base["stages"])))
+    for name in names:
+        b = base["stages"].get(name, {})
+        n = new["stages"].get(name, {})
+        bt, nt = b.get("total", 0.0), n.get("total", 0.0)
+        print(f"{name:<24} {bt:>9.1f} {nt:>9.1f} {nt - bt:>+9.1f} {b.get('p95', 0.0):>8.2f} {n.get('p95', 0.0):>8.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("사용법: python run_profile.py <기준 프로파일.json> <비교 프로파일.json>")
+        sys.exit(1)
+    compare_profiles(sys.argv[1], sys.argv[2])
@@ -0,0 +1,182 @@
+"""
+로그인 세션 캐시 (배민/쿠팡/요기요 공용)
+
+로그인 성공 직후 쿠키(CDP Network.getAllCookies)와 origin 의 localStorage 를 계정별 파일로 저장하고,
+다음 실행에서 복원한 뒤 로그인 상태에서만 열리는 probe URL 로 확인되면 ID/PW 입력을 생략합니다.
+- 계정 ID 는 파일명에 그대로 쓰지 않고 해시 사용
+- TTL 초과, 복원 실패, probe 페이지에서 로그인 화면으로 이동되면 저장된 세션 삭제
+- probe 확인은 고정 sleep 대신 URL 조건을 폴링: 로그인 화면으로 이동하면 즉시,
+  probe 페이지에 머문 채 로드 완료 상태가 SESSION_PROBE_STABLE_POLLS 회 연속이면 (로드 후 스크립트 이동 대비) 확정
+
+사용 예:
+    session_cache = SessionCache("baemin", "https://ceo.baemin.com", "https://self.baemin.com/", "/login", log=print)
+    if session_cache.restore(driver, platform_id, wait=wait_for):
+        ...                                      # 로그인 생략
+    session_cache.save(driver, platform_id)      # 로그인 성공 직후
+    session_cache.invalidate(platform_id, "로그아웃")
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+SESSION_CACHE_DIR = "session_cache"
+SESSION_CACHE_TTL_HOURS = 12
+SESSION_PROBE_TIMEOUT = 5.0      # probe 페이지 확인 최대 대기(초)
+SESSION_PROBE_POLL_SEC = 0.1
+SESSION_PROBE_STABLE_POLLS = 5   # probe 페이지 로드 완료 상태가 이 횟수 연속이면 로그인 상태로 판단
+SESSION_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+_LOCAL_STORAGE_DUMP_JS = (
+    "var d = {}; for (var i = 0; i < localStorage.length; i++) {"
+    " var k = localStorage.key(i); d[k] = localStorage.getItem(k); } return d;"
+)
+_LOCAL_STORAGE_LOAD_JS = (
+    "var d = arguments[0]; localStorage.clear();"
+    " for (var k in d) { localStorage.setItem(k, d[k]); }"
+)
+
+
+class SessionCache:
+    """플랫폼 하나의 계정별 로그인 세션 파일 저장/복원"""
+
+    def __init__(self, platform, origin, probe_url, login_marker, log=print, enabled=True,
+                 cache_dir=SESSION_CACHE_DIR, ttl_hours=SESSION_CACHE_TTL_HOURS):
+        self.platform = platform            # 파일명 접두어 (baemin/coupang/yogiyo)
+        self.origin = origin                # localStorage 를 저장/복원할 origin
+        self.probe_url = probe_url          # 로그인 상태에서만 열리는 가벼운 페이지
+        self.login_marker = login_marker    # 미로그인 시 이동되는 URL 에 포함된 문자열
+        self.log = log
+        self.enabled = enabled
+        self.cache_dir = cache_dir
+        self.ttl_hours = ttl_hours
+
+    def path(self, platform_id):
+        key = hashlib.sha256(f"{self.platform}_{platform_id}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{self.platform}_{key}.json")
+
+    def save(self, driver, platform_id):
+        """로그인 성공 직후 쿠키/localStorage 저장"""
+        if not self.enabled:
+            return False
+        try:
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+            local_storage = {}
+            if driver.current_url.startswith(self.origin):
+                local_storage = driver.execute_script(_LOCAL_STORAGE_DUMP_JS) or {}
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.path(platform_id), "w", encoding="utf-8") as f:
+                json.dump({
+                    "saved_at": datetime.now().isoformat(),
+                    "cookies": cookies,
+                    "local_storage": local_storage
+                }, f, ensure_ascii=False)
+            self.log(f"[session_cache] ID={platform_id} 세션 저장 (쿠키 {len(cookies)}개)")
+            return True
+        except Exception as e:
+            self.log(f"[session_cache] 세션 저장 실패: {str(e)}")
+            return False
+
+    def invalidate(self, platform_id, reason=""):
+        """저장된 세션 삭제 (로그아웃/로그인 실패/검증 실패 시)"""
+        path = self.path(platform_id)
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+                self.log(f"[session_cache] ID={platform_id} 세션 삭제{f' ({reason})' if reason else ''}")
+            except Exception as e:
+                self.log(f"[session_cache] 세션 삭제 실패: {str(e)}")
+
+    def clear_browser(self, driver):
+        """다음 계정 처리 전 브라우저 쿠키/localStorage 비우기 (서버 세션은 유지)"""
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            if driver.current_url.startswith(self.origin):
+                driver.execute_script("localStorage.clear();")
+        except Exception as e:
+            self.log(f"[session_cache] 브라우저 세션 초기화 실패: {str(e)}")
+
+    def probe_settled(self):
+        """
+        probe 결과가 정해지면 True 인 조건 (호출마다 새로 생성)
+        - 로그인 화면으로 이동: 즉시 True
+        - probe 페이지 로드 완료가 SESSION_PROBE_STABLE_POLLS 회 연속: True
+        """
+        state = {"stable": 0}
+
+        def _condition(driver):
+            url = driver.current_url or ""
+            if self.login_marker in url:
+                return True
+            if url.startswith(self.probe_url) and driver.execute_script("return document.readyState") == "complete":
+                state["stable"] += 1
+            else:
+                state["stable"] = 0
+            return state["stable"] >= SESSION_PROBE_STABLE_POLLS
+        return _condition
+
+    def _wait_probe(self, driver, condition, timeout):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                if condition(driver):
+                    return True
+            except Exception:
+                pass  # 페이지 이동 중 스크립트 실행 실패 등은 계속 대기
+            time.sleep(SESSION_PROBE_POLL_SEC)
+        return False
+
+    def restore(self, driver, platform_id, wait=None, timeout=SESSION_PROBE_TIMEOUT):
+        """
+        저장된 세션을 브라우저에 복원하고 로그인 상태인지 확인
+        - wait: wait(driver, site, condition, timeout) 형식의 대기 함수 (page_wait.wait_for 등, 없으면 자체 폴링)
+        - TTL 초과, 복원 실패, probe 페이지에서 로그인 화면으로 이동되면 세션 삭제 후 False
+        """
+        if not self.enabled:
+            return False
+        path = self.path(platform_id)
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+
+            saved_at = datetime.fromisoformat(cached["saved_at"])
+            if datetime.now() - saved_at > timedelta(hours=self.ttl_hours):
+                self.invalidate(platform_id, "TTL 만료")
+                return False
+
+            # 다른 계정 쿠키가 남아있지 않도록 비운 뒤 복원
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            cookies = []
+            for c in cached.get("cookies", []):
+                cookie = {k: c[k] for k in SESSION_COOKIE_FIELDS if k in c}
+                if c.get("session") or cookie.get("expires", -1) < 0:
+                    cookie.pop("expires", None)
+                cookies.append(cookie)
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+            local_storage = cached.get("local_storage") or {}
+            if local_storage:
+                driver.get(self.origin)
+                driver.execute_script(_LOCAL_STORAGE_LOAD_JS, local_storage)
+
+            # 로그인 상태 확인
+            driver.get(self.probe_url)
+            if wait is not None:
+                wait(driver, "session.probe", self.probe_settled(), timeout)
+            else:
+                self._wait_probe(driver, self.probe_settled(), timeout)
+            if self.login_marker in driver.current_url:
+                self.invalidate(platform_id, "세션 만료")
+                return False
+
+            self.log(f"[session_cache] ID={platform_id} 저장된 세션으로 로그인 생략")
+            return True
+        except Exception as e:
+            self.log(f"[session_cache] 세션 복원 실패: {str(e)}")
+            self.invalidate(platform_id, "복원 실패")
+            return False
@@ -0,0 +1,52 @@
+import json
+from datetime import datetime, timedelta
+
+import crawl_watermark
+from crawl_watermark import CrawlWatermarks
+
+
+def _done(review_hash):
+    return "답변완료", True, "2026-10-01"
+
+
+def _run(marks, hashes, platform, platform_code):
+    crawl = marks.begin("STORE00003", platform, platform_code)
+    for h in hashes:
+        if crawl.reached_frontier(h):
+            break
+        crawl.seen(h, "2026-10-01")
+    else:
+        crawl.complete = True
+    marks.finish(crawl, _done)
+    return crawl
+
+
+def test_shops_under_one_store_code_keep_separate_frontiers(tmp_path):
+    marks = CrawlWatermarks("yogiyo", log=lambda *_: None, watermark_dir=str(tmp_path))
+    _run(marks, ["a1", "a2"], "요기요", "111")
+    _run(marks, ["b1", "b2"], "요기요", "222")
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert marks.load("STORE00003", "요기요", "111")["frontier"] == ["a1", "a2"]
+    assert marks.load("STORE00003", "요기요", "222")["frontier"] == ["b1", "b2"]
+
+
+def test_stops_at_frontier_until_full_rescan_is_due(tmp_path):
+    marks = CrawlWatermarks("baemin", log=lambda *_: None, watermark_dir=str(tmp_path))
+    _run(marks, ["r2", "r1"], "배민", "12345")
+
+    crawl = _run(marks, ["r3", "r2", "r1"], "배민", "12345")
+    assert crawl.stopped_at == "r2"
+    assert crawl.order == [("r3", "2026-10-01", None)]
+
+    path = marks._path("STORE00003", "배민", "12345")
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    stale = datetime.now() - timedelta(hours=crawl_watermark.FULL_RESCAN_HOURS + 1)
+    state["full_scan_at"] = stale.isoformat(timespec="seconds")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+    crawl = _run(marks, ["r3", "late", "r2", "r1"], "배민", "12345")
+    assert crawl.stopped_at is None
+    assert [h for h, _, _ in crawl.order] == ["r3", "late", "r2", "r1"]
+    assert marks.load("STORE00003", "배민", "12345")["full_scan_at"] > state["full_scan_at"]
@@ -0,0 +1,143 @@
+import time
+
+import pytest
+
+import error_log_sink as els
+from error_log_sink import ErrorLogSink
+
+
+class FakeTable:
+    def __init__(self, client):
+        self.client = client
+        self.rows = None
+
+    def insert(self, rows):
+        self.rows = rows
+        return self
+
+    def execute(self):
+        if self.client.fail:
+            raise RuntimeError(self.client.fail)
+        if self.client.no_count_columns and any("occurrence_count" in r for r in self.rows):
+            raise RuntimeError("column error_logs.occurrence_count does not exist")
+        self.client.inserts.append(list(self.rows))
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.inserts = []
+        self.fail = None
+        self.no_count_columns = False
+
+    def table(self, name):
+        assert name == els.ERROR_TABLE
+        return FakeTable(self)
+
+    @property
+    def rows(self):
+        return [row for batch in self.inserts for row in batch]
+
+
+def error(message="로그인 실패", store_code="S1", occurred_at="2025-03-01T10:00:00"):
+    return {"store_code": store_code, "error_type": "login", "error_message": message, "occurred_at": occurred_at}
+
+
+@pytest.fixture
+def make_sink():
+    sinks = []
+
+    def _make(supabase, **kwargs):
+        sink = ErrorLogSink(supabase, log=lambda *a: None, **kwargs)
+        sink._ensure_thread = lambda: None      # flush 는 테스트에서 직접 호출
+        sinks.append(sink)
+        return sink
+    yield _make
+    for sink in sinks:
+        sink.supabase = FakeSupabase()          # atexit close 가 테스트 클라이언트에 쓰지 않도록
+
+
+def test_repeats_within_window_collapse_into_one_row(make_sink):
+    supabase = FakeSupabase()
+    sink = make_sink(supabase)
+    assert sink.add(error(occurred_at="2025-03-01T10:00:00")) is True
+    assert sink.add(error(occurred_at="2025-03-01T10:00:05")) is False
+    assert sink.add(error(occurred_at="2025-03-01T10:00:09")) is False
+    assert sink.add(error(store_code="S2")) is True
+
+    assert sink.flush(force=True) == 2
+    rows = {r["store_code"]: r for r in supabase.rows}
+    assert rows["S1"]["occurrence_count"] == 3
+    assert rows["S1"]["last_occurred_at"] == "2025-03-01T10:00:09"
+    assert rows["S2"]["occurrence_count"] == 1
+    assert sink.stats["merged"] == 2
+
+
+def test_flush_waits_for_dedup_window(make_sink, monkeypatch):
+    supabase = FakeSupabase()
+    sink = make_sink(supabase, dedup_window=60)
+    now = time.time()
+    monkeypatch.setattr(els.time, "time", lambda: now)
+    sink.add(error())
+    assert sink.flush() == 0
+    assert supabase.rows == []
+
+    monkeypatch.setattr(els.time, "time", lambda: now + 61)
+    assert sink.flush() == 1
+    sink.add(error())                           # 창이 지난 뒤 같은 오류는 새 행
+    assert sink.flush(force=True) == 1
+    assert [r["occurrence_count"] for r in supabase.rows] == [1, 1]
+
+
+def test_count_is_prefixed_when_count_columns_are_missing(make_sink):
+    supabase = FakeSupabase()
+    supabase.no_count_columns = True
+    sink = make_sink(supabase)
+    sink.add(error())
+    sink.add(error())
+    sink.add(error("다른 오류"))
+
+    assert sink.flush(force=True) == 2
+    messages = sorted(r["error_message"] for r in supabase.rows)
+    assert messages == ["[2회 반복] 로그인 실패", "다른 오류"]
+    assert all("occurrence_count" not in r for r in supabase.rows)
+
+
+def test_pending_is_capped_and_overflow_is_counted(make_sink):
+    supabase = FakeSupabase()
+    sink = make_sink(supabase, max_pending=4)
+    for i in range(6):
+        sink.add(error(f"오류 {i}"))
+    sink.add(error("오류 0"))                   # 대기 중인 오류는 상한과 무관하게 합쳐짐
+
+    assert len(sink._pending) == 4
+    assert sink.stats["dropped"] == 2
+    assert sink.stats["merged"] == 1
+    assert sink.flush() == 4                    # 상한의 절반 이상이면 창을 기다리지 않고 저장
+
+
+def test_failed_insert_is_retried_then_dropped(make_sink):
+    supabase = FakeSupabase()
+    supabase.fail = "offline"
+    sink = make_sink(supabase, dedup_window=0)
+    sink.add(error())
+    for _ in range(els.ERROR_MAX_RETRY):
+        assert sink.flush() == 0
+        assert len(sink._pending) == 1
+    assert sink.flush() == 0
+    assert sink._pending == {}
+    assert sink.stats["failed_rows"] == 1
+
+
+def test_close_flushes_everything_and_resets_stats(make_sink):
+    supabase = FakeSupabase()
+    sink = make_sink(supabase, dedup_window=3600)
+    sink.add(error())
+    sink.add(error())
+    sink.close()
+    assert len(supabase.rows) == 1
+    assert supabase.rows[0]["occurrence_count"] == 2
+    assert sink._pending == {}
+    assert all(v == 0 for v in sink.stats.values())
+
+    sink.close()                                # 두 번째 호출은 아무것도 저장하지 않음
+    assert len(supabase.inserts) == 1
@@ -0,0 +1,62 @@
+import json
+
+from learned_bans import LearnedBans, LEARNED_BAN_MAX_LEN
+
+
+def _store(tmp_path):
+    bans = LearnedBans(str(tmp_path / "learned_bans.json"), log=lambda *_: None)
+    bans.load()
+    return bans
+
+
+def test_single_char_popup_word_is_learned_and_avoided(tmp_path):
+    bans = _store(tmp_path)
+    bans.record("쿠팡이츠", "S001", " 꿀 ")
+    assert bans.get("쿠팡이츠", "S001") == ["꿀"]
+
+    calls = []
+
+    def regenerate(review_text, info):
+        calls.append(info)
+        return "안녕하세요! 달콤한 맛으로 보답하겠습니다."
+
+    info = {"learned_bans": bans.get("쿠팡이츠", "S001"), "author": "김고객"}
+    reply = bans.avoid("안녕하세요! 꿀맛이라니 감사합니다.", "꿀맛", info, regenerate)
+    assert reply == "안녕하세요! 달콤한 맛으로 보답하겠습니다."
+    assert calls[0]["detected_prohibited_word"] == "꿀"
+    assert calls[0]["author"] == "고객님"
+    assert bans.stats == {"popups": 1, "learned": 1, "checked": 1, "avoided": 1}
+
+
+def test_empty_and_overlong_popup_words_are_skipped(tmp_path):
+    bans = _store(tmp_path)
+    bans.record("쿠팡이츠", "S001", "")
+    bans.record("쿠팡이츠", "S001", "가" * (LEARNED_BAN_MAX_LEN + 1))
+    assert bans.get("쿠팡이츠", "S001") == []
+    assert bans.stats["popups"] == 2
+
+
+def test_reply_without_learned_word_is_kept(tmp_path):
+    bans = _store(tmp_path)
+    bans.record("쿠팡이츠", "S001", "꿀")
+    info = {"learned_bans": bans.get("쿠팡이츠", "S001")}
+    reply = "안녕하세요! 맛있게 드셔주셔서 감사합니다."
+    assert bans.avoid(reply, "", info, lambda *_: "교체") == reply
+
+
+def test_word_shared_across_stores(tmp_path):
+    bans = _store(tmp_path)
+    bans.record("쿠팡이츠", "S001", "꿀")
+    bans.record("쿠팡이츠", "S002", "꿀")
+    bans.record("쿠팡이츠", "S002", "대박")
+    assert bans.get("쿠팡이츠", "S003") == ["꿀"]
+    assert set(bans.get("쿠팡이츠", "S002")) == {"꿀", "대박"}
+
+
+def test_save_merges_with_other_process(tmp_path):
+    path = tmp_path / "learned_bans.json"
+    path.write_text(json.dumps({"쿠팡이츠": {"S009": {"짱": 3}}}, ensure_ascii=False), encoding="utf-8")
+    bans = LearnedBans(str(path), log=lambda *_: None)
+    bans.record("쿠팡이츠", "S001", "꿀")
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["쿠팡이츠"] == {"S009": {"짱": 3}, "S001": {"꿀": 1}}
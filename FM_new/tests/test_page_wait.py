@@ -0,0 +1,124 @@
+import json
+import time
+
+import pytest
+
+import page_wait as pw
+from page_wait import PageWaiter
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(pw, "WAIT_POLL_SEC", 0.001)
+
+
+def make_waiter(tmp_path, platform="baemin"):
+    return PageWaiter(platform, log=lambda *a: None, history_file=str(tmp_path / f"wait_stats_{platform}.json"))
+
+
+def test_default_history_file_uses_platform_name():
+    assert PageWaiter("coupang").history_file == "wait_stats_coupang.json"
+
+
+def test_learned_deadline_needs_min_samples(tmp_path):
+    waiter = make_waiter(tmp_path)
+    waiter.history["site"] = [0.2] * (pw.WAIT_MIN_SAMPLES - 1)
+    assert waiter.learned_deadline("site", 3.0) == 3.0
+
+
+def test_learned_deadline_is_p95_times_1_5_clamped(tmp_path):
+    waiter = make_waiter(tmp_path)
+    waiter.history["mid"] = [1.0] * 10
+    waiter.history["fast"] = [0.01] * 10
+    waiter.history["slow"] = [4.0] * 10
+    assert waiter.learned_deadline("mid", 3.0) == pytest.approx(1.5)
+    assert waiter.learned_deadline("fast", 3.0) == 0.5
+    assert waiter.learned_deadline("slow", 3.0) == 3.0
+
+
+def test_learned_deadline_follows_p95_not_mean(tmp_path):
+    waiter = make_waiter(tmp_path)
+    waiter.history["site"] = [0.4] * 19 + [1.6]
+    assert waiter.learned_deadline("site", 5.0) == pytest.approx(pw.percentile([0.4] * 19 + [1.6], 95) * 1.5)
+    assert waiter.learned_deadline("site", 5.0) > 0.6
+
+
+def test_met_wait_is_learned(tmp_path):
+    waiter = make_waiter(tmp_path)
+    assert waiter.wait_for(None, "site", lambda d: True, timeout=1.0) is True
+    assert len(waiter.history["site"]) == 1
+    assert len(waiter.new_samples["site"]) == 1
+    assert waiter.stats["site"]["calls"] == 1
+    assert waiter.stats["site"]["timeouts"] == 0
+
+
+def test_timeout_is_counted_but_not_learned(tmp_path):
+    waiter = make_waiter(tmp_path)
+    assert waiter.wait_for(None, "site", lambda d: False, timeout=0.02) is False
+    assert waiter.stats["site"]["timeouts"] == 1
+    assert "site" not in waiter.history
+    assert "site" not in waiter.new_samples
+
+
+def test_condition_errors_keep_waiting(tmp_path):
+    waiter = make_waiter(tmp_path)
+    calls = {"n": 0}
+
+    def flaky(driver):
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise RuntimeError("stale")
+        return True
+
+    assert waiter.wait_for(None, "site", flaky, timeout=1.0) is True
+    assert calls["n"] == 3
+
+
+def test_fallback_extends_to_timeout(tmp_path):
+    waiter = make_waiter(tmp_path)
+    waiter.history["site"] = [0.001] * pw.WAIT_MIN_SAMPLES    # 학습 기한 0.5초
+    start = {}
+
+    def slow(driver):
+        start.setdefault("t", time.time())
+        return time.time() - start["t"] > 0.6
+
+    assert waiter.wait_for(None, "site", slow, timeout=2.0) is True
+    assert waiter.stats["site"]["fallbacks"] == 1
+    assert waiter.stats["site"]["timeouts"] == 0
+
+
+def test_history_is_capped(tmp_path):
+    waiter = make_waiter(tmp_path)
+    for _ in range(pw.WAIT_HISTORY_SIZE + 5):
+        waiter.wait_for(None, "site", lambda d: True, timeout=1.0)
+    assert len(waiter.history["site"]) == pw.WAIT_HISTORY_SIZE
+
+
+def test_save_history_merges_other_process_samples(tmp_path):
+    waiter = make_waiter(tmp_path)
+    waiter.load_history()
+    waiter.wait_for(None, "mine", lambda d: True, timeout=1.0)
+
+    # 다른 워커가 그 사이 저장한 기록
+    with open(waiter.history_file, "w", encoding="utf-8") as f:
+        json.dump({"theirs": [0.3, 0.4], "mine": [0.2]}, f)
+
+    waiter.save_history()
+    with open(waiter.history_file, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["theirs"] == [0.3, 0.4]
+    assert saved["mine"][0] == 0.2 and len(saved["mine"]) == 2
+    assert waiter.new_samples == {}
+
+
+def test_print_stats_saves_history(tmp_path):
+    lines = []
+    waiter = PageWaiter("coupang", log=lines.append, history_file=str(tmp_path / "wait_stats_coupang.json"))
+    waiter.wait_for(None, "site", lambda d: True, timeout=1.0)
+    waiter.print_stats()
+    assert any("site" in line for line in lines)
+
+    reloaded = make_waiter(tmp_path, "coupang")
+    reloaded.load_history()
+    assert len(reloaded.history["site"]) == 1
@@ -0,0 +1,34 @@
+from prohibited_matcher import (
+    get_prohibited_matcher, parse_prohibited_words, KIND_LOCATION, KIND_PROHIBITED,
+)
+
+
+def test_parse_prohibited_words_formats():
+    assert parse_prohibited_words("['리뷰', '이벤트']") == ["리뷰", "이벤트"]
+    assert parse_prohibited_words('["리뷰", "리뷰"]') == ["리뷰"]
+    assert parse_prohibited_words("리뷰, 이벤트 , 꿀") == ["리뷰", "이벤트"]
+    assert parse_prohibited_words(None) == []
+
+
+def test_single_char_kept_only_for_extra_words():
+    assert parse_prohibited_words(["꿀", "리뷰"]) == ["리뷰"]
+    assert parse_prohibited_words(["꿀", "리뷰"], min_length=1) == ["꿀", "리뷰"]
+    matcher = get_prohibited_matcher(["꿀", "리뷰"], extra_words=["쭉"])
+    assert "꿀" not in matcher.words
+    assert "쭉" in matcher.words
+    assert matcher.mask("쫀쭉한 맛") == "쫀****한 맛"
+
+
+def test_location_words_are_opt_in():
+    text = "다음에 또 방문해 주시면 쫀쭉한 맛으로 보답할게요"
+    assert get_prohibited_matcher(["이벤트"]).mask(text) == text
+    matcher = get_prohibited_matcher(["이벤트"], location_words=True)
+    hits = matcher.find_all(text)
+    assert [(w, k) for _, _, w, k in hits] == [("방문", KIND_LOCATION)]
+
+
+def test_overlapping_hits_masked_once():
+    matcher = get_prohibited_matcher(["매장", "매장에서"], location_words=True)
+    hits = matcher.find_all("매장에서 드세요")
+    assert ("매장", KIND_PROHIBITED) in [(w, k) for _, _, w, k in hits]
+    assert matcher.mask("매장에서 드세요") == "**** 드세요"
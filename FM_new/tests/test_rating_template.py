@@ -0,0 +1,66 @@
+from rating_template import with_josa, rating_only_candidates, use_rating_template
+
+
+def test_josa_object_particle_after_any_batchim():
+    assert with_josa("족발", "을 ", "를 ") == "족발을 "
+    assert with_josa("닭발", "을 ", "를 ") == "닭발을 "
+    assert with_josa("곱창전골", "을 ", "를 ") == "곱창전골을 "
+    assert with_josa("갈비살", "을 ", "를 ") == "갈비살을 "
+    assert with_josa("치킨", "을 ", "를 ") == "치킨을 "
+    assert with_josa("피자", "을 ", "를 ") == "피자를 "
+
+
+def test_josa_rieul_exception_only_for_euro():
+    assert with_josa("갈비살", "으로서", "로서") == "갈비살로서"
+    assert with_josa("사장", "으로서", "로서") == "사장으로서"
+    assert with_josa("요리사", "으로서", "로서") == "요리사로서"
+    assert with_josa("닭발", "이", "가") == "닭발이"
+    assert with_josa("족발", "은", "는") == "족발은"
+
+
+def test_josa_non_hangul_ending_uses_plain():
+    assert with_josa("세트A", "을 ", "를 ") == "세트A를 "
+    assert with_josa("", "을 ", "를 ") == "를 "
+
+
+def _shop(**kw):
+    shop = {"greeting_start": "안녕하세요!", "greeting_end": "감사합니다.", "max_length": 350,
+            "tone": "정중하고 친절한", "role": "사장"}
+    shop.update(kw)
+    return shop
+
+
+def test_candidates_use_correct_particle_for_menu():
+    rv = {"author": "고객", "star": 5, "review_text": "", "order_menu": "족발, 막국수"}
+    assert any("족발을 " in reply for reply in rating_only_candidates(rv, _shop()))
+    for menu in ("족발", "닭발 [대]", "곱창전골(2인)", "갈비살, 콜라"):
+        rv = {"author": "고객", "star": 5, "review_text": "", "order_menu": menu}
+        for reply in rating_only_candidates(rv, _shop()):
+            assert "발를" not in reply and "골를" not in reply and "살를" not in reply
+
+
+def test_candidates_are_deterministic_and_fit_max_length():
+    rv = {"author": "고객", "star": 4, "review_text": "", "order_menu": "족발"}
+    first = list(rating_only_candidates(rv, _shop(max_length=120)))
+    assert first == list(rating_only_candidates(rv, _shop(max_length=120)))
+    assert first and all(len(r) <= 120 for r in first)
+    assert all(r.startswith("안녕하세요!\n") and r.endswith("\n감사합니다.") for r in first)
+
+
+def test_candidates_role_line_first_then_shorter():
+    rv = {"author": "고객", "star": 5, "review_text": "", "order_menu": ""}
+    replies = list(rating_only_candidates(rv, _shop()))
+    assert "사장으로서 늘 정성을 다하겠습니다." in replies[0]
+    assert "사장으로서" not in replies[-1]
+
+
+def test_low_rating_uses_apology_bank():
+    rv = {"author": "고객", "star": 1, "review_text": "", "order_menu": "족발"}
+    reply = next(rating_only_candidates(rv, _shop()))
+    assert "죄송" in reply or "마음이 무겁" in reply
+
+
+def test_use_rating_template():
+    assert use_rating_template({"review_text": ""}, {}) is True
+    assert use_rating_template({"review_text": "맛있어요"}, {}) is False
+    assert use_rating_template({"review_text": " "}, {"rating_only_template": False}) is False
@@ -0,0 +1,73 @@
+from reply_scorer import (local_score_reply, category_totals, LOCAL_SCORE_CATEGORIES, escalate_score,
+                          needs_remote_score, pass_fail_totals, SCORE_ESCALATION_MARGIN)
+
+SHOP = {"greeting_start": "안녕하세요!", "greeting_end": "감사합니다.", "max_length": 200}
+REVIEW = {"review_text": "족발이 정말 부드럽고 맛있어요", "star": 5, "order_menu": "족발 [대], 막국수"}
+GOOD = ("안녕하세요!\n"
+        "족발 부드럽고 맛있게 드셔주셔서 정말 감사합니다. 항상 정성껏 준비하겠습니다. 또 찾아주세요.\n"
+        "감사합니다.")
+
+
+def test_greeting_and_menu_mention_score_full():
+    score, details = local_score_reply(GOOD, REVIEW, SHOP)
+    assert details["format_score"]["인사말"] == 5
+    assert details["context_score"]["대응방향"] == 10
+    assert details["improvement_needed"] == []
+    assert score >= 80
+
+
+def test_missing_menu_and_greeting_are_reported():
+    reply = "맛있게 드셔주셔서 감사해요. 또 오세요."
+    score, details = local_score_reply(reply, REVIEW, SHOP)
+    assert "주문 메뉴 언급 없음" in details["improvement_needed"]
+    assert "인사말/맺음말 불일치" in details["improvement_needed"]
+    assert score < local_score_reply(GOOD, REVIEW, SHOP)[0]
+
+
+def test_over_max_length_gets_zero_length_score():
+    _, details = local_score_reply(GOOD, REVIEW, {**SHOP, "max_length": 50})
+    assert details["format_score"]["길이"] == 0
+    assert "길이 초과" in details["improvement_needed"]
+
+
+def test_low_rating_expects_apology():
+    low = {**REVIEW, "star": 2}
+    _, sorry = local_score_reply(GOOD.replace("정말 감사합니다", "죄송합니다"), low, SHOP)
+    _, thanks = local_score_reply(GOOD, low, SHOP)
+    assert sorry["context_score"]["감정이해"] > thanks["context_score"]["감정이해"]
+
+
+def test_category_totals_match_score_reply_format():
+    score, details = local_score_reply(GOOD, REVIEW, SHOP)
+    totals = category_totals(details)
+    assert set(totals) == set(LOCAL_SCORE_CATEGORIES.values()) | {"총점"}
+    assert totals["총점"] == score
+    assert sum(v for k, v in totals.items() if k != "총점") == score
+
+
+def test_escalate_score_calls_remote_only_near_threshold():
+    score, _ = local_score_reply(GOOD, REVIEW, SHOP)
+    calls = []
+
+    def remote():
+        calls.append(1)
+        return 42, {"remote": True}
+
+    assert escalate_score(GOOD, REVIEW, SHOP, remote, threshold=score, log=lambda *a: None) == (42, {"remote": True})
+    assert len(calls) == 1
+
+    far = score - SCORE_ESCALATION_MARGIN - 1
+    result_score, details = escalate_score(GOOD, REVIEW, SHOP, remote, threshold=far, log=lambda *a: None)
+    assert result_score == score and details["total_score"] == score
+    assert len(calls) == 1
+
+
+def test_escalate_score_local_result_uses_pass_fail_format():
+    score, details = local_score_reply(GOOD, REVIEW, SHOP)
+    threshold = score - SCORE_ESCALATION_MARGIN - 1
+    is_good, totals = escalate_score(GOOD, REVIEW, SHOP, lambda: (False, {}), threshold=threshold,
+                                     log=lambda *a: None, local_result=pass_fail_totals)
+    assert is_good is True
+    assert totals == category_totals(details)
+    assert not needs_remote_score(score, threshold)
+    assert needs_remote_score(score, score + SCORE_ESCALATION_MARGIN)
@@ -0,0 +1,69 @@
+import json
+import os
+from datetime import date
+
+import pytest
+
+import review_html_parser
+from review_html_parser import parse_review_cards, relative_date_to_iso, _diff_records
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+PAGE_SOURCE = os.path.join(os.path.dirname(__file__), "..", "page_source.html")
+TODAY = date(2025, 3, 31)
+
+
+def _load():
+    with open(PAGE_SOURCE, "r", encoding="utf-8") as f:
+        html = f.read()
+    with open(os.path.join(FIXTURES, "page_source_expected.json"), "r", encoding="utf-8") as f:
+        expected = json.load(f)
+    return html, expected
+
+
+@pytest.mark.parametrize("engine", ["html.parser", "lxml"])
+def test_page_source_matches_expected_records(engine, monkeypatch):
+    if engine == "lxml":
+        pytest.importorskip("lxml.html")
+    else:
+        monkeypatch.setattr(review_html_parser, "lxml_html", None)
+    html, expected = _load()
+    records = parse_review_cards(html, "S001", TODAY)
+    assert _diff_records(expected, records) == []
+
+
+def test_page_source_cards_are_in_page_order():
+    html, _ = _load()
+    records = parse_review_cards(html, "S001", TODAY)
+    positions = [r["position"] for r in records]
+    assert positions == sorted(set(positions))
+    assert all(r["author"] and r["review_hash"] for r in records)
+
+
+def test_owner_reply_block_is_not_a_card():
+    html, _ = _load()
+    records = parse_review_cards(html, "S001", TODAY)
+    assert "사장님" not in [r["author"] for r in records]
+    # 건너뛴 블록도 문서 내 순서에는 포함 (브라우저에서 같은 선택자로 다시 찾을 때 어긋나지 않도록)
+    by_author = {r["author"]: r for r in records}
+    assert by_author["사동지멘"]["position"] + 2 == by_author["다빈"]["position"]
+    assert {r["card_selector"] for r in records} == {review_html_parser.CARD_SELECTOR_LEGACY}
+
+
+def test_position_counts_every_selector_match():
+    html = (
+        '<div class="review-list">'
+        '<div class="Card"><p>배너</p></div>'
+        '<div class="Card"><p class="nick">고객1</p><p class="review-cont">맛있어요</p></div>'
+        '<div class="Card"><p class="nick">사장님</p><p class="review-cont">감사합니다</p></div>'
+        '<div class="Card"><p class="nick">고객2</p><p class="review-cont">또 시킬게요</p></div>'
+        '</div>'
+    )
+    records = parse_review_cards(html, "S001", TODAY)
+    assert [(r["author"], r["position"]) for r in records] == [("고객1", 1), ("고객2", 3)]
+
+
+def test_relative_dates_use_fixed_today():
+    assert relative_date_to_iso("오늘", TODAY) == "2025-03-31"
+    assert relative_date_to_iso("어제", TODAY) == "2025-03-30"
+    assert relative_date_to_iso("2개월 전", TODAY) == "2025-01-31"
+    assert relative_date_to_iso("지난 달", TODAY) == "2025-02-28"
@@ -0,0 +1,65 @@
+from review_mirror import ReviewMirror
+
+
+class FakeQuery:
+    def __init__(self, db):
+        self.db = db
+        self.filters = []
+        self.window = (0, None)
+
+    def select(self, *_):
+        return self
+
+    def eq(self, col, value):
+        self.filters.append(lambda r: r.get(col) == value)
+        return self
+
+    def gte(self, col, value):
+        self.filters.append(lambda r: r.get(col) >= value)
+        return self
+
+    def order(self, col):
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1)
+        return self
+
+    def execute(self):
+        rows = sorted((r for r in self.db.rows if all(f(r) for f in self.filters)), key=lambda r: r["updated_at"])
+        return type("Resp", (), {"data": [dict(r) for r in rows[self.window[0]:self.window[1]]]})()
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.rows = []
+
+    def table(self, name):
+        return FakeQuery(self)
+
+
+def _row(review_id, updated_at):
+    return {"review_id": review_id, "store_code": "STORE00001", "platform": "배민", "updated_at": updated_at}
+
+
+def test_incremental_sync_picks_up_late_rows_within_overlap(tmp_path):
+    supabase = FakeSupabase()
+    supabase.rows = [_row("a", "2026-10-18T12:00:00"), _row("b", "2026-10-18T12:10:00")]
+    mirror = ReviewMirror(supabase, "test", log=lambda *_: None, db_path=str(tmp_path / "m.db"))
+    assert mirror.sync_store("STORE00001", "배민") == 2
+
+    # 클라이언트 시각이 기준점(12:10)보다 이른 행이 뒤늦게 저장됨
+    supabase.rows.append(_row("late", "2026-10-18T12:05:00"))
+    assert mirror.sync_store("STORE00001", "배민") == 1
+    assert mirror.get("late") is not None
+
+    # 겹치는 구간의 같은 행은 다시 반영하지 않음
+    assert mirror.sync_store("STORE00001", "배민") == 0
+
+
+def test_db_file_is_created_on_first_use(tmp_path):
+    path = tmp_path / "lazy.db"
+    mirror = ReviewMirror(FakeSupabase(), "test", log=lambda *_: None, db_path=str(path))
+    assert not path.exists()
+    assert mirror.get("missing") is None
+    assert path.exists()
@@ -0,0 +1,80 @@
+import json
+
+from review_writer import ReviewWriter
+
+
+class FakeTable:
+    def __init__(self, db, fail):
+        self.db, self.fail, self.rows = db, fail, None
+
+    def upsert(self, rows, on_conflict=None):
+        self.rows = rows
+        return self
+
+    def execute(self):
+        if self.fail:
+            raise RuntimeError("offline")
+        for row in self.rows:
+            self.db[row["review_id"]] = row
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.db = {}
+        self.fail = False
+
+    def table(self, name):
+        return FakeTable(self.db, self.fail)
+
+
+def test_flush_keeps_last_row_per_review_id(tmp_path):
+    supabase = FakeSupabase()
+    writer = ReviewWriter(supabase, str(tmp_path / "q.jsonl"), log=lambda *_: None)
+    writer.enqueue({"review_id": "a", "status": "대기"})
+    writer.enqueue({"review_id": "a", "status": "답변완료"})
+    writer.enqueue({"review_id": "b", "status": "답변완료"})
+    assert writer.flush()
+    assert supabase.db["a"]["status"] == "답변완료"
+    assert writer.pending() == 0
+    assert not (tmp_path / "q.jsonl").exists()
+
+
+def test_flush_merges_partial_rows_per_review_id(tmp_path):
+    supabase = FakeSupabase()
+    writer = ReviewWriter(supabase, str(tmp_path / "q.jsonl"), log=lambda *_: None)
+    writer.enqueue({"review_id": "a", "status": "대기", "review_content": "맛있어요", "rating": 5})
+    writer.enqueue({"review_id": "a", "status": "답변완료", "ai_response": "감사합니다"})
+    assert writer.flush()
+    assert supabase.db["a"] == {"review_id": "a", "status": "답변완료", "review_content": "맛있어요",
+                                "rating": 5, "ai_response": "감사합니다"}
+
+
+def test_failed_flush_is_recovered_from_own_spill_file(tmp_path):
+    supabase = FakeSupabase()
+    supabase.fail = True
+    first = ReviewWriter(supabase, str(tmp_path / "review_write_queue_a.jsonl"), log=lambda *_: None)
+    other = ReviewWriter(supabase, str(tmp_path / "review_write_queue_b.jsonl"), log=lambda *_: None)
+    first.enqueue({"review_id": "a"})
+    assert not first.flush()
+    lines = (tmp_path / "review_write_queue_a.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(l)["review_id"] for l in lines] == ["a"]
+
+    assert other.load_spilled() == 0
+    supabase.fail = False
+    restarted = ReviewWriter(supabase, str(tmp_path / "review_write_queue_a.jsonl"), log=lambda *_: None)
+    assert restarted.load_spilled() == 1
+    assert restarted.flush()
+    assert "a" in supabase.db
+
+
+def test_worker_forwards_rows_to_parent(tmp_path):
+    class Queue(list):
+        put = list.append
+
+    parent = Queue()
+    writer = ReviewWriter(FakeSupabase(), str(tmp_path / "q.jsonl"), log=lambda *_: None)
+    writer.forward_to(parent, 3)
+    writer.enqueue({"review_id": "a"})
+    assert parent == [("review", 3, {"review_id": "a"})]
+    assert writer.pending() == 0
+    assert not (tmp_path / "q.jsonl").exists()
@@ -0,0 +1,73 @@
+import rules_repository
+from rules_repository import RulesRepository
+
+
+class FakeQuery:
+    def __init__(self, db):
+        self.db = db
+        self.filters = []
+
+    def select(self, *_):
+        return self
+
+    def eq(self, col, value):
+        self.filters.append(lambda r: r.get(col) == value)
+        return self
+
+    def in_(self, col, values):
+        self.filters.append(lambda r: r.get(col) in values)
+        return self
+
+    def gt(self, col, value):
+        self.filters.append(lambda r: (r.get(col) or "") > value)
+        return self
+
+    def execute(self):
+        self.db.calls += 1
+        return type("Resp", (), {"data": [dict(r) for r in self.db.rows if all(f(r) for f in self.filters)]})()
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def table(self, name):
+        return FakeQuery(self)
+
+
+def _row(id, code, platform_code, name, updated_at):
+    return {"id": id, "store_code": code, "platform": "요기요", "platform_code": platform_code,
+            "store_name": name, "updated_at": updated_at}
+
+
+def test_store_name_loads_on_first_lookup():
+    supabase = FakeSupabase([_row(1, "STORE00003", "111", "본점", "2026-01-01")])
+    repo = RulesRepository(supabase, "요기요", log=lambda *_: None)
+    assert repo.store_name("STORE00003", "요기요") == "본점"
+    assert supabase.calls == 1
+
+
+def test_incremental_refresh_drops_rekeyed_row():
+    supabase = FakeSupabase([_row(1, "STORE00003", "111", "본점", "2026-01-01")])
+    repo = RulesRepository(supabase, "요기요", log=lambda *_: None)
+    repo.load()
+    supabase.rows[0] = _row(1, "STORE00003", "222", "본점", "2026-01-02")
+    assert repo.refresh() == 1
+    assert repo._find("STORE00003", "요기요", "111") is None
+    assert repo._find("STORE00003", "요기요", "222")["platform_code"] == "222"
+    assert len(repo.rows()) == 1
+
+
+def test_full_reload_drops_deleted_rows(monkeypatch):
+    supabase = FakeSupabase([_row(1, "STORE00001", "111", "A", "2026-01-01"),
+                             _row(2, "STORE00002", "222", "B", "2026-01-01")])
+    repo = RulesRepository(supabase, "요기요", log=lambda *_: None)
+    repo.load()
+    del supabase.rows[1]
+    repo.refresh()
+    assert repo._find("STORE00002") is not None      # 증분 조회로는 삭제를 알 수 없음
+    monkeypatch.setattr(rules_repository, "RULES_FULL_RELOAD_INTERVAL", 0)
+    repo.refresh()
+    assert repo._find("STORE00002") is None
+    assert repo.store_name("STORE00001") == "A"
@@ -0,0 +1,120 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import session_cache as sc
+from session_cache import SessionCache
+
+ORIGIN = "https://ceo.example.com"
+PROBE = "https://ceo.example.com/reviews/"
+
+
+class FakeDriver:
+    """쿠키/localStorage/URL 만 흉내낸 드라이버 (probe 이동 결과는 redirect_to 로 지정)"""
+
+    def __init__(self, redirect_to=None):
+        self.cookies = []
+        self.local_storage = {}
+        self.current_url = "about:blank"
+        self.redirect_to = redirect_to
+        self.visited = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.getAllCookies":
+            return {"cookies": list(self.cookies)}
+        if cmd == "Network.clearBrowserCookies":
+            self.cookies = []
+        if cmd == "Network.setCookies":
+            self.cookies = list(params["cookies"])
+        return {}
+
+    def execute_script(self, script, *args):
+        if "document.readyState" in script:
+            return "complete"
+        if "localStorage.setItem" in script:
+            self.local_storage = dict(args[0])
+            return None
+        if "localStorage.clear" in script:
+            self.local_storage = {}
+            return None
+        return dict(self.local_storage)
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = self.redirect_to if (url == PROBE and self.redirect_to) else url
+
+
+def _cache(tmp_path):
+    return SessionCache("test", ORIGIN, PROBE, "/login", log=lambda *_: None, cache_dir=str(tmp_path))
+
+
+def _saved(tmp_path, cache):
+    driver = FakeDriver()
+    driver.current_url = ORIGIN + "/home"
+    driver.cookies = [{"name": "sid", "value": "abc", "domain": ".example.com", "expires": -1, "session": True}]
+    driver.local_storage = {"token": "t1"}
+    assert cache.save(driver, "user1")
+    return driver
+
+
+def test_save_and_restore_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(sc, "SESSION_PROBE_POLL_SEC", 0)
+    cache = _cache(tmp_path)
+    _saved(tmp_path, cache)
+    assert "user1" not in os.path.basename(cache.path("user1"))
+
+    driver = FakeDriver()
+    assert cache.restore(driver, "user1")
+    assert driver.cookies == [{"name": "sid", "value": "abc", "domain": ".example.com"}]
+    assert driver.local_storage == {"token": "t1"}
+    assert driver.visited == [ORIGIN, PROBE]
+    assert os.path.exists(cache.path("user1"))
+
+
+def test_redirect_to_login_invalidates(tmp_path):
+    cache = _cache(tmp_path)
+    _saved(tmp_path, cache)
+    driver = FakeDriver(redirect_to=ORIGIN + "/login?next=reviews")
+    calls = []
+
+    def wait(drv, site, condition, timeout):
+        calls.append(site)
+        return condition(drv)   # 로그인 화면 이동은 첫 확인에서 바로 확정
+
+    assert not cache.restore(driver, "user1", wait=wait)
+    assert calls == ["session.probe"]
+    assert not os.path.exists(cache.path("user1"))
+
+
+def test_probe_needs_stable_polls_on_probe_page(tmp_path):
+    cache = _cache(tmp_path)
+    driver = FakeDriver()
+    driver.current_url = PROBE
+    condition = cache.probe_settled()
+    results = [condition(driver) for _ in range(sc.SESSION_PROBE_STABLE_POLLS)]
+    assert results[:-1] == [False] * (sc.SESSION_PROBE_STABLE_POLLS - 1)
+    assert results[-1] is True
+
+
+def test_expired_session_is_removed(tmp_path):
+    cache = _cache(tmp_path)
+    _saved(tmp_path, cache)
+    path = cache.path("user1")
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["saved_at"] = (datetime.now() - timedelta(hours=sc.SESSION_CACHE_TTL_HOURS + 1)).isoformat()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    driver = FakeDriver()
+    assert not cache.restore(driver, "user1")
+    assert driver.visited == []
+    assert not os.path.exists(path)
+
+
+def test_disabled_cache_does_nothing(tmp_path):
+    cache = SessionCache("test", ORIGIN, PROBE, "/login", log=lambda *_: None, enabled=False,
+                         cache_dir=str(tmp_path))
+    assert not cache.save(FakeDriver(), "user1")
+    assert not cache.restore(FakeDriver(), "user1")
+    assert os.listdir(tmp_path) == []
@@ -1,8 +1,15 @@
 import os
+import sys
 import json
 import time
+import asyncio
+import sqlite3
+import difflib
 import traceback
 import logging
+import threading
+import multiprocessing
+import queue
 from datetime import datetime, timedelta
 import hashlib
 import re
@@ -22,6 +29,17 @@ from selenium.common.exceptions import (
 
 # Supabase & OpenAI 설정
 from supabase import create_client, Client
+from prohibited_matcher import get_prohibited_matcher, KIND_LOCATION
+from rating_template import use_rating_template, rating_only_candidates
+from reply_scorer import local_score_reply, escalate_score, needs_remote_score, SCORE_ESCALATION_MARGIN
+from review_events import ReviewEventLog
+from rules_repository import RulesRepository
+from error_log_sink import ErrorLogSink
+from review_mirror import ReviewMirror
+from review_writer import ReviewWriter
+from crawl_watermark import CrawlWatermarks
+from run_profile import timed, span, print_profile_report, percentile
+from session_cache import SessionCache
 import openai
 from dotenv import load_dotenv
 
@@ -44,6 +62,21 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 client = openai  # OpenAI 클라이언트
 
+# 리뷰별 처리 단계 이벤트 로그 (events/review_events_yogiyo_*.jsonl)
+review_events = ReviewEventLog("요기요", "yogiyo")
+
+# platform_reply_rules 메모리 저장소 (fetch_yogiyo_data 에서 로드, updated_at 증분 갱신)
+rules_repo = RulesRepository(supabase, "요기요", log=logging.info)
+
+# error_logs 비동기 저장 (같은 오류는 60초 안에 한 행으로 합쳐 배치 insert)
+error_sink = ErrorLogSink(supabase, log=logging.info)
+
+# reviews 로컬 미러 (review_mirror_yogiyo.db, 중복 체크를 로컬에서 처리하고 updated_at 기준 백그라운드 동기화)
+review_mirror = ReviewMirror(supabase, "yogiyo", log=logging.info)
+
+# 매장별 크롤링 기준점 (watermarks/yogiyo_*.json, 처리 끝난 구간에 도달하면 스크롤 중단)
+crawl_watermarks = CrawlWatermarks("yogiyo", log=logging.info)
+
 CONFIG_FILE = 'config_yogiyo.json'
 
 # 세션 내 처리된 리뷰 관리
@@ -89,6 +122,18 @@ def extract_date_from_html(element):
                 date_text = text
                 break
         
+        return normalize_review_date(date_text)
+            
+    except Exception as e:
+        logging.error(f"[extract_date_from_html] 날짜 추출 오류: {e}")
+        return datetime.now().strftime("%Y-%m-%d")
+
+def normalize_review_date(date_text):
+    """
+    리뷰 날짜 텍스트를 'YYYY-MM-DD' 형식으로 변환
+    - 빈 값, '분 전', '시간 전' 등은 오늘 날짜
+    """
+    try:
         # 날짜 요소를 찾지 못한 경우
         if not date_text:
             return datetime.now().strftime("%Y-%m-%d")
@@ -107,7 +152,7 @@ def extract_date_from_html(element):
             return datetime.now().strftime("%Y-%m-%d")
             
     except Exception as e:
-        logging.error(f"[extract_date_from_html] 날짜 추출 오류: {e}")
+        logging.error(f"[normalize_review_date] 날짜 변환 오류: {e}")
         return datetime.now().strftime("%Y-%m-%d")
 
 ###################################################################
@@ -118,20 +163,15 @@ def fetch_yogiyo_data():
     platform_reply_rules 테이블에서 요기요 데이터를 가져옴
     """
     try:
-        response = (
-            supabase
-            .table("platform_reply_rules")
-            .select("*")
-            .eq("platform", "요기요")
-            .execute()
-        )
+        # 매장 설정은 저장소에 한 번 로드 (이후 get_shop_info 등은 메모리에서 조회)
+        data = rules_repo.load()
 
-        if not response.data:
+        if not data:
             logging.warning("[fetch_yogiyo_data] 요기요용 platform_reply_rules 데이터가 없습니다.")
             return []
 
         rows = []
-        for item in response.data:
+        for item in data:
             row = {
                 "store_code": item["store_code"],
                 "store_name": item.get("store_name", ""),
@@ -149,7 +189,9 @@ def fetch_yogiyo_data():
                 "rating_3_reply": item.get("rating_3_reply", True),
                 "rating_2_reply": item.get("rating_2_reply", True),
                 "rating_1_reply": item.get("rating_1_reply", True),
-                "store_type": item.get("store_type", "delivery_only")
+                "store_type": item.get("store_type", "delivery_only"),
+                "reply_engine": item.get("reply_engine") or REPLY_ENGINE_DEFAULT,
+                "rating_only_template": item.get("rating_only_template")
             }
             rows.append(row)
 
@@ -159,6 +201,19 @@ def fetch_yogiyo_data():
         logging.error(f"[fetch_yogiyo_data] 오류: {e}")
         return []
 
+def group_by_credentials(data_list):
+    """
+    같은 계정(platform_id, platform_pw)을 쓰는 매장끼리 묶음
+    """
+    grouped = {}
+    for item in data_list:
+        key = (item["platform_id"], item["platform_pw"])
+        if key not in grouped:
+            grouped[key] = []
+        grouped[key].append(item)
+    logging.info(f"[group_by_credentials] 그룹화된 계정 수: {len(grouped)}")
+    return grouped
+
 # 2. 리뷰-답변 일치 검증 함수 추가
 def verify_review_reply_match(driver, review_element, review_data):
     """
@@ -201,13 +256,8 @@ def save_error_log_to_supabase(
     error_logs 테이블에 오류 기록
     """
     try:
-        # 매장명 조회
-        store_query = supabase.table("platform_reply_rules") \
-                             .select("store_name") \
-                             .eq("store_code", store_code) \
-                             .eq("platform", "요기요") \
-                             .execute()
-        store_name = store_query.data[0].get("store_name", "") if store_query.data else ""
+        # 매장명 조회 (매장 설정 저장소, 워커 프로세스는 첫 조회 시 1회 로드)
+        store_name = rules_repo.store_name(store_code, "요기요")
 
         data = {
             "store_code": store_code,
@@ -219,8 +269,9 @@ def save_error_log_to_supabase(
             "occurred_at": datetime.now().isoformat(),
             "store_name": store_name
         }
-        res = supabase.table("error_logs").insert(data).execute()
-        logging.info(f"[save_error_log_to_supabase] 에러 로그 저장: {store_code}/{error_type}")
+        # 바로 insert 하지 않고 대기열에 추가 (같은 오류는 합쳐서 백그라운드에서 일괄 저장)
+        if error_sink.add(data):
+            logging.info(f"[save_error_log_to_supabase] 에러 로그 대기열 추가: {store_code}/{error_type}")
     except Exception as ex:
         logging.error(f"[save_error_log_to_supabase] 에러 로그 저장 오류: {ex}")
 
@@ -248,11 +299,27 @@ def generate_review_hash(store_code: str, author: str, review_text: str) -> str:
     """
     store_code + author(닉네임) + review_text를 합쳐 md5 해시를 생성
     """
-    base_str = f"{store_code}_{author}_{review_text}"
-    hash_val = hashlib.md5(base_str.encode("utf-8")).hexdigest()
+    hash_val = _review_hash(store_code, author, review_text)
     logging.info(f"[generate_review_hash] hash={hash_val[:8]}...")
     return hash_val
 
+def _review_hash(store_code, author, review_text):
+    """generate_review_hash 와 같은 해시 (로그 없음 - 스크롤 중 기준점 확인용)"""
+    base_str = f"{store_code}_{author}_{review_text}"
+    return hashlib.md5(base_str.encode("utf-8")).hexdigest()
+
+def crawl_status_from_mirror(review_hash):
+    """
+    크롤링 기준점 계산용 리뷰 상태 (상태, 처리끝 여부, review_date)
+    - 답변완료 / 사장님 확인필요 / 재시도 초과는 처리 끝 (_check_duplicate_review 스킵 기준)
+    - 재시도 초과 항목은 다시 열리지 않으므로 상태를 비워 사장님 확인필요 목록에서 제외
+    """
+    record = review_mirror.get(review_hash) or {}
+    status = record.get("response_status") or ""
+    if (record.get("retry_count") or 0) >= 3:
+        return "", True, record.get("review_date", "")
+    return status, status in ("답변완료", "사장님 확인필요"), record.get("review_date", "")
+
 def extract_date_from_review_id(review_id):
     """리뷰 ID에서 날짜를 추출하여 YYYY-MM-DD 형식으로 반환"""
     try:
@@ -295,14 +362,13 @@ def _check_duplicate_review(driver, store_code, review_hash, author, review_text
             
         today = datetime.now().date()
         
-        # 기존 리뷰 조회
-        existing = supabase.table("reviews").select("*").eq("review_id", review_hash).execute()
-        
-        if not existing.data:
+        # 기존 리뷰 조회 (로컬 미러 우선, 동기화된 적 없는 매장만 DB 조회)
+        record = review_mirror.lookup(review_hash, store_code, "요기요")
+        if not record:
             # 새 리뷰
             return False
+        known_review_records[review_hash] = record
             
-        record = existing.data[0]
         status = record.get('response_status', '')
         record_date_str = record.get('review_date', '')
         retry_count = record.get('retry_count', 0)
@@ -363,6 +429,9 @@ def initialize_driver():
     options = uc.ChromeOptions()
     options.add_argument("--start-maximized")
     options.add_argument("--disable-notifications")
+    if worker_profile_dir:
+        # 병렬 실행 워커는 전용 프로필 사용
+        options.add_argument(f"--user-data-dir={worker_profile_dir}")
     
     try:
         # 최신 버전 undetected_chromedriver에서는 executable_path 직접 지정 옵션
@@ -430,6 +499,7 @@ def check_and_close_new_windows(driver, store_code=None):
     
     return main_window  # 메인 창 핸들 반환
 
+@timed("popup")
 def close_popups(driver, timeout=5):
     """
     요기요 사이트의 팝업 닫기
@@ -456,10 +526,27 @@ def close_popups(driver, timeout=5):
 ###################################################################
 # 6) 로그인 및 페이지 이동
 ###################################################################
+# 로그인 세션 캐시 (session_cache.py): 쿠키 + localStorage를 계정별 파일로 보관
+SESSION_CACHE_ENABLED = True
+session_cache = SessionCache(
+    "yogiyo",
+    origin="https://ceo.yogiyo.co.kr",
+    probe_url="https://ceo.yogiyo.co.kr/reviews/",
+    login_marker="/login",
+    enabled=SESSION_CACHE_ENABLED, log=logging.info
+)
+
+@timed("login")
 def login_to_yogiyo(driver, store_code, platform_id, platform_pw):
     """
     요기요 로그인 (platform_id, platform_pw 사용)
+    - 저장된 세션이 유효하면 ID/PW 입력 생략
     """
+    if session_cache.restore(driver, platform_id):
+        close_popups(driver, 5)
+        logging.info(f"[로그인성공] store_code={store_code} (저장된 세션)")
+        return True
+
     try:
         max_attempts = 3
         for attempt in range(1, max_attempts+1):
@@ -489,6 +576,7 @@ def login_to_yogiyo(driver, store_code, platform_id, platform_pw):
                     if errtxt:
                         logging.warning(f"[로그인] 에러 메시지: {errtxt}")
                 if attempt == max_attempts:
+                    session_cache.invalidate(platform_id, "로그인 실패")
                     take_screenshot(driver, store_code, "로그인실패")
                     save_error_log_to_supabase(
                         category="오류",
@@ -504,10 +592,12 @@ def login_to_yogiyo(driver, store_code, platform_id, platform_pw):
             # 팝업 닫기
             close_popups(driver, 5)
             logging.info(f"[로그인성공] store_code={store_code}")
+            session_cache.save(driver, platform_id)
             return True
             
     except Exception as ex:
         logging.error(f"[로그인실패] store_code={store_code}, {ex}")
+        session_cache.invalidate(platform_id, "로그인 실패")
         take_screenshot(driver, store_code, "로그인실패")
         save_error_log_to_supabase(
             category="오류",
@@ -553,6 +643,7 @@ def select_store(driver, store_code, platform_code):
         logging.error(f"[select_store] store_code={store_code} => {ex}")
         return False
 
+@timed("navigate")
 def navigate_to_reviews(driver, store_code, platform_code):
     """
     리뷰 페이지로 이동하고 미답변 탭 선택
@@ -599,81 +690,134 @@ def navigate_to_reviews(driver, store_code, platform_code):
 ###################################################################
 # 7) 리뷰 크롤링 및 데이터 가져오기
 ###################################################################
-def scroll_to_bottom(driver):
-    """무한 스크롤로 전체 리뷰 로드"""
+@timed("scan.scroll")
+def scroll_to_bottom(driver, stop_check=None):
+    """
+    무한 스크롤로 전체 리뷰 로드
+    - stop_check(driver) 가 True 면 더 내리지 않음 (크롤링 기준점 도달)
+    - 반환: "end"(목록 끝) / "watermark"(기준점 도달) / "max"(최대 스크롤 횟수)
+    """
     last_h = driver.execute_script("return document.body.scrollHeight")
     scroll_count = 0
     max_scrolls = 10  # 최대 스크롤 횟수 제한
     
     while scroll_count < max_scrolls:
+        if stop_check and stop_check(driver):
+            return "watermark"
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         time.sleep(2)
         new_h = driver.execute_script("return document.body.scrollHeight")
         if new_h == last_h:
-            break
+            return "end"
         last_h = new_h
         scroll_count += 1
+    return "max"
+
+# 리뷰 카드 정보를 한 번에 추출하는 스크립트
+# - 카드마다 find_element/.text 를 반복 호출하지 않고 execute_script 1회로 전체 카드 정보를 가져옴
+REVIEW_CARD_EXTRACT_JS = r"""
+function txt(el) {
+    return ((el && (el.innerText || el.textContent)) || '').trim();
+}
+function joinTexts(els) {
+    var out = [];
+    for (var i = 0; i < els.length; i++) {
+        var t = txt(els[i]);
+        if (t) out.push(t);
+    }
+    return out.join(', ');
+}
+
+var cards = document.querySelectorAll('div.ReviewItem__Container-sc-1oxgj67-0');
+var result = [];
+for (var i = 0; i < cards.length; i++) {
+    var card = cards[i];
+    var starEl = card.querySelector('h6.cknzqP');
+    var authorEl = card.querySelector('h6.Typography__StyledTypography-sc-r9ksfy-0');
+    var textEl = card.querySelector('p.ReviewItem__CommentTypography-sc-1oxgj67-3');
+
+    var dateText = '';
+    var dateEls = card.querySelectorAll('p.Typography__StyledTypography-sc-r9ksfy-0.jwoVKl');
+    for (var d = 0; d < dateEls.length; d++) {
+        var dt = txt(dateEls[d]);
+        if (/^\d{4}\.\d{2}\.\d{2}/.test(dt)) { dateText = dt; break; }
+    }
+
+    result.push({
+        element: card,
+        index: i,
+        has_reply_button: !!card.querySelector('button.ReviewReply__AddReplyButton-sc-1536a88-9'),
+        star_text: starEl ? txt(starEl) : null,
+        author: authorEl ? txt(authorEl) : null,
+        review_text: textEl ? txt(textEl) : null,
+        order_menu: joinTexts(card.querySelectorAll('.ReviewMenus-module__menuName')),
+        delivery_review: joinTexts(card.querySelectorAll('.Badge_b_9yfm_19agxism')),
+        date_text: dateText
+    });
+}
+return result;
+"""
 
 # 3. crawl_review_data 함수 수정 - 날짜 추출 추가
-def crawl_review_data(driver, store_code):
+@timed("scan.cards")
+def crawl_review_data(driver, store_code, crawl=None):
     """
     요기요 리뷰 페이지에서 리뷰 카드 정보 크롤링
+    - 카드 정보는 REVIEW_CARD_EXTRACT_JS 한 번으로 추출하고, element 는 답글 등록용으로만 보관
+    - crawl(매장 크롤링 기준점)이 있으면 기준점 카드가 로드되는 즉시 스크롤을 멈추고 그 아래 카드는 제외
     """
+    crawl_started = time.time()   # 리뷰 처리 이벤트 시작 시각 (review_events)
     try:
-        scroll_to_bottom(driver)
+        stop_check = None
+        if crawl is not None and crawl.can_stop_early():
+            def stop_check(drv):
+                loaded = drv.execute_script(REVIEW_CARD_EXTRACT_JS) or []
+                return any(
+                    _review_hash(store_code, c.get("author"), c.get("review_text")) in crawl.frontier
+                    for c in loaded if c.get("author") is not None and c.get("review_text") is not None
+                )
+        scroll_result = scroll_to_bottom(driver, stop_check)
         time.sleep(2)
-        elements = driver.find_elements(By.CSS_SELECTOR, "div.ReviewItem__Container-sc-1oxgj67-0")
-        logging.info(f"[크롤링] store_code={store_code}, 리뷰카드={len(elements)}개 발견")
+        cards = driver.execute_script(REVIEW_CARD_EXTRACT_JS) or []
+        crawled_at = time.time()
+        logging.info(f"[크롤링] store_code={store_code}, 리뷰카드={len(cards)}개 발견 (스크롤: {scroll_result})")
+        if crawl is not None and scroll_result == "end":
+            crawl.complete = True
 
         reviews=[]
-        for element in elements:
+        for card in cards:
+            # 크롤링 기준점 확인 (최신순, 이후 카드는 지난 실행에서 모두 처리 끝)
+            if crawl is not None and card.get("author") is not None and card.get("review_text") is not None:
+                card_hash = _review_hash(store_code, card["author"], card["review_text"])
+                if crawl.reached_frontier(card_hash):
+                    logging.info(f"[크롤링] store_code={store_code}, 기준점 도달 (해시: {card_hash[:8]}), 이후 카드 {len(cards) - card.get('index', 0) - 1}개 제외")
+                    break
+                # 답글 버튼이 없는 카드는 이미 답변된 리뷰
+                crawl.seen(card_hash, normalize_review_date(card.get("date_text")),
+                           settled=True if not card.get("has_reply_button") else None)
             try:
                 # 답글 버튼이 있는 리뷰만 필터링
-                add_btn = element.find_elements(By.CSS_SELECTOR, "button.ReviewReply__AddReplyButton-sc-1536a88-9")
-                if not add_btn:
+                if not card.get("has_reply_button"):
                     continue
-                    
-                # 별점
-                star_el = element.find_element(By.CSS_SELECTOR, "h6.cknzqP")
-                star_val = float(star_el.text.strip())
-                
-                # 작성자명
-                author_el = element.find_element(By.CSS_SELECTOR, "h6.Typography__StyledTypography-sc-r9ksfy-0")
-                author = author_el.text.strip()
                 
-                # 리뷰 텍스트
-                txt_el = element.find_element(By.CSS_SELECTOR, "p.ReviewItem__CommentTypography-sc-1oxgj67-3")
-                review_text = txt_el.text.strip()
-                
-                # 메뉴 정보 추출 시도 (있을 경우만)
-                order_menu = ""
-                try:
-                    menu_els = element.find_elements(By.CSS_SELECTOR, ".ReviewMenus-module__menuName")
-                    if menu_els:
-                        order_menu = ", ".join([m.text.strip() for m in menu_els if m.text.strip()])
-                except:
-                    pass
+                # 필수 요소(별점/작성자/리뷰 텍스트) 확인
+                missing = [k for k in ("star_text", "author", "review_text") if card.get(k) is None]
+                if missing:
+                    raise ValueError(f"카드 {card.get('index')} 필수 요소 없음: {missing}")
                     
-                # 배달 평가 추출 시도 (있을 경우만)
-                delivery_review = ""
-                try:
-                    del_els = element.find_elements(By.CSS_SELECTOR, ".Badge_b_9yfm_19agxism")
-                    if del_els:
-                        delivery_review = ", ".join([d.text.strip() for d in del_els if d.text.strip()])
-                except:
-                    pass
-                
-                # 리뷰 날짜 추출 (새로 추가)
-                review_date = extract_date_from_html(element)
+                # 별점
+                star_val = float(card["star_text"])
 
                 reviews.append({
-                    "author": author,
+                    "author": card["author"],
                     "star": star_val,
-                    "review_text": review_text,
-                    "review_date": review_date,  # 추출한 날짜 추가
-                    "order_menu": order_menu,
-                    "delivery_review": delivery_review,
-                    "element": element
+                    "review_text": card["review_text"],
+                    "review_date": normalize_review_date(card.get("date_text")),
+                    "order_menu": card.get("order_menu") or "",
+                    "delivery_review": card.get("delivery_review") or "",
+                    "element": card["element"],
+                    "crawl_started": crawl_started,
+                    "crawled_at": crawled_at
                 })
             except Exception as ex:
                 logging.warning(f"[crawl_review_data] store_code={store_code}, 리뷰카드 처리 오류: {ex}")
@@ -699,21 +843,10 @@ def get_shop_info(store_code, platform_code=None):
     platform_code가 제공된 경우 해당 매장으로 명확히 구분
     """
     try:
-        # 기본 쿼리 생성
-        query = supabase.table("platform_reply_rules") \
-                       .select("*") \
-                       .eq("store_code", store_code) \
-                       .eq("platform", "요기요")
-        
-        # platform_code가 제공된 경우 추가 필터링
-        if platform_code:
-            query = query.eq("platform_code", str(platform_code))
-            
-        # 쿼리 실행
-        response = query.execute()
+        # 매장 설정 저장소에서 조회 (platform_code가 제공된 경우 해당 매장으로 한정)
+        shop_info = rules_repo.get(store_code, "요기요", platform_code)
         
-        if response.data:
-            shop_info = response.data[0]
+        if shop_info:
             
             # 중요 필드에 기본값 설정
             greeting_start = shop_info.get("greeting_start")
@@ -729,6 +862,7 @@ def get_shop_info(store_code, platform_code=None):
             logging.info(f"[get_shop_info] greeting_start='{greeting_start}', greeting_end='{greeting_end}'")
             
             return {
+                "store_code": store_code,
                 "store_name": shop_info.get("store_name", ""),
                 "max_length": shop_info.get("max_lenth", 350),  # 필드명 주의: DB는 max_lenth
                 "greeting_start": greeting_start,
@@ -742,12 +876,15 @@ def get_shop_info(store_code, platform_code=None):
                 "rating_2_reply": shop_info.get("rating_2_reply", True),
                 "rating_1_reply": shop_info.get("rating_1_reply", True),
                 "store_type": shop_info.get("store_type", "delivery_only"),
+                "reply_engine": shop_info.get("reply_engine") or REPLY_ENGINE_DEFAULT,
+                "rating_only_template": shop_info.get("rating_only_template"),
                 "platform_code": shop_info.get("platform_code", "")  # 저장해두면 유용
             }
         else:
             logging.warning(f"[get_shop_info] store_code={store_code}, platform_code={platform_code} 정보 없음")
             # 기본값 반환
             return {
+                "store_code": store_code,
                 "store_name": "",
                 "max_length": 350,
                 "greeting_start": "안녕하세요!",
@@ -787,6 +924,14 @@ def get_shop_info(store_code, platform_code=None):
 ###################################################################
 # 8) 리뷰 저장 관련 함수
 ###################################################################
+# 이번 실행에서 조회/저장한 리뷰 레코드 (review_id -> 레코드)
+# 중복 체크 시 이미 조회한 값을 재사용해 저장 전 SELECT를 생략
+known_review_records = {}
+
+# 리뷰 저장 write-behind 큐 (배치 upsert, review_writer.py)
+review_writer = ReviewWriter(supabase, "review_write_queue_yogiyo.jsonl", log=logging.info)
+
+@timed("db.save")
 def insert_review_to_supabase(
     store_code: str,
     store_name: str,
@@ -838,29 +983,26 @@ def insert_review_to_supabase(
         if not boss_reply_needed:
             data["response_at"] = datetime.now().isoformat()
         
-        # 기존 레코드 확인
-        existing = supabase.table("reviews").select("*").eq("review_id", review_id).execute()
+        # 기존 레코드 확인 (중복 체크에서 조회한 값 사용)
+        record = known_review_records.get(review_id)
         
-        if existing.data:
-            # 기존 레코드가 있으면 업데이트
-            record_id = existing.data[0]['id']
-            record = existing.data[0]
-            
+        if record:
             # retry_count 증가
-            current_retry = record.get('retry_count', 0)
+            current_retry = record.get('retry_count', 0) or 0
             data['retry_count'] = current_retry + 1
             
             # 기존 review_date 유지
             if 'review_date' in record and record['review_date']:
                 data['review_date'] = record['review_date']
-            
-            resp = supabase.table("reviews").update(data).eq("id", record_id).execute()
-            logging.info(f"[insert_review_to_supabase] 리뷰 업데이트 완료: id={record_id}, hash={review_id[:8]}...")
         else:
-            # 새 레코드 삽입
             data['retry_count'] = 0  # 신규는 0부터 시작
-            resp = supabase.table("reviews").insert(data).execute()
-            logging.info(f"[insert_review_to_supabase] 새 리뷰 저장 완료: hash={review_id[:8]}...")
+        
+        # write-behind 큐에 추가 (review_id 기준 upsert로 일괄 저장)
+        review_writer.enqueue(data)
+        review_mirror.put({**(record or {}), **data})
+        review_events.finish(review_id, data["response_status"])
+        known_review_records[review_id] = {**(record or {}), **data}
+        logging.info(f"[insert_review_to_supabase] 리뷰 저장 대기열 추가: hash={review_id[:8]}..., retry={data['retry_count']}")
         
         # 세션 내 처리 완료 리뷰에 추가
         processed_reviews_in_session.add(review_id)
@@ -872,29 +1014,8 @@ def insert_review_to_supabase(
 ###################################################################
 # 9) AI 리뷰 분석 관련 함수
 ###################################################################
-def analyze_restaurant_review(review_text: str, rating: int, order_menu: str = "", delivery_review: str = "") -> dict:
-    """
-    음식점 리뷰를 더 세부적으로 분석하여 AI 답변 가능 여부와 상세 정보를 반환
-    """
-    try:
-        # 1. 기본 정보 로깅
-        logging.info("\n" + "="*50)
-        logging.info("[분석 시작] 리뷰 정보")
-        logging.info(f"별점: {rating}점")
-        logging.info(f"리뷰: {review_text}")
-        logging.info(f"주문메뉴: {order_menu}")
-        logging.info(f"배달리뷰: {delivery_review}")
-        logging.info("="*50)
-
-        if not openai.api_key:
-            raise ValueError("OpenAI API 키가 설정되지 않음")
-
-        # 2. 텍스트가 없는 경우 별점 기반 처리
-        if not review_text or review_text.strip() == "":
-            return _handle_rating_only_review(rating)
-
-        # 3. GPT 프롬프트 개선
-        system_prompt = """
+# 리뷰 분석 시스템 프롬프트 (단건/일괄 분석 공용)
+REVIEW_ANALYSIS_PROMPT = """
 음식점 리뷰 분석 전문가로서 다음 기준으로 분석해주세요:
 
 1. 감성 분석:
@@ -946,6 +1067,51 @@ def analyze_restaurant_review(review_text: str, rating: int, order_menu: str = "
     "action_needed": ["필요한", "조치", "사항"]
 }"""
 
+# GPT 사용량 누적 (엔진 비교/비용 추정용)
+llm_usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+llm_usage_lock = threading.Lock()
+
+def _record_llm_usage(response):
+    """chat.completions 응답의 토큰 사용량을 llm_usage 에 누적"""
+    try:
+        usage = getattr(response, "usage", None)
+        with llm_usage_lock:
+            llm_usage["calls"] += 1
+            if usage:
+                llm_usage["prompt_tokens"] += usage.prompt_tokens or 0
+                llm_usage["completion_tokens"] += usage.completion_tokens or 0
+    except Exception as e:
+        logging.warning(f"[_record_llm_usage] 사용량 기록 실패: {e}")
+
+# 일괄 분석 설정
+ANALYSIS_BATCH_SIZE = 10         # 한 번의 요청에 넣을 리뷰 수
+ANALYSIS_BATCH_MAX_TOKENS = 350  # 리뷰 1건당 응답 토큰 예산
+
+@timed("llm.analyze")
+def analyze_restaurant_review(review_text: str, rating: int, order_menu: str = "", delivery_review: str = "") -> dict:
+    """
+    음식점 리뷰를 더 세부적으로 분석하여 AI 답변 가능 여부와 상세 정보를 반환
+    """
+    try:
+        # 1. 기본 정보 로깅
+        logging.info("\n" + "="*50)
+        logging.info("[분석 시작] 리뷰 정보")
+        logging.info(f"별점: {rating}점")
+        logging.info(f"리뷰: {review_text}")
+        logging.info(f"주문메뉴: {order_menu}")
+        logging.info(f"배달리뷰: {delivery_review}")
+        logging.info("="*50)
+
+        if not openai.api_key:
+            raise ValueError("OpenAI API 키가 설정되지 않음")
+
+        # 2. 텍스트가 없는 경우 별점 기반 처리
+        if not review_text or review_text.strip() == "":
+            return _handle_rating_only_review(rating)
+
+        # 3. GPT 프롬프트 (REVIEW_ANALYSIS_PROMPT 공용)
+        system_prompt = REVIEW_ANALYSIS_PROMPT
+
         user_prompt = f"""
 별점: {rating}점
 주문메뉴: {order_menu}
@@ -962,6 +1128,7 @@ def analyze_restaurant_review(review_text: str, rating: int, order_menu: str = "
             temperature=0.1,
             max_tokens=500
         )
+        _record_llm_usage(response)
 
         result = json.loads(response.choices[0].message.content)
         
@@ -1148,6 +1315,110 @@ def _create_error_result(error_type: str, error_msg: str) -> dict:
         'action_needed': ['사장님 확인']
     }
 
+@timed("llm.analyze_batch")
+def analyze_reviews_batch(reviews: list) -> list:
+    """
+    여러 리뷰를 한 번의 GPT 요청으로 분석 (ANALYSIS_BATCH_SIZE 단위)
+    - reviews: [{"review_text", "rating", "order_menu", "delivery_review"}, ...]
+    - 반환: 입력 순서와 같은 분석 결과 목록 (analyze_restaurant_review 와 동일한 형식)
+    - 텍스트 없는 리뷰는 별점 기반 처리, 응답에서 누락/파싱 실패한 항목은 단건 분석으로 대체
+    """
+    results = [None] * len(reviews)
+    pending = []
+    
+    for i, rv in enumerate(reviews):
+        text = rv.get("review_text") or ""
+        if not text.strip():
+            results[i] = _handle_rating_only_review(rv.get("rating", 0))
+        else:
+            pending.append(i)
+    
+    logging.info(f"[일괄분석] 전체 {len(reviews)}건 중 GPT 분석 대상 {len(pending)}건 (배치 크기 {ANALYSIS_BATCH_SIZE})")
+    
+    for start in range(0, len(pending), ANALYSIS_BATCH_SIZE):
+        chunk = pending[start:start + ANALYSIS_BATCH_SIZE]
+        parsed = _request_analysis_batch([reviews[i] for i in chunk])
+        
+        for pos, i in enumerate(chunk):
+            rv = reviews[i]
+            item = parsed.get(pos)
+            if item is None:
+                logging.warning(f"[일괄분석] {pos}번 항목 결과 없음 => 단건 분석으로 대체")
+                results[i] = analyze_restaurant_review(
+                    rv.get("review_text", ""), rv.get("rating", 0),
+                    rv.get("order_menu", ""), rv.get("delivery_review", "")
+                )
+                continue
+            try:
+                item = _adjust_analysis_result(item, rv.get("rating", 0))
+                item = _override_analysis_for_special_cases(rv.get("review_text", ""), rv.get("rating", 0), item)
+                results[i] = _validate_analysis_result(item)
+            except Exception as e:
+                logging.warning(f"[일괄분석] {pos}번 항목 보정 실패({e}) => 단건 분석으로 대체")
+                results[i] = analyze_restaurant_review(
+                    rv.get("review_text", ""), rv.get("rating", 0),
+                    rv.get("order_menu", ""), rv.get("delivery_review", "")
+                )
+    
+    return results
+
+def _request_analysis_batch(chunk: list) -> dict:
+    """
+    리뷰 묶음을 한 번의 GPT 요청으로 분석
+    - 반환: {입력 순번: 분석 결과 dict} (요청 실패 시 빈 dict => 전부 단건 분석)
+    """
+    try:
+        if not openai.api_key:
+            raise ValueError("OpenAI API 키가 설정되지 않음")
+        
+        items = []
+        for pos, rv in enumerate(chunk):
+            items.append(
+                f"[{pos}]\n"
+                f"별점: {rv.get('rating', 0)}점\n"
+                f"주문메뉴: {rv.get('order_menu', '')}\n"
+                f"배달리뷰: {rv.get('delivery_review', '')}\n"
+                f"리뷰내용: {rv.get('review_text', '')}"
+            )
+        
+        batch_prompt = REVIEW_ANALYSIS_PROMPT + f"""
+
+여러 리뷰가 [번호]와 함께 주어집니다. 각 리뷰를 독립적으로 분석하고,
+위 형식의 객체에 "id"(리뷰 번호)를 추가해 다음 JSON으로만 응답하세요:
+{{"results": [{{"id": 0, ...}}, {{"id": 1, ...}}]}}
+리뷰 수: {len(chunk)}개 (모든 번호에 대해 결과를 반환)"""
+        
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": batch_prompt},
+                {"role": "user", "content": "\n\n".join(items)}
+            ],
+            temperature=0.1,
+            max_tokens=ANALYSIS_BATCH_MAX_TOKENS * len(chunk),
+            response_format={"type": "json_object"}
+        )
+        _record_llm_usage(response)
+        
+        data = json.loads(response.choices[0].message.content)
+        parsed = {}
+        for item in data.get("results", []):
+            if not isinstance(item, dict):
+                continue
+            try:
+                pos = int(item.pop("id"))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= pos < len(chunk) and pos not in parsed:
+                parsed[pos] = item
+        
+        logging.info(f"[일괄분석] {len(chunk)}건 요청 => {len(parsed)}건 결과 수신")
+        return parsed
+    
+    except Exception as e:
+        logging.error(f"[일괄분석 실패] {len(chunk)}건 => 단건 분석으로 대체: {e}")
+        return {}
+
 ###################################################################
 # 10) AI 답변 생성 관련 함수
 ###################################################################
@@ -1176,32 +1447,15 @@ def validate_reply_content(ai_reply: str, shop_info: dict) -> tuple[bool, str]:
     if invalid_ratio > 0.2:  # 20%까지 허용 (이모지 등을 위해)
         return False, "허용되지 않는 문자 과다 사용"
 
-    # 3. 금지어 체크
-    prohibited = shop_info.get('prohibited_words', [])
-    if isinstance(prohibited, str):
-        try:
-            prohibited = eval(prohibited)
-        except:
-            prohibited = []
-            if ',' in shop_info.get('prohibited_words', ''):
-                prohibited = [word.strip() for word in shop_info.get('prohibited_words', '').split(',')]
-    
-    # 실제 금지어만 필터링 (빈 문자열 등 제외)
-    prohibited = [word for word in prohibited if word and len(word.strip()) > 1]
-    
-    # 매장 유형에 따른 금지어 처리
-    store_type = shop_info.get("store_type", "")
-    if store_type == "delivery_only":
-        # 배달 전문점이면 '방문', '홀' 등 관련 단어 체크
-        location_words = ['방문', '홀', '매장 식사', '매장에서']
-        for word in location_words:
-            if word in ai_reply:
-                return False, f"배달전문점 금지어 '{word}' 사용"
-    
-    # 기존 금지어 체크
-    for word in prohibited:
-        if len(word.strip()) > 1 and word.strip() in ai_reply:
-            return False, f"금지어 '{word}' 사용"
+    # 3. 금지어 체크 (매장 금지어 + 배달전문점 위치 관련 단어를 한 번에 탐색)
+    matcher = get_prohibited_matcher(shop_info.get('prohibited_words', []),
+                                     location_words=shop_info.get("store_type", "") == "delivery_only")
+    hits = matcher.find_all(ai_reply)
+    for _, _, word, kind in hits:
+        if kind == KIND_LOCATION:
+            return False, f"배달전문점 금지어 '{word}' 사용"
+    if hits:
+        return False, f"금지어 '{hits[0][2]}' 사용"
     
     # 5. 길이 제한
     max_length = shop_info.get('max_length')
@@ -1210,48 +1464,36 @@ def validate_reply_content(ai_reply: str, shop_info: dict) -> tuple[bool, str]:
     
     return True, ""
 
-def generate_ai_reply(review: dict, shop_info: dict) -> str:
-    """
-    AI 답변 생성 함수
-    """
-    try:
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            logging.error("OpenAI API 키가 설정되지 않았습니다.")
-            return None
-            
-        # 디버깅용 로그 추가
-        store_name = shop_info.get("store_name", "")
-        greeting_end = shop_info.get("greeting_end", "감사합니다.")
-        
-        logging.info(f"[generate_ai_reply] 매장명: {store_name}")
-        logging.info(f"[generate_ai_reply] 맺음말: '{greeting_end}'")
+def _build_reply_prompts(review: dict, shop_info: dict) -> tuple:
+    """답변 생성용 (system, user) 프롬프트 구성 (다중 호출/단일 호출 엔진 공용)"""
+    store_name = shop_info.get("store_name", "")
+    greeting_end = shop_info.get("greeting_end", "감사합니다.")
 
-        # 매장 유형
-        store_type = shop_info.get("store_type", "delivery_only")
-        
-        # 시작 인사 예시 제공
-        greeting_start = shop_info.get("greeting_start", "안녕하세요!")
-        greeting_examples = f"'{greeting_start}', '{greeting_start} 고객님,', '{greeting_start} 고객님!'"
+    # 매장 유형
+    store_type = shop_info.get("store_type", "delivery_only")
+    
+    # 시작 인사 예시 제공
+    greeting_start = shop_info.get("greeting_start", "안녕하세요!")
+    greeting_examples = f"'{greeting_start}', '{greeting_start} 고객님,', '{greeting_start} 고객님!'"
 
-        # 배달 전문 / 홀+배달에 따른 추가 지시
-        if store_type == "delivery_only":
-            type_instruction = (
-                "매장은 배달전문 업체입니다. 배달 전문에 맞게 응답해주세요."
-                " '홀', '방문', '매장 식사' 표현은 절대 사용하지 마세요. "
-                "'주문'이나 '배달'이라는 표현만 사용해주세요."
-            )
-        else:  # "dine_in_delivery" 등으로 가정
-            type_instruction = (
-                "매장은 홀+배달 운영이 가능합니다. 리뷰에서 질문시에만 안내해주세요. "
-            )
+    # 배달 전문 / 홀+배달에 따른 추가 지시
+    if store_type == "delivery_only":
+        type_instruction = (
+            "매장은 배달전문 업체입니다. 배달 전문에 맞게 응답해주세요."
+            " '홀', '방문', '매장 식사' 표현은 절대 사용하지 마세요. "
+            "'주문'이나 '배달'이라는 표현만 사용해주세요."
+        )
+    else:  # "dine_in_delivery" 등으로 가정
+        type_instruction = (
+            "매장은 홀+배달 운영이 가능합니다. 리뷰에서 질문시에만 안내해주세요. "
+        )
 
-        # 주문 메뉴 언급
-        order_menu_prompt = ""
-        if review.get('order_menu'):
-            order_menu_prompt = f"주문 메뉴: {review.get('order_menu')}\n- 메뉴가 있으면 반드시 답변에서 언급해주세요."
+    # 주문 메뉴 언급
+    order_menu_prompt = ""
+    if review.get('order_menu'):
+        order_menu_prompt = f"주문 메뉴: {review.get('order_menu')}\n- 메뉴가 있으면 반드시 답변에서 언급해주세요."
 
-        prompt_system = f"""
+    prompt_system = f"""
 당신은 '{store_name}' 리뷰 답변 전문가입니다.
 
 ## 필수 규칙:
@@ -1277,13 +1519,43 @@ def generate_ai_reply(review: dict, shop_info: dict) -> str:
 - 다시 강조: 맺음말은 반드시 '{greeting_end}'로 끝내야 합니다.
 """
 
-        prompt_user = (
-            f"리뷰 작성자: {review['author']}, 별점: {review['star']}점\n"
-            f"리뷰내용: {review['review_text']}\n"
-            f"메뉴: {review.get('order_menu', '')}\n"
-            f"배달평가: {review.get('delivery_review', '')}\n\n"
-            f"위 규칙을 철저히 지키면서 적절한 답변을 작성해주세요. 특히 맺음말은 '{greeting_end}'로 해주세요."
-        )
+    prompt_user = (
+        f"리뷰 작성자: {review['author']}, 별점: {review['star']}점\n"
+        f"리뷰내용: {review['review_text']}\n"
+        f"메뉴: {review.get('order_menu', '')}\n"
+        f"배달평가: {review.get('delivery_review', '')}\n\n"
+        f"위 규칙을 철저히 지키면서 적절한 답변을 작성해주세요. 특히 맺음말은 '{greeting_end}'로 해주세요."
+    )
+    return prompt_system, prompt_user
+
+def _ensure_greeting_end(ai_reply: str, greeting_end: str, tag: str) -> str:
+    """맺음말 누락 시 줄바꿈 후 강제 추가"""
+    if greeting_end not in ai_reply:
+        logging.warning(f"[{tag}] 맺음말('{greeting_end}') 누락, 강제 추가")
+        if not ai_reply.endswith('\n'):
+            ai_reply += '\n'
+        ai_reply += greeting_end
+    return ai_reply
+
+@timed("llm.generate")
+def generate_ai_reply(review: dict, shop_info: dict) -> str:
+    """
+    AI 답변 생성 함수
+    """
+    try:
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            logging.error("OpenAI API 키가 설정되지 않았습니다.")
+            return None
+            
+        # 디버깅용 로그 추가
+        store_name = shop_info.get("store_name", "")
+        greeting_end = shop_info.get("greeting_end", "감사합니다.")
+        
+        logging.info(f"[generate_ai_reply] 매장명: {store_name}")
+        logging.info(f"[generate_ai_reply] 맺음말: '{greeting_end}'")
+
+        prompt_system, prompt_user = _build_reply_prompts(review, shop_info)
 
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -1293,16 +1565,12 @@ def generate_ai_reply(review: dict, shop_info: dict) -> str:
             ],
             max_tokens=500
         )
+        _record_llm_usage(response)
         ai_reply = response.choices[0].message.content
         ai_reply = clean_ai_reply(ai_reply)
         
         # 맺음말 검증 및 강제 추가
-        if greeting_end not in ai_reply:
-            logging.warning(f"[generate_ai_reply] 맺음말('{greeting_end}') 누락, 강제 추가")
-            # 줄바꿈 추가 후 맺음말 강제 추가
-            if not ai_reply.endswith('\n'):
-                ai_reply += '\n'
-            ai_reply += greeting_end
+        ai_reply = _ensure_greeting_end(ai_reply, greeting_end, "generate_ai_reply")
         
         logging.info(f"[generate_ai_reply] 생성 완료, 길이: {len(ai_reply)}자")
         return ai_reply
@@ -1312,8 +1580,11 @@ def generate_ai_reply(review: dict, shop_info: dict) -> str:
         traceback.print_exc()  # 상세 스택 트레이스 출력
         return None
 
-def generate_ai_reply_with_retry(review: dict, shop_info: dict, max_attempts: int = 3) -> str:
-    """검증을 통과할 때까지 최대 3회 재시도하는 답변 생성 함수"""
+def generate_ai_reply_with_retry(review: dict, shop_info: dict, max_attempts: int = 3, record_drafts: bool = True) -> str:
+    """
+    검증을 통과할 때까지 최대 3회 재시도하는 답변 생성 함수
+    - record_drafts: 합격선 미달 초안을 SCORER_DRAFT_FILE 에 기록할지 (엔진 비교 등 운영 외 실행은 False)
+    """
     
     best_reply = None
     best_score = 0
@@ -1333,9 +1604,11 @@ def generate_ai_reply_with_retry(review: dict, shop_info: dict, max_attempts: in
                 logging.warning(f"[AI 답변 검증] 실패: {reason}")
                 continue
                 
-            # 3. 품질 점수 평가
-            score, details = score_reply(ai_reply, review, shop_info)
+            # 3. 품질 점수 평가 (로컬 평가, 기준점 근처만 GPT)
+            score, details = evaluate_reply(ai_reply, review, shop_info)
             logging.info(f"[AI 답변 평가] 점수: {score}")
+            if score < 80 and record_drafts:
+                record_scorer_draft(ai_reply, review, shop_info, score)
             
             # 더 나은 답변 저장
             if score > best_score:
@@ -1355,19 +1628,8 @@ def generate_ai_reply_with_retry(review: dict, shop_info: dict, max_attempts: in
     logging.error("[AI 답변 생성] 모든 시도 실패")
     return None
 
-def score_reply(ai_reply: str, review: dict, shop_info: dict, threshold: int = 80) -> tuple[int, dict]:
-    """
-    AI 답변의 품질을 세부적으로 평가합니다.
-    
-    Returns:
-        tuple[총점, 세부점수_딕셔너리]
-    """
-    try:
-        if not openai.api_key:
-            logging.warning("[score_reply] OpenAI API 키 없음")
-            return 85, {}  # API 키가 없으면 합격 처리
-
-        system_prompt = """
+# 답변 품질 평가 시스템 프롬프트 (score_reply / 단일 호출 엔진 공용)
+REPLY_SCORE_PROMPT = """
 당신은 전문적인 리뷰 답변 평가자입니다. 다음 기준으로 평가하고 정확히 아래 JSON 형식으로만 응답하세요:
 
 1. 맥락 이해도 (30점)
@@ -1406,7 +1668,9 @@ def score_reply(ai_reply: str, review: dict, shop_info: dict, threshold: int = 8
     "improvement_needed": ["개선필요사항1", "개선필요사항2"]
 }"""
 
-        user_prompt = f"""
+def _build_score_user_prompt(ai_reply: str, review: dict, shop_info: dict) -> str:
+    """답변 품질 평가 요청 본문 (score_reply / 비동기 평가 공용)"""
+    user_prompt = f"""
 원본 리뷰 정보:
 작성자: {review['author']}
 별점: {review['star']}점
@@ -1425,6 +1689,82 @@ AI 답글:
 - 답변 톤: {shop_info['tone']}
 
 각 평가 항목의 점수를 매겨주세요."""
+    return user_prompt
+
+def _parse_score_content(content: str) -> tuple:
+    """평가 응답(JSON)을 (총점, 세부점수) 로 변환하고 로깅 (score_reply / 비동기 평가 공용)"""
+    try:
+        # JSON 형식만 추출
+        import re
+        json_match = re.search(r'\{[\s\S]*\}', content)
+        if json_match:
+            result = json.loads(json_match.group(0))
+        else:
+            logging.warning(f"[score_reply] JSON 형식을 찾을 수 없음: {content[:100]}...")
+            return 85, {}  # 기본값 반환
+            
+        # 총점 계산
+        total_score = result.get("total_score", 0)
+        if total_score == 0:
+            # 항목별 점수 합산
+            category_scores = [
+                sum(result.get('context_score', {}).values()),
+                sum(result.get('expertise_score', {}).values()),
+                sum(result.get('format_score', {}).values()),
+                sum(result.get('tone_score', {}).values()),
+                sum(result.get('quality_score', {}).values())
+            ]
+            total_score = sum(category_scores)
+            result["total_score"] = total_score
+        
+        # 세부 점수 로깅
+        logging.info("\n[답변 품질 평가]")
+        logging.info(f"총점: {total_score}")
+        
+        for category, scores in {
+            "맥락 이해도": result.get('context_score', {}),
+            "전문성": result.get('expertise_score', {}),
+            "형식 완성도": result.get('format_score', {}),
+            "어조와 태도": result.get('tone_score', {}),
+            "문장 품질": result.get('quality_score', {})
+        }.items():
+            logging.info(f"\n{category}:")
+            for name, score in scores.items():
+                logging.info(f"- {name}: {score}점")
+        
+        # 개선 필요 사항
+        if result.get('improvement_needed'):
+            logging.info("\n개선 필요 사항:")
+            for item in result['improvement_needed']:
+                logging.info(f"- {item}")
+        
+        # 재시도 트리거 조건 확인
+        should_retry = _check_retry_conditions(result)
+        if should_retry:
+            logging.info("\n[재시도 권장]")
+            
+        return total_score, result
+        
+    except json.JSONDecodeError as e:
+        logging.error(f"[score_reply] JSON 파싱 오류: {e}")
+        return 80, {}  # 오류 시 기본값
+
+@timed("llm.score")
+def score_reply(ai_reply: str, review: dict, shop_info: dict, threshold: int = 80) -> tuple[int, dict]:
+    """
+    AI 답변의 품질을 세부적으로 평가합니다.
+    
+    Returns:
+        tuple[총점, 세부점수_딕셔너리]
+    """
+    try:
+        if not openai.api_key:
+            logging.warning("[score_reply] OpenAI API 키 없음")
+            return 85, {}  # API 키가 없으면 합격 처리
+
+        system_prompt = REPLY_SCORE_PROMPT
+
+        user_prompt = _build_score_user_prompt(ai_reply, review, shop_info)
 
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -1435,64 +1775,9 @@ AI 답글:
             temperature=0.1,
             max_tokens=500
         )
+        _record_llm_usage(response)
 
-        try:
-            content = response.choices[0].message.content
-            
-            # JSON 형식만 추출
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                result = json.loads(json_match.group(0))
-            else:
-                logging.warning(f"[score_reply] JSON 형식을 찾을 수 없음: {content[:100]}...")
-                return 85, {}  # 기본값 반환
-                
-            # 총점 계산
-            total_score = result.get("total_score", 0)
-            if total_score == 0:
-                # 항목별 점수 합산
-                category_scores = [
-                    sum(result.get('context_score', {}).values()),
-                    sum(result.get('expertise_score', {}).values()),
-                    sum(result.get('format_score', {}).values()),
-                    sum(result.get('tone_score', {}).values()),
-                    sum(result.get('quality_score', {}).values())
-                ]
-                total_score = sum(category_scores)
-                result["total_score"] = total_score
-            
-            # 세부 점수 로깅
-            logging.info("\n[답변 품질 평가]")
-            logging.info(f"총점: {total_score}")
-            
-            for category, scores in {
-                "맥락 이해도": result.get('context_score', {}),
-                "전문성": result.get('expertise_score', {}),
-                "형식 완성도": result.get('format_score', {}),
-                "어조와 태도": result.get('tone_score', {}),
-                "문장 품질": result.get('quality_score', {})
-            }.items():
-                logging.info(f"\n{category}:")
-                for name, score in scores.items():
-                    logging.info(f"- {name}: {score}점")
-            
-            # 개선 필요 사항
-            if result.get('improvement_needed'):
-                logging.info("\n개선 필요 사항:")
-                for item in result['improvement_needed']:
-                    logging.info(f"- {item}")
-            
-            # 재시도 트리거 조건 확인
-            should_retry = _check_retry_conditions(result)
-            if should_retry:
-                logging.info("\n[재시도 권장]")
-                
-            return total_score, result
-            
-        except json.JSONDecodeError as e:
-            logging.error(f"[score_reply] JSON 파싱 오류: {e}")
-            return 80, {}  # 오류 시 기본값
+        return _parse_score_content(response.choices[0].message.content)
             
     except Exception as e:
         logging.error(f"[score_reply] 평가 중 오류: {e}")
@@ -1537,9 +1822,817 @@ def _check_retry_conditions(scores: dict) -> bool:
     # 2개 이상 영역에서 낮은 점수면 재시도
     return sum([1 for x in low_scores if x]) >= 2
 
+# 로컬 품질 평가 (reply_scorer.py, 배민/쿠팡/요기요 공용): score_reply 와 같은 100점 항목을 간단한 특징으로 계산하고,
+# 점수가 기준점 근처일 때만 GPT 평가 호출
+SCORE_LOCAL_ENABLED = True
+
+def evaluate_reply(ai_reply: str, review: dict, shop_info: dict, threshold: int = 80) -> tuple:
+    """로컬 평가 후 기준점 근처(±SCORE_ESCALATION_MARGIN)일 때만 GPT 평가(score_reply)로 확정 (reply_scorer.escalate_score)"""
+    def remote_score():
+        return score_reply(ai_reply, review, shop_info, threshold)
+
+    if not SCORE_LOCAL_ENABLED:
+        return remote_score()
+    return escalate_score(ai_reply, review, shop_info, remote_score, threshold, log=logging.info)
+
+# 합격선에 못 미친 답변 초안 기록 (run_scorer_agreement 재평가용)
+# 저장된 답변완료 답변만 다시 평가하면 불합격 쪽 판정 일치도를 확인할 수 없으므로 함께 보관
+SCORER_DRAFT_FILE = "scorer_drafts_yogiyo.jsonl"
+SCORER_DRAFT_KEEP = 2000      # 파일에 보관할 최근 초안 수
+
+def record_scorer_draft(ai_reply: str, review: dict, shop_info: dict, score: int):
+    """합격선 미달 답변 초안을 파일에 추가 (실패해도 답변 생성에는 영향 없음)"""
+    row = {
+        "store_code": shop_info.get("store_code", ""),
+        "review": {k: review.get(k, "") for k in ("author", "star", "review_text", "order_menu", "delivery_review")},
+        "reply": ai_reply,
+        "score": score,
+        "recorded_at": datetime.now().isoformat(timespec="seconds")
+    }
+    try:
+        with open(SCORER_DRAFT_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    except Exception as e:
+        logging.error(f"[답변평가] 미달 초안 기록 실패: {e}")
+
+def load_scorer_drafts(store_code: str, limit: int) -> list:
+    """매장의 최근 미달 초안 (오래된 초안은 SCORER_DRAFT_KEEP 개만 남기고 정리)"""
+    if not os.path.exists(SCORER_DRAFT_FILE):
+        return []
+    rows = []
+    with open(SCORER_DRAFT_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    if len(rows) > SCORER_DRAFT_KEEP:
+        rows = rows[-SCORER_DRAFT_KEEP:]
+        with open(SCORER_DRAFT_FILE, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+    return [r for r in rows if r.get("store_code") == store_code][-limit:]
+
+###################################################################
+# 10-1) 단일 호출 답변 엔진 (분석 + 답변 + 자체 평가)
+###################################################################
+# 매장별 답변 엔진 (platform_reply_rules.reply_engine 값, 없으면 기본값)
+# - "multi": 기존 방식 (분석 → 답변 생성 → 품질 평가, 최대 3회 재시도)
+# - "single": 한 번의 JSON 스키마 응답으로 분석/답변/평가, 실패 시 "multi" 로 대체
+REPLY_ENGINE_DEFAULT = "multi"
+
+# gpt-4o-mini 토큰 단가 (USD / 1M 토큰, 비용 추정용)
+GPT_PRICE_PER_1M = {"prompt": 0.15, "completion": 0.60}
+
+def _schema_object(properties: dict) -> dict:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties.keys()),
+        "additionalProperties": False
+    }
+
+def _schema_scores(*names) -> dict:
+    return _schema_object({name: {"type": "integer"} for name in names})
+
+SINGLE_PASS_SCHEMA = _schema_object({
+    "analysis": _schema_object({
+        "ai_reply": {"type": "boolean"},
+        "sentiment_score": {"type": "number"},
+        "category": {"type": "string"},
+        "sub_category": {"type": "string"},
+        "keywords": {"type": "array", "items": {"type": "string"}},
+        "severity": {"type": "string", "enum": ["LOW", "MEDIUM", "HIGH"]},
+        "reason": {"type": "string"},
+        "action_needed": {"type": "array", "items": {"type": "string"}}
+    }),
+    "reply": {"type": "string"},
+    "score": _schema_object({
+        "total_score": {"type": "integer"},
+        "context_score": _schema_scores("리뷰이해", "감정이해", "대응방향"),
+        "expertise_score": _schema_scores("전문성", "구체성"),
+        "format_score": _schema_scores("인사말", "구조", "길이", "단락"),
+        "tone_score": _schema_scores("공손함", "경어사용", "진정성"),
+        "quality_score": _schema_scores("맞춤법", "자연스러움", "간결성"),
+        "improvement_needed": {"type": "array", "items": {"type": "string"}}
+    })
+})
+
+def get_reply_engine(shop_info: dict) -> str:
+    engine = (shop_info or {}).get("reply_engine") or REPLY_ENGINE_DEFAULT
+    return engine if engine in ("multi", "single") else REPLY_ENGINE_DEFAULT
+
+@timed("llm.single_pass")
+def generate_single_pass_reply(review: dict, shop_info: dict, threshold: int = 80) -> dict:
+    """
+    분석 → 답변 생성 → 품질 평가를 한 번의 GPT 요청(JSON 스키마 응답)으로 처리
+    - 반환: {"analysis", "reply", "score", "details"} / 요청·파싱 실패 시 None (기존 방식으로 대체)
+    - reply 는 형식 검증과 자체 평가 점수(threshold)를 통과한 경우에만 채워지고, 아니면 None
+    """
+    try:
+        if not openai.api_key:
+            raise ValueError("OpenAI API 키가 설정되지 않음")
+        
+        star_rating = int(review['star']) if review.get('star') else 0
+        review_text = review.get('review_text') or ""
+        greeting_end = shop_info.get("greeting_end", "감사합니다.")
+        
+        prompt_system, prompt_user = _build_reply_prompts(review, shop_info)
+        system_prompt = f"""{prompt_system}
+
+## 리뷰 분석 기준 (analysis 항목)
+{REVIEW_ANALYSIS_PROMPT}
+
+## 답변 자체 평가 기준 (score 항목, 작성한 reply 를 평가)
+{REPLY_SCORE_PROMPT}
+
+## 응답 방법
+한 번의 응답으로 analysis(리뷰 분석), reply(답변), score(reply 에 대한 평가)를 모두 채워 JSON 스키마에 맞게 응답하세요.
+analysis.ai_reply 가 false 이면 reply 는 빈 문자열로 두세요."""
+        
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt_user}
+            ],
+            temperature=0.3,
+            max_tokens=1200,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "review_reply_single_pass", "strict": True, "schema": SINGLE_PASS_SCHEMA}
+            }
+        )
+        _record_llm_usage(response)
+        data = json.loads(response.choices[0].message.content)
+        
+        # 1. 분석 결과 보정 (단건 분석과 동일한 후처리)
+        if not review_text.strip():
+            analysis = _handle_rating_only_review(star_rating)
+        else:
+            analysis = _adjust_analysis_result(data["analysis"], star_rating)
+            analysis = _override_analysis_for_special_cases(review_text, star_rating, analysis)
+            analysis = _validate_analysis_result(analysis)
+        
+        # 2. 자체 평가 점수
+        details = data.get("score", {})
+        total_score = details.get("total_score", 0)
+        if not total_score:
+            total_score = sum(
+                sum(details.get(k, {}).values())
+                for k in ("context_score", "expertise_score", "format_score", "tone_score", "quality_score")
+            )
+            details["total_score"] = total_score
+        
+        # 3. 답변 검증 (맺음말 보정 → 형식 검증 → 점수 기준)
+        reply = None
+        if analysis['ai_reply']:
+            reply = clean_ai_reply(data.get("reply") or "")
+            if reply:
+                reply = _ensure_greeting_end(reply, greeting_end, "single_pass")
+            
+            is_valid, reason = validate_reply_content(reply, shop_info)
+            if not is_valid:
+                logging.warning(f"[single_pass] 답변 검증 실패: {reason} => 기존 방식으로 답변 생성")
+                reply = None
+            elif total_score < threshold or _check_retry_conditions(details):
+                logging.warning(f"[single_pass] 자체 평가 미달({total_score}) => 기존 방식으로 답변 생성")
+                reply = None
+        
+        logging.info(f"[single_pass] 분석={analysis.get('category')}/{analysis.get('severity')}, "
+                     f"ai_reply={analysis.get('ai_reply')}, 점수={total_score}, 답변채택={reply is not None}")
+        return {"analysis": analysis, "reply": reply, "score": total_score, "details": details}
+    
+    except Exception as e:
+        logging.error(f"[single_pass] 단일 호출 실패 => 기존 방식으로 대체: {e}")
+        return None
+
+def _llm_usage_snapshot() -> dict:
+    with llm_usage_lock:
+        return dict(llm_usage)
+
+def _benchmark_record(run: dict, rv: dict, started: float, usage_before: dict, analysis: dict, reply):
+    """엔진 비교: 리뷰 1건의 지연시간/사용량/결과를 run 에 누적"""
+    run["latencies"].append(time.time() - started)
+    usage = _llm_usage_snapshot()
+    for k in run["usage"]:
+        run["usage"][k] += usage[k] - usage_before[k]
+    run["items"].append({"rv": rv, "boss": bool(analysis) and not analysis.get("ai_reply"), "reply": reply})
+
+def run_engine_benchmark(store_code: str, sample_size: int = 20, threshold: int = 80) -> dict:
+    """
+    기존 다중 호출 엔진과 단일 호출 엔진 비교 (댓글 등록 없이 생성만 수행)
+    - 대상: reviews 테이블의 해당 매장 최근 리뷰 (내용 있는 리뷰)
+    - 엔진: multi(기존 방식), single(단일 호출만), single+fallback(단일 호출 실패/미달 시 기존 방식 - 운영 흐름)
+    - 지표: 리뷰당 지연시간(p50/p95), 호출 수, 토큰/추정 비용, 답변 채택률
+    - 채택 기준은 모든 엔진 동일: 최종 답변을 evaluate_reply 로 평가해 threshold 이상
+      (평가 호출은 측정 구간 밖에서 수행, 같은 답변은 한 번만 평가)
+    - 생성 중 미달 초안은 SCORER_DRAFT_FILE 에 기록하지 않음
+    - 결과는 로그 출력 + engine_benchmark_<store_code>_<시각>.json 저장
+    """
+    shop_info = get_shop_info(store_code)
+    rows = (
+        supabase.table("reviews")
+        .select("review_name, rating, review_content, ordered_menu, delivery_review")
+        .eq("store_code", store_code)
+        .eq("platform", "요기요")
+        .neq("review_content", "")
+        .order("review_date", desc=True)
+        .limit(sample_size)
+        .execute()
+    ).data or []
+    samples = [
+        {
+            "author": r.get("review_name", ""),
+            "star": r.get("rating", 0),
+            "review_text": r.get("review_content", ""),
+            "order_menu": r.get("ordered_menu", "") or "",
+            "delivery_review": r.get("delivery_review", "") or ""
+        }
+        for r in rows
+    ]
+    logging.info(f"[엔진비교] store_code={store_code}, 샘플 {len(samples)}건")
+    
+    runs = {name: {"latencies": [], "usage": dict.fromkeys(llm_usage, 0), "items": []}
+            for name in ("multi", "single", "single+fallback")}
+    fallbacks = 0
+    for rv in samples:
+        usage_before = _llm_usage_snapshot()
+        started = time.time()
+        analysis = analyze_restaurant_review(rv["review_text"], int(rv["star"] or 0),
+                                             rv["order_menu"], rv["delivery_review"])
+        reply = generate_ai_reply_with_retry(rv, shop_info, record_drafts=False) if analysis.get("ai_reply") else None
+        _benchmark_record(runs["multi"], rv, started, usage_before, analysis, reply)
+    
+    for rv in samples:
+        usage_before = _llm_usage_snapshot()
+        started = time.time()
+        result = generate_single_pass_reply(rv, shop_info, threshold)
+        analysis = result["analysis"] if result else {}
+        reply = result["reply"] if result else None
+        _benchmark_record(runs["single"], rv, started, usage_before, analysis, reply)
+        
+        # 운영 흐름 (process_review_with_analysis): 단일 호출 실패 시 단건 분석, 답변 미채택 시 기존 방식으로 생성
+        if not result:
+            analysis = analyze_restaurant_review(rv["review_text"], int(rv["star"] or 0),
+                                                 rv["order_menu"], rv["delivery_review"])
+        if analysis.get("ai_reply") and not reply:
+            fallbacks += 1
+            reply = generate_ai_reply_with_retry(rv, shop_info, record_drafts=False)
+        _benchmark_record(runs["single+fallback"], rv, started, usage_before, analysis, reply)
+    
+    # 채택 판정 (모든 엔진 같은 기준)
+    final_scores = {}
+    def final_score(reply, rv):
+        key = (reply, rv["author"], rv["review_text"])
+        if key not in final_scores:
+            final_scores[key] = evaluate_reply(reply, rv, shop_info, threshold)[0]
+        return final_scores[key]
+    
+    report = {"store_code": store_code, "samples": len(samples), "threshold": threshold, "engines": {}}
+    for engine, run in runs.items():
+        used = run["usage"]
+        cost = (used["prompt_tokens"] * GPT_PRICE_PER_1M["prompt"]
+                + used["completion_tokens"] * GPT_PRICE_PER_1M["completion"]) / 1_000_000
+        boss = sum(x["boss"] for x in run["items"])
+        scores = [final_score(x["reply"], x["rv"]) for x in run["items"] if not x["boss"] and x["reply"]]
+        accepted = sum(s >= threshold for s in scores)
+        replyable = len(run["items"]) - boss
+        report["engines"][engine] = {
+            "latency_p50": round(percentile(run["latencies"], 50), 2),
+            "latency_p95": round(percentile(run["latencies"], 95), 2),
+            "latency_total": round(sum(run["latencies"]), 2),
+            "calls": used["calls"],
+            "prompt_tokens": used["prompt_tokens"],
+            "completion_tokens": used["completion_tokens"],
+            "cost_usd": round(cost, 5),
+            "accepted": accepted,
+            "below_threshold": len(scores) - accepted,
+            "boss_needed": boss,
+            "failed": replyable - len(scores),
+            "mean_score": round(sum(scores) / len(scores), 1) if scores else 0.0,
+            "acceptance_rate": round(accepted / replyable, 3) if replyable else 0.0
+        }
+    report["engines"]["single+fallback"]["fallbacks"] = fallbacks
+    
+    logging.info("\n[엔진비교 결과]")
+    logging.info(f"{'엔진':<16}{'p50(s)':>8}{'p95(s)':>8}{'호출':>6}{'입력토큰':>10}{'출력토큰':>10}{'비용($)':>10}"
+                 f"{'평균점수':>8}{'채택률':>8}{'사장님':>6}")
+    for engine, st in report["engines"].items():
+        logging.info(f"{engine:<16}{st['latency_p50']:>8}{st['latency_p95']:>8}{st['calls']:>6}"
+                     f"{st['prompt_tokens']:>10}{st['completion_tokens']:>10}{st['cost_usd']:>10}"
+                     f"{st['mean_score']:>8}{st['acceptance_rate']:>8}{st['boss_needed']:>6}")
+    logging.info(f"- 채택 기준: 최종 답변 평가 {threshold}점 이상 (모든 엔진 동일)")
+    logging.info(f"- single+fallback: 단일 호출 미채택 {fallbacks}건을 기존 방식으로 생성 (운영 흐름)")
+    
+    out_path = f"engine_benchmark_{store_code}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    try:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logging.info(f"[엔진비교] 결과 저장: {out_path}")
+    except Exception as e:
+        logging.error(f"[엔진비교] 결과 저장 실패: {e}")
+    return report
+
+def run_scorer_agreement(store_code: str, sample_size: int = 50, threshold: int = 80) -> dict:
+    """
+    로컬 평가와 GPT 평가(score_reply) 일치도 확인
+    - 대상: reviews 테이블의 해당 매장 최근 답변완료/사장님 확인필요 리뷰의 저장된 ai_response
+            + 답변 생성 중 합격선에 못 미친 초안 (SCORER_DRAFT_FILE, 각각 최대 sample_size 건)
+    - 지표: 평균 점수차, 합격/불합격 일치율(로컬 단독, 로컬+GPT 확인), GPT 확인 비율
+    - 결과는 로그 출력 + scorer_agreement_<store_code>_<시각>.json 저장
+    """
+    shop_info = get_shop_info(store_code)
+    rows = (
+        supabase.table("reviews")
+        .select("review_name, rating, review_content, ordered_menu, delivery_review, ai_response")
+        .eq("store_code", store_code)
+        .eq("platform", "요기요")
+        .in_("response_status", ["답변완료", "사장님 확인필요"])
+        .order("review_date", desc=True)
+        .limit(sample_size)
+        .execute()
+    ).data or []
+    
+    samples = []
+    for r in rows:
+        rv = {
+            "author": r.get("review_name", ""),
+            "star": r.get("rating", 0),
+            "review_text": r.get("review_content", "") or "",
+            "order_menu": r.get("ordered_menu", "") or "",
+            "delivery_review": r.get("delivery_review", "") or ""
+        }
+        samples.append(("saved", rv, r.get("ai_response") or ""))
+    try:
+        for d in load_scorer_drafts(store_code, sample_size):
+            samples.append(("draft", d.get("review") or {}, d.get("reply") or ""))
+    except Exception as e:
+        logging.error(f"[평가 일치도] 미달 초안 읽기 실패: {e}")
+    
+    items = []
+    for source, rv, reply in samples:
+        if not reply:
+            continue
+        local, _ = local_score_reply(reply, rv, shop_info)
+        llm, _ = score_reply(reply, rv, shop_info, threshold)
+        escalated = needs_remote_score(local, threshold)
+        final = llm if escalated else local
+        items.append({"source": source, "local": local, "llm": llm, "escalated": escalated,
+                      "local_pass": local >= threshold, "final_pass": final >= threshold,
+                      "llm_pass": llm >= threshold})
+    
+    n = len(items)
+    diffs = [abs(x["local"] - x["llm"]) for x in items]
+    report = {
+        "store_code": store_code,
+        "threshold": threshold,
+        "margin": SCORE_ESCALATION_MARGIN,
+        "samples": n,
+        "draft_samples": sum(x["source"] == "draft" for x in items),
+        "llm_fail_samples": sum(not x["llm_pass"] for x in items),
+        "mean_abs_diff": round(sum(diffs) / n, 2) if n else 0.0,
+        "p95_abs_diff": percentile(diffs, 95),
+        "local_agreement": round(sum(x["local_pass"] == x["llm_pass"] for x in items) / n, 3) if n else 0.0,
+        "final_agreement": round(sum(x["final_pass"] == x["llm_pass"] for x in items) / n, 3) if n else 0.0,
+        "escalation_rate": round(sum(x["escalated"] for x in items) / n, 3) if n else 0.0,
+        "items": items
+    }
+    logging.info(f"\n[평가 일치도] store_code={store_code}, 샘플 {n}건 (미달 초안 {report['draft_samples']}건, "
+                 f"GPT 불합격 {report['llm_fail_samples']}건)")
+    logging.info(f"- 평균 점수차: {report['mean_abs_diff']} (p95 {report['p95_abs_diff']})")
+    logging.info(f"- 합격 판정 일치율: 로컬 단독 {report['local_agreement']}, GPT 확인 포함 {report['final_agreement']}")
+    logging.info(f"- GPT 평가 호출 비율: {report['escalation_rate']}")
+    
+    out_path = f"scorer_agreement_{store_code}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    try:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logging.info(f"[평가 일치도] 결과 저장: {out_path}")
+    except Exception as e:
+        logging.error(f"[평가 일치도] 결과 저장 실패: {e}")
+    return report
+
+###################################################################
+# 10-2) 비동기 답변 생성 풀 (브라우저 작업과 GPT 호출 병행)
+###################################################################
+# 크롤링 직후 처리 대상 리뷰의 답변 생성을 미리 시작하고,
+# 브라우저 스레드는 완료된 답변을 결과 큐에서 꺼내 등록만 수행
+LLM_POOL_ENABLED = True
+LLM_POOL_CONCURRENCY = 4      # 동시에 진행할 GPT 답변 생성 수
+LLM_RESULT_TIMEOUT = 90       # 답변 대기 최대 시간(초), 초과 시 동기 방식으로 생성
+
+llm_pool = {"loop": None, "thread": None, "client": None, "semaphore": None, "generation": 0}
+llm_pool_lock = threading.Lock()
+llm_results = queue.Queue()   # (generation, key, ai_reply) - 완료 순서대로
+llm_ready = {}                # 결과 큐에서 꺼냈지만 아직 사용하지 않은 답변 {key: ai_reply}
+llm_pending = set()           # 생성 중인 key
+
+def start_llm_pool():
+    """이벤트 루프 스레드와 AsyncOpenAI 클라이언트 준비 (최초 1회)"""
+    with llm_pool_lock:
+        if llm_pool["loop"] is not None:
+            return True
+        try:
+            loop = asyncio.new_event_loop()
+            aclient = openai.AsyncOpenAI(api_key=openai.api_key)
+            
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.run_forever()
+            
+            thread = threading.Thread(target=run_loop, daemon=True, name="llm-pool")
+            thread.start()
+            llm_pool["semaphore"] = asyncio.run_coroutine_threadsafe(
+                _make_semaphore(LLM_POOL_CONCURRENCY), loop
+            ).result(timeout=5)
+            llm_pool.update(loop=loop, thread=thread, client=aclient)
+            logging.info(f"[LLM풀] 시작 (동시 생성 {LLM_POOL_CONCURRENCY}개)")
+            return True
+        except Exception as e:
+            logging.error(f"[LLM풀] 시작 실패 => 동기 방식 사용: {e}")
+            return False
+
+async def _make_semaphore(limit):
+    return asyncio.Semaphore(limit)
+
+def submit_reply_job(key, review, shop_info):
+    """답변 생성 작업 등록 (결과는 wait_for_reply 로 수신)"""
+    if not LLM_POOL_ENABLED or key in llm_pending or key in llm_ready:
+        return False
+    if not start_llm_pool():
+        return False
+    job_review = {k: v for k, v in review.items() if k != "element"}
+    llm_pending.add(key)
+    asyncio.run_coroutine_threadsafe(_reply_job(llm_pool["generation"], key, job_review, dict(shop_info)),
+                                     llm_pool["loop"])
+    return True
+
+async def _reply_job(generation, key, review, shop_info):
+    ai_reply = None
+    try:
+        async with llm_pool["semaphore"]:
+            ai_reply = await generate_ai_reply_with_retry_async(review, shop_info)
+    except Exception as e:
+        logging.error(f"[LLM풀] 답변 생성 오류 (key={key[:8]}): {e}")
+    llm_results.put((generation, key, ai_reply))
+
+@timed("llm.pool_wait")
+def wait_for_reply(key, timeout=LLM_RESULT_TIMEOUT):
+    """
+    key 에 해당하는 답변을 결과 큐에서 수신
+    - 등록되지 않은 key 또는 시간 초과/생성 실패 시 None (호출부에서 동기 방식으로 생성)
+    """
+    if key in llm_ready:
+        llm_pending.discard(key)
+        return llm_ready.pop(key)
+    if key not in llm_pending:
+        return None
+    
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            logging.warning(f"[LLM풀] 답변 대기 시간 초과 (key={key[:8]}) => 동기 방식으로 생성")
+            llm_pending.discard(key)
+            return None
+        try:
+            generation, done_key, ai_reply = llm_results.get(timeout=remaining)
+        except queue.Empty:
+            continue
+        # 정리(clear_reply_jobs) 이전에 등록됐거나 대기 시간 초과로 포기한 작업의 결과는 버림
+        if generation != llm_pool["generation"] or done_key not in llm_pending:
+            continue
+        if done_key == key:
+            llm_pending.discard(key)
+            return ai_reply
+        llm_ready[done_key] = ai_reply
+
+def clear_reply_jobs():
+    """
+    매장 처리 종료 시 사용하지 않은 답변 정리
+    - 진행 중인 작업은 취소하지 않고 세대 번호만 올림: 나중에 도착한 결과는 wait_for_reply 가 버림
+      (같은 리뷰를 다음 매장 처리에서 다시 등록해도 이전 결과를 쓰지 않음)
+    """
+    while True:
+        try:
+            llm_results.get_nowait()
+        except queue.Empty:
+            break
+    if llm_ready or llm_pending:
+        logging.info(f"[LLM풀] 미사용 답변 {len(llm_ready)}개, 진행 중 {len(llm_pending)}개 정리")
+    llm_pool["generation"] += 1
+    llm_ready.clear()
+    llm_pending.clear()
+
+async def _generate_ai_reply_async(review: dict, shop_info: dict) -> str:
+    """generate_ai_reply 의 AsyncOpenAI 버전"""
+    try:
+        prompt_system, prompt_user = _build_reply_prompts(review, shop_info)
+        response = await llm_pool["client"].chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": prompt_system},
+                {"role": "user", "content": prompt_user},
+            ],
+            max_tokens=500
+        )
+        _record_llm_usage(response)
+        ai_reply = clean_ai_reply(response.choices[0].message.content)
+        return _ensure_greeting_end(ai_reply, shop_info.get("greeting_end", "감사합니다."), "generate_ai_reply_async")
+    except Exception as e:
+        logging.error(f"[generate_ai_reply_async] 답변 생성 오류: {e}")
+        return None
+
+async def _score_reply_async(ai_reply: str, review: dict, shop_info: dict) -> tuple:
+    """score_reply 의 AsyncOpenAI 버전"""
+    try:
+        response = await llm_pool["client"].chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": REPLY_SCORE_PROMPT},
+                {"role": "user", "content": _build_score_user_prompt(ai_reply, review, shop_info)}
+            ],
+            temperature=0.1,
+            max_tokens=500
+        )
+        _record_llm_usage(response)
+        return _parse_score_content(response.choices[0].message.content)
+    except Exception as e:
+        logging.error(f"[score_reply_async] 평가 중 오류: {e}")
+        return 80, {}
+
+async def _evaluate_reply_async(ai_reply: str, review: dict, shop_info: dict, threshold: int = 80) -> tuple:
+    """evaluate_reply 의 비동기 버전 (기준점 근처만 GPT 평가)"""
+    if not SCORE_LOCAL_ENABLED:
+        return await _score_reply_async(ai_reply, review, shop_info)
+    score, details = local_score_reply(ai_reply, review, shop_info)
+    if needs_remote_score(score, threshold):
+        return await _score_reply_async(ai_reply, review, shop_info)
+    return score, details
+
+async def generate_ai_reply_with_retry_async(review: dict, shop_info: dict, max_attempts: int = 3) -> str:
+    """generate_ai_reply_with_retry 와 같은 규칙(검증 → 80점 이상 즉시 채택, 아니면 최고점)의 비동기 버전"""
+    best_reply = None
+    best_score = 0
+    
+    for attempt in range(max_attempts):
+        ai_reply = await _generate_ai_reply_async(review, shop_info)
+        if not ai_reply:
+            continue
+        
+        is_valid, reason = validate_reply_content(ai_reply, shop_info)
+        if not is_valid:
+            logging.warning(f"[AI 답변 검증(비동기)] {review.get('author')} 시도 {attempt + 1} 실패: {reason}")
+            continue
+        
+        if not openai.api_key:
+            return ai_reply
+        score, _ = await _evaluate_reply_async(ai_reply, review, shop_info)
+        if score < 80:
+            record_scorer_draft(ai_reply, review, shop_info, score)
+        if score > best_score:
+            best_score = score
+            best_reply = ai_reply
+        if score >= 80:
+            return ai_reply
+    
+    if best_reply:
+        logging.info(f"[AI 답변 선택(비동기)] {review.get('author')} 최고 점수({best_score}) 답변 선택")
+    return best_reply
+
+###################################################################
+# 10-3) 답변 캐시 (별점만 있는/짧은 반복 문구 리뷰)
+###################################################################
+# 키: 정규화한 리뷰 텍스트 + 별점 구간 + 주문메뉴 + store_code + 매장 답변 설정 해시
+# 키마다 서로 다른 답변을 최대 REPLY_CACHE_POOL_SIZE개 보관하고 돌려 쓰며,
+# 같은 답변이 연속으로 나가지 않도록 직전에 사용한 답변은 제외
+REPLY_CACHE_ENABLED = True
+REPLY_CACHE_FILE = "reply_cache_yogiyo.sqlite3"
+REPLY_CACHE_MAX_TEXT_LEN = 20        # 정규화 후 이 길이 이하인 리뷰만 캐시 대상
+REPLY_CACHE_POOL_SIZE = 5            # 키당 보관할 답변 수
+REPLY_CACHE_MIN_POOL = 3             # 이 수만큼 모이기 전에는 새로 생성 (다양성 확보)
+REPLY_CACHE_SIMILARITY = 0.9         # 기존 답변과 이 이상 비슷하면 새로 보관하지 않음
+REPLY_CACHE_TTL = 30 * 24 * 3600     # 답변 보관 기간(초)
+REPLY_CACHE_MAX_KEYS = 2000          # 초과 시 가장 오래 사용하지 않은 키부터 삭제
+
+reply_cache_conn = None
+reply_cache_lock = threading.Lock()
+reply_cache_stats = {"hits": 0, "misses": 0, "fills": 0, "stored": 0, "evicted": 0}
+
+def _reply_cache_db():
+    """캐시 DB 연결 (최초 호출 시 테이블 생성)"""
+    global reply_cache_conn
+    if reply_cache_conn is None:
+        conn = sqlite3.connect(REPLY_CACHE_FILE, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reply_cache (
+                cache_key TEXT NOT NULL,
+                reply_hash TEXT NOT NULL,
+                reply TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_served_at REAL NOT NULL DEFAULT 0,
+                served_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (cache_key, reply_hash)
+            );
+            CREATE TABLE IF NOT EXISTS reply_cache_keys (
+                cache_key TEXT PRIMARY KEY,
+                store_code TEXT,
+                last_access REAL NOT NULL,
+                last_reply_hash TEXT
+            );
+            CREATE TABLE IF NOT EXISTS reply_cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+        reply_cache_conn = conn
+    return reply_cache_conn
+
+def normalize_review_text(text: str) -> str:
+    """
+    캐시 키용 리뷰 텍스트 정규화
+    - 유니코드 정규화, 소문자, 공백/문장부호/이모지 제거, 3회 이상 반복 문자 축약
+      ('맛있어요!!!', '맛있어요 ㅎㅎㅎㅎ' -> '맛있어요', '맛있어요ㅎㅎ')
+    """
+    text = unicodedata.normalize('NFC', text or "").lower()
+    text = re.sub(r'[^0-9a-z가-힣ㄱ-ㅎㅏ-ㅣ]', '', text)
+    return re.sub(r'(.)\1{2,}', r'\1\1', text)
+
+def _rating_bucket(rating) -> str:
+    try:
+        rating = int(float(rating or 0))
+    except (TypeError, ValueError):
+        rating = 0
+    return str(rating) if rating >= 3 else "1-2"
+
+def _shop_config_hash(shop_info: dict) -> str:
+    """답변 내용에 영향을 주는 매장 설정의 해시 (설정이 바뀌면 캐시 키도 바뀜)"""
+    fields = ("greeting_start", "greeting_end", "role", "tone", "max_length", "store_type", "prohibited_words")
+    base = json.dumps([str(shop_info.get(f, "")) for f in fields], ensure_ascii=False)
+    return hashlib.md5(base.encode("utf-8")).hexdigest()[:12]
+
+def reply_cache_key(review: dict, shop_info: dict, store_code: str):
+    """캐시 대상이면 키, 아니면 None (긴 리뷰는 개별 답변 필요)"""
+    normalized = normalize_review_text(review.get("review_text", ""))
+    if len(normalized) > REPLY_CACHE_MAX_TEXT_LEN:
+        return None
+    menu = normalize_review_text(review.get("order_menu", ""))
+    base = f"{store_code}|{_rating_bucket(review.get('star'))}|{normalized}|{menu}|{_shop_config_hash(shop_info)}"
+    return hashlib.md5(base.encode("utf-8")).hexdigest()
+
+def _bump_cache_stat(name, count=1):
+    reply_cache_stats[name] += count
+    _reply_cache_db().execute(
+        "INSERT INTO reply_cache_stats(name, value) VALUES(?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, count))
+
+def get_cached_reply(review: dict, shop_info: dict, store_code: str, peek: bool = False):
+    """
+    캐시에서 답변 꺼내기 (직전에 사용한 답변 제외, 가장 오래 사용하지 않은 답변 우선)
+    - peek=True 면 사용 기록/통계를 남기지 않고 존재 여부만 확인
+    - 답변 수가 REPLY_CACHE_MIN_POOL 미만이면 None (새로 생성해서 풀을 채움)
+    """
+    if not REPLY_CACHE_ENABLED:
+        return None
+    key = reply_cache_key(review, shop_info, store_code)
+    if not key:
+        return None
+    try:
+        with reply_cache_lock:
+            db = _reply_cache_db()
+            now = time.time()
+            rows = db.execute(
+                "SELECT reply_hash, reply FROM reply_cache WHERE cache_key = ? AND created_at >= ? "
+                "ORDER BY last_served_at ASC", (key, now - REPLY_CACHE_TTL)).fetchall()
+            if len(rows) < REPLY_CACHE_MIN_POOL:
+                if not peek:
+                    _bump_cache_stat("fills" if rows else "misses")
+                    db.commit()
+                return None
+            if peek:
+                return rows[0][1]
+            
+            last = db.execute("SELECT last_reply_hash FROM reply_cache_keys WHERE cache_key = ?", (key,)).fetchone()
+            last_hash = last[0] if last else None
+            reply_hash, reply = next(((h, r) for h, r in rows if h != last_hash), rows[0])
+            
+            db.execute("UPDATE reply_cache SET last_served_at = ?, served_count = served_count + 1 "
+                       "WHERE cache_key = ? AND reply_hash = ?", (now, key, reply_hash))
+            db.execute("INSERT INTO reply_cache_keys(cache_key, store_code, last_access, last_reply_hash) VALUES(?, ?, ?, ?) "
+                       "ON CONFLICT(cache_key) DO UPDATE SET last_access = excluded.last_access, "
+                       "last_reply_hash = excluded.last_reply_hash", (key, store_code, now, reply_hash))
+            _bump_cache_stat("hits")
+            db.commit()
+        logging.info(f"[답변캐시] 적중 (key={key[:8]}, 보관 {len(rows)}개)")
+        return reply
+    except Exception as e:
+        logging.error(f"[답변캐시] 조회 실패: {e}")
+        return None
+
+def store_cached_reply(review: dict, shop_info: dict, store_code: str, ai_reply: str):
+    """등록에 성공한 답변을 캐시에 보관 (작성자 이름이 들어간 답변, 비슷한 답변은 제외)"""
+    if not REPLY_CACHE_ENABLED or not ai_reply:
+        return
+    key = reply_cache_key(review, shop_info, store_code)
+    if not key:
+        return
+    author = (review.get("author") or "").strip()
+    if len(author) >= 2 and author in ai_reply:
+        return
+    try:
+        with reply_cache_lock:
+            db = _reply_cache_db()
+            now = time.time()
+            reply_hash = hashlib.md5(ai_reply.encode("utf-8")).hexdigest()
+            existing = db.execute("SELECT reply_hash, reply FROM reply_cache WHERE cache_key = ?", (key,)).fetchall()
+            if any(h == reply_hash or difflib.SequenceMatcher(None, r, ai_reply).ratio() >= REPLY_CACHE_SIMILARITY
+                   for h, r in existing):
+                return
+            
+            # 풀이 가득 차면 가장 많이 사용한 답변을 교체
+            if len(existing) >= REPLY_CACHE_POOL_SIZE:
+                db.execute("DELETE FROM reply_cache WHERE rowid IN (SELECT rowid FROM reply_cache WHERE cache_key = ? "
+                           "ORDER BY served_count DESC, created_at ASC LIMIT ?)",
+                           (key, len(existing) - REPLY_CACHE_POOL_SIZE + 1))
+            db.execute("INSERT OR IGNORE INTO reply_cache(cache_key, reply_hash, reply, created_at, last_served_at) "
+                       "VALUES(?, ?, ?, ?, ?)", (key, reply_hash, ai_reply, now, now))
+            db.execute("INSERT INTO reply_cache_keys(cache_key, store_code, last_access, last_reply_hash) VALUES(?, ?, ?, ?) "
+                       "ON CONFLICT(cache_key) DO UPDATE SET last_access = excluded.last_access, "
+                       "last_reply_hash = excluded.last_reply_hash", (key, store_code, now, reply_hash))
+            _bump_cache_stat("stored")
+            db.commit()
+    except Exception as e:
+        logging.error(f"[답변캐시] 저장 실패: {e}")
+
+def evict_reply_cache():
+    """TTL 지난 답변 삭제 + 키 수가 REPLY_CACHE_MAX_KEYS 를 넘으면 오래 사용하지 않은 키부터 삭제"""
+    if not REPLY_CACHE_ENABLED:
+        return
+    try:
+        with reply_cache_lock:
+            db = _reply_cache_db()
+            expired = db.execute("DELETE FROM reply_cache WHERE created_at < ?",
+                                 (time.time() - REPLY_CACHE_TTL,)).rowcount
+            key_count = db.execute("SELECT COUNT(*) FROM reply_cache_keys").fetchone()[0]
+            lru = 0
+            if key_count > REPLY_CACHE_MAX_KEYS:
+                old_keys = [r[0] for r in db.execute(
+                    "SELECT cache_key FROM reply_cache_keys ORDER BY last_access ASC LIMIT ?",
+                    (key_count - REPLY_CACHE_MAX_KEYS,)).fetchall()]
+                for k in old_keys:
+                    lru += db.execute("DELETE FROM reply_cache WHERE cache_key = ?", (k,)).rowcount
+                    db.execute("DELETE FROM reply_cache_keys WHERE cache_key = ?", (k,))
+            db.execute("DELETE FROM reply_cache_keys WHERE cache_key NOT IN (SELECT DISTINCT cache_key FROM reply_cache)")
+            if expired or lru:
+                _bump_cache_stat("evicted", expired + lru)
+            db.commit()
+        if expired or lru:
+            logging.info(f"[답변캐시] 정리: 기간 만료 {expired}개, LRU {lru}개 삭제")
+    except Exception as e:
+        logging.error(f"[답변캐시] 정리 실패: {e}")
+
+def log_reply_cache_stats():
+    """이번 실행/누적 캐시 적중률 로그"""
+    if not REPLY_CACHE_ENABLED:
+        return
+    try:
+        with reply_cache_lock:
+            totals = dict(_reply_cache_db().execute("SELECT name, value FROM reply_cache_stats").fetchall())
+            entries = _reply_cache_db().execute("SELECT COUNT(*), COUNT(DISTINCT cache_key) FROM reply_cache").fetchone()
+        for label, st in (("이번 실행", reply_cache_stats), ("누적", totals)):
+            lookups = st.get("hits", 0) + st.get("misses", 0) + st.get("fills", 0)
+            rate = st.get("hits", 0) / lookups * 100 if lookups else 0.0
+            logging.info(f"[답변캐시] {label}: 적중 {st.get('hits', 0)}/{lookups} ({rate:.1f}%), "
+                         f"미보관 {st.get('misses', 0)}, 풀 채우는 중 {st.get('fills', 0)}, "
+                         f"보관 {st.get('stored', 0)}, 삭제 {st.get('evicted', 0)}")
+        logging.info(f"[답변캐시] 보관 답변 {entries[0]}개 / 키 {entries[1]}개")
+    except Exception as e:
+        logging.error(f"[답변캐시] 통계 조회 실패: {e}")
+
+###################################################################
+# 10-4) 별점만 있는 리뷰 템플릿 답변
+###################################################################
+# 내용 없는 리뷰는 GPT 호출 없이 템플릿으로 답변 (문구/조합은 rating_template.py)
+def build_rating_only_reply(rv: dict, shop_info: dict) -> str:
+    """
+    별점만 있는 리뷰의 템플릿 답변
+    - validate_reply_content 를 통과하는 첫 후보 반환, 없으면 None (GPT 생성으로 대체)
+    """
+    rating = rv.get("star")
+    for reply in rating_only_candidates(rv, shop_info):
+        is_valid, reason = validate_reply_content(reply, shop_info)
+        if is_valid:
+            logging.info(f"[템플릿답변] 별점 {rating}점, {len(reply)}자")
+            return reply
+    
+    logging.warning(f"[템플릿답변] 검증 통과 조합 없음 (별점 {rating}점) => GPT 생성으로 대체")
+    return None
+
 ###################################################################
 # 11) 댓글 등록 함수
 ###################################################################
+@timed("submit")
 def post_review_response(driver, store_code, rv, ai_reply):
     """
     요기요 댓글 등록
@@ -1629,10 +2722,29 @@ def post_review_response(driver, store_code, rv, ai_reply):
 ###################################################################
 # 12) 리뷰 분석 및 처리 통합 함수
 ###################################################################
-def process_review_with_analysis(driver, store_code, store_name, platform_code, rv, shop_info=None):
+def _get_ai_reply(rv, shop_info, reply_key=None, store_code=""):
+    """템플릿(별점만 있는 리뷰) → 답변 캐시 → 비동기 풀에서 미리 생성한 답변 → 동기 방식 생성 순으로 답변 확보"""
+    if use_rating_template(rv, shop_info):
+        template_reply = build_rating_only_reply(rv, shop_info)
+        if template_reply:
+            return template_reply
+    cached = get_cached_reply(rv, shop_info, store_code)
+    if cached:
+        return cached
+    if reply_key:
+        ai_reply = wait_for_reply(reply_key)
+        if ai_reply:
+            logging.info(f"[AI 답변] 미리 생성된 답변 사용 (key={reply_key[:8]})")
+            return ai_reply
+    return generate_ai_reply_with_retry(rv, shop_info)
+
+def process_review_with_analysis(driver, store_code, store_name, platform_code, rv, shop_info=None, analysis_result=None,
+                                 reply_key=None):
     """
     리뷰 분석 및 처리 통합 함수
     - 별점 체크 → 리뷰 분석 → 답변 생성 → 댓글 등록 → DB 저장
+    - analysis_result: analyze_reviews_batch 로 미리 분석한 결과 (없으면 단건 분석)
+    - reply_key: submit_reply_job 으로 답변 생성을 미리 시작한 경우 해당 key
     """
     author = rv['author']
     star_rating = int(rv['star']) if rv['star'] else 0
@@ -1643,6 +2755,8 @@ def process_review_with_analysis(driver, store_code, store_name, platform_code,
     
     # 리뷰 해시 생성
     review_id = generate_review_hash(store_code, author, review_text)
+    review_events.start(review_id, store_code, started_at=rv.get("crawl_started"), rating=star_rating)
+    review_events.mark(review_id, "crawled", at=rv.get("crawled_at"))
     
     # 매장 설정 가져오기 (전달받지 않았을 경우만)
     if shop_info is None:
@@ -1672,9 +2786,10 @@ def process_review_with_analysis(driver, store_code, store_name, platform_code,
         )
         return
     
-    # 기존 리뷰 확인
-    existing = supabase.table("reviews").select("*").eq("review_id", review_id).execute()
-    existing_record = existing.data[0] if existing.data else None
+    # 기존 리뷰 확인 (로컬 미러 우선)
+    existing_record = review_mirror.lookup(review_id, store_code, "요기요")
+    if existing_record:
+        known_review_records[review_id] = existing_record
     
     # 2일 이상 경과된 '사장님 확인필요' 리뷰 처리
     if existing_record and existing_record.get('response_status') == "사장님 확인필요":
@@ -1687,9 +2802,10 @@ def process_review_with_analysis(driver, store_code, store_name, platform_code,
                 if days_passed >= 2:
                     logging.info(f"[오래된리뷰] {days_passed}일 경과 => AI 답변 시도")
                     # AI 답변 생성 시도
-                    ai_reply = generate_ai_reply_with_retry(rv, shop_info)
+                    ai_reply = _get_ai_reply(rv, shop_info, reply_key, store_code)
                     
                     if ai_reply and post_review_response(driver, store_code, rv, ai_reply):
+                        store_cached_reply(rv, shop_info, store_code, ai_reply)
                         # 성공 시 답변완료로 상태 변경
                         insert_review_to_supabase(
                             store_code=store_code,
@@ -1709,7 +2825,16 @@ def process_review_with_analysis(driver, store_code, store_name, platform_code,
                 logging.error(f"[날짜처리오류] {e}")
     
     # 일반적인 리뷰 처리 로직
-    analysis_result = analyze_restaurant_review(review_text, star_rating, order_menu, delivery_review)
+    # 단일 호출 엔진 매장: 분석/답변/평가를 한 번에 (실패 항목은 기존 방식으로 대체)
+    single_pass = None
+    if get_reply_engine(shop_info) == "single":
+        single_pass = generate_single_pass_reply(rv, shop_info)
+        if single_pass:
+            analysis_result = single_pass["analysis"]
+    
+    if analysis_result is None:
+        analysis_result = analyze_restaurant_review(review_text, star_rating, order_menu, delivery_review)
+    review_events.mark(review_id, "analyzed")
     category = analysis_result.get('category', '')
     reason = analysis_result.get('reason', '')
     
@@ -1732,8 +2857,14 @@ def process_review_with_analysis(driver, store_code, store_name, platform_code,
         )
         return
     
-    # AI 답변 생성
-    ai_reply = generate_ai_reply_with_retry(rv, shop_info)
+    # AI 답변 생성 (단일 호출 엔진에서 채택된 답변이 있으면 재사용)
+    if single_pass and single_pass.get("reply"):
+        ai_reply = single_pass["reply"]
+    else:
+        ai_reply = _get_ai_reply(rv, shop_info, reply_key, store_code)
+    # 요기요는 생성 재시도 루프 안에서 품질 평가까지 끝나므로 평가 시간은 generated 구간에 포함
+    review_events.mark(review_id, "generated")
+    review_events.mark(review_id, "scored")
     
     if not ai_reply:
         insert_review_to_supabase(
@@ -1755,6 +2886,8 @@ def process_review_with_analysis(driver, store_code, store_name, platform_code,
     
     # 답변 등록
     if post_review_response(driver, store_code, rv, ai_reply):
+        review_events.mark(review_id, "posted")
+        store_cached_reply(rv, shop_info, store_code, ai_reply)
         insert_review_to_supabase(
             store_code=store_code,
             store_name=store_name,
@@ -1789,9 +2922,12 @@ def process_review_with_analysis(driver, store_code, store_name, platform_code,
 ###################################################################
 # 13) 매장 처리 로직
 ###################################################################
-def process_yogiyo_store(driver, shop_info):
+def process_yogiyo_store(driver, shop_info, logged_in=False, do_logout=True):
     """
     요기요 매장 처리 함수
+    - logged_in=True 이면 로그인 생략 (드라이버 재사용 모드에서 이미 로그인된 상태)
+    - do_logout=False 이면 처리 후 로그아웃하지 않음 (같은 계정의 다음 매장으로 이어서 처리)
+    - 로그인/리뷰페이지 이동 실패 시 False 반환
     """
     store_code = shop_info["store_code"]
     store_name = shop_info["store_name"]
@@ -1818,26 +2954,30 @@ def process_yogiyo_store(driver, shop_info):
     logging.info(f"[매장정보] greeting_start='{current_shop_info['greeting_start']}', greeting_end='{current_shop_info['greeting_end']}'")
     
     # 1) 로그인
-    if not login_to_yogiyo(driver, store_code, platform_id, platform_pw):
-        return
-    check_and_close_new_windows(driver)
+    if not logged_in:
+        if not login_to_yogiyo(driver, store_code, platform_id, platform_pw):
+            return False
+        check_and_close_new_windows(driver)
 
     # 2) 리뷰페이지 이동
     if not navigate_to_reviews(driver, store_code, platform_code):
-        return
+        return False
     check_and_close_new_windows(driver)
 
-    # 3) 리뷰 크롤링
-    rv_list = crawl_review_data(driver, store_code)
+    # 3) 리뷰 크롤링 (크롤링 기준점에 도달하면 스크롤 중단)
+    crawl = crawl_watermarks.begin(store_code, "요기요", platform_code)
+    rv_list = crawl_review_data(driver, store_code, crawl)
     if not rv_list:
         logging.info(f"[리뷰없음] store_code={store_code}")
-        return
+        crawl_watermarks.finish(crawl, crawl_status_from_mirror)
+        return True
     check_and_close_new_windows(driver)
     
     # 이미 처리한 리뷰의 해시값을 저장하는 세트 (세션 내 중복 방지)
     processed_in_session = set()
     
-    # 4) 리뷰 처리
+    # 4) 처리 대상 선별 (중복/재시도 초과 리뷰 제외)
+    targets = []
     for idx, rv in enumerate(rv_list, 1):
         # 해시 생성
         review_hash = generate_review_hash(store_code, rv['author'], rv['review_text'])
@@ -1851,19 +2991,70 @@ def process_yogiyo_store(driver, shop_info):
         if _check_duplicate_review(driver, store_code, review_hash, rv['author'], rv['review_text']):
             # True가 반환되면 이 리뷰는 스킵
             continue
-            
+        
+        processed_in_session.add(review_hash)
+        targets.append((idx, rv))
+    
+    # 5) 리뷰 일괄 분석 (별점 자동답글 제외 리뷰는 분석하지 않음)
+    analyses = {}
+    to_analyze = [
+        (idx, rv) for idx, rv in targets
+        if current_shop_info.get(f"rating_{int(rv['star']) if rv['star'] else 0}_reply", True)
+    ]
+    if to_analyze and get_reply_engine(current_shop_info) != "single":
+        batch_results = analyze_reviews_batch([
+            {
+                "review_text": rv['review_text'],
+                "rating": int(rv['star']) if rv['star'] else 0,
+                "order_menu": rv.get('order_menu', ''),
+                "delivery_review": rv.get('delivery_review', '')
+            }
+            for _, rv in to_analyze
+        ])
+        analyses = {idx: result for (idx, _), result in zip(to_analyze, batch_results)}
+    
+    # 6) 답변 생성 미리 시작 (비동기 풀, 브라우저는 등록만 수행)
+    reply_keys = {}
+    if LLM_POOL_ENABLED and get_reply_engine(current_shop_info) != "single":
+        for idx, rv in targets:
+            review_hash = generate_review_hash(store_code, rv['author'], rv['review_text'])
+            record = known_review_records.get(review_hash) or {}
+            needs_reply = (analyses.get(idx) or {}).get('ai_reply') or record.get('response_status') == "사장님 확인필요"
+            if needs_reply and (use_rating_template(rv, current_shop_info)
+                                or get_cached_reply(rv, current_shop_info, store_code, peek=True)):
+                continue
+            if needs_reply and submit_reply_job(review_hash, rv, current_shop_info):
+                reply_keys[idx] = review_hash
+        if reply_keys:
+            logging.info(f"[LLM풀] store_code={store_code}, 답변 생성 {len(reply_keys)}건 시작")
+    
+    # 7) 리뷰 처리
+    for idx, rv in targets:
         logging.info(f"[리뷰] {idx}/{len(rv_list)} => 작성자={rv['author']}, 별점={rv['star']}")
         
         # 중요: shop_info를 매개변수로 전달
-        process_review_with_analysis(driver, store_code, store_name, platform_code, rv, current_shop_info)
-        
-        # 처리된 리뷰 해시 저장 (세션 내 중복 방지)
-        processed_in_session.add(review_hash)
+        process_review_with_analysis(driver, store_code, store_name, platform_code, rv, current_shop_info,
+                                     analysis_result=analyses.get(idx), reply_key=reply_keys.get(idx))
         
         # 처리 후 잠시 대기 (서버 부하 방지)
         time.sleep(1)
 
-    # 5) 로그아웃
+    clear_reply_jobs()
+    crawl_watermarks.finish(crawl, crawl_status_from_mirror)
+
+    # 8) 로그아웃
+    if do_logout:
+        logout_from_yogiyo(driver, store_code, platform_id)
+
+    logging.info(f"===== [매장 처리 끝] {store_name} =====\n")
+    return True
+
+def logout_from_yogiyo(driver, store_code, platform_id=None):
+    """
+    요기요 로그아웃 (로그아웃하면 저장된 세션도 무효화)
+    """
+    if platform_id:
+        session_cache.invalidate(platform_id, "로그아웃")
     try:
         driver.get("https://ceo.yogiyo.co.kr/my/")
         time.sleep(3)
@@ -1873,6 +3064,7 @@ def process_yogiyo_store(driver, shop_info):
         logout_btn.click()
         time.sleep(2)
         logging.info(f"[로그아웃] store_code={store_code}")
+        return True
     except Exception as ex:
         logging.error(f"[로그아웃 실패] store_code={store_code}, {ex}")
         save_error_log_to_supabase(
@@ -1882,8 +3074,77 @@ def process_yogiyo_store(driver, shop_info):
             error_message=str(ex),
             stack_trace=traceback.format_exc()
         )
+        return False
 
-    logging.info(f"===== [매장 처리 끝] {store_name} =====\n")
+def is_driver_alive(driver):
+    """드라이버(브라우저)가 아직 응답하는지 확인"""
+    try:
+        _ = driver.current_url
+        return True
+    except Exception:
+        return False
+
+def process_credential_group(platform_id, rows, on_store_done=None):
+    """
+    드라이버 재사용 모드: 같은 계정의 매장들을 브라우저 하나로 처리
+    - 계정당 로그인 1회, 매장 전환은 select_store(navigate_to_reviews)로 처리
+    - 브라우저가 죽으면 새로 띄우고 다시 로그인
+    - on_store_done(store_code, ok): 매장 처리 후 호출 (병렬 실행 시 결과 보고용)
+    """
+    driver = None
+    logged_in = False
+    try:
+        for row in rows:
+            store_code = row.get("store_code", "Unknown")
+            try:
+                if driver is None or not is_driver_alive(driver):
+                    if driver:
+                        try:
+                            driver.quit()
+                        except:
+                            pass
+                    driver = initialize_driver()
+                    logged_in = False
+                    if not driver:
+                        logging.error(f"[드라이버풀] 브라우저 초기화 실패 => 계정 ID={platform_id} 중단")
+                        return
+
+                if not logged_in:
+                    logged_in = login_to_yogiyo(driver, store_code, row["platform_id"], row["platform_pw"])
+                    if not logged_in:
+                        logging.error(f"[드라이버풀] 계정 ID={platform_id} 로그인 실패 => 다음 계정으로")
+                        if on_store_done:
+                            for r in rows[rows.index(row):]:
+                                on_store_done(r.get("store_code", "Unknown"), False)
+                        return
+                    check_and_close_new_windows(driver)
+
+                ok = process_yogiyo_store(driver, row, logged_in=True, do_logout=False)
+                if on_store_done:
+                    on_store_done(store_code, ok)
+            except Exception as ex:
+                logging.error(f"[전체처리오류] store_code={store_code}, {ex}")
+                save_error_log_to_supabase(
+                    category="오류",
+                    store_code=store_code,
+                    error_type="전체 처리 오류",
+                    error_message=str(ex),
+                    stack_trace=traceback.format_exc()
+                )
+                if on_store_done:
+                    on_store_done(store_code, False)
+            finally:
+                review_writer.flush(f"매장 종료 {store_code}")
+
+        # 세션 캐시 사용 시 로그아웃하지 않고 다음 실행에서 세션 재사용
+        if logged_in and is_driver_alive(driver) and not SESSION_CACHE_ENABLED:
+            logout_from_yogiyo(driver, rows[-1].get("store_code", "Unknown"), platform_id)
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except:
+                pass
     
 ###################################################################
 # 14) 메인 실행 함수
@@ -1894,6 +3155,7 @@ def run_automation():
     """
     global processed_reviews_in_session
     processed_reviews_in_session = set()  # 세션 초기화
+    known_review_records.clear()
     
     if not driver_path:
         messagebox.showerror("오류", "크롬드라이버 경로가 설정되지 않았습니다.")
@@ -1934,15 +3196,51 @@ def run_automation():
 
     logging.info(f"[총 매장 수] {len(shop_rows)}개")
 
-    # 2) 하나씩 처리
+    # 리뷰 저장 큐 준비 (이전 실행 미전송분 복구 후 백그라운드 writer 시작)
+    review_writer.load_spilled()
+    review_writer.start()
+    evict_reply_cache()
+
+    # 2-0) 동시 실행 계정 수가 2 이상이면 프로세스 풀로 병렬 처리 (워커마다 계정별 브라우저 재사용)
+    worker_count = get_worker_count()
+    creds_group = group_by_credentials(shop_rows)
+    if worker_count > 1 and len(creds_group) > 1:
+        run_in_worker_pool(creds_group, worker_count)
+        review_writer.flush("작업 완료")
+        log_reply_cache_stats()
+        print_profile_report("yogiyo", logging.info)
+        error_sink.close()
+        review_mirror.log_stats()
+        crawl_watermarks.log_stats()
+        messagebox.showinfo("완료", "요기요 리뷰 처리가 모두 완료되었습니다.")
+        return
+
+    # 2-1) 드라이버 재사용 모드: 계정별로 브라우저 하나 + 로그인 1회
+    if driver_pool_mode.get():
+        for (pid, _), rows in creds_group.items():
+            logging.info(f"\n[드라이버풀] 계정 ID={pid}, 매장수={len(rows)}")
+            process_credential_group(pid, rows)
+            review_writer.flush(f"계정 종료 {pid}")
+
+        review_writer.flush("작업 완료")
+        log_reply_cache_stats()
+        print_profile_report("yogiyo", logging.info)
+        error_sink.close()
+        review_mirror.log_stats()
+        crawl_watermarks.log_stats()
+        messagebox.showinfo("완료", "요기요 리뷰 처리가 모두 완료되었습니다.")
+        return
+
+    # 2-2) 하나씩 처리 (매장마다 브라우저 새로 실행)
     for row in shop_rows:
+        driver = None
         try:
             driver = initialize_driver()
             if not driver:
                 messagebox.showerror("오류", "브라우저 초기화 실패")
                 return
                 
-            process_yogiyo_store(driver, row)
+            process_yogiyo_store(driver, row, do_logout=not SESSION_CACHE_ENABLED)
         except Exception as ex:
             logging.error(f"[전체처리오류] store_code={row.get('store_code','Unknown')}, {ex}")
             save_error_log_to_supabase(
@@ -1955,18 +3253,141 @@ def run_automation():
         finally:
             if driver:
                 driver.quit()
-
+            review_writer.flush(f"매장 종료 {row.get('store_code', 'Unknown')}")
+
+    review_writer.flush("작업 완료")
+    log_reply_cache_stats()
+    print_profile_report("yogiyo", logging.info)
+    error_sink.close()
+    review_mirror.log_stats()
+    crawl_watermarks.log_stats()
     messagebox.showinfo("완료", "요기요 리뷰 처리가 모두 완료되었습니다.")
 
 ###################################################################
-# 15) GUI
+# 15) 병렬 실행 (계정 그룹별 프로세스 풀)
 ###################################################################
-root = tk.Tk()
-root.title("요기요 리뷰 자동화 (Supabase)")
+WORKER_PROFILE_ROOT = "chrome_profiles"  # 워커별 크롬 프로필 상위 폴더
+worker_profile_dir = None  # 워커 프로세스에서만 설정 (initialize_driver에서 사용)
+
+def get_worker_count():
+    """GUI에서 입력한 동시 실행 계정 수 (잘못된 값이면 1)"""
+    try:
+        return max(1, int(worker_count_var.get()))
+    except Exception:
+        return 1
+
+def account_worker(worker_id, groups, result_queue):
+    """
+    워커 프로세스 진입점
+    - 전용 크롬 프로필로 할당받은 계정 그룹을 순서대로 처리
+    - 리뷰 행, 매장 결과, 오류는 result_queue로 부모 프로세스에 전달
+    """
+    global worker_profile_dir
+    review_writer.forward_to(result_queue, worker_id)
+    worker_profile_dir = os.path.abspath(os.path.join(WORKER_PROFILE_ROOT, f"yogiyo_w{worker_id}"))
+    os.makedirs(worker_profile_dir, exist_ok=True)
+
+    # 같은 로그 파일을 공유하므로 워커 번호를 로그에 표시
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(logging.Formatter(f'%(asctime)s - %(levelname)s - [w{worker_id}] %(message)s'))
+
+    stats = {"accounts": 0, "stores": 0, "failed_stores": 0, "errors": 0}
+    started = time.time()
+
+    def on_store_done(store_code, ok):
+        stats["stores" if ok else "failed_stores"] += 1
+        result_queue.put(("store", worker_id, store_code, ok))
+
+    try:
+        logging.info(f"[account_worker] 워커 {worker_id} 시작: 계정 {len(groups)}개, 프로필={worker_profile_dir}")
+        for pid, rows in groups:
+            stats["accounts"] += 1
+            try:
+                process_credential_group(pid, rows, on_store_done)
+            except Exception as e:
+                stats["errors"] += 1
+                result_queue.put(("error", worker_id, f"ID={pid}: {str(e)}"))
+    finally:
+        log_reply_cache_stats()
+        print_profile_report("yogiyo", logging.info)
+        error_sink.close()
+        review_mirror.log_stats()
+        crawl_watermarks.log_stats()
+        stats["elapsed"] = time.time() - started
+        result_queue.put(("done", worker_id, stats))
+
+def run_in_worker_pool(creds_group, worker_count):
+    """
+    계정 그룹을 worker_count개 프로세스에 나눠 병렬 처리
+    - 워커가 보낸 리뷰 행은 부모의 write-behind 큐로 저장
+    - 종료 후 워커별 처리량 요약 출력
+    """
+    groups = [(pid, rows) for (pid, _), rows in creds_group.items() if rows]
+    worker_count = max(1, min(worker_count, len(groups)))
+    shards = [groups[i::worker_count] for i in range(worker_count)]
+
+    ctx = multiprocessing.get_context("spawn")
+    result_queue = ctx.Queue()
+    workers = {}
+    summary = {}
+    for worker_id, shard in enumerate(shards, 1):
+        proc = ctx.Process(target=account_worker, args=(worker_id, shard, result_queue))
+        proc.start()
+        workers[worker_id] = proc
+        summary[worker_id] = {"accounts": 0, "stores": 0, "failed_stores": 0, "errors": 0, "reviews": 0, "elapsed": 0.0}
+        logging.info(f"[run_in_worker_pool] 워커 {worker_id} 시작 (pid={proc.pid}, 계정 {len(shard)}개)")
+
+    started = time.time()
+    finished = set()
+    while len(finished) < len(workers):
+        try:
+            msg = result_queue.get(timeout=5)
+        except queue.Empty:
+            # 비정상 종료된 워커는 done 메시지 없이 끝난 것으로 처리
+            for worker_id, proc in workers.items():
+                if worker_id not in finished and not proc.is_alive() and result_queue.empty():
+                    logging.error(f"[run_in_worker_pool] 워커 {worker_id} 비정상 종료 (exitcode={proc.exitcode})")
+                    summary[worker_id]["errors"] += 1
+                    summary[worker_id]["elapsed"] = time.time() - started
+                    finished.add(worker_id)
+            continue
 
-driver_label = tk.Label(root, text=f"크롬드라이버 경로: {driver_path or '미설정'}")
-driver_label.pack(pady=10)
+        kind, worker_id = msg[0], msg[1]
+        if kind == "review":
+            review_writer.enqueue(msg[2])
+            summary[worker_id]["reviews"] += 1
+        elif kind == "store":
+            logging.info(f"[run_in_worker_pool] 워커 {worker_id} 매장 완료: {msg[2]} ({'성공' if msg[3] else '실패'})")
+        elif kind == "error":
+            logging.error(f"[run_in_worker_pool] 워커 {worker_id} 오류: {msg[2]}")
+        elif kind == "done":
+            summary[worker_id].update(msg[2])
+            finished.add(worker_id)
+
+    for proc in workers.values():
+        proc.join(timeout=10)
+
+    log_worker_summary(summary, time.time() - started)
+    return summary
+
+def log_worker_summary(summary, total_elapsed):
+    """워커별 처리량 요약 출력"""
+    logging.info("\n[병렬 실행 요약]")
+    logging.info(f"{'워커':>4} {'계정':>4} {'매장':>4} {'실패':>4} {'리뷰':>5} {'오류':>4} {'소요(초)':>8} {'매장/분':>7} {'리뷰/분':>7}")
+    for worker_id in sorted(summary):
+        s = summary[worker_id]
+        minutes = s["elapsed"] / 60 if s["elapsed"] else 0
+        stores_per_min = s["stores"] / minutes if minutes else 0
+        reviews_per_min = s["reviews"] / minutes if minutes else 0
+        logging.info(f"{worker_id:>4} {s['accounts']:>4} {s['stores']:>4} {s['failed_stores']:>4} {s['reviews']:>5} "
+                     f"{s['errors']:>4} {s['elapsed']:>8.1f} {stores_per_min:>7.2f} {reviews_per_min:>7.2f}")
+    total_stores = sum(s["stores"] for s in summary.values())
+    total_reviews = sum(s["reviews"] for s in summary.values())
+    logging.info(f"[병렬 실행 요약] 전체 소요 {total_elapsed:.1f}초, 매장 {total_stores}개, 리뷰 {total_reviews}건")
 
+###################################################################
+# 16) GUI
+###################################################################
 def set_driver_path():
     global driver_path
     path = filedialog.askopenfilename(
@@ -1980,29 +3401,63 @@ def set_driver_path():
         save_config(cfg)
         driver_path = path
 
-btn_set = tk.Button(root, text="크롬드라이버 경로 설정", command=set_driver_path)
-btn_set.pack(pady=5)
+def build_gui():
+    """
+    GUI 구성 (메인 프로세스에서만 호출)
+    - 병렬 실행 워커(spawn)는 이 모듈을 다시 import 하므로 Tk 창은 모듈 최상위에서 만들지 않음
+    """
+    global root, driver_label, execution_mode, range_entry, driver_pool_mode, worker_count_var
+    root = tk.Tk()
+    root.title("요기요 리뷰 자동화 (Supabase)")
+
+    driver_label = tk.Label(root, text=f"크롬드라이버 경로: {driver_path or '미설정'}")
+    driver_label.pack(pady=10)
+
+    btn_set = tk.Button(root, text="크롬드라이버 경로 설정", command=set_driver_path)
+    btn_set.pack(pady=5)
 
-# 실행 모드: 전체 / 부분
-execution_mode = tk.StringVar(value='all')  # "all" 또는 "partial"
+    # 실행 모드: 전체 / 부분
+    execution_mode = tk.StringVar(value='all')  # "all" 또는 "partial"
 
-frame_mode = tk.LabelFrame(root, text="실행 범위 설정", padx=10, pady=10)
-frame_mode.pack(pady=5)
+    frame_mode = tk.LabelFrame(root, text="실행 범위 설정", padx=10, pady=10)
+    frame_mode.pack(pady=5)
 
-rb_all = tk.Radiobutton(frame_mode, text="전체 실행", variable=execution_mode, value='all')
-rb_all.grid(row=0, column=0, sticky="w")
+    rb_all = tk.Radiobutton(frame_mode, text="전체 실행", variable=execution_mode, value='all')
+    rb_all.grid(row=0, column=0, sticky="w")
 
-rb_partial = tk.Radiobutton(frame_mode, text="부분 실행", variable=execution_mode, value='partial')
-rb_partial.grid(row=0, column=1, sticky="w")
+    rb_partial = tk.Radiobutton(frame_mode, text="부분 실행", variable=execution_mode, value='partial')
+    rb_partial.grid(row=0, column=1, sticky="w")
 
-range_label = tk.Label(frame_mode, text="StoreCode 범위 (예: STORE00001, STORE00005)")
-range_label.grid(row=1, column=0, columnspan=2, sticky="w")
+    range_label = tk.Label(frame_mode, text="StoreCode 범위 (예: STORE00001, STORE00005)")
+    range_label.grid(row=1, column=0, columnspan=2, sticky="w")
 
-range_entry = tk.Entry(frame_mode, width=30)
-range_entry.grid(row=2, column=0, columnspan=2, pady=5, sticky="w")
+    range_entry = tk.Entry(frame_mode, width=30)
+    range_entry.grid(row=2, column=0, columnspan=2, pady=5, sticky="w")
 
-btn_run = tk.Button(root, text="자동화 실행", command=run_automation)
-btn_run.pack(pady=20)
+    # 드라이버 재사용 모드 (같은 계정 매장은 브라우저/로그인 공유)
+    driver_pool_mode = tk.BooleanVar(value=True)
+    chk_pool = tk.Checkbutton(root, text="계정별 브라우저 재사용 (로그인 1회)", variable=driver_pool_mode)
+    chk_pool.pack(pady=5)
+
+    # 동시 실행 계정 수 (2 이상이면 계정 그룹별 프로세스로 병렬 처리)
+    worker_frame = tk.Frame(root)
+    worker_frame.pack(pady=5)
+    tk.Label(worker_frame, text="동시 실행 계정 수").pack(side=tk.LEFT)
+    worker_count_var = tk.StringVar(value="1")
+    worker_spin = tk.Spinbox(worker_frame, from_=1, to=8, width=5, textvariable=worker_count_var)
+    worker_spin.pack(side=tk.LEFT, padx=5)
+
+    btn_run = tk.Button(root, text="자동화 실행", command=run_automation)
+    btn_run.pack(pady=20)
 
 if __name__=="__main__":
-    root.mainloop()
\ No newline at end of file
+    multiprocessing.freeze_support()
+    # 답변 엔진 비교: python 요기요(완).py --benchmark-engines <store_code> [샘플수]
+    if len(sys.argv) >= 3 and sys.argv[1] == "--benchmark-engines":
+        run_engine_benchmark(sys.argv[2], int(sys.argv[3]) if len(sys.argv) >= 4 else 20)
+    # 로컬/GPT 평가 일치도: python 요기요(완).py --score-agreement <store_code> [샘플수]
+    elif len(sys.argv) >= 3 and sys.argv[1] == "--score-agreement":
+        run_scorer_agreement(sys.argv[2], int(sys.argv[3]) if len(sys.argv) >= 4 else 50)
+    else:
+        build_gui()
+        root.mainloop()
\ No newline at end of file
@@ -25,6 +25,8 @@ from supabase import create_client, Client
 import openai
 from dotenv import load_dotenv
 
+from review_writer import ReviewWriter
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -298,6 +300,8 @@ def _check_duplicate_review(driver, store_code, review_hash, author, review_text
         
         # 기존 리뷰 조회
         existing = supabase.table("reviews").select("*").eq("review_id", review_hash).execute()
+        if existing.data:
+            known_review_records[review_hash] = existing.data[0]
         
         if not existing.data:
             # 새 리뷰 - 일단 저장만 하고 처리는 나중에
@@ -798,6 +802,13 @@ def get_shop_info(store_code, platform_code=None):
 ###################################################################
 # 8) 리뷰 저장 관련 함수
 ###################################################################
+# 이번 실행에서 조회/저장한 리뷰 레코드 (review_id -> 레코드)
+# 중복 체크 시 이미 조회한 값을 재사용해 저장 전 SELECT를 생략
+known_review_records = {}
+
+# 리뷰 저장 write-behind 큐 (배치 upsert, review_writer.py)
+review_writer = ReviewWriter(supabase, "review_write_queue_yogiyo_2day.jsonl", log=logging.info)
+
 def insert_review_to_supabase(
     store_code: str,
     store_name: str,
@@ -859,29 +870,24 @@ def insert_review_to_supabase(
         if response_status == "답변완료":
             data["response_at"] = datetime.now().isoformat()
         
-        # 기존 레코드 확인
-        existing = supabase.table("reviews").select("*").eq("review_id", review_id).execute()
+        # 기존 레코드 확인 (중복 체크에서 조회한 값 사용)
+        record = known_review_records.get(review_id)
         
-        if existing.data:
-            # 기존 레코드가 있으면 업데이트
-            record_id = existing.data[0]['id']
-            record = existing.data[0]
-            
+        if record:
             # retry_count 증가
-            current_retry = record.get('retry_count', 0)
+            current_retry = record.get('retry_count', 0) or 0
             data['retry_count'] = current_retry + 1
             
             # 기존 review_date 유지
             if 'review_date' in record and record['review_date']:
                 data['review_date'] = record['review_date']
-            
-            resp = supabase.table("reviews").update(data).eq("id", record_id).execute()
-            logging.info(f"[insert_review_to_supabase] 리뷰 업데이트 완료: id={record_id}, hash={review_id[:8]}...")
         else:
-            # 새 레코드 삽입
             data['retry_count'] = 0  # 신규는 0부터 시작
-            resp = supabase.table("reviews").insert(data).execute()
-            logging.info(f"[insert_review_to_supabase] 새 리뷰 저장 완료: hash={review_id[:8]}...")
+        
+        # write-behind 큐에 추가 (review_id 기준 upsert로 일괄 저장)
+        review_writer.enqueue(data)
+        known_review_records[review_id] = {**(record or {}), **data}
+        logging.info(f"[insert_review_to_supabase] 리뷰 저장 대기열 추가: hash={review_id[:8]}..., retry={data['retry_count']}")
         
         # 세션 내 처리 완료 리뷰에 추가
         processed_reviews_in_session.add(review_id)
@@ -1698,6 +1704,8 @@ def process_review_with_analysis(driver, store_code, store_name, platform_code,
     # 기존 리뷰 확인
     existing = supabase.table("reviews").select("*").eq("review_id", review_id).execute()
     existing_record = existing.data[0] if existing.data else None
+    if existing_record:
+        known_review_records[review_id] = existing_record
     
     # 1. 이미 존재하는 리뷰 처리 로직
     if existing_record:
@@ -1964,6 +1972,7 @@ def run_automation():
     """
     global processed_reviews_in_session
     processed_reviews_in_session = set()  # 세션 초기화
+    known_review_records.clear()
     
     if not driver_path:
         messagebox.showerror("오류", "크롬드라이버 경로가 설정되지 않았습니다.")
@@ -2004,6 +2013,10 @@ def run_automation():
 
     logging.info(f"[총 매장 수] {len(shop_rows)}개")
 
+    # 리뷰 저장 큐 준비 (이전 실행 미전송분 복구 후 백그라운드 writer 시작)
+    review_writer.load_spilled()
+    review_writer.start()
+
     # 2) 하나씩 처리
     for row in shop_rows:
         try:
@@ -2025,7 +2038,9 @@ def run_automation():
         finally:
             if driver:
                 driver.quit()
+            review_writer.flush(f"매장 종료 {row.get('store_code', 'Unknown')}")
 
+    review_writer.flush("작업 완료")
     messagebox.showinfo("완료", "요기요 리뷰 처리가 모두 완료되었습니다.")
 
 ###################################################################